@@ -1,7 +1,7 @@
 # application/dtos/diet_dtos.py
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 from decimal import Decimal
 
 @dataclass
@@ -150,6 +150,17 @@ class DietWithLiquidationDTO:
     diet: DietResponseDTO
     liquidation: Optional[DietLiquidationResponseDTO] = None
 
+@dataclass
+class DietListRowDTO:
+    """DTO para una fila de las listas de dietas con los datos relacionados ya resueltos"""
+    item: Union[DietResponseDTO, DietLiquidationResponseDTO]
+    diet: DietResponseDTO
+    requester_name: Optional[str] = None
+    department_name: Optional[str] = None
+    diet_service: Optional[DietServiceResponseDTO] = None
+    total: float = 0.0
+    requester_ci: Optional[str] = None
+
 @dataclass
 class DietCounterDTO:
     """DTO para contadores de dietas"""
@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from core.entities.report_query import ReportPage
+
+
+CENT = Decimal("0.01")
+
+DIET_STATUS_LABELS = {
+    "LIQUIDATED": "Liquidado",
+    "REQUESTED": "Solicitado",
+}
+
+
+def to_money(value) -> Decimal:
+    """Convierte un importe a Decimal redondeado a centavos"""
+    if value is None:
+        return Decimal("0.00")
+    if isinstance(value, Decimal):
+        return value.quantize(CENT, rounding=ROUND_HALF_UP)
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def format_report_value(kind: str, value: Any) -> str:
+    """
+    Formatea un valor nativo del reporte para mostrarlo o exportarlo.
+
+    Args:
+        kind: Tipo de la columna (text, int, date, money, diet_status, active_flag)
+        value: Valor nativo de la celda
+
+    Returns:
+        str: Texto tal como se muestra en pantalla
+    """
+    if kind == "money":
+        return f"${to_money(value):.2f}"
+    if kind == "active_flag":
+        return "+Activa" if value else "-Inactiva"
+    if value is None:
+        return "N/A"
+    if kind == "date":
+        return value.strftime("%d/%m/%Y")
+    if kind == "diet_status":
+        return DIET_STATUS_LABELS.get(value, value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class ReportColumn:
+    """
+    DTO que describe una columna del reporte.
+
+    Campos:
+        key: Clave de la columna (coincide con los campos de filtro)
+        header: Encabezado mostrado al usuario
+        kind: Tipo nativo de los valores (text, int, date, money, diet_status, active_flag)
+        sortable: Si el repositorio puede ordenar por la columna (ReportSort);
+            los montos de dietas se calculan en Python y no se ordenan en SQL
+    """
+    key: str
+    header: str
+    kind: str = "text"
+    sortable: bool = True
+
+    def format(self, value: Any) -> str:
+        return format_report_value(self.kind, value)
+
+
+@dataclass
+class ReportTable(ReportPage):
+    """
+    DTO con el resultado tipado de un reporte.
+
+    Las filas guardan valores nativos (int, date, Decimal, códigos de
+    estado) en el orden de `columns`; el texto para pantalla o exportación
+    se genera solo cuando se pide con `display_rows`.
+    """
+    columns: List[ReportColumn] = field(default_factory=list)
+
+    @property
+    def rows(self) -> List[Tuple]:
+        return self.items
+
+    @property
+    def headers(self) -> List[str]:
+        return [column.header for column in self.columns]
+
+    def column_index(self, key: str) -> int:
+        for index, column in enumerate(self.columns):
+            if column.key == key:
+                return index
+        raise KeyError(f"Columna inexistente en el reporte: {key}")
+
+    def column_values(self, key: str) -> List[Any]:
+        """Valores nativos de una columna"""
+        index = self.column_index(key)
+        return [row[index] for row in self.items]
+
+    def display_row(self, row: Sequence[Any]) -> Tuple[str, ...]:
+        return tuple(column.format(value) for column, value in zip(self.columns, row))
+
+    def display_rows(self) -> Iterator[Tuple[str, ...]]:
+        """Filas formateadas, generadas bajo demanda"""
+        for row in self.items:
+            yield self.display_row(row)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Filas como diccionarios {clave: valor nativo}"""
+        keys = [column.key for column in self.columns]
+        return [dict(zip(keys, row)) for row in self.items]
+
+
+DIET_REPORT_COLUMNS = [
+    ReportColumn("no_anticipo", "No.A", "int"),
+    ReportColumn("no_liquidacion", "No.L", "int"),
+    ReportColumn("descripcion", "Descripción"),
+    ReportColumn("solicitante", "Solicitante"),
+    ReportColumn("departamento", "Departamento"),
+    ReportColumn("fecha_inicio", "Fecha Inicio", "date"),
+    ReportColumn("fecha_fin", "Fecha Fin", "date"),
+    ReportColumn("fecha_solicitud", "Fecha Solicitud", "date"),
+    ReportColumn("fecha_liquidacion", "Fecha Liquidación", "date"),
+    ReportColumn("monto_solicitado_efec", "S.E", "money", sortable=False),
+    ReportColumn("monto_solicitado_card", "S.T", "money", sortable=False),
+    ReportColumn("gasto_efec", "G.E", "money", sortable=False),
+    ReportColumn("gasto_card", "G.T", "money", sortable=False),
+    ReportColumn("gasto", "Monto", "money", sortable=False),
+    ReportColumn("estado", "Estado", "diet_status"),
+]
+
+CARD_REPORT_COLUMNS = [
+    ReportColumn("numero_tarjeta", "Número de Tarjeta"),
+    ReportColumn("pin", "PIN"),
+    ReportColumn("balance", "Balance", "money"),
+    ReportColumn("estado", "Estado", "active_flag"),
+]
+
+
+def as_date(value) -> Optional[date]:
+    """Normaliza fechas y fechas-hora a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
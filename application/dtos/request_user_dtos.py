@@ -25,4 +25,20 @@ class RequestUserDetailDTO:
     fullname: str
     email: str
     ci: str
-    department: DepartmentResponseDTO
\ No newline at end of file
+    department: DepartmentResponseDTO
+
+@dataclass
+class RequestUserImportErrorDTO:
+    row: int
+    ci: str
+    fullname: str
+    reason: str
+
+
+@dataclass
+class RequestUserImportResultDTO:
+    total: int
+    created: int
+    existing: int
+    department_not_found: int
+    errors: list[RequestUserImportErrorDTO]
@@ -1,4 +1,4 @@
-from infrastructure.database.session import SessionLocal, get_db
+from infrastructure.database.session import ScopedSession, scope_service_calls
 from infrastructure.database.repositories.card_repository import CardRepositoryImpl
 from infrastructure.database.repositories.card_transaction_repository import (
     CardTransactionRepositoryImpl,
@@ -7,6 +7,7 @@ from infrastructure.database.repositories.card_transaction_repository import (
 from core.use_cases.cards.record_card_transaction_use_case import RecordCardTransactionUseCase
 from core.use_cases.cards.get_card_transactions_use_case import GetCardTransactionsUseCase
 from core.use_cases.cards.get_card_balance_at_date_use_case import GetCardBalanceAtDateUseCase
+from core.use_cases.cards.get_card_balance_history_use_case import GetCardBalanceHistoryUseCase
 from core.use_cases.cards.get_card_monthly_summary_use_case import GetCardMonthlySummaryUseCase
 from core.use_cases.cards.export_card_transactions_use_case import ExportCardTransactionsUseCase
 from core.use_cases.cards.generate_daily_snapshots_use_case import GenerateDailySnapshotsUseCase
@@ -28,8 +29,8 @@ class CardTransactionServiceFactory:
         Returns:
             CardTransactionService: Servicio configurado y listo para usar
         """
-        # Obtener sesión de base de datos
-        db = SessionLocal()
+        # Proxy de sesión por hilo
+        db = ScopedSession
         
         
         # Crear repositorios
@@ -40,7 +41,8 @@ class CardTransactionServiceFactory:
         # Crear casos de uso
         record_card_transaction_use_case = RecordCardTransactionUseCase(
             card_transaction_repository=card_transaction_repository,
-            card_repository=card_repository
+            card_repository=card_repository,
+            card_balance_snapshot_repository=card_balance_snapshot_repository
         )
         
         get_card_transactions_use_case = GetCardTransactionsUseCase(
@@ -53,6 +55,11 @@ class CardTransactionServiceFactory:
             card_repository=card_repository
         )
         
+        get_card_balance_history_use_case = GetCardBalanceHistoryUseCase(
+            card_transaction_repository=card_transaction_repository,
+            card_repository=card_repository
+        )
+        
         get_card_monthly_summary_use_case = GetCardMonthlySummaryUseCase(
             card_balance_snapshot_repository=card_balance_snapshot_repository,
             card_transaction_repository=card_transaction_repository,
@@ -70,12 +77,13 @@ class CardTransactionServiceFactory:
             card_repository=card_repository
         )
         
-        # Crear y retornar servicio
-        return CardTransactionService(
+        # Crear y retornar servicio (una sesión por llamada)
+        return scope_service_calls(CardTransactionService(
             record_card_transaction_use_case=record_card_transaction_use_case,
             get_card_transactions_use_case=get_card_transactions_use_case,
             get_card_balance_at_date_use_case=get_card_balance_at_date_use_case,
             get_card_monthly_summary_use_case=get_card_monthly_summary_use_case,
             export_card_transactions_use_case=export_card_transactions_use_case,
-            generate_daily_snapshots_use_case=generate_daily_snapshots_use_case
-        )
\ No newline at end of file
+            generate_daily_snapshots_use_case=generate_daily_snapshots_use_case,
+            get_card_balance_history_use_case=get_card_balance_history_use_case
+        ))
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from core.entities.cards import Card
 from core.use_cases.cards.aviable_card import GetAviableCardsUseCase
 from core.use_cases.cards.create_card import CreateCardUseCase
@@ -46,6 +46,9 @@ class CardService:
     def discount_card(self, card_id: int, amount: float) -> bool:
         return self.discount_card_use_case.execute(card_id, amount)
     
+    def discount_cards(self, discounts: List[Tuple[int, float]]) -> bool:
+        return self.discount_card_use_case.execute_many(discounts)
+    
     def update_card(self, card_id: int, card_number: str, card_pin: str) -> Optional[Card]:
         return self.update_card_use_case.execute(card_id, card_number, card_pin)
 
@@ -1,5 +1,5 @@
-from datetime import datetime, date
-from typing import Dict, Any
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional
 from application.dtos.card_transaction_dtos import (
     CreateCardTransactionRequest,
     CardTransactionResponse,
@@ -18,6 +18,7 @@ from application.dtos.card_transaction_dtos import (
 from core.use_cases.cards.record_card_transaction_use_case import RecordCardTransactionUseCase
 from core.use_cases.cards.get_card_transactions_use_case import GetCardTransactionsUseCase
 from core.use_cases.cards.get_card_balance_at_date_use_case import GetCardBalanceAtDateUseCase
+from core.use_cases.cards.get_card_balance_history_use_case import GetCardBalanceHistoryUseCase
 from core.use_cases.cards.get_card_monthly_summary_use_case import GetCardMonthlySummaryUseCase
 from core.use_cases.cards.export_card_transactions_use_case import ExportCardTransactionsUseCase
 from core.use_cases.cards.generate_daily_snapshots_use_case import GenerateDailySnapshotsUseCase
@@ -41,7 +42,8 @@ class CardTransactionService:
         get_card_balance_at_date_use_case: GetCardBalanceAtDateUseCase,
         get_card_monthly_summary_use_case: GetCardMonthlySummaryUseCase,
         export_card_transactions_use_case: ExportCardTransactionsUseCase,
-        generate_daily_snapshots_use_case: GenerateDailySnapshotsUseCase
+        generate_daily_snapshots_use_case: GenerateDailySnapshotsUseCase,
+        get_card_balance_history_use_case: Optional[GetCardBalanceHistoryUseCase] = None
     ):
         self.record_card_transaction_use_case = record_card_transaction_use_case
         self.get_card_transactions_use_case = get_card_transactions_use_case
@@ -49,6 +51,13 @@ class CardTransactionService:
         self.get_card_monthly_summary_use_case = get_card_monthly_summary_use_case
         self.export_card_transactions_use_case = export_card_transactions_use_case
         self.generate_daily_snapshots_use_case = generate_daily_snapshots_use_case
+        
+        if get_card_balance_history_use_case is None:
+            get_card_balance_history_use_case = GetCardBalanceHistoryUseCase(
+                card_transaction_repository=get_card_balance_at_date_use_case.card_transaction_repository,
+                card_repository=get_card_balance_at_date_use_case.card_repository
+            )
+        self.get_card_balance_history_use_case = get_card_balance_history_use_case
     
     # ========== OPERACIONES BÁSICAS ==========
     
@@ -245,67 +254,20 @@ class CardTransactionService:
             CardBalanceHistoryResponse: Historial de balances
         """
         try:
-            # Generar lista de fechas en el período
-            date_range = []
-            current_date = request.start_date
-            
-            while current_date <= request.end_date:
-                date_range.append(current_date)
-                current_date += timedelta(days=1)
-            
-            # Obtener balance para cada fecha
-            daily_balances = []
-            total_movement = float('0')
-            
-            for current_date in date_range:
-                try:
-                    # Obtener balance al final del día
-                    end_of_day = datetime.combine(current_date, datetime.max.time())
-                    balance = self.get_card_balance_at_date_use_case.execute(
-                        card_id=request.card_id,
-                        target_date=end_of_day
-                    )
-                    
-                    # Obtener transacciones del día para calcular movimiento
-                    start_of_day = datetime.combine(current_date, datetime.min.time())
-                    daily_transactions = self.get_card_transactions_use_case.execute(
-                        card_id=request.card_id,
-                        start_date=start_of_day,
-                        end_date=end_of_day,
-                        page=1,
-                        page_size=1000  # Número alto para obtener todas
-                    )
-                    
-                    daily_movement = daily_transactions['summary']['net_movement']
-                    total_movement += daily_movement
-                    
-                    daily_balances.append({
-                        'date': current_date,
-                        'balance': balance,
-                        'daily_movement': daily_movement,
-                        'transaction_count': daily_transactions['pagination']['total_count']
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Error procesando fecha {current_date}: {str(e)}")
-                    continue
-            
-            # Calcular balances inicial y final
-            opening_balance = float('0')
-            closing_balance = float('0')
-            
-            if daily_balances:
-                opening_balance = daily_balances[0]['balance'] - daily_balances[0]['daily_movement']
-                closing_balance = daily_balances[-1]['balance']
+            history = self.get_card_balance_history_use_case.execute(
+                card_id=request.card_id,
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
             
             return CardBalanceHistoryResponse(
                 success=True,
                 card_id=request.card_id,
                 period={'start': request.start_date, 'end': request.end_date},
-                daily_balances=daily_balances,
-                opening_balance=opening_balance,
-                closing_balance=closing_balance,
-                total_movement=total_movement
+                daily_balances=history['daily_balances'],
+                opening_balance=history['opening_balance'],
+                closing_balance=history['closing_balance'],
+                total_movement=history['total_movement']
             )
             
         except Exception as e:
@@ -397,6 +359,64 @@ class CardTransactionService:
                 'errors': 1
             }
     
+    def generate_snapshots_bulk(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        force_regenerate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Genera snapshots de todas las tarjetas para un rango de días en bloque.
+        
+        Args:
+            start_date: Primer día (default: ayer)
+            end_date: Último día (default: start_date)
+            force_regenerate: Sobrescribir los snapshots existentes
+            
+        Returns:
+            Dict con estadísticas de la generación
+        """
+        try:
+            return self.generate_daily_snapshots_use_case.execute_bulk(
+                start_date, end_date, force_regenerate
+            )
+            
+        except Exception as e:
+            logger.error(f"Error generando snapshots en bloque: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'start_date': start_date,
+                'end_date': end_date,
+                'snapshots_created': 0,
+                'errors': 1
+            }
+    
+    def backfill_snapshots(self, start_date: date, end_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Regenera los snapshots de un rango de fechas (ej: tras importar historial).
+        
+        Args:
+            start_date: Primer día a regenerar
+            end_date: Último día a regenerar (default: ayer)
+            
+        Returns:
+            Dict con estadísticas de la generación
+        """
+        try:
+            return self.generate_daily_snapshots_use_case.backfill(start_date, end_date)
+            
+        except Exception as e:
+            logger.error(f"Error regenerando snapshots: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'start_date': start_date,
+                'end_date': end_date,
+                'snapshots_created': 0,
+                'errors': 1
+            }
+    
     def cleanup_old_snapshots(self, retention_days: int = 365) -> Dict[str, Any]:
         """
         Elimina snapshots antiguos.
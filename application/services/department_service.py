@@ -7,6 +7,7 @@ from core.use_cases.department.get_department import GetDepartmentUseCase
 from core.use_cases.department.delete_department import DeleteDepartmentUseCase 
 from core.use_cases.department.list_department import ListDepartmentUseCase 
 from application.dtos.department_dtos import *
+from application.services.reference_data_cache import ReferenceDataCache
 from typing import Optional
 
 class DepartmentService:
@@ -16,8 +17,10 @@ class DepartmentService:
                  update_department: UpdateDepartmentUseCase,
                  get_department: GetDepartmentUseCase,
                  delete_department: DeleteDepartmentUseCase,
-                 get_department_list: ListDepartmentUseCase):
+                 get_department_list: ListDepartmentUseCase,
+                 reference_cache: Optional[ReferenceDataCache] = None):
         self.department_repository = department_repository
+        self.reference_cache = reference_cache
         self.create_department = create_department
         self.update_department = update_department
         self.delete_department = delete_department
@@ -27,38 +30,65 @@ class DepartmentService:
     def create_department_f(self, name: str) -> DepartmentResponseDTO:
         try:
             department = self.create_department.execute(name)
+            self._cache_store(department)
             return DepartmentResponseDTO(id=department.id, name=department.name)                                # type: ignore
         except Exception as e:
+            self._invalidate_cache()
             raise Exception(f"Error al crear departamento: {str(e)}")
         
     def get_department_by_id(self, department_id: int) -> Optional[DepartmentResponseDTO]:
         try:
-            department = self.get_department.execute(department_id)
+            if self.reference_cache:
+                department = self.reference_cache.get_department(department_id)
+            else:
+                department = self.get_department.execute(department_id)
             return DepartmentResponseDTO(id=department.id, name=department.name) if department else None        # type: ignore
         except Exception as e:
             raise Exception(f"Error al obtener departamento: {str(e)}")
         
     def get_department_by_name(self, name: str) -> Optional[Department]:
         try:
+            if self.reference_cache:
+                return self.reference_cache.get_department_by_name(name)
             return self.department_repository.get_by_name(name)
         except Exception as e:
             raise Exception(f"Error al buscar departamento por nombre: {str(e)}")
         
     def get_all_departments(self) -> list[DepartmentResponseDTO]:
         try:
-            departments = self.get_department_list.execute()
+            if self.reference_cache:
+                departments = self.reference_cache.list_departments()
+            else:
+                departments = self.get_department_list.execute()
             return [DepartmentResponseDTO(id=dept.id, name=dept.name) for dept in departments]                  # type: ignore
         except Exception as e:
             raise Exception(f"Error al obtener todos los departamentos: {str(e)}")
         
     def update_department_f(self, department_id: int, name: str) -> Department:
         try:
-            return self.update_department.execute(department_id, name)
+            department = self.update_department.execute(department_id, name)
+            self._cache_store(department)
+            return department
         except Exception as e:
+            self._invalidate_cache()
             raise Exception(f"Error al actualizar departamento: {str(e)}")
         
     def delete_department_f(self, department_id: int) -> bool:
         try:
-            return self.delete_department.execute(department_id)    
+            deleted = self.delete_department.execute(department_id)    
+            if deleted and self.reference_cache:
+                self.reference_cache.discard_department(department_id)
+                # Los solicitantes del departamento eliminado también pueden cambiar
+                self.reference_cache.invalidate_requesters()
+            return deleted
         except Exception as e:
-            raise
\ No newline at end of file
+            self._invalidate_cache()
+            raise
+
+    def _cache_store(self, department: Optional[Department]):
+        if self.reference_cache:
+            self.reference_cache.store_department(department)
+
+    def _invalidate_cache(self):
+        if self.reference_cache:
+            self.reference_cache.invalidate_departments()
\ No newline at end of file
@@ -10,8 +10,10 @@ from core.repositories.diet_repository import DietRepository
 from core.repositories.diet_service_repository import DietServiceRepository
 from core.repositories.diet_liquidation_repository import DietLiquidationRepository
 from core.repositories.request_user_repository import RequestUserRepository
+from core.repositories.report_repository import ReportRepository
 
 from core.use_cases.diets.diet_liquidations.list_all_liquidations import ListAllLiquidationsUseCase
+from core.use_cases.diets.diet_liquidations.list_liquidation_records import ListLiquidationRecordsUseCase
 from core.use_cases.diets.diet_services.get_diet_service_by_local import GetDietServiceByLocalUseCase
 from core.use_cases.diets.diet_services.get_service_diet_by_id import GetDietServiceByIdUseCase
 from core.use_cases.diets.diet_services.list_all_diet_services import ListAllDietServicesUseCase
@@ -20,6 +22,7 @@ from core.use_cases.diets.diets.create_diet import CreateDietUseCase
 from core.use_cases.diets.diets.get_all import GetAllUseCase
 from core.use_cases.diets.diets.get_diet import GetDietUseCase
 from core.use_cases.diets.diets.list_diets_by_status import ListDietsByStatusUseCase
+from core.use_cases.diets.diets.list_diet_records import ListDietRecordsUseCase
 from core.use_cases.diets.diets.list_diets_pending_liquidation import ListDietsPendingLiquidationUseCase
 from core.use_cases.diets.diets.update_diet import UpdateDietUseCase
 from core.use_cases.diets.diets.delete_diet import DeleteDietUseCase
@@ -51,6 +54,7 @@ from application.dtos.diet_dtos import (
     DietLiquidationResponseDTO,
     DietCalculationDTO,
     DietWithLiquidationDTO,
+    DietListRowDTO,
     DietCounterDTO
 )
 
@@ -60,11 +64,13 @@ class DietAppService:
                  diet_repository: DietRepository,
                  diet_service_repository: DietServiceRepository,
                  diet_liquidation_repository: DietLiquidationRepository,
-                 request_user_repository: RequestUserRepository):
+                 request_user_repository: RequestUserRepository,
+                 report_repository: Optional[ReportRepository] = None):
         self.diet_repository = diet_repository
         self.diet_service_repository = diet_service_repository
         self.diet_liquidation_repository = diet_liquidation_repository
         self.request_user_repository = request_user_repository
+        self.report_repository = report_repository
 
     # ===== SERVICIOS DE DIETA (PRECIOS) =====
     
@@ -289,6 +295,81 @@ class DietAppService:
         diets = use_case.execute()
         return [self._to_diet_liquidation_response_dto(diet) for diet in diets]
     
+    # ===== FILAS PARA LISTAS =====
+    
+    def list_diet_rows(self, status: Optional[str] = None,
+                       diet_ids: Optional[List[int]] = None) -> List[DietListRowDTO]:
+        """
+        Lista dietas listas para mostrar: solicitante, departamento, tarifa
+        y total se resuelven en una sola consulta en lugar de una por fila.
+        Con `diet_ids` devuelve solo esas dietas (para actualizar la lista tras un alta o edición)
+        """
+        use_case = ListDietRecordsUseCase(self.report_repository)
+        records = use_case.execute(DietStatus(status) if status else None, diet_ids)
+        rows = []
+        for record in records:
+            diet = self._to_diet_response_dto(record.diet)
+            diet_service = self._to_diet_service_response_dto(record.diet_service) if record.diet_service else None
+            rows.append(DietListRowDTO(
+                item=diet,
+                diet=diet,
+                requester_name=record.requester_name,
+                department_name=record.department_name,
+                diet_service=diet_service,
+                total=self._list_row_total(diet, diet_service),
+                requester_ci=record.requester_ci
+            ))
+        return rows
+    
+    def list_liquidation_rows(self, diet_ids: Optional[List[int]] = None) -> List[DietListRowDTO]:
+        """Lista liquidaciones listas para mostrar, con su dieta y datos relacionados en una sola consulta"""
+        use_case = ListLiquidationRecordsUseCase(self.report_repository)
+        rows = []
+        for record in use_case.execute(diet_ids):
+            diet = self._to_diet_response_dto(record.diet)
+            diet_service = self._to_diet_service_response_dto(record.diet_service) if record.diet_service else None
+            liquidation = self._to_diet_liquidation_response_dto(record.liquidation, record.diet_service)
+            rows.append(DietListRowDTO(
+                item=liquidation,
+                diet=diet,
+                requester_name=record.requester_name,
+                department_name=record.department_name,
+                diet_service=diet_service,
+                total=self._list_row_total(liquidation, diet_service),
+                requester_ci=record.requester_ci
+            ))
+        return rows
+    
+    def _list_row_total(self, item, diet_service: Optional[DietServiceResponseDTO]) -> float:
+        """Monto mostrado en las listas de dietas y liquidaciones, con la tarifa de la localidad"""
+        if not diet_service:
+            return 0.0
+        try:
+            is_card = item.accommodation_payment_method.upper() == "CARD"
+            if isinstance(item, DietLiquidationResponseDTO):
+                counts = (item.breakfast_count_liquidated, item.lunch_count_liquidated, item.dinner_count_liquidated)
+                # En liquidaciones el alojamiento se toma de lo pagado
+                if is_card:
+                    accommodation_total = item.total_pay
+                else:
+                    accommodation_total = item.accommodation_count_liquidated * item.total_pay
+            else:
+                counts = (item.breakfast_count, item.lunch_count, item.dinner_count)
+                if is_card:
+                    accommodation_total = item.accommodation_count * diet_service.accommodation_card_price
+                else:
+                    accommodation_total = item.accommodation_count * diet_service.accommodation_cash_price
+            
+            breakfast_count, lunch_count, dinner_count = counts
+            return (
+                breakfast_count * diet_service.breakfast_price +
+                lunch_count * diet_service.lunch_price +
+                dinner_count * diet_service.dinner_price +
+                accommodation_total
+            )
+        except Exception:
+            return 0.0
+    
     # ===== OPERACIONES ESPECIALES =====
     
     def calculate_diet_amount(self, calculation_data: Dict[str, Any]) -> DietCalculationDTO:
@@ -485,11 +566,13 @@ class DietAppService:
             total_amount=total_amount
         )
     
-    def _to_diet_liquidation_response_dto(self, liquidation: DietLiquidation) -> DietLiquidationResponseDTO:
-        # Calcular monto liquidado
+    def _to_diet_liquidation_response_dto(self, liquidation: DietLiquidation,
+                                          diet_service: Optional[DietService] = None) -> DietLiquidationResponseDTO:
+        # Calcular monto liquidado (reutiliza la tarifa ya cargada si es la de la liquidación)
         liquidated_amount = None
         try:
-            diet_service = self.diet_service_repository.get_by_id(liquidation.diet_service_id)
+            if diet_service is None or diet_service.id != liquidation.diet_service_id:
+                diet_service = self.diet_service_repository.get_by_id(liquidation.diet_service_id)
             if diet_service:
                 if liquidation.accommodation_payment_method.value == "CASH":
                     accommodation_price = diet_service.accommodation_cash_price
@@ -0,0 +1,223 @@
+import copy
+from typing import Dict, List, Optional
+from core.entities.department import Department
+from core.entities.request_user import RequestUser
+from core.repositories.department_repository import DepartmentRepository
+from core.repositories.request_user_repository import RequestUserRepository
+from infrastructure.database.session import in_unit_of_work, on_unit_of_work_rollback
+
+
+class ReferenceDataCache:
+    """
+    Caché en memoria de los datos de referencia: departamentos y solicitantes.
+
+    Son las consultas más repetidas de la interfaz (listas de dietas, módulo
+    de solicitantes, reportes y diálogos) y cambian poco. Cada tabla se carga
+    completa en la primera lectura (una consulta) y se indexa por id, por
+    nombre de departamento y por CI del solicitante.
+
+    DepartmentService y UserRequestService la mantienen al día: después de
+    un alta o edición guardan la entidad (`store_*`), después de una baja la
+    quitan (`discard_*`) y, si la escritura falla, invalidan la tabla para
+    que la próxima lectura vuelva a la base de datos. Así una carga masiva
+    (buscar por CI y crear, fila por fila) no recarga la tabla en cada alta.
+
+    Dentro de una unidad de trabajo la escritura todavía puede deshacerse:
+    `store_*` y `discard_*` invalidan la tabla en lugar de modificarla, y
+    si la unidad se deshace la tabla se vuelve a invalidar (lo leído dentro
+    de la unidad puede incluir cambios descartados).
+
+    Las entidades se entregan como copias, para que modificarlas no altere
+    la caché. `stats()` devuelve los aciertos (entidad encontrada en
+    memoria) y los fallos (no encontrada, o hubo que cargar la tabla).
+    """
+
+    def __init__(self, department_repository: DepartmentRepository,
+                 request_user_repository: RequestUserRepository):
+        self.department_repository = department_repository
+        self.request_user_repository = request_user_repository
+        self.hits = {"departments": 0, "requesters": 0}
+        self.misses = {"departments": 0, "requesters": 0}
+        self._departments_by_id: Optional[Dict[int, Department]] = None
+        self._departments_by_name: Dict[str, Department] = {}
+        self._department_order: Optional[List[Department]] = None
+        self._requesters_by_id: Optional[Dict[int, RequestUser]] = None
+        self._requesters_by_ci: Dict[str, RequestUser] = {}
+        self._requester_order: Optional[List[RequestUser]] = None
+
+    # ========== DEPARTAMENTOS ==========
+
+    def get_department(self, department_id: int) -> Optional[Department]:
+        loaded = self._load_departments()
+        return self._lookup("departments", loaded, self._departments_by_id.get(department_id))
+
+    def get_department_by_name(self, name: str) -> Optional[Department]:
+        loaded = self._load_departments()
+        return self._lookup("departments", loaded, self._departments_by_name.get(name))
+
+    def list_departments(self) -> List[Department]:
+        """Departamentos ordenados por nombre, como DepartmentRepository.get_all"""
+        self._count("departments", hit=not self._load_departments())
+        if self._department_order is None:
+            self._department_order = sorted(self._departments_by_id.values(), key=lambda d: d.name)
+        return [self._copy(department) for department in self._department_order]
+
+    def store_department(self, department: Department):
+        """Registra un departamento creado o editado (si la tabla ya está en memoria)"""
+        if self._within_unit(self.invalidate_departments):
+            return
+        if self._departments_by_id is None or department is None:
+            return
+        self.discard_department(department.id)
+        department = copy.copy(department)
+        self._departments_by_id[department.id] = department
+        self._departments_by_name.setdefault(department.name, department)
+        self._department_order = None
+
+    def discard_department(self, department_id: int):
+        """Quita un departamento eliminado (o a punto de reemplazarse)"""
+        if self._within_unit(self.invalidate_departments):
+            return
+        if self._departments_by_id is None:
+            return
+        old = self._departments_by_id.pop(department_id, None)
+        if old is None:
+            return
+        if self._departments_by_name.get(old.name) is old:
+            del self._departments_by_name[old.name]
+            for other in self._departments_by_id.values():
+                if other.name == old.name:
+                    self._departments_by_name[old.name] = other
+                    break
+        self._department_order = None
+
+    def invalidate_departments(self):
+        self._departments_by_id = None
+        self._departments_by_name = {}
+        self._department_order = None
+
+    # ========== SOLICITANTES ==========
+
+    def get_requester(self, request_user_id: int) -> Optional[RequestUser]:
+        loaded = self._load_requesters()
+        return self._lookup("requesters", loaded, self._requesters_by_id.get(request_user_id))
+
+    def get_requester_by_ci(self, ci: str) -> Optional[RequestUser]:
+        loaded = self._load_requesters()
+        return self._lookup("requesters", loaded, self._requesters_by_ci.get(ci))
+
+    def list_requesters(self) -> List[RequestUser]:
+        """Solicitantes ordenados por nombre, como RequestUserRepository.get_all"""
+        self._count("requesters", hit=not self._load_requesters())
+        if self._requester_order is None:
+            self._requester_order = sorted(self._requesters_by_id.values(), key=lambda r: r.fullname)
+        return [self._copy(requester) for requester in self._requester_order]
+
+    def store_requester(self, requester: RequestUser):
+        """Registra un solicitante creado o editado (si la tabla ya está en memoria)"""
+        if self._within_unit(self.invalidate_requesters):
+            return
+        if self._requesters_by_id is None or requester is None:
+            return
+        self.discard_requester(requester.id)
+        requester = copy.copy(requester)
+        self._requesters_by_id[requester.id] = requester
+        self._requesters_by_ci.setdefault(requester.ci, requester)
+        self._requester_order = None
+
+    def discard_requester(self, request_user_id: int):
+        """Quita un solicitante eliminado (o a punto de reemplazarse)"""
+        if self._within_unit(self.invalidate_requesters):
+            return
+        if self._requesters_by_id is None:
+            return
+        old = self._requesters_by_id.pop(request_user_id, None)
+        if old is None:
+            return
+        if self._requesters_by_ci.get(old.ci) is old:
+            del self._requesters_by_ci[old.ci]
+            for other in self._requesters_by_id.values():
+                if other.ci == old.ci:
+                    self._requesters_by_ci[old.ci] = other
+                    break
+        self._requester_order = None
+
+    def invalidate_requesters(self):
+        self._requesters_by_id = None
+        self._requesters_by_ci = {}
+        self._requester_order = None
+
+    # ========== DIAGNÓSTICO ==========
+
+    def invalidate(self):
+        """Descarta todos los datos en memoria"""
+        self.invalidate_departments()
+        self.invalidate_requesters()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Aciertos, fallos (no encontrados o con carga desde la base de datos) y registros en memoria por tabla"""
+        return {
+            "departments": {
+                "hits": self.hits["departments"],
+                "misses": self.misses["departments"],
+                "size": len(self._departments_by_id or {}),
+            },
+            "requesters": {
+                "hits": self.hits["requesters"],
+                "misses": self.misses["requesters"],
+                "size": len(self._requesters_by_id or {}),
+            },
+        }
+
+    # ========== CARGA ==========
+
+    def _load_departments(self) -> bool:
+        """Carga la tabla si no está en memoria; True si hubo que consultarla"""
+        if self._departments_by_id is not None:
+            return False
+        departments = self.department_repository.get_all()
+        self._departments_by_name = {}
+        for department in departments:
+            self._departments_by_name.setdefault(department.name, department)
+        self._department_order = departments
+        self._departments_by_id = {department.id: department for department in departments}
+        return True
+
+    def _load_requesters(self) -> bool:
+        """Carga la tabla si no está en memoria; True si hubo que consultarla"""
+        if self._requesters_by_id is not None:
+            return False
+        requesters = self.request_user_repository.get_all()
+        self._requesters_by_ci = {}
+        for requester in requesters:
+            self._requesters_by_ci.setdefault(requester.ci, requester)
+        self._requester_order = requesters
+        self._requesters_by_id = {requester.id: requester for requester in requesters}
+        return True
+
+    # ========== CONTADORES Y UNIDAD DE TRABAJO ==========
+
+    def _count(self, table: str, hit: bool):
+        if hit:
+            self.hits[table] += 1
+        else:
+            self.misses[table] += 1
+
+    def _lookup(self, table: str, loaded: bool, entity):
+        """Acierto si la entidad ya estaba en memoria; fallo si no existe o hubo que cargar la tabla"""
+        self._count(table, hit=entity is not None and not loaded)
+        return self._copy(entity)
+
+    def _within_unit(self, invalidate) -> bool:
+        """
+        Dentro de una unidad de trabajo invalida la tabla en lugar de
+        modificarla y vuelve a invalidarla si la unidad se deshace.
+        """
+        if not in_unit_of_work():
+            return False
+        invalidate()
+        on_unit_of_work_rollback(invalidate)
+        return True
+
+    def _copy(self, entity):
+        return copy.copy(entity) if entity else None
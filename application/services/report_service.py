@@ -1,11 +1,20 @@
 # application/services/report_service.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence
 from datetime import datetime
 from sqlalchemy.orm import Session
 from application.services.diet_service import DietAppService
 from core.entities.cards import Card
 from core.entities.diet import Diet
 from core.entities.diet_liquidation import DietLiquidation
+from core.entities.diet_report import DietReportRecord
+from core.entities.report_query import ReportFilter, ReportSort
+from application.dtos.report_dtos import (
+    CARD_REPORT_COLUMNS,
+    DIET_REPORT_COLUMNS,
+    ReportTable,
+    as_date,
+    to_money,
+)
 from core.entities.request_user import RequestUser
 from core.entities.department import Department
 from infrastructure.database.repositories.card_repository import CardRepository
@@ -18,86 +27,122 @@ from infrastructure.database.repositories.diet_liquidation_repository import Die
 class ReportService:
     """Servicio para generar reportes del sistema"""
     
-    def __init__(self, card_repo, diet_repo, request_user_repo, department_repo, liquidation_repo, diet_service):
+    def __init__(self, card_repo, diet_repo, request_user_repo, department_repo, liquidation_repo, diet_service, report_repo=None):
         self.card_repo = card_repo
         self.diet_repo = diet_repo
         self.request_user_repo = request_user_repo
         self.department_repo = department_repo
         self.liquidation_repo = liquidation_repo
         self.diet_service = diet_service
+        self.report_repo = report_repo
     
     def get_all_cards_report(self) -> list[dict[str, Any]]:
         """Obtiene todos los datos de tarjetas para el reporte"""
+        return self.get_cards_report_table().to_dicts()
+
+    def get_cards_report_table(self) -> ReportTable:
+        """Obtiene el reporte de tarjetas como resultado tipado"""
         cards = self.card_repo.get_all()
-        
-        report_data = []
-        for card in cards:
-            if not card.is_active:
-                estado = "-Inactiva"
-            else: 
-                estado = "+Activa"
-
-            
-            report_data.append({
-                "numero_tarjeta": card.card_number,
-                "pin": card.card_pin,  # Nota: Esto podría estar hasheado
-                "balance": f"${card.balance:.2f}" if card.balance is not None else "$0.00",
-                "estado": estado,
-                "raw_balance": card.balance or 0.0,
-                "is_active": card.is_active
-            })
-        
-        return report_data
+        return self._cards_table(cards, len(cards))
+
+    def _cards_table(self, cards: List[Card], total: int, page: int = 1, page_size: Optional[int] = None) -> ReportTable:
+        return ReportTable(
+            items=[self._build_card_report_row(card) for card in cards],
+            total_count=total,
+            page=page,
+            page_size=page_size,
+            columns=CARD_REPORT_COLUMNS
+        )
+
+    def _build_card_report_row(self, card: Card) -> tuple:
+        """Construye la fila tipada del reporte de tarjetas (orden de CARD_REPORT_COLUMNS)"""
+        return (
+            card.card_number,
+            card.card_pin,  # Nota: Esto podría estar hasheado
+            to_money(card.balance),
+            card.is_active
+        )
     
     def get_all_diets_report(self) -> list[dict[str, Any]]:
         """Obtiene todos los datos de dietas para el reporte consolidado"""
-        diets = self.diet_repo.get_all()
-        
-        report_data = []
-        for diet in diets:
+        return self.get_diets_report_table().to_dicts()
+
+    def get_diets_report_table(self) -> ReportTable:
+        """Obtiene el reporte consolidado de dietas como resultado tipado"""
+        records = self._get_diet_report_records()
+        return self._diets_table(records, len(records))
+
+    def _diets_table(self, records: List[DietReportRecord], total: int, page: int = 1, page_size: Optional[int] = None) -> ReportTable:
+        return ReportTable(
+            items=[self._build_diet_report_row(record) for record in records],
+            total_count=total,
+            page=page,
+            page_size=page_size,
+            columns=DIET_REPORT_COLUMNS
+        )
+
+    def _get_diet_report_records(self) -> List[DietReportRecord]:
+        """
+        Obtiene las dietas con sus datos relacionados.
+
+        Con un repositorio de reportes todo se resuelve en una sola consulta;
+        sin él se mantiene la resolución dieta por dieta.
+        """
+        if self.report_repo is not None:
+            return self.report_repo.get_diets_report_records()
+
+        records = []
+        for diet in self.diet_repo.get_all():
             # Obtener información del solicitante
             request_user = self.request_user_repo.get_by_id(diet.request_user_id)
-            
+
             # Obtener departamento
-            department_name = "N/A"
+            department_name = None
             if request_user and request_user.department_id:
                 department = self.department_repo.get_by_id(request_user.department_id)
-                department_name = department.name if department else "N/A"
-            
-            diet_service = self.diet_service.get_by_local(diet.is_local)
-
-            # Obtener liquidación si existe
-            liquidation = self.liquidation_repo.get_by_diet_id(diet.id)
-            
-            # Calcular montos
-            monto_solicitado = self._calculate_diet_amount(diet, diet_service)
-            gasto_liquidado = self._calculate_liquidation_amount(liquidation, diet_service)
-            
-            # Formatear fechas
-            fecha_solicitud = diet.created_at.strftime("%d/%m/%Y") if diet.created_at else "N/A"
-            fecha_liquidacion = liquidation.liquidation_date.strftime("%d/%m/%Y") if liquidation and liquidation.liquidation_date else "N/A"
-            
-
-            report_data.append({
-                "no_anticipo": diet.advance_number,
-                "no_liquidacion": liquidation.liquidation_number if liquidation else "N/A",
-                "descripcion": diet.description or "",
-                "solicitante": request_user.fullname if request_user else "N/A",
-                "departamento": department_name,
-                "fecha_inicio": diet.start_date.strftime("%d/%m/%Y") if diet.start_date else "N/A",
-                "fecha_fin": diet.end_date.strftime("%d/%m/%Y") if diet.end_date else "N/A",
-                "fecha_solicitud": fecha_solicitud,
-                "fecha_liquidacion": fecha_liquidacion,
-                "monto_solicitado_efec": f"${monto_solicitado[0]:.2f}",
-                "monto_solicitado_card": f"${monto_solicitado[1]:.2f}",
-                "gasto_efec": f"${gasto_liquidado[0]:.2f}" if liquidation else "$0.00",
-                "gasto_card": f"${gasto_liquidado[1]:.2f}" if liquidation else "$0.00",
-                "raw_monto_solicitado": monto_solicitado[0] + monto_solicitado[1],
-                "raw_gasto": gasto_liquidado[0] + gasto_liquidado[1],
-                "estado": diet.status.upper() if hasattr(diet, 'status') else "N/A"
-            })
-        
-        return report_data
+                department_name = department.name if department else None
+
+            records.append(DietReportRecord(
+                diet=diet,
+                requester_name=request_user.fullname if request_user else None,
+                department_name=department_name,
+                diet_service=self.diet_service.get_by_local(diet.is_local),
+                liquidation=self.liquidation_repo.get_by_diet_id(diet.id),
+                requester_ci=request_user.ci if request_user else None
+            ))
+        return records
+
+    def _build_diet_report_row(self, record: DietReportRecord) -> tuple:
+        """
+        Construye la fila tipada del reporte de dietas (orden de DIET_REPORT_COLUMNS)
+        a partir de un registro ya resuelto
+        """
+        diet = record.diet
+        liquidation = record.liquidation
+
+        # Calcular montos
+        monto_solicitado = self._calculate_diet_amount(diet, record.diet_service)
+        gasto_liquidado = self._calculate_liquidation_amount(liquidation, record.diet_service)
+        gasto_efec = to_money(gasto_liquidado[0])
+        gasto_card = to_money(gasto_liquidado[1])
+
+        return (
+            diet.advance_number,
+            liquidation.liquidation_number if liquidation else None,
+            diet.description or "",
+            record.requester_name,
+            record.department_name,
+            as_date(diet.start_date),
+            as_date(diet.end_date),
+            as_date(diet.created_at),
+            as_date(liquidation.liquidation_date) if liquidation else None,
+            to_money(monto_solicitado[0]),
+            to_money(monto_solicitado[1]),
+            gasto_efec,
+            gasto_card,
+            gasto_efec + gasto_card,
+            diet.status.upper() if hasattr(diet, 'status') else None
+        )
     
     # En ambos calcular la primera pos de la lista es el efectivo y en la segunda en tarjeta
     def _calculate_diet_amount(self, diet: Diet, diet_service) -> list[float]:
@@ -148,46 +193,136 @@ class ReportService:
             accommodation_total = liquidation.accommodation_count_liquidated * diet_service.accommodation_cash_price
             return [efective + accommodation_total, 0.0]
          
+    # ========== FILTRADO Y PAGINACIÓN ==========
+
+    def query_cards_report(
+        self,
+        filters: Optional[Sequence[ReportFilter]] = None,
+        page: int = 1,
+        page_size: Optional[int] = None,
+        sort: Optional[Sequence[ReportSort]] = None
+    ) -> ReportTable:
+        """
+        Obtiene una página del reporte de tarjetas filtrada y ordenada en la base de datos.
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            page: Número de página (desde 1)
+            page_size: Filas por página (None para todas)
+            sort: Criterios de orden sobre las columnas con `sortable` (ver ReportColumn)
+
+        Returns:
+            ReportTable: Filas tipadas de la página y total de filas que cumplen los filtros
+        """
+        limit, offset = self._page_bounds(page, page_size)
+        cards, total = self.report_repo.query_cards_report(filters or (), limit, offset, sort or ())
+        return self._cards_table(cards, total, page, page_size)
+
+    def query_diets_report(
+        self,
+        filters: Optional[Sequence[ReportFilter]] = None,
+        page: int = 1,
+        page_size: Optional[int] = None,
+        sort: Optional[Sequence[ReportSort]] = None
+    ) -> ReportTable:
+        """
+        Obtiene una página del reporte de dietas filtrada y ordenada en la base de datos.
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            page: Número de página (desde 1)
+            page_size: Filas por página (None para todas)
+            sort: Criterios de orden sobre las columnas con `sortable` (ver ReportColumn)
+
+        Returns:
+            ReportTable: Filas tipadas de la página y total de filas que cumplen los filtros
+        """
+        limit, offset = self._page_bounds(page, page_size)
+        records, total = self.report_repo.query_diets_report(filters or (), limit, offset, sort or ())
+        return self._diets_table(records, total, page, page_size)
+
+    # ========== EXPORTACIÓN EN STREAMING ==========
+
+    def iter_diets_report_rows(self, filters: Optional[Sequence[ReportFilter]] = None) -> Iterator[tuple]:
+        """
+        Genera las filas tipadas del reporte de dietas (orden de DIET_REPORT_COLUMNS)
+        agrupadas por departamento, sin materializar el reporte completo.
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+
+        Returns:
+            Iterator[tuple]: Filas con valores nativos
+        """
+        if self.report_repo is not None:
+            for record in self.report_repo.iter_diets_report(filters or ()):
+                yield self._build_diet_report_row(record)
+            return
+
+        if filters:
+            raise ValueError("Los filtros requieren el repositorio de reportes")
+        department_index = [column.key for column in DIET_REPORT_COLUMNS].index("departamento")
+        rows = self.get_diets_report_table().items
+        yield from sorted(rows, key=lambda row: row[department_index] or "")
+
+    def iter_cards_report_rows(self, filters: Optional[Sequence[ReportFilter]] = None) -> Iterator[tuple]:
+        """
+        Genera las filas tipadas del reporte de tarjetas (orden de CARD_REPORT_COLUMNS).
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+
+        Returns:
+            Iterator[tuple]: Filas con valores nativos
+        """
+        if self.report_repo is not None:
+            for card in self.report_repo.iter_cards_report(filters or ()):
+                yield self._build_card_report_row(card)
+            return
+
+        if filters:
+            raise ValueError("Los filtros requieren el repositorio de reportes")
+        yield from self.get_cards_report_table().items
+
+    def _page_bounds(self, page: int, page_size: Optional[int]) -> tuple:
+        if page < 1:
+            raise ValueError("El número de página debe ser mayor a 0")
+        if page_size is None:
+            return None, 0
+        if page_size < 1:
+            raise ValueError("El tamaño de página debe ser mayor a 0")
+        return page_size, (page - 1) * page_size
+
+    def _contains_filters(self, filters: Dict[str, str]) -> List[ReportFilter]:
+        """Convierte el filtro clásico {campo: texto} en condiciones 'contains'"""
+        return [ReportFilter(key, "contains", value) for key, value in (filters or {}).items() if value]
+
     def filter_cards_report(self, filters: Dict[str, str]) -> List[Dict[str, Any]]:
         """Filtra el reporte de tarjetas"""
-        all_cards = self.get_all_cards_report()
-        
-        if not filters:
-            return all_cards
-        
-        filtered_data = []
-        for card in all_cards:
-            match = True
-            for key, value in filters.items():
-                if value and key in card:
-                    card_value = str(card[key]).lower()
-                    if value.lower() not in card_value:
-                        match = False
-                        break
-            
-            if match:
-                filtered_data.append(card)
-        
-        return filtered_data
+        if self.report_repo is not None:
+            return self.query_cards_report(self._contains_filters(filters)).to_dicts()
+
+        return self._filter_table(self.get_cards_report_table(), filters)
     
     def filter_diets_report(self, filters: Dict[str, str]) -> List[Dict[str, Any]]:
         """Filtra el reporte de dietas"""
-        all_diets = self.get_all_diets_report()
-        
-        if not filters:
-            return all_diets
-        
+        if self.report_repo is not None:
+            return self.query_diets_report(self._contains_filters(filters)).to_dicts()
+
+        return self._filter_table(self.get_diets_report_table(), filters)
+
+    def _filter_table(self, table: ReportTable, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Filtrado en memoria sobre el texto mostrado, sin repositorio de reportes"""
+        criteria = [
+            (table.columns[table.column_index(key)], table.column_index(key), value.lower())
+            for key, value in (filters or {}).items()
+            if value and any(column.key == key for column in table.columns)
+        ]
+        keys = [column.key for column in table.columns]
+
         filtered_data = []
-        for diet in all_diets:
-            match = True
-            for key, value in filters.items():
-                if value and key in diet:
-                    diet_value = str(diet[key]).lower()
-                    if value.lower() not in diet_value:
-                        match = False
-                        break
-            
-            if match:
-                filtered_data.append(diet)
+        for row in table.items:
+            if all(text in column.format(row[index]).lower() for column, index, text in criteria):
+                filtered_data.append(dict(zip(keys, row)))
         
-        return filtered_data
\ No newline at end of file
+        return filtered_data
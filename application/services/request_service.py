@@ -6,8 +6,11 @@ from core.use_cases.request_user.update_user_request import UpdateRequestUserUse
 from core.use_cases.request_user.get_request_user import GetRequestUserUseCase
 from core.use_cases.request_user.delete_request_user import DeleteRequestUserUseCase 
 from core.use_cases.request_user.list_users_request import ListRequestUsersUseCase 
+from core.use_cases.request_user.import_request_users import ImportRequestUsersUseCase
 from application.dtos.request_user_dtos import *
+from application.services.reference_data_cache import ReferenceDataCache
 from typing import Optional, Union
+import pandas as pd
 
 class UserRequestService:
     def __init__(self, 
@@ -16,8 +19,12 @@ class UserRequestService:
                  update_user_request: UpdateRequestUserUseCase,
                  get_user_request: GetRequestUserUseCase,
                  get_user_request_list: ListRequestUsersUseCase,
-                 delete_user_request: DeleteRequestUserUseCase):
+                 delete_user_request: DeleteRequestUserUseCase,
+                 reference_cache: Optional[ReferenceDataCache] = None,
+                 import_request_users: Optional[ImportRequestUsersUseCase] = None):
         self.request_user_repository = request_user_repository
+        self.reference_cache = reference_cache
+        self.import_request_users = import_request_users
         self.create_request_user = create_request_user
         self.update_user_request = update_user_request
         self.delete_user_request = delete_user_request
@@ -25,13 +32,18 @@ class UserRequestService:
         self.get_user_request_list = get_user_request_list
 
     def create_user(self, user_data: RequestUserCreateDTO) -> RequestUserResponseDTO:
-        user = self.create_request_user.execute(
-            ci=user_data.ci,
-            username=user_data.username, 
-            fullname=user_data.fullname,
-            email=user_data.email,
-            department_id=user_data.department_id
-        )
+        try:
+            user = self.create_request_user.execute(
+                ci=user_data.ci,
+                username=user_data.username, 
+                fullname=user_data.fullname,
+                email=user_data.email,
+                department_id=user_data.department_id
+            )
+        except Exception:
+            self._invalidate_cache()
+            raise
+        self._cache_store(user)
         return RequestUserResponseDTO(
             id=user.id,                                                                             # type: ignore
             username=user.username,
@@ -46,7 +58,7 @@ class UserRequestService:
         user = None
         
         if isinstance(user_data, int):
-            user = self.request_user_repository.get_by_id(user_data)
+            user = self.get_user_by_id(user_data)
         
         if isinstance(user_data, str) and not user:
             user = self.request_user_repository.get_by_username(user_data)
@@ -57,21 +69,69 @@ class UserRequestService:
         return user
     
     def get_user_by_id(self, user_id: int)-> Optional[RequestUser]:
+        if self.reference_cache:
+            return self.reference_cache.get_requester(user_id)
         return self.get_user_request.execute(user_id)
     
     def get_user_by_ci(self, ci: str)-> Optional[RequestUser]:
+        if self.reference_cache:
+            return self.reference_cache.get_requester_by_ci(ci)
         return self.request_user_repository.get_by_ci(ci)
     
     def get_user_by_username(self, username: str) -> Optional[RequestUser]:
         return self.request_user_repository.get_by_username(username)
     
     def get_all_users(self) -> list[RequestUser]:
+        if self.reference_cache:
+            return self.reference_cache.list_requesters()
         return self.get_user_request_list.execute()
     
     def update_user(self, req_user_id: int, username: str, email: str, fullname: str, department_id: int) -> RequestUser:
-        return self.update_user_request.execute(req_user_id, username, email, fullname, department_id )
+        try:
+            user = self.update_user_request.execute(req_user_id, username, email, fullname, department_id )
+        except Exception:
+            self._invalidate_cache()
+            raise
+        self._cache_store(user)
+        return user
 
     def delete_user(self, user_id: int) -> bool:
-        return self.delete_user_request.execute(user_id)
+        try:
+            deleted = self.delete_user_request.execute(user_id)
+        except Exception:
+            self._invalidate_cache()
+            raise
+        if deleted and self.reference_cache:
+            self.reference_cache.discard_requester(user_id)
+        return deleted
+
+    def import_users(self, frame: pd.DataFrame) -> RequestUserImportResultDTO:
+        """Carga masiva de solicitantes (columnas fullname, ci y department)"""
+        if not self.import_request_users:
+            raise ValueError("Importación masiva de solicitantes no disponible")
+        try:
+            result = self.import_request_users.execute(frame)
+        finally:
+            # Muchas altas de una vez: la tabla se recarga en la próxima lectura
+            self._invalidate_cache()
+
+        return RequestUserImportResultDTO(
+            total=result.total,
+            created=result.created,
+            existing=result.existing,
+            department_not_found=result.department_not_found,
+            errors=[
+                RequestUserImportErrorDTO(row=error.row, ci=error.ci, fullname=error.fullname, reason=error.reason)
+                for error in result.errors
+            ],
+        )
+
+    def _cache_store(self, user: Optional[RequestUser]):
+        if self.reference_cache:
+            self.reference_cache.store_requester(user)
+
+    def _invalidate_cache(self):
+        if self.reference_cache:
+            self.reference_cache.invalidate_requesters()
     
     
\ No newline at end of file
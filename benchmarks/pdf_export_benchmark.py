@@ -0,0 +1,103 @@
+"""
+Benchmark de la exportación a PDF del reporte de dietas.
+
+Genera el reporte de dietas sobre una base SQLite en memoria y compara
+el PdfRenderer fragmentado (tablas de CHUNK_ROWS filas generadas a
+demanda) con una sola tabla por departamento (chunk_rows=0), midiendo
+tiempo, pico de memoria y tamaño del archivo. Con pocos departamentos
+cada tabla única abarca cientos de páginas, que es donde reportlab paga
+el costo de dividirla página a página.
+
+Uso:
+    python -m benchmarks.pdf_export_benchmark
+    python -m benchmarks.pdf_export_benchmark --sizes 1000 10000 50000 --departments 5 --legacy-max 10000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.dtos.report_dtos import DIET_REPORT_COLUMNS
+from benchmarks.report_benchmark import build_service, seed
+from infrastructure.database.session import Base
+from presentation.gui.utils.data_exporter import DataExporter, PdfRenderer
+
+
+def build_document(size: int, departments: int):
+    """Reporte de dietas con `size` filas, tal como se exporta desde la interfaz"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        seed(session, size, random.Random(size), departments)
+        service = build_service(session, joined=True)
+        headers = [column.header for column in DIET_REPORT_COLUMNS]
+        rows = DataExporter.display_rows(DIET_REPORT_COLUMNS, service.iter_diets_report_rows())
+        return DataExporter.build_document(headers, rows, "Reporte de Dietas")
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def render_once(renderer: PdfRenderer, document, track_memory: bool = False):
+    fd, filename = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        if track_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        renderer.render(document, filename)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        return elapsed, peak, os.path.getsize(filename)
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+        os.remove(filename)
+
+
+def measure(renderer: PdfRenderer, document, track_memory: bool):
+    """Tiempo sin trazar; el pico de memoria se mide en una segunda pasada con tracemalloc"""
+    elapsed, _, file_size = render_once(renderer, document)
+    peak = render_once(renderer, document, track_memory=True)[1] if track_memory else None
+    return elapsed, peak, file_size
+
+
+def run(sizes, departments: int, legacy_max: int, track_memory: bool):
+    print(f"{'filas':>8} | {'modo':<12} | {'tiempo (s)':>10} | {'pico (MB)':>9} | {'PDF (KB)':>9}")
+    print("-" * 61)
+    for size in sizes:
+        document = build_document(size, departments)
+        modes = [("fragmentado", PdfRenderer())]
+        if size <= legacy_max:
+            modes.append(("tabla única", PdfRenderer(chunk_rows=0)))
+
+        for name, renderer in modes:
+            elapsed, peak, file_size = measure(renderer, document, track_memory)
+            peak_text = f"{peak / 1024 ** 2:>9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{size:>8} | {name:<12} | {elapsed:>10.3f} | {peak_text} | {file_size / 1024:>9.0f}")
+
+        if size > legacy_max:
+            print(f"{size:>8} | {'tabla única':<12} | {'omitido':>10} | {'-':>9} | {'-':>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--departments", type=int, default=5,
+                        help="Cantidad de departamentos (menos departamentos, tablas más largas)")
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Tamaño máximo en el que se ejecuta también el modo de tabla única")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="No medir el pico de memoria (requiere una segunda pasada con tracemalloc)")
+    args = parser.parse_args()
+    run(args.sizes, args.departments, args.legacy_max, not args.no_memory)
+
+
+if __name__ == "__main__":
+    main()
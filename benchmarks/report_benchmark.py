@@ -0,0 +1,161 @@
+"""
+Benchmark del reporte consolidado de dietas.
+
+Compara la resolución dieta por dieta (N+1 consultas) con la consulta
+unificada de ReportRepositoryImpl sobre una base SQLite en memoria,
+midiendo cantidad de sentencias SQL y tiempo total.
+
+Uso:
+    python -m benchmarks.report_benchmark
+    python -m benchmarks.report_benchmark --sizes 1000 10000 50000 --legacy-max 10000
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from application.services.report_service import ReportService
+from infrastructure.database.models import (
+    DepartmentModel,
+    DietLiquidationModel,
+    DietModel,
+    DietServiceModel,
+    RequestUserModel,
+)
+from infrastructure.database.repositories.department_repository import DepartmentRepositoryImpl
+from infrastructure.database.repositories.diet_liquidation_repository import DietLiquidationRepositoryImpl
+from infrastructure.database.repositories.diet_repository import DietRepositoryImpl
+from infrastructure.database.repositories.diet_service_repository import DietServiceRepositoryImpl
+from infrastructure.database.repositories.report_repository import ReportRepositoryImpl
+from infrastructure.database.repositories.request_user_repository import RequestUserRepositoryImpl
+from infrastructure.database.session import Base
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL emitidas por un engine"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def seed(session, diet_count: int, rng: random.Random, department_count: Optional[int] = None):
+    """Puebla la base con departamentos, solicitantes, tarifas, dietas y liquidaciones"""
+    department_count = department_count or max(5, diet_count // 500)
+    requester_count = max(20, diet_count // 20)
+
+    session.execute(insert(DietServiceModel), [
+        {"is_local": True, "breakfast_price": 2.5, "lunch_price": 5.0, "dinner_price": 5.0,
+         "accommodation_cash_price": 20.0, "accommodation_card_price": 25.0},
+        {"is_local": False, "breakfast_price": 3.0, "lunch_price": 6.0, "dinner_price": 6.0,
+         "accommodation_cash_price": 30.0, "accommodation_card_price": 35.0},
+    ])
+    session.execute(insert(DepartmentModel), [
+        {"name": f"Departamento {i}"} for i in range(1, department_count + 1)
+    ])
+    session.execute(insert(RequestUserModel), [
+        {"username": f"user{i}", "fullname": f"Solicitante {i}", "email": f"user{i}@example.com",
+         "ci": f"{i:011d}", "department_id": rng.randint(1, department_count)}
+        for i in range(1, requester_count + 1)
+    ])
+
+    base_day = date(2024, 1, 1)
+    diets, liquidations = [], []
+    for i in range(1, diet_count + 1):
+        start = base_day + timedelta(days=rng.randint(0, 600))
+        is_local = rng.random() < 0.5
+        diets.append({
+            "id": i, "is_local": is_local, "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(0, 5)),
+            "description": f"Comisión {i}", "advance_number": i, "is_group": False,
+            "status": "LIQUIDATED" if i % 3 == 0 else "REQUESTED",
+            "breakfast_count": rng.randint(0, 5), "lunch_count": rng.randint(0, 5),
+            "dinner_count": rng.randint(0, 5), "accommodation_count": rng.randint(0, 4),
+            "accommodation_payment_method": "CASH",
+            "request_user_id": rng.randint(1, requester_count),
+            "diet_service_id": 1 if is_local else 2, "created_at": start,
+        })
+        if i % 3 == 0:
+            liquidations.append({
+                "liquidation_number": i, "liquidation_date": datetime.combine(start, datetime.min.time()),
+                "breakfast_count_liquidated": rng.randint(0, 5), "lunch_count_liquidated": rng.randint(0, 5),
+                "dinner_count_liquidated": rng.randint(0, 5), "accommodation_count_liquidated": rng.randint(0, 4),
+                "accommodation_payment_method": "CASH", "total_pay": 0.0,
+                "diet_id": i, "diet_service_id": 1 if is_local else 2,
+            })
+    session.execute(insert(DietModel), diets)
+    if liquidations:
+        session.execute(insert(DietLiquidationModel), liquidations)
+    session.commit()
+
+
+def build_service(session, joined: bool) -> ReportService:
+    return ReportService(
+        card_repo=None,
+        diet_repo=DietRepositoryImpl(session),
+        request_user_repo=RequestUserRepositoryImpl(session),
+        department_repo=DepartmentRepositoryImpl(session),
+        liquidation_repo=DietLiquidationRepositoryImpl(session),
+        diet_service=DietServiceRepositoryImpl(session),
+        report_repo=ReportRepositoryImpl(session) if joined else None,
+    )
+
+
+def measure(engine, counter, joined: bool):
+    session = sessionmaker(bind=engine)()
+    try:
+        service = build_service(session, joined)
+        counter.reset()
+        started = time.perf_counter()
+        rows = service.get_all_diets_report()
+        elapsed = time.perf_counter() - started
+        return len(rows), counter.count, elapsed, rows
+    finally:
+        session.close()
+
+
+def run(sizes, legacy_max: int):
+    print(f"{'dietas':>8} | {'modo':<9} | {'consultas':>9} | {'tiempo (s)':>10}")
+    print("-" * 46)
+    for size in sizes:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        seed_session = sessionmaker(bind=engine)()
+        seed(seed_session, size, random.Random(size))
+        seed_session.close()
+
+        counter = QueryCounter(engine)
+        count, queries, elapsed, joined_rows = measure(engine, counter, joined=True)
+        print(f"{size:>8} | {'unificada':<9} | {queries:>9} | {elapsed:>10.3f}")
+
+        if size <= legacy_max:
+            count, queries, elapsed, legacy_rows = measure(engine, counter, joined=False)
+            print(f"{size:>8} | {'N+1':<9} | {queries:>9} | {elapsed:>10.3f}")
+            if legacy_rows != joined_rows:
+                print(f"{'':>8}   ADVERTENCIA: los resultados difieren entre ambos modos")
+        else:
+            print(f"{size:>8} | {'N+1':<9} | {'omitido':>9} | {'-':>10}")
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Tamaño máximo en el que se ejecuta también el modo N+1")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -53,4 +53,32 @@ class CardTransaction:
                 f"Inconsistencia en balances: "
                 f"{self.previous_balance} + {self.amount} = {expected_new_balance}, "
                 f"pero new_balance es {self.new_balance}"
-            )
\ No newline at end of file
+            )
+
+@dataclass
+class CardMovement:
+    """
+    Movimiento a aplicar sobre el saldo de una tarjeta.
+    
+    Describe el cambio de saldo y los datos del asiento que se registra en
+    el historial; el repositorio calcula los balances antes/después.
+    """
+    card_id: int
+    amount: float
+    transaction_type: str
+    notes: Optional[str] = None
+    operation_date: Optional[datetime] = None
+    diet_id: Optional[int] = None
+    liquidation_id: Optional[int] = None
+    require_active: bool = False
+
+    def __post_init__(self):
+        """Validaciones después de la inicialización"""
+        if not self.card_id or self.card_id <= 0:
+            raise ValueError("El ID de la tarjeta debe ser un número positivo")
+        
+        if not self.amount:
+            raise ValueError("El monto del movimiento no puede ser cero")
+        
+        if not self.transaction_type:
+            raise ValueError("El tipo de transacción es requerido")
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+from core.entities.diet import Diet
+from core.entities.diet_liquidation import DietLiquidation
+from core.entities.diet_service import DietService
+
+
+@dataclass
+class DietReportRecord:
+    """
+
+    Registro de lectura para el reporte consolidado de dietas.
+
+    Agrupa en un solo objeto la dieta y los datos relacionados que el
+    reporte necesita (solicitante, departamento, tarifa y liquidación),
+    de modo que puedan obtenerse con una única consulta.
+
+    """
+    diet: Diet
+    requester_name: Optional[str] = None
+    department_name: Optional[str] = None
+    diet_service: Optional[DietService] = None
+    liquidation: Optional[DietLiquidation] = None
+    requester_ci: Optional[str] = None
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ReportFilter:
+    """
+
+    Condición de filtrado de un reporte expresada como (campo, operador, valor).
+
+    El campo es la clave de la columna del reporte (por ejemplo
+    "solicitante" o "fecha_solicitud"); el repositorio la traduce a la
+    columna correspondiente del modelo y compila la condición en SQL.
+
+    """
+    field: str
+    operator: str = "contains"
+    value: Any = None
+
+    OPERATORS = ("contains", "startswith", "eq", "ne", "gt", "gte", "lt", "lte", "in")
+
+    def __post_init__(self):
+        """Validaciones después de la inicialización"""
+        if self.operator not in self.OPERATORS:
+            raise ValueError(f"Operador de filtro no soportado: {self.operator}")
+
+
+@dataclass(frozen=True)
+class ReportSort:
+    """
+
+    Criterio de orden de un reporte: clave de la columna y sentido.
+
+    Usa las mismas claves que ReportFilter; el repositorio lo traduce a un
+    ORDER BY sobre la columna nativa, de modo que el orden abarca todas las
+    filas que cumplen los filtros y no solo la página cargada.
+
+    """
+    field: str
+    descending: bool = False
+
+
+@dataclass
+class ReportPage(Generic[T]):
+    """
+
+    Página de resultados de un reporte junto con el total de filas que
+    cumplen los filtros.
+
+    """
+    items: List[T] = field(default_factory=list)
+    total_count: int = 0
+    page: int = 1
+    page_size: Optional[int] = None
+
+    @property
+    def total_pages(self) -> int:
+        """Cantidad de páginas disponibles (al menos una)"""
+        if not self.page_size:
+            return 1
+        return max(1, -(-self.total_count // self.page_size))
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.total_pages
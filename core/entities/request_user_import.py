@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class RequestUserImportError:
+    """
+
+    Fila rechazada en la carga masiva de solicitantes.
+
+    `row` es la etiqueta de la fila en la tabla de origen (su índice) y
+    `reason` el primer motivo de rechazo encontrado.
+
+    """
+    row: int
+    ci: Optional[str]
+    fullname: Optional[str]
+    reason: str
+
+
+@dataclass
+class RequestUserImportResult:
+    """
+
+    Resultado de la carga masiva de solicitantes: totales y filas rechazadas.
+
+    """
+    total: int = 0
+    created: int = 0
+    existing: int = 0
+    department_not_found: int = 0
+    errors: List[RequestUserImportError] = field(default_factory=list)
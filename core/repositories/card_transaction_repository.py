@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
-from core.entities.card_transaction import CardTransaction
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from core.entities.card_transaction import CardTransaction, CardMovement
 from core.entities.card_balance_snapshot import CardBalanceSnapshot
 
 
@@ -26,6 +26,43 @@ class CardTransactionRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def apply_movement(self, movement: CardMovement, update_snapshot: bool = True) -> CardTransaction:
+        """
+        Aplica un movimiento al saldo de la tarjeta y lo registra en el historial.
+        
+        El saldo se actualiza de forma atómica en la base de datos y el
+        asiento se inserta en la misma transacción (un solo commit).
+        
+        Args:
+            movement: Movimiento a aplicar (positivo crédito, negativo débito)
+            update_snapshot: Mantener también el snapshot del día
+            
+        Returns:
+            CardTransaction: La transacción registrada
+            
+        Raises:
+            ValueError: Si la tarjeta no existe, está inactiva (cuando se
+                exige) o el saldo no alcanza para el débito
+        """
+        pass
+    
+    @abstractmethod
+    def apply_movements(self, movements: List[CardMovement], update_snapshot: bool = True) -> List[CardTransaction]:
+        """
+        Aplica varios movimientos en una sola transacción.
+        
+        Si alguno falla no se aplica ninguno.
+        
+        Args:
+            movements: Movimientos a aplicar, en orden
+            update_snapshot: Mantener también los snapshots diarios
+            
+        Returns:
+            List[CardTransaction]: Transacciones registradas, en el mismo orden
+        """
+        pass
+    
     @abstractmethod
     def get_by_id(self, transaction_id: int) -> Optional[CardTransaction]:
         """
@@ -65,6 +102,26 @@ class CardTransactionRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def iter_movements(
+        self,
+        card_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Tuple[datetime, float]]:
+        """
+        Recorre los movimientos de una tarjeta en un período, en orden cronológico.
+        
+        Args:
+            card_id: ID de la tarjeta
+            start_date: Fecha inicial del rango (inclusive)
+            end_date: Fecha final del rango (inclusive)
+            
+        Returns:
+            Iterator[Tuple[datetime, float]]: Pares (fecha de operación, monto) ordenados por fecha
+        """
+        pass
+    
     @abstractmethod
     def count_by_card_id(
         self,
@@ -101,6 +158,24 @@ class CardTransactionRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_balance_before(self, card_id: int, before_date: datetime) -> float:
+        """
+        Obtiene el balance de una tarjeta justo antes de un instante.
+        
+        Se calcula como el balance actual menos los movimientos registrados
+        con fecha desde ese instante, así una transacción cargada con fecha
+        pasada cuenta en el día de su operación.
+        
+        Args:
+            card_id: ID de la tarjeta
+            before_date: Instante de referencia (exclusivo)
+            
+        Returns:
+            float: Balance de la tarjeta antes del instante
+        """
+        pass
+    
     @abstractmethod
     def get_transactions_by_reference(
         self, 
@@ -138,6 +213,39 @@ class CardTransactionRepository(ABC):
             Dict con estadísticas del período
         """
         pass
+    
+    @abstractmethod
+    def get_daily_aggregates(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene créditos, débitos y cantidad de transacciones por tarjeta y día.
+        
+        Args:
+            start_date: Primer día del rango (inclusive)
+            end_date: Último día del rango (inclusive)
+            
+        Returns:
+            List[Dict]: Registros con card_id, day, total_credits, total_debits y transaction_count
+        """
+        pass
+    
+    @abstractmethod
+    def get_opening_balances(self, before_date: datetime) -> Dict[int, float]:
+        """
+        Obtiene el balance de todas las tarjetas justo antes de un instante.
+        
+        Aplica la misma regla que get_balance_before a todas las tarjetas.
+        
+        Args:
+            before_date: Instante de referencia (exclusivo)
+            
+        Returns:
+            Dict[int, float]: Balance por ID de tarjeta
+        """
+        pass
 
 
 class CardBalanceSnapshotRepository(ABC):
@@ -229,4 +337,49 @@ class CardBalanceSnapshotRepository(ABC):
         Returns:
             int: Número de snapshots eliminados
         """
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def apply_transaction(self, transaction: CardTransaction) -> CardBalanceSnapshot:
+        """
+        Actualiza incrementalmente el snapshot del día de una transacción.
+        
+        Suma la transacción a créditos/débitos/conteo, avanza el balance de
+        cierre y recalcula los snapshots de días posteriores. No confirma la
+        transacción: forma parte de la unidad de trabajo de quien la llama.
+        
+        Args:
+            transaction: Transacción ya guardada (con ID)
+            
+        Returns:
+            CardBalanceSnapshot: Snapshot del día actualizado
+        """
+        pass
+    
+    @abstractmethod
+    def get_existing_keys(self, start_date: date, end_date: date) -> set:
+        """
+        Obtiene los pares (card_id, snapshot_date) ya generados en un rango.
+        
+        Args:
+            start_date: Primer día del rango (inclusive)
+            end_date: Último día del rango (inclusive)
+            
+        Returns:
+            set: Conjunto de tuplas (card_id, snapshot_date)
+        """
+        pass
+    
+    @abstractmethod
+    def bulk_upsert(self, snapshots: List[CardBalanceSnapshot], overwrite: bool = True) -> int:
+        """
+        Inserta o actualiza muchos snapshots en una sola transacción.
+        
+        Args:
+            snapshots: Snapshots a guardar
+            overwrite: Si es False, los snapshots existentes no se modifican
+            
+        Returns:
+            int: Número de snapshots enviados a la base de datos
+        """
+        pass
@@ -28,6 +28,11 @@ class DepartmentRepository(ABC):
         """Obtiene todos los departamentos con ese nombre"""
         pass
 
+    @abstractmethod
+    def get_by_names(self, names: list[str]) -> dict[str, Department]:
+        """Obtiene los departamentos con los nombres dados, indexados por nombre"""
+        pass
+
     @abstractmethod
     def update(self, dpto: Department) -> Department:
         """Actualiza un departamento existente"""
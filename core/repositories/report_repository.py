@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Sequence, Tuple
+from core.entities.cards import Card
+from core.entities.diet import DietStatus
+from core.entities.diet_report import DietReportRecord
+from core.entities.report_query import ReportFilter, ReportSort
+
+
+class ReportRepository(ABC):
+    """
+
+    Interfaz para el repositorio de consultas de reportes.
+    Define los contratos de lectura que alimentan los reportes consolidados.
+
+    """
+
+    @abstractmethod
+    def get_diets_report_records(self) -> List[DietReportRecord]:
+        """
+
+        Obtiene todas las dietas junto con su solicitante, departamento,
+        tarifa y liquidación en una sola consulta
+
+        """
+        pass
+
+    @abstractmethod
+    def query_diets_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: Sequence[ReportSort] = ()
+    ) -> Tuple[List[DietReportRecord], int]:
+        """
+
+        Obtiene una página del reporte de dietas aplicando los filtros en SQL
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            limit: Cantidad máxima de registros (None para todos)
+            offset: Registros a omitir desde el inicio
+            sort: Criterios de orden, del principal al último desempate
+
+        Returns:
+            Tuple[List[DietReportRecord], int]: Registros de la página y total que cumple los filtros
+
+        """
+        pass
+
+    @abstractmethod
+    def query_cards_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: Sequence[ReportSort] = ()
+    ) -> Tuple[List[Card], int]:
+        """
+
+        Obtiene una página del reporte de tarjetas aplicando los filtros en SQL
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            limit: Cantidad máxima de registros (None para todos)
+            offset: Registros a omitir desde el inicio
+            sort: Criterios de orden, del principal al último desempate
+
+        Returns:
+            Tuple[List[Card], int]: Tarjetas de la página y total que cumple los filtros
+
+        """
+        pass
+
+    @abstractmethod
+    def iter_diets_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        batch_size: int = 1000
+    ) -> Iterator[DietReportRecord]:
+        """
+
+        Recorre el reporte de dietas filtrado sin cargarlo completo en memoria,
+        agrupado por departamento (orden: departamento, No. de anticipo desc.)
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            batch_size: Filas que se leen de la base de datos por lote
+
+        Returns:
+            Iterator[DietReportRecord]: Registros en orden de exportación
+
+        """
+        pass
+
+    @abstractmethod
+    def iter_cards_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        batch_size: int = 1000
+    ) -> Iterator[Card]:
+        """
+
+        Recorre el reporte de tarjetas filtrado sin cargarlo completo en memoria
+
+        Args:
+            filters: Condiciones (campo, operador, valor) sobre las columnas del reporte
+            batch_size: Filas que se leen de la base de datos por lote
+
+        Returns:
+            Iterator[Card]: Tarjetas ordenadas por número
+
+        """
+        pass
+
+    @abstractmethod
+    def list_diet_records(self, status: Optional[DietStatus] = None,
+                          diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        """
+
+        Obtiene las dietas (todas o las de un estado) con su solicitante,
+        departamento, tarifa y liquidación en una sola consulta
+
+        Args:
+            status: Estado de las dietas a listar (None para todas)
+            diet_ids: Limita el resultado a esas dietas (None para todas)
+
+        Returns:
+            List[DietReportRecord]: Registros ordenados por No. de anticipo desc.
+
+        """
+        pass
+
+    @abstractmethod
+    def list_liquidation_records(self, diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        """
+
+        Obtiene todas las liquidaciones con su dieta, solicitante,
+        departamento y tarifa en una sola consulta (un registro por liquidación)
+
+        Args:
+            diet_ids: Limita el resultado a las liquidaciones de esas dietas (None para todas)
+
+        Returns:
+            List[DietReportRecord]: Registros ordenados por fecha de liquidación desc.
+
+        """
+        pass
@@ -32,11 +32,26 @@ class RequestUserRepository(ABC):
     def get_by_ci(self, ci: str) -> Optional[RequestUser]:
         pass
 
+    @abstractmethod
+    def get_existing_cis(self, cis: list[str]) -> set[str]:
+        """Devuelve cuáles de los CI dados ya están registrados"""
+        pass
+
+    @abstractmethod
+    def get_existing_fullnames(self, fullnames: list[str]) -> set[str]:
+        """Devuelve cuáles de los nombres completos dados ya están registrados"""
+        pass
+
     @abstractmethod
     def get_all(self) -> list[RequestUser]:
         """Obtiene todos los solicitantes del sistema"""
         pass
 
+    @abstractmethod
+    def save_all(self, req_users: list[RequestUser]) -> int:
+        """Guarda varios solicitantes nuevos en una sola transacción"""
+        pass
+
     @abstractmethod
     def update(self, req_user: RequestUser) -> RequestUser:
         """Actualiza un solicitante existente"""
@@ -1,6 +1,7 @@
+from typing import List, Optional, Tuple
+from core.entities.card_transaction import CardMovement
 from core.repositories.card_repository import CardRepository
 from core.repositories.card_transaction_repository import CardTransactionRepository
-from core.use_cases.cards.record_card_transaction_use_case import RecordCardTransactionUseCase
 
 class DiscountCardUseCase:
     def __init__(self, card_repository: CardRepository, 
@@ -8,17 +9,34 @@ class DiscountCardUseCase:
     ):
         self.card_repository = card_repository
         self.card_transaction_repository = card_transaction_repository
-        self.record_card_transaction = RecordCardTransactionUseCase( card_transaction_repository, card_repository,)
 
-    def execute(self, card_id: int, amount: float) -> bool:
-        # Verificar si la tarjeta existe
-        card = self.card_repository.get_by_id(card_id)
-        if not card:
-            return False
+    def execute(self, card_id: int, amount: float, liquidation_id: Optional[int] = None) -> bool:
+        """
+        Descuenta de la tarjeta y registra el asiento en una sola transacción.
         
-        # Recargar la tarjeta
-        succes = self.card_repository.discount(card_id, amount)
-        if succes:
-            self.record_card_transaction.execute(card_id, 'PAYMENT', -amount, description='Liquidación de dieta', reference_type='DEBIT' )
+        Raises:
+            ValueError: Si la tarjeta no existe (antes se devolvía False) o
+                el saldo no alcanza
+        """
+        # Saldo y asiento en una sola transacción
+        self.card_transaction_repository.apply_movement(self._movement(card_id, amount, liquidation_id))
         
-        return succes 
\ No newline at end of file
+        return True
+
+    def execute_many(self, discounts: List[Tuple[int, float]], liquidation_id: Optional[int] = None) -> bool:
+        """
+        Descuenta de varias tarjetas a la vez (p. ej. al liquidar una dieta grupal).
+        
+        Si alguna tarjeta no tiene saldo suficiente no se aplica ningún descuento.
+        """
+        movements = [self._movement(card_id, amount, liquidation_id) for card_id, amount in discounts]
+        if movements:
+            self.card_transaction_repository.apply_movements(movements)
+        
+        return True
+
+    def _movement(self, card_id: int, amount: float, liquidation_id: Optional[int]) -> CardMovement:
+        if amount <= 0:
+            raise ValueError("El monto a descontar debe ser mayor a cero")
+        
+        return CardMovement(card_id, -amount, 'PAYMENT', notes='Liquidación de dieta', liquidation_id=liquidation_id)
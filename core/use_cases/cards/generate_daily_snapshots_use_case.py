@@ -98,6 +98,132 @@ class GenerateDailySnapshotsUseCase:
         
         return stats
     
+    def execute_bulk(
+        self,
+        start_date: date = None,
+        end_date: date = None,
+        force_regenerate: bool = False
+    ) -> dict:
+        """
+        Genera snapshots de todas las tarjetas para uno o varios días.
+        
+        A diferencia de execute, no consulta tarjeta por tarjeta: obtiene los
+        balances de apertura y los totales diarios con consultas agrupadas,
+        calcula los snapshots en memoria y los guarda con un upsert en una
+        sola transacción.
+        
+        Args:
+            start_date: Primer día a generar (default: ayer)
+            end_date: Último día a generar (default: start_date)
+            force_regenerate: Sobrescribir los snapshots existentes
+            
+        Returns:
+            Dict con estadísticas de la generación
+        """
+        from core.entities.card_balance_snapshot import CardBalanceSnapshot
+        
+        if start_date is None:
+            start_date = date.today() - timedelta(days=1)
+        if end_date is None:
+            end_date = start_date
+        if start_date > end_date:
+            raise ValueError("La fecha inicial no puede ser posterior a la final")
+        
+        logger.info(f"Iniciando generación masiva de snapshots del {start_date} al {end_date}")
+        
+        card_ids = [card.id for card in self.card_repository.get_all()]
+        opening_balances = self.card_transaction_repository.get_opening_balances(
+            datetime.combine(start_date, datetime.min.time())
+        )
+        daily_totals = {
+            (row['card_id'], row['day']): row
+            for row in self.card_transaction_repository.get_daily_aggregates(start_date, end_date)
+        }
+        existing = self.card_balance_snapshot_repository.get_existing_keys(start_date, end_date)
+        
+        stats = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'total_cards': len(card_ids),
+            'snapshots_created': 0,
+            'snapshots_updated': 0,
+            'snapshots_skipped': 0,
+            'errors': 0
+        }
+        
+        snapshots = []
+        days = (end_date - start_date).days + 1
+        
+        for card_id in card_ids:
+            balance = opening_balances.get(card_id, float('0'))
+            
+            for offset in range(days):
+                snapshot_date = start_date + timedelta(days=offset)
+                totals = daily_totals.get((card_id, snapshot_date))
+                
+                total_credits = totals['total_credits'] if totals else float('0')
+                total_debits = totals['total_debits'] if totals else float('0')
+                closing_balance = round(balance + total_credits - total_debits, 2)
+                
+                if (card_id, snapshot_date) in existing:
+                    if force_regenerate:
+                        stats['snapshots_updated'] += 1
+                    else:
+                        stats['snapshots_skipped'] += 1
+                else:
+                    stats['snapshots_created'] += 1
+                
+                snapshots.append(CardBalanceSnapshot(
+                    card_id=card_id,
+                    snapshot_date=snapshot_date,
+                    opening_balance=balance,
+                    closing_balance=closing_balance,
+                    total_credits=total_credits,
+                    total_debits=total_debits,
+                    transaction_count=totals['transaction_count'] if totals else 0
+                ))
+                
+                # El cierre de un día es la apertura del siguiente
+                balance = closing_balance
+        
+        try:
+            self.card_balance_snapshot_repository.bulk_upsert(snapshots, overwrite=force_regenerate)
+        except Exception as e:
+            # El upsert es una sola transacción: no se guardó ningún snapshot
+            stats['errors'] = stats['snapshots_created'] + stats['snapshots_updated']
+            stats['snapshots_created'] = 0
+            stats['snapshots_updated'] = 0
+            logger.error(f"Error guardando snapshots en bloque: {str(e)}")
+        
+        logger.info(
+            f"Generación masiva de snapshots completada: "
+            f"{stats['snapshots_created']} creados, "
+            f"{stats['snapshots_updated']} actualizados, "
+            f"{stats['snapshots_skipped']} omitidos, "
+            f"{stats['errors']} errores"
+        )
+        
+        return stats
+    
+    def backfill(self, start_date: date, end_date: date = None) -> dict:
+        """
+        Regenera todos los snapshots de un rango de fechas.
+        
+        Útil después de importar transacciones históricas: los snapshots
+        existentes del rango se recalculan a partir del libro de transacciones.
+        
+        Args:
+            start_date: Primer día a regenerar
+            end_date: Último día a regenerar (default: ayer)
+            
+        Returns:
+            Dict con estadísticas de la generación
+        """
+        if end_date is None:
+            end_date = date.today() - timedelta(days=1)
+        
+        return self.execute_bulk(start_date, end_date, force_regenerate=True)
+    
     def _calculate_daily_snapshot(self, card_id: int, snapshot_date: date):
         """Calcula un snapshot diario para una tarjeta."""
         from core.entities.card_balance_snapshot import CardBalanceSnapshot
@@ -106,8 +232,8 @@ class GenerateDailySnapshotsUseCase:
         start_of_day = datetime.combine(snapshot_date, datetime.min.time())
         end_of_day = datetime.combine(snapshot_date, datetime.max.time())
         
-        # Obtener balance al inicio del día
-        opening_balance = self.card_transaction_repository.get_balance_at_date(
+        # Obtener balance al inicio del día (misma regla que execute_bulk)
+        opening_balance = self.card_transaction_repository.get_balance_before(
             card_id, start_of_day
         )
         
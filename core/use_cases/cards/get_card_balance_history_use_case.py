@@ -0,0 +1,121 @@
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from typing import Dict, Any
+from core.repositories.card_transaction_repository import CardTransactionRepository
+from core.repositories.card_repository import CardRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GetCardBalanceHistoryUseCase:
+    """
+    Caso de uso para obtener los balances diarios de una tarjeta en un período.
+
+    Obtiene el balance de apertura una sola vez y recorre las transacciones
+    del período en orden cronológico, emitiendo el balance de cada día en
+    una sola pasada. Los días sin movimientos se completan sin consultar.
+    """
+
+    def __init__(
+        self,
+        card_transaction_repository: CardTransactionRepository,
+        card_repository: CardRepository
+    ):
+        self.card_transaction_repository = card_transaction_repository
+        self.card_repository = card_repository
+
+    def execute(self, card_id: int, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Calcula el historial de balances diarios.
+
+        Args:
+            card_id: ID de la tarjeta
+            start_date: Primer día del período
+            end_date: Último día del período (los días futuros se omiten)
+
+        Returns:
+            Dict con opening_balance, closing_balance, total_movement y
+            daily_balances (date, balance, daily_movement, transaction_count)
+
+        Raises:
+            ValueError: Si las validaciones fallan
+        """
+        # Validaciones
+        if not card_id or card_id <= 0:
+            raise ValueError("El ID de la tarjeta debe ser un número positivo")
+
+        if not start_date or not end_date:
+            raise ValueError("El período es requerido")
+
+        if start_date > end_date:
+            raise ValueError("La fecha inicial no puede ser posterior a la final")
+
+        # Verificar que la tarjeta existe
+        card = self.card_repository.get_by_id(card_id)
+        if not card:
+            raise ValueError(f"Tarjeta con ID {card_id} no encontrada")
+
+        now = datetime.now()
+        last_day = min(end_date, now.date())
+
+        period_start = datetime.combine(start_date, datetime.min.time())
+
+        # Balance de apertura: el actual menos lo registrado desde el inicio
+        # del período (sin movimientos desde entonces, es el balance actual)
+        opening_balance = Decimal(str(
+            self.card_transaction_repository.get_balance_before(card_id, period_start)
+        ))
+
+        if last_day < start_date:
+            return {
+                'opening_balance': float(opening_balance),
+                'closing_balance': float(opening_balance),
+                'total_movement': float('0'),
+                'daily_balances': []
+            }
+
+        period_end = min(datetime.combine(last_day, datetime.max.time()), now)
+
+        # Acumular movimientos por día en una sola pasada
+        daily_totals = {}
+        for operation_date, amount in self.card_transaction_repository.iter_movements(
+            card_id, period_start, period_end
+        ):
+            day = operation_date.date()
+            movement, count = daily_totals.get(day, (Decimal('0'), 0))
+            daily_totals[day] = (movement + Decimal(str(amount)), count + 1)
+
+        # Emitir un registro por día, completando los días sin actividad
+        daily_balances = []
+        balance = opening_balance
+        total_movement = Decimal('0')
+        current_date = start_date
+
+        while current_date <= last_day:
+            movement, count = daily_totals.get(current_date, (Decimal('0'), 0))
+            balance += movement
+            total_movement += movement
+
+            daily_balances.append({
+                'date': current_date,
+                'balance': float(balance),
+                'daily_movement': float(movement),
+                'transaction_count': count
+            })
+            current_date += timedelta(days=1)
+
+        # El último día de un período que llega a hoy debe cerrar en el
+        # balance de la tarjeta; si no, el libro no cuadra con el saldo
+        if last_day == now.date() and balance != Decimal(str(card.balance or 0)):
+            logger.warning(
+                f"El historial de la tarjeta {card_id} cierra en {balance} "
+                f"pero su balance es {card.balance}"
+            )
+
+        return {
+            'opening_balance': float(opening_balance),
+            'closing_balance': float(balance),
+            'total_movement': float(total_movement),
+            'daily_balances': daily_balances
+        }
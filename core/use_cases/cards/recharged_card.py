@@ -1,28 +1,31 @@
+from core.entities.card_transaction import CardMovement
 from core.repositories.card_repository import CardRepository
 from core.repositories.card_transaction_repository import CardTransactionRepository
-from core.use_cases.cards.record_card_transaction_use_case import RecordCardTransactionUseCase
 
 class RechargeCardUseCase:
     def __init__(self, card_repository: CardRepository, 
-                card_transaction_repository: CardTransactionRepository, 
-                
+                card_transaction_repository: CardTransactionRepository
     ):
         self.card_repository = card_repository
-        self.card_transaction_repository = card_transaction_repository, 
-        self.record_card_transaction = RecordCardTransactionUseCase( card_transaction_repository, card_repository)
+        self.card_transaction_repository = card_transaction_repository
 
     def execute(self, card_id: int, amount: float, is_refound: bool = False ) -> bool:
-        # Verificar si la tarjeta existe
-        card = self.card_repository.get_by_id(card_id)
-        if not card:
-            return False
+        """
+        Recarga la tarjeta y registra el asiento en una sola transacción.
         
-        # Recargar la tarjeta
-        succes = self.card_repository.recharge(card_id, amount)
-        if succes:
-            if not is_refound:
-                self.record_card_transaction.execute(card_id, 'RECHARGE', amount, description='Recarga manual', reference_type='CREDIT')
-            else:    
-                self.record_card_transaction.execute(card_id, 'REFUND', amount, description='Reembolso de hospedaje', reference_type='CREDIT')
+        Raises:
+            ValueError: Si el monto no es positivo o la tarjeta no existe o
+                está inactiva (antes se devolvía False cuando no existía)
+        """
+        if amount <= 0:
+            raise ValueError("El monto a recargar debe ser mayor a cero")
         
-        return succes 
\ No newline at end of file
+        if not is_refound:
+            movement = CardMovement(card_id, amount, 'RECHARGE', notes='Recarga manual', require_active=True)
+        else:
+            movement = CardMovement(card_id, amount, 'REFUND', notes='Reembolso de hospedaje', require_active=True)
+        
+        # Saldo y asiento en una sola transacción
+        self.card_transaction_repository.apply_movement(movement)
+        
+        return True 
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Optional
 from core.entities.card_transaction import CardTransaction
-from core.repositories.card_transaction_repository import CardTransactionRepository
+from core.repositories.card_transaction_repository import (
+    CardTransactionRepository,
+    CardBalanceSnapshotRepository
+)
 from core.repositories.card_repository import CardRepository
 import logging
 
@@ -17,15 +20,18 @@ class RecordCardTransactionUseCase:
     2. Calcular balances antes/después
     3. Registrar transacción con auditoría completa
     4. Actualizar balance de la tarjeta
+    5. Mantener el snapshot diario del día afectado (opcional)
     """
     
     def __init__(
         self, 
         card_transaction_repository: CardTransactionRepository,
-        card_repository: CardRepository
+        card_repository: CardRepository,
+        card_balance_snapshot_repository: Optional[CardBalanceSnapshotRepository] = None
     ):
         self.card_transaction_repository = card_transaction_repository
         self.card_repository = card_repository
+        self.card_balance_snapshot_repository = card_balance_snapshot_repository
     
     def execute(
         self,
@@ -36,7 +42,8 @@ class RecordCardTransactionUseCase:
         description: Optional[str] = None,
         reference_id: Optional[int] = None,
         reference_type: Optional[str] = None,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        update_snapshot: bool = True
     ) -> CardTransaction:
         """
         Ejecuta el registro de una transacción.
@@ -50,6 +57,8 @@ class RecordCardTransactionUseCase:
             reference_id: ID de la entidad relacionada
             reference_type: Tipo de referencia
             user_id: ID del usuario que realiza la operación
+            update_snapshot: Actualizar el snapshot del día en la misma unidad
+                de trabajo (requiere el repositorio de snapshots)
             
         Returns:
             CardTransaction: La transacción registrada
@@ -106,6 +115,10 @@ class RecordCardTransactionUseCase:
         # Guardar transacción
         saved_transaction = self.card_transaction_repository.save(transaction)
         
+        # Actualizar el snapshot del día antes del commit de la tarjeta
+        if update_snapshot and self.card_balance_snapshot_repository:
+            self.card_balance_snapshot_repository.apply_transaction(saved_transaction)
+        
         # Actualizar balance de la tarjeta
         self.card_repository.update(card)
         
@@ -0,0 +1,12 @@
+from typing import List, Optional, Sequence
+from core.entities.diet_report import DietReportRecord
+from core.repositories.report_repository import ReportRepository
+
+class ListLiquidationRecordsUseCase:
+    """Caso de uso para listar liquidaciones con su dieta, solicitante, departamento y tarifa ya resueltos"""
+    
+    def __init__(self, report_repository: ReportRepository):
+        self.report_repository = report_repository
+    
+    def execute(self, diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        return self.report_repository.list_liquidation_records(diet_ids)
@@ -0,0 +1,14 @@
+from typing import List, Optional, Sequence
+from core.entities.diet import DietStatus
+from core.entities.diet_report import DietReportRecord
+from core.repositories.report_repository import ReportRepository
+
+class ListDietRecordsUseCase:
+    """Caso de uso para listar dietas con solicitante, departamento y tarifa ya resueltos"""
+    
+    def __init__(self, report_repository: ReportRepository):
+        self.report_repository = report_repository
+    
+    def execute(self, status: Optional[DietStatus] = None,
+                diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        return self.report_repository.list_diet_records(status, diet_ids)
@@ -0,0 +1,116 @@
+import pandas as pd
+from core.entities.request_user import RequestUser
+from core.entities.request_user_import import RequestUserImportError, RequestUserImportResult
+from core.repositories.department_repository import DepartmentRepository
+from core.repositories.request_user_repository import RequestUserRepository
+
+class ImportRequestUsersUseCase:
+    """Caso de uso para la carga masiva de solicitantes desde una tabla (Excel)"""
+
+    COLUMNS = ("fullname", "ci", "department")
+    MAX_CI_LENGTH = 11
+
+    def __init__(self, request_user_repository: RequestUserRepository,
+                 department_repository: DepartmentRepository):
+        self.request_user_repository = request_user_repository
+        self.department_repository = department_repository
+
+    def execute(self, frame: pd.DataFrame) -> RequestUserImportResult:
+        """
+        Valida las filas de `frame` e inserta los solicitantes nuevos.
+
+        La validación se hace por columnas con pandas; los CI y nombres ya
+        registrados y los departamentos se resuelven con una consulta por
+        conjunto, y los solicitantes nuevos se insertan juntos en una sola
+        transacción. Los CI ya registrados se omiten (no son error).
+
+        Args:
+            frame: Tabla con las columnas fullname, ci y department (nombre
+                del departamento). Su índice identifica cada fila en el
+                reporte de errores.
+
+        Returns:
+            RequestUserImportResult: Totales y errores por fila
+
+        Raises:
+            ValueError: Si faltan columnas
+            Exception: Si la inserción falla (no se guarda ningún solicitante)
+        """
+        missing_columns = [column for column in self.COLUMNS if column not in frame.columns]
+        if missing_columns:
+            raise ValueError(f"Columnas faltantes: {', '.join(missing_columns)}")
+
+        data = pd.DataFrame({column: self._clean(frame[column]) for column in self.COLUMNS},
+                            index=frame.index)
+        # Filas sin nombre ni CI: relleno al final de la hoja
+        data = data[(data["fullname"] != "") | (data["ci"] != "")]
+        reasons = pd.Series("", index=data.index, dtype=object)
+
+        self._flag(reasons, data["fullname"] == "", "Nombre vacío")
+        self._flag(reasons, data["ci"] == "", "CI vacío")
+        self._flag(reasons, data["ci"].str.len() > self.MAX_CI_LENGTH,
+                   f"CI con más de {self.MAX_CI_LENGTH} caracteres")
+        self._flag(reasons, data["department"] == "", "Unidad vacía")
+
+        # CI ya registrados: se omiten, como en la carga fila a fila (motivo None)
+        valid = reasons == ""
+        existing_cis = self.request_user_repository.get_existing_cis(data.loc[valid, "ci"].tolist())
+        existing = valid & data["ci"].isin(existing_cis)
+        reasons[existing] = None
+
+        valid = reasons == ""
+        self._flag(reasons, valid & data["ci"].where(valid).duplicated(), "CI repetido en el archivo")
+
+        valid = reasons == ""
+        departments = self.department_repository.get_by_names(data.loc[valid, "department"].tolist())
+        department_ids = data["department"].map({name: department.id for name, department in departments.items()})
+        department_not_found = valid & department_ids.isna()
+        self._flag(reasons, department_not_found, "Unidad no encontrada: " + data["department"])
+
+        valid = reasons == ""
+        self._flag(reasons, valid & data["fullname"].where(valid).duplicated(), "Nombre repetido en el archivo")
+
+        valid = reasons == ""
+        existing_names = self.request_user_repository.get_existing_fullnames(data.loc[valid, "fullname"].tolist())
+        self._flag(reasons, valid & data["fullname"].isin(existing_names),
+                   "Ya existe otro solicitante con ese nombre")
+
+        valid = reasons == ""
+        new_users = [
+            RequestUser(
+                username=None,
+                fullname=fullname,
+                email=None,
+                ci=ci,
+                department_id=int(department_id),
+            )
+            for fullname, ci, department_id in zip(
+                data.loc[valid, "fullname"], data.loc[valid, "ci"], department_ids[valid]
+            )
+        ]
+        created = self.request_user_repository.save_all(new_users)
+
+        failed = reasons.notna() & (reasons != "")
+        errors = [
+            RequestUserImportError(row=row, ci=ci, fullname=fullname, reason=reason)
+            for row, ci, fullname, reason in zip(
+                data.index[failed], data.loc[failed, "ci"], data.loc[failed, "fullname"], reasons[failed]
+            )
+        ]
+        return RequestUserImportResult(
+            total=len(data),
+            created=created,
+            existing=int(existing.sum()),
+            department_not_found=int(department_not_found.sum()),
+            errors=errors,
+        )
+
+    def _clean(self, column: pd.Series) -> pd.Series:
+        """Texto sin espacios extremos; vacíos, NaN y "None" quedan como cadena vacía"""
+        text = column.astype("string").str.strip().fillna("")
+        return text.mask(text.str.lower().isin(["nan", "none"]), "").astype(object)
+
+    def _flag(self, reasons: pd.Series, mask: pd.Series, reason):
+        """Anota `reason` en las filas de `mask` que todavía no tienen error"""
+        mask = mask & (reasons == "")
+        reasons[mask] = reason[mask] if isinstance(reason, pd.Series) else reason
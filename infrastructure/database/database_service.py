@@ -37,6 +37,19 @@ class DatabaseService:
             if conn:
                 conn.close()
     
+    def _checkpoint_wal(self):
+        """
+        Vuelca el WAL al archivo principal antes de copiarlo a mano.
+        
+        Con journal_mode=WAL los últimos commits pueden estar solo en el
+        archivo -wal; una copia del .db sin checkpoint los perdería.
+        """
+        try:
+            with self._db_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.warning(f"No se pudo hacer checkpoint del WAL: {e}")
+    
     def _get_timestamp(self) -> str:
         """Devuelve timestamp formateado para nombres de archivo"""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -70,6 +83,7 @@ class DatabaseService:
             logger.error(f"Error en backup SQLite: {e}")
             # Fallback a copia de archivo
             try:
+                self._checkpoint_wal()
                 shutil.copy2(self.db_path, backup_path)
                 logger.info(f"Backup creado (fallback): {backup_path}")
                 return backup_path
@@ -114,6 +128,7 @@ class DatabaseService:
             # Intentar restaurar desde el backup de seguridad
             try:
                 if pre_restore_backup.exists():
+                    self._checkpoint_wal()
                     shutil.copy2(pre_restore_backup, self.db_path)
                     logger.info("Restaurado desde backup de seguridad")
             except Exception as restore_error:
@@ -298,7 +313,8 @@ NOTA: La aplicación debe ser reiniciada para comenzar con el nuevo ciclo.
             "exists": self.db_path.exists(),
             "backup_dir": str(self.backup_dir),
             "backup_count": len(list(self.backup_dir.glob("*.db"))),
-            "cycles_count": len(list(self.cycles_dir.glob("*.txt")))
+            "cycles_count": len(list(self.cycles_dir.glob("*.txt"))),
+            "profile": self._get_profile_info()
         }
         
         if self.db_path.exists():
@@ -319,6 +335,23 @@ NOTA: La aplicación debe ser reiniciada para comenzar con el nuevo ciclo.
         
         return info
     
+    def _get_profile_info(self) -> Dict[str, Any]:
+        """Perfil de rendimiento activo y los PRAGMAs efectivos del motor"""
+        from sqlalchemy import text
+        from infrastructure.database.session import engine, get_active_profile
+        
+        profile = get_active_profile()
+        try:
+            with engine.connect() as conn:
+                profile["effective"] = {
+                    name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                    for name in ("journal_mode", "synchronous", "cache_size",
+                                 "mmap_size", "temp_store", "foreign_keys")
+                }
+        except Exception as e:
+            logger.warning(f"No se pudieron leer los PRAGMAs activos: {e}")
+        return profile
+    
     def create_clean_database_copy(self, new_db_name: str) -> Path:
         """
         Crea una nueva base de datos copiando todo EXCEPTO:
@@ -345,7 +378,8 @@ NOTA: La aplicación debe ser reiniciada para comenzar con el nuevo ciclo.
             
             logger.info(f"Creando nuevo ciclo: {new_db_path}")
             
-            # 4. Crear copia completa
+            # 4. Crear copia completa (con el WAL ya volcado)
+            self._checkpoint_wal()
             path = shutil.copy2(self.db_path, new_db_path)
             
             # 5. Conectar a la nueva base de datos
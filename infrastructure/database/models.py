@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, ForeignKey, Float, Date, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, ForeignKey, Float, Date, Enum, Text, Index
 from sqlalchemy.sql import func
 from infrastructure.database.session import Base 
 from sqlalchemy.orm import relationship
 import enum
+import logging
+
+logger = logging.getLogger(__name__)
 
 class DietStatus(enum.Enum):
     """
@@ -301,6 +304,10 @@ class CardTransactionModel(Base):
     # AUDITORÍA
     notes = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # Búsqueda de la última transacción / rango de transacciones por tarjeta
+        Index("ix_card_transactions_card_operation_date", "card_id", "operation_date"),
+    )
     
     @property
     def is_credit(self) -> bool:
@@ -324,4 +331,24 @@ class CardBalanceSnapshotModel(Base):
     total_credits = Column(Numeric(12, 2), nullable=False, default=0)
     total_debits = Column(Numeric(12, 2), nullable=False, default=0)
     transaction_count = Column(Integer, nullable=False, default=0)
-    
\ No newline at end of file
+
+    __table_args__ = (
+        # Un único snapshot por tarjeta y día; también resuelve "snapshot más cercano"
+        Index("ux_card_balance_snapshots_card_date", "card_id", "snapshot_date", unique=True),
+    )
+    
+
+def create_missing_indexes(bind) -> None:
+    """
+    Crea en una base existente los índices declarados después de crear las tablas.
+
+    `Base.metadata.create_all` no agrega índices a tablas que ya existen, por
+    lo que las bases creadas con versiones anteriores no los tendrían.
+    """
+    for table in (CardTransactionModel.__table__, CardBalanceSnapshotModel.__table__):
+        for index in table.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except Exception as e:
+                # Un índice único puede fallar si ya hay datos duplicados
+                logger.warning(f"No se pudo crear el índice {index.name}: {str(e)}")
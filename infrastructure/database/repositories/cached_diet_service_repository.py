@@ -0,0 +1,85 @@
+import copy
+from typing import Dict, List, Optional
+from core.entities.diet_service import DietService
+from core.repositories.diet_service_repository import DietServiceRepository
+
+
+class CachedDietServiceRepository(DietServiceRepository):
+    """
+    
+    Caché de lectura de tarifas delante de otro DietServiceRepository
+    (normalmente DietServiceRepositoryImpl).
+    
+    Solo hay una tarifa por localidad, pero se consulta por cada dieta al
+    calcular montos, listar liquidaciones o armar reportes. La primera
+    lectura carga todas las tarifas; las siguientes se responden desde
+    memoria hasta que una escritura (create/update/delete, por ejemplo
+    desde EditDietServiceUseCase o DietAppService.update_diet_service)
+    vacía la caché.
+    
+    Se devuelven copias de las entidades: EditDietServiceUseCase modifica la
+    tarifa obtenida antes de guardarla y no debe alterar la caché.
+    
+    """
+    
+    def __init__(self, repository: DietServiceRepository):
+        self.repository = repository
+        self._services: Optional[List[DietService]] = None
+        self._by_id: Dict[int, DietService] = {}
+        self._by_local: Dict[bool, DietService] = {}
+    
+    def invalidate(self):
+        """Descarta las tarifas en memoria; la próxima lectura vuelve a la base de datos"""
+        self._services = None
+        self._by_id = {}
+        self._by_local = {}
+    
+    # ========== LECTURAS ==========
+    
+    def get_by_id(self, diet_service_id: int) -> Optional[DietService]:
+        self._load()
+        return self._copy(self._by_id.get(diet_service_id))
+    
+    def get_by_local(self, is_local: bool) -> Optional[DietService]:
+        self._load()
+        return self._copy(self._by_local.get(is_local))
+    
+    def list_all(self) -> List[DietService]:
+        self._load()
+        return [self._copy(service) for service in self._services]
+    
+    # ========== ESCRITURAS ==========
+    
+    def create(self, diet_service: DietService) -> DietService:
+        try:
+            return self.repository.create(diet_service)
+        finally:
+            self.invalidate()
+    
+    def update(self, diet_service: DietService) -> Optional[DietService]:
+        try:
+            return self.repository.update(diet_service)
+        finally:
+            self.invalidate()
+    
+    def delete(self, diet_service_id: int) -> bool:
+        try:
+            return self.repository.delete(diet_service_id)
+        finally:
+            self.invalidate()
+    
+    # ========== CARGA ==========
+    
+    def _load(self):
+        if self._services is not None:
+            return
+        services = self.repository.list_all()
+        self._by_id = {service.id: service for service in services}
+        # Tarifa vigente por localidad: la primera, igual que la consulta del reporte
+        self._by_local = {}
+        for service in sorted(services, key=lambda service: service.id or 0):
+            self._by_local.setdefault(service.is_local, service)
+        self._services = services
+    
+    def _copy(self, service: Optional[DietService]) -> Optional[DietService]:
+        return copy.copy(service) if service else None
@@ -1,10 +1,12 @@
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
+from decimal import Decimal
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, extract
+from sqlalchemy import and_, or_, func, extract, case, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 
-from core.entities.card_transaction import CardTransaction
+from core.entities.card_transaction import CardTransaction, CardMovement
 from core.entities.card_balance_snapshot import CardBalanceSnapshot
 from core.repositories.card_transaction_repository import (
     CardTransactionRepository, 
@@ -63,6 +65,99 @@ class CardTransactionRepositoryImpl(CardTransactionRepository):
             logger.error(f"Error al guardar transacción: {str(e)}")
             raise Exception(f"Error de base de datos al guardar transacción: {str(e)}")
     
+    def apply_movement(self, movement: CardMovement, update_snapshot: bool = True) -> CardTransaction:
+        """Aplica un movimiento de saldo y su asiento en un solo commit."""
+        return self.apply_movements([movement], update_snapshot)[0]
+    
+    def apply_movements(self, movements: List[CardMovement], update_snapshot: bool = True) -> List[CardTransaction]:
+        """Aplica varios movimientos de saldo en una sola transacción."""
+        try:
+            snapshot_repository = CardBalanceSnapshotRepositoryImpl(self.db) if update_snapshot else None
+            
+            transactions = [
+                self._apply_movement(movement, snapshot_repository)
+                for movement in movements
+            ]
+            
+            self.db.commit()
+            return transactions
+            
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error al aplicar movimientos de tarjeta: {str(e)}")
+            raise Exception(f"Error de base de datos al aplicar movimientos de tarjeta: {str(e)}")
+    
+    def _apply_movement(self, movement: CardMovement, snapshot_repository=None) -> CardTransaction:
+        """
+        Actualiza el saldo con un UPDATE atómico e inserta el asiento (sin commit).
+        
+        La condición de saldo suficiente va dentro del UPDATE, de modo que
+        el saldo nunca queda negativo aunque otra operación lo haya cambiado.
+        """
+        amount = Decimal(str(movement.amount))
+        # Una tarjeta sin saldo registrado (NULL) cuenta como saldo cero
+        balance = func.coalesce(CardModel.balance, 0)
+        
+        conditions = [CardModel.card_id == movement.card_id]
+        if movement.require_active:
+            conditions.append(CardModel.is_active.is_(True))
+        if amount < 0:
+            conditions.append(balance + amount >= 0)
+        
+        new_balance = self.db.execute(
+            update(CardModel)
+            .where(*conditions)
+            .values(balance=balance + amount)
+            .returning(CardModel.balance)
+        ).scalar_one_or_none()
+        
+        if new_balance is None:
+            self._raise_movement_rejected(movement)
+        
+        new_balance = Decimal(str(new_balance))
+        transaction = self.save(CardTransaction(
+            card_id=movement.card_id,
+            transaction_type=movement.transaction_type,
+            amount=float(amount),
+            previous_balance=float(new_balance - amount),
+            new_balance=float(new_balance),
+            operation_date=movement.operation_date or datetime.now(),
+            diet_id=movement.diet_id,
+            liquidation_id=movement.liquidation_id,
+            notes=movement.notes
+        ))
+        
+        if snapshot_repository:
+            snapshot_repository.apply_transaction(transaction)
+        
+        return transaction
+    
+    def _raise_movement_rejected(self, movement: CardMovement):
+        """Explica por qué el UPDATE no afectó ninguna fila."""
+        row = self.db.execute(
+            select(CardModel.is_active, CardModel.balance)
+            .where(CardModel.card_id == movement.card_id)
+        ).first()
+        
+        if row is None:
+            raise ValueError(f"Tarjeta con ID {movement.card_id} no encontrada")
+        
+        is_active, balance = row
+        if movement.require_active and not is_active:
+            raise ValueError(
+                "No se puede recargar una tarjeta inactiva. Puede que necesite "
+                "liquidar dietas pendientes asociadas a esta tarjeta"
+            )
+        
+        raise ValueError(
+            f"Saldo insuficiente. "
+            f"Disponible: {float(balance or 0):.2f}, "
+            f"Requiere: {abs(movement.amount):.2f}"
+        )
+    
     def get_by_id(self, transaction_id: int) -> Optional[CardTransaction]:
         """Obtiene una transacción por ID."""
         try:
@@ -115,6 +210,38 @@ class CardTransactionRepositoryImpl(CardTransactionRepository):
             logger.error(f"Error al obtener transacciones de tarjeta {card_id}: {str(e)}")
             raise Exception(f"Error de base de datos al obtener transacciones: {str(e)}")
     
+    def iter_movements(
+        self,
+        card_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Tuple[datetime, float]]:
+        """
+        Recorre (fecha de operación, monto) del período en orden cronológico.
+        
+        Solo se leen las dos columnas necesarias y por lotes, usando el
+        índice (card_id, operation_date).
+        """
+        try:
+            query = self.db.query(
+                CardTransactionModel.operation_date,
+                CardTransactionModel.amount
+            ).filter(
+                CardTransactionModel.card_id == card_id,
+                CardTransactionModel.operation_date >= start_date,
+                CardTransactionModel.operation_date <= end_date
+            ).order_by(
+                CardTransactionModel.operation_date.asc(),
+                CardTransactionModel.id.asc()
+            ).yield_per(500)
+            
+            for operation_date, amount in query:
+                yield operation_date, float(str(amount)) if amount else float('0')
+                
+        except SQLAlchemyError as e:
+            logger.error(f"Error al recorrer movimientos de tarjeta {card_id}: {str(e)}")
+            raise Exception(f"Error de base de datos al obtener movimientos: {str(e)}")
+    
     def count_by_card_id(
         self,
         card_id: int,
@@ -145,33 +272,87 @@ class CardTransactionRepositoryImpl(CardTransactionRepository):
         """
         Obtiene el balance de una tarjeta en una fecha/hora específica.
         
-        Utiliza la última transacción antes de la fecha objetivo.
+        Parte del snapshot diario más cercano (del mismo día o anterior) y
+        aplica solo las transacciones posteriores a ese punto. Si la tarjeta
+        no tiene snapshots descuenta del balance actual lo registrado con
+        fecha posterior a la objetivo.
         """
         try:
-            # Buscar la última transacción antes de target_date
-            last_transaction = self.db.query(CardTransactionModel).filter(
-                CardTransactionModel.card_id == card_id,
-                CardTransactionModel.operation_date <= target_date
-            ).order_by(CardTransactionModel.operation_date.desc()).first()
+            snapshot_balance = self._get_balance_from_snapshot(card_id, target_date)
+            if snapshot_balance is not None:
+                return snapshot_balance
+            
+            # Sin snapshots: balance actual menos lo registrado después de
+            # target_date (misma regla que get_balance_before)
+            return self.get_balance_before(card_id, target_date + timedelta(microseconds=1))
             
-            if last_transaction:
-                # Balance después de la última transacción
-                return float(str(last_transaction.new_balance))
-            else:
-                # Si no hay transacciones previas, verificar si la tarjeta existe
-                card = self.db.query(CardModel).filter(CardModel.card_id == card_id).first()
-                if card and card.balance is not None:
-                    # Si la tarjeta existe pero no tiene transacciones, usar balance actual
-                    # Esto solo debería pasar durante la migración
-                    return float(str(card.balance))
-                else:
-                    # Tarjeta no encontrada o sin balance
-                    return float('0')
-                    
         except SQLAlchemyError as e:
             logger.error(f"Error al obtener balance histórico: {str(e)}")
             raise Exception(f"Error de base de datos al obtener balance histórico: {str(e)}")
     
+    def get_balance_before(self, card_id: int, before_date: datetime) -> float:
+        """
+        Balance actual de la tarjeta menos lo registrado desde `before_date`.
+        
+        Es la misma regla de get_opening_balances, para una sola tarjeta.
+        """
+        try:
+            card_balance = self.db.query(CardModel.balance).filter(
+                CardModel.card_id == card_id
+            ).scalar()
+            
+            movement = self.db.query(
+                func.coalesce(func.sum(CardTransactionModel.amount), 0)
+            ).filter(
+                CardTransactionModel.card_id == card_id,
+                CardTransactionModel.operation_date >= before_date
+            ).scalar()
+            
+            return float(Decimal(str(card_balance or 0)) - Decimal(str(movement or 0)))
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error al obtener balance de apertura: {str(e)}")
+            raise Exception(f"Error de base de datos al obtener balance de apertura: {str(e)}")
+    
+    def _get_balance_from_snapshot(self, card_id: int, target_date: datetime) -> Optional[float]:
+        """
+        Calcula el balance a partir del snapshot más cercano al día objetivo.
+        
+        Ambas consultas se resuelven con los índices (card_id, snapshot_date)
+        y (card_id, operation_date), sin recorrer el historial completo.
+        
+        Returns:
+            float con el balance, o None si la tarjeta no tiene snapshots
+        """
+        target_day = target_date.date() if isinstance(target_date, datetime) else target_date
+        
+        snapshot = self.db.query(CardBalanceSnapshotModel).filter(
+            CardBalanceSnapshotModel.card_id == card_id,
+            CardBalanceSnapshotModel.snapshot_date <= target_day
+        ).order_by(CardBalanceSnapshotModel.snapshot_date.desc()).first()
+        
+        if not snapshot:
+            return None
+        
+        if snapshot.snapshot_date == target_day:
+            # Snapshot del mismo día: partir del balance de apertura
+            base_balance = snapshot.opening_balance
+            since = datetime.combine(target_day, datetime.min.time())
+        else:
+            # Snapshot anterior: partir del cierre y aplicar lo ocurrido después
+            base_balance = snapshot.closing_balance
+            since = datetime.combine(snapshot.snapshot_date + timedelta(days=1), datetime.min.time())
+        
+        movement = self.db.query(
+            func.coalesce(func.sum(CardTransactionModel.amount), 0)
+        ).filter(
+            CardTransactionModel.card_id == card_id,
+            CardTransactionModel.operation_date >= since,
+            CardTransactionModel.operation_date <= target_date
+        ).scalar()
+        
+        return float(Decimal(str(base_balance or 0)) + Decimal(str(movement or 0)))
+    
     def get_transactions_by_reference(
         self, 
         reference_type: str, 
@@ -255,6 +436,81 @@ class CardTransactionRepositoryImpl(CardTransactionRepository):
             logger.error(f"Error al obtener resumen del período: {str(e)}")
             raise Exception(f"Error de base de datos al obtener resumen: {str(e)}")
     
+    def get_daily_aggregates(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales por tarjeta y día del rango con una sola consulta agrupada.
+        """
+        try:
+            range_start = datetime.combine(start_date, datetime.min.time())
+            range_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            day = func.date(CardTransactionModel.operation_date)
+            
+            rows = self.db.query(
+                CardTransactionModel.card_id,
+                day.label('day'),
+                func.coalesce(func.sum(
+                    case((CardTransactionModel.amount > 0, CardTransactionModel.amount), else_=0)
+                ), 0).label('total_credits'),
+                func.coalesce(func.sum(
+                    case((CardTransactionModel.amount < 0, -CardTransactionModel.amount), else_=0)
+                ), 0).label('total_debits'),
+                func.count(CardTransactionModel.id).label('transaction_count')
+            ).filter(
+                CardTransactionModel.operation_date >= range_start,
+                CardTransactionModel.operation_date < range_end
+            ).group_by(
+                CardTransactionModel.card_id, day
+            ).all()
+            
+            return [
+                {
+                    'card_id': row.card_id,
+                    'day': date.fromisoformat(row.day),
+                    'total_credits': float(str(row.total_credits)),
+                    'total_debits': float(str(row.total_debits)),
+                    'transaction_count': row.transaction_count
+                }
+                for row in rows
+            ]
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error al agregar transacciones diarias: {str(e)}")
+            raise Exception(f"Error de base de datos al agregar transacciones: {str(e)}")
+    
+    def get_opening_balances(self, before_date: datetime) -> Dict[int, float]:
+        """
+        Balance de todas las tarjetas antes de un instante, con una consulta.
+        
+        Misma regla que get_balance_before: el balance actual de cada tarjeta
+        menos la suma de lo registrado con fecha desde el instante.
+        """
+        try:
+            later_movements = self.db.query(
+                CardTransactionModel.card_id.label('card_id'),
+                func.sum(CardTransactionModel.amount).label('movement')
+            ).filter(
+                CardTransactionModel.operation_date >= before_date
+            ).group_by(CardTransactionModel.card_id).subquery()
+            
+            rows = self.db.query(
+                CardModel.card_id, CardModel.balance, later_movements.c.movement
+            ).outerjoin(
+                later_movements, later_movements.c.card_id == CardModel.card_id
+            ).all()
+            
+            return {
+                card_id: float(Decimal(str(balance or 0)) - Decimal(str(movement or 0)))
+                for card_id, balance, movement in rows
+            }
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error al obtener balances de apertura: {str(e)}")
+            raise Exception(f"Error de base de datos al obtener balances de apertura: {str(e)}")
+    
     def _to_entity(self, model: CardTransactionModel) -> Optional[CardTransaction]:
         """Convierte un modelo de SQLAlchemy a entidad de dominio."""
         if not model:
@@ -280,6 +536,9 @@ class CardBalanceSnapshotRepositoryImpl(CardBalanceSnapshotRepository):
     Implementación concreta del repositorio de snapshots usando SQLAlchemy.
     """
     
+    # Filas por sentencia en las escrituras masivas
+    BULK_BATCH_SIZE = 500
+    
     def __init__(self, db: Session):
         self.db = db
     
@@ -470,6 +729,219 @@ class CardBalanceSnapshotRepositoryImpl(CardBalanceSnapshotRepository):
             logger.error(f"Error al eliminar snapshots: {str(e)}")
             raise Exception(f"Error de base de datos al eliminar snapshots: {str(e)}")
     
+    def apply_transaction(self, transaction: CardTransaction) -> CardBalanceSnapshot:
+        """
+        Mantiene el snapshot del día al registrar una transacción (sin commit).
+        """
+        try:
+            operation_date = transaction.operation_date
+            snapshot_date = operation_date.date() if isinstance(operation_date, datetime) else operation_date
+            amount = Decimal(str(transaction.amount))
+            
+            db_snapshot = self.db.query(CardBalanceSnapshotModel).filter(
+                CardBalanceSnapshotModel.card_id == transaction.card_id,
+                CardBalanceSnapshotModel.snapshot_date == snapshot_date
+            ).first()
+            
+            if db_snapshot:
+                # Sumar la transacción al día existente
+                if amount > 0:
+                    db_snapshot.total_credits = Decimal(str(db_snapshot.total_credits or 0)) + amount
+                else:
+                    db_snapshot.total_debits = Decimal(str(db_snapshot.total_debits or 0)) - amount
+                db_snapshot.transaction_count = (db_snapshot.transaction_count or 0) + 1
+                db_snapshot.closing_balance = Decimal(str(db_snapshot.closing_balance or 0)) + amount
+            else:
+                db_snapshot = self._create_snapshot_from_day(transaction, snapshot_date)
+                self.db.add(db_snapshot)
+            
+            # Una transacción con fecha pasada cambia los días siguientes
+            self._rebase_later_snapshots(
+                transaction.card_id, snapshot_date, Decimal(str(db_snapshot.closing_balance or 0))
+            )
+            
+            self.db.flush()
+            
+            return self._to_entity(db_snapshot)
+            
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error al actualizar snapshot: {str(e)}")
+            raise Exception(f"Error de base de datos al actualizar snapshot: {str(e)}")
+    
+    def _create_snapshot_from_day(self, transaction: CardTransaction, snapshot_date: date) -> CardBalanceSnapshotModel:
+        """
+        Crea el snapshot de un día que aún no lo tiene a partir del libro.
+        
+        Incluye las transacciones del día ya registradas. La apertura es el
+        balance al inicio del día (ver _balance_before_day), no el
+        previous_balance de la transacción, que es el saldo al registrarla.
+        """
+        start_of_day = datetime.combine(snapshot_date, datetime.min.time())
+        end_of_day = start_of_day + timedelta(days=1)
+        
+        totals = self.db.query(
+            func.coalesce(func.sum(case(
+                (CardTransactionModel.amount > 0, CardTransactionModel.amount), else_=0
+            )), 0),
+            func.coalesce(func.sum(case(
+                (CardTransactionModel.amount < 0, -CardTransactionModel.amount), else_=0
+            )), 0),
+            func.count(CardTransactionModel.id)
+        ).filter(
+            CardTransactionModel.card_id == transaction.card_id,
+            CardTransactionModel.operation_date >= start_of_day,
+            CardTransactionModel.operation_date < end_of_day
+        ).one()
+        
+        total_credits, total_debits, transaction_count = (
+            Decimal(str(totals[0])), Decimal(str(totals[1])), totals[2]
+        )
+        
+        opening_balance = self._balance_before_day(transaction, snapshot_date)
+        
+        return CardBalanceSnapshotModel(
+            card_id=transaction.card_id,
+            snapshot_date=snapshot_date,
+            opening_balance=opening_balance,
+            closing_balance=opening_balance + total_credits - total_debits,
+            total_credits=total_credits,
+            total_debits=total_debits,
+            transaction_count=transaction_count
+        )
+    
+    def _balance_before_day(self, transaction: CardTransaction, snapshot_date: date) -> Decimal:
+        """
+        Balance de la tarjeta al inicio de `snapshot_date` (sin commit).
+        
+        Misma regla que CardTransactionRepository.get_opening_balances: al
+        balance posterior a la transacción (el saldo actual) se le descuenta
+        todo lo registrado con fecha desde ese día, incluida la propia
+        transacción.
+        """
+        start_of_day = datetime.combine(snapshot_date, datetime.min.time())
+        
+        movement = self.db.query(
+            func.coalesce(func.sum(CardTransactionModel.amount), 0)
+        ).filter(
+            CardTransactionModel.card_id == transaction.card_id,
+            CardTransactionModel.operation_date >= start_of_day
+        ).scalar()
+        
+        return Decimal(str(transaction.new_balance)) - Decimal(str(movement or 0))
+    
+    def _rebase_later_snapshots(self, card_id: int, snapshot_date: date, closing_balance: Decimal):
+        """
+        Recalcula apertura y cierre de los snapshots posteriores a `snapshot_date`.
+        
+        Avanza desde el cierre de ese día sumando los movimientos diarios del
+        libro (una consulta agrupada), incluidos los días sin snapshot.
+        """
+        later_snapshots = self.db.query(CardBalanceSnapshotModel).filter(
+            CardBalanceSnapshotModel.card_id == card_id,
+            CardBalanceSnapshotModel.snapshot_date > snapshot_date
+        ).order_by(CardBalanceSnapshotModel.snapshot_date.asc()).all()
+        
+        if not later_snapshots:
+            return
+        
+        day = func.date(CardTransactionModel.operation_date)
+        daily_movements = self.db.query(
+            day, func.sum(CardTransactionModel.amount)
+        ).filter(
+            CardTransactionModel.card_id == card_id,
+            CardTransactionModel.operation_date >= datetime.combine(
+                snapshot_date + timedelta(days=1), datetime.min.time()
+            )
+        ).group_by(day).order_by(day).all()
+        
+        movements = [(date.fromisoformat(movement_day), Decimal(str(total or 0)))
+                     for movement_day, total in daily_movements]
+        position = 0
+        balance = closing_balance
+        
+        for db_snapshot in later_snapshots:
+            # Días sin snapshot entre el anterior y este
+            while position < len(movements) and movements[position][0] < db_snapshot.snapshot_date:
+                balance += movements[position][1]
+                position += 1
+            db_snapshot.opening_balance = balance
+            if position < len(movements) and movements[position][0] == db_snapshot.snapshot_date:
+                balance += movements[position][1]
+                position += 1
+            db_snapshot.closing_balance = balance
+    
+    def get_existing_keys(self, start_date: date, end_date: date) -> set:
+        """Pares (card_id, snapshot_date) existentes en el rango."""
+        try:
+            rows = self.db.query(
+                CardBalanceSnapshotModel.card_id,
+                CardBalanceSnapshotModel.snapshot_date
+            ).filter(
+                CardBalanceSnapshotModel.snapshot_date >= start_date,
+                CardBalanceSnapshotModel.snapshot_date <= end_date
+            ).all()
+            
+            return {(card_id, snapshot_date) for card_id, snapshot_date in rows}
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error al obtener snapshots existentes: {str(e)}")
+            raise Exception(f"Error de base de datos al obtener snapshots: {str(e)}")
+    
+    def bulk_upsert(self, snapshots: List[CardBalanceSnapshot], overwrite: bool = True) -> int:
+        """
+        Upsert masivo sobre el índice único (card_id, snapshot_date).
+        
+        Todas las filas se escriben por lotes dentro de una única transacción.
+        """
+        if not snapshots:
+            return 0
+        
+        try:
+            statement = sqlite_insert(CardBalanceSnapshotModel)
+            conflict_columns = ['card_id', 'snapshot_date']
+            
+            if overwrite:
+                statement = statement.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={
+                        column: statement.excluded[column]
+                        for column in (
+                            'opening_balance', 'closing_balance', 'total_credits',
+                            'total_debits', 'transaction_count'
+                        )
+                    }
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=conflict_columns)
+            
+            rows = [
+                {
+                    'card_id': snapshot.card_id,
+                    'snapshot_date': snapshot.snapshot_date,
+                    'opening_balance': snapshot.opening_balance,
+                    'closing_balance': snapshot.closing_balance,
+                    'total_credits': snapshot.total_credits,
+                    'total_debits': snapshot.total_debits,
+                    'transaction_count': snapshot.transaction_count
+                }
+                for snapshot in snapshots
+            ]
+            
+            for start in range(0, len(rows), self.BULK_BATCH_SIZE):
+                self.db.execute(statement, rows[start:start + self.BULK_BATCH_SIZE])
+            
+            self.db.commit()
+            
+            logger.info(f"Snapshots guardados en bloque: {len(rows)}")
+            
+            return len(rows)
+            
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error al guardar snapshots en bloque: {str(e)}")
+            raise Exception(f"Error de base de datos al guardar snapshots: {str(e)}")
+    
     def _to_entity(self, model: CardBalanceSnapshotModel) -> Optional[CardBalanceSnapshot]:
         """Convierte modelo a entidad."""
         if not model:
@@ -6,6 +6,9 @@ from infrastructure.database.models import DepartmentModel
 
 class DepartmentRepositoryImpl(DepartmentRepository):
     
+    # Valores por consulta en los filtros IN (SQLite admite pocos parámetros)
+    IN_CHUNK_SIZE = 500
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -38,6 +41,20 @@ class DepartmentRepositoryImpl(DepartmentRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener departamento por nombre: {str(e)}")
 
+    def get_by_names(self, names: list[str]) -> dict[str, Department]:
+        try:
+            departments = {}
+            names = list(set(names))
+            for start in range(0, len(names), self.IN_CHUNK_SIZE):
+                db_departments = self.db.query(DepartmentModel).filter(
+                    DepartmentModel.name.in_(names[start:start + self.IN_CHUNK_SIZE])
+                ).order_by(DepartmentModel.id.asc()).all()
+                for db_department in db_departments:
+                    departments.setdefault(db_department.name, self._to_entity(db_department))
+            return departments
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener departamentos por nombre: {str(e)}")
+
     def get_all(self) -> list[Department]:
         try:
             db_departments = self.db.query(DepartmentModel).order_by(
@@ -0,0 +1,394 @@
+# infrastructure/database/repositories/report_repository.py
+from typing import Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Date, String, and_, case, cast, func
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from core.entities.cards import Card
+from core.entities.diet import Diet, DietStatus
+from core.entities.diet_liquidation import DietLiquidation
+from core.entities.diet_report import DietReportRecord
+from core.entities.diet_service import DietService
+from core.entities.report_query import ReportFilter, ReportSort
+from core.repositories.report_repository import ReportRepository
+from infrastructure.database.models import (
+    CardModel,
+    DepartmentModel,
+    DietLiquidationModel,
+    DietModel,
+    DietServiceModel,
+    RequestUserModel,
+)
+
+
+class ReportRepositoryImpl(ReportRepository):
+    """
+
+    Implementación concreta del repositorio de reportes usando SQLAlchemy.
+
+    Resuelve en una sola sentencia SELECT con OUTER JOINs todo lo que el
+    reporte consolidado de dietas necesita, en lugar de consultar
+    solicitante, departamento, tarifa y liquidación por cada dieta.
+
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_diets_report_records(self) -> List[DietReportRecord]:
+        """
+        Obtiene todas las dietas con sus datos relacionados en una sola consulta.
+        """
+        try:
+            return [self._to_record(row) for row in self._diets_report_query().all()]
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener el reporte de dietas: {str(e)}")
+
+    def query_diets_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: Sequence[ReportSort] = ()
+    ) -> Tuple[List[DietReportRecord], int]:
+        """
+        Obtiene una página del reporte de dietas con los filtros y el orden compilados a SQL.
+        """
+        try:
+            fields = self._diet_report_fields()
+            query = self._diets_report_query()
+            condition = self._compile_filters(filters, fields)
+            if condition is not None:
+                query = query.filter(condition)
+
+            total = query.order_by(None).count()
+            query = query.order_by(None).order_by(
+                *self._compile_order(sort, fields), DietModel.advance_number.desc(), DietModel.id.desc()
+            )
+            rows = self._paginate(query, limit, offset).all()
+            return [self._to_record(row) for row in rows], total
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al filtrar el reporte de dietas: {str(e)}")
+
+    def query_cards_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: Sequence[ReportSort] = ()
+    ) -> Tuple[List[Card], int]:
+        """
+        Obtiene una página del reporte de tarjetas con los filtros y el orden compilados a SQL.
+        """
+        try:
+            fields = self._card_report_fields()
+            query = self.session.query(CardModel)
+            condition = self._compile_filters(filters, fields)
+            if condition is not None:
+                query = query.filter(condition)
+
+            total = query.count()
+            query = query.order_by(*self._compile_order(sort, fields), CardModel.card_number.asc())
+            models = self._paginate(query, limit, offset).all()
+            return [self._card_to_entity(model) for model in models], total
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al filtrar el reporte de tarjetas: {str(e)}")
+
+    def iter_diets_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        batch_size: int = 1000
+    ) -> Iterator[DietReportRecord]:
+        """
+        Recorre el reporte de dietas por lotes, agrupado por departamento.
+        """
+        try:
+            query = self._diets_report_query()
+            condition = self._compile_filters(filters, self._diet_report_fields())
+            if condition is not None:
+                query = query.filter(condition)
+
+            query = query.order_by(None).order_by(
+                DepartmentModel.name.asc(), DietModel.advance_number.desc()
+            )
+            for row in query.yield_per(batch_size):
+                yield self._to_record(row)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al recorrer el reporte de dietas: {str(e)}")
+
+    def iter_cards_report(
+        self,
+        filters: Sequence[ReportFilter] = (),
+        batch_size: int = 1000
+    ) -> Iterator[Card]:
+        """
+        Recorre el reporte de tarjetas por lotes.
+        """
+        try:
+            query = self.session.query(CardModel)
+            condition = self._compile_filters(filters, self._card_report_fields())
+            if condition is not None:
+                query = query.filter(condition)
+
+            for model in query.order_by(CardModel.card_number.asc()).yield_per(batch_size):
+                yield self._card_to_entity(model)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al recorrer el reporte de tarjetas: {str(e)}")
+
+    def list_diet_records(self, status: Optional[DietStatus] = None,
+                          diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        """
+        Obtiene las dietas con sus datos relacionados para las listas de la interfaz.
+        """
+        try:
+            query = self._diets_report_query()
+            if status is not None:
+                query = query.filter(DietModel.status == status.value)
+            if diet_ids is not None:
+                query = query.filter(DietModel.id.in_(diet_ids))
+            return [self._to_record(row) for row in query.all()]
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al listar dietas con sus datos relacionados: {str(e)}")
+
+    def list_liquidation_records(self, diet_ids: Optional[Sequence[int]] = None) -> List[DietReportRecord]:
+        """
+        Obtiene las liquidaciones con su dieta y datos relacionados en una sola consulta.
+        """
+        try:
+            tariff_ids = self._tariff_ids_subquery()
+            query = (
+                self.session.query(
+                    DietModel,
+                    RequestUserModel.fullname,
+                    DepartmentModel.name,
+                    DietServiceModel,
+                    DietLiquidationModel,
+                    RequestUserModel.ci,
+                )
+                .select_from(DietLiquidationModel)
+                .join(DietModel, DietModel.id == DietLiquidationModel.diet_id)
+                .outerjoin(RequestUserModel, RequestUserModel.id == DietModel.request_user_id)
+                .outerjoin(DepartmentModel, DepartmentModel.id == RequestUserModel.department_id)
+                .outerjoin(tariff_ids, tariff_ids.c.is_local == DietModel.is_local)
+                .outerjoin(DietServiceModel, DietServiceModel.id == tariff_ids.c.id)
+                .order_by(DietLiquidationModel.liquidation_date.desc())
+            )
+            if diet_ids is not None:
+                query = query.filter(DietLiquidationModel.diet_id.in_(diet_ids))
+            return [self._to_record(row) for row in query.all()]
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al listar liquidaciones con sus datos relacionados: {str(e)}")
+
+    # ========== COMPILACIÓN DE FILTROS ==========
+
+    def _diet_report_fields(self) -> dict:
+        """
+        Columnas filtrables y ordenables del reporte de dietas.
+
+        Cada campo se asocia a (expresión nativa, expresión textual): la
+        nativa se usa en comparaciones (eq, gt, ...) y la textual reproduce
+        lo que el usuario ve en pantalla para contains/startswith.
+        """
+        def date_field(column):
+            native = func.date(column, type_=Date)
+            return native, func.strftime("%d/%m/%Y", column)
+
+        return {
+            "no_anticipo": (DietModel.advance_number, cast(DietModel.advance_number, String)),
+            "no_liquidacion": (DietLiquidationModel.liquidation_number,
+                               cast(DietLiquidationModel.liquidation_number, String)),
+            "descripcion": (DietModel.description, DietModel.description),
+            "solicitante": (RequestUserModel.fullname, RequestUserModel.fullname),
+            "departamento": (DepartmentModel.name, DepartmentModel.name),
+            "fecha_inicio": date_field(DietModel.start_date),
+            "fecha_fin": date_field(DietModel.end_date),
+            "fecha_solicitud": date_field(DietModel.created_at),
+            "fecha_liquidacion": date_field(DietLiquidationModel.liquidation_date),
+            "estado": (DietModel.status, cast(DietModel.status, String)),
+        }
+
+    def _card_report_fields(self) -> dict:
+        """Columnas filtrables y ordenables del reporte de tarjetas"""
+        # Un saldo nulo se muestra como $0.00: se compara y ordena como 0
+        balance = func.coalesce(CardModel.balance, 0)
+        return {
+            "numero_tarjeta": (CardModel.card_number, CardModel.card_number),
+            "pin": (CardModel.card_pin, CardModel.card_pin),
+            "balance": (balance, func.printf("$%.2f", balance)),
+            "estado": (CardModel.is_active, case((CardModel.is_active, "+Activa"), else_="-Inactiva")),
+            "is_active": (CardModel.is_active, CardModel.is_active),
+        }
+
+    def _compile_filters(self, filters: Sequence[ReportFilter], fields: dict):
+        """
+        Traduce la lista de filtros a una única condición SQL (AND entre filtros).
+        """
+        conditions = []
+        for report_filter in filters or ():
+            if report_filter.value is None or report_filter.value == "":
+                continue
+            if report_filter.field not in fields:
+                raise ValueError(f"Campo de filtro no soportado: {report_filter.field}")
+
+            native, text = fields[report_filter.field]
+            operator, value = report_filter.operator, report_filter.value
+
+            if operator == "contains":
+                conditions.append(func.lower(text).contains(str(value).lower(), autoescape=True))
+            elif operator == "startswith":
+                conditions.append(func.lower(text).startswith(str(value).lower(), autoescape=True))
+            elif operator == "eq":
+                conditions.append(native == value)
+            elif operator == "ne":
+                conditions.append(native != value)
+            elif operator == "gt":
+                conditions.append(native > value)
+            elif operator == "gte":
+                conditions.append(native >= value)
+            elif operator == "lt":
+                conditions.append(native < value)
+            elif operator == "lte":
+                conditions.append(native <= value)
+            elif operator == "in":
+                conditions.append(native.in_(list(value)))
+
+        return and_(*conditions) if conditions else None
+
+    def _compile_order(self, sort: Sequence[ReportSort], fields: dict) -> list:
+        """
+        Traduce los criterios de orden a expresiones ORDER BY sobre las columnas nativas.
+
+        Los valores nulos quedan al final en ambos sentidos, igual que al
+        ordenar la tabla en memoria.
+        """
+        clauses = []
+        for criterion in sort or ():
+            if criterion.field not in fields:
+                raise ValueError(f"Campo de orden no soportado: {criterion.field}")
+
+            native, _ = fields[criterion.field]
+            clauses.append(native.is_(None))
+            clauses.append(native.desc() if criterion.descending else native.asc())
+        return clauses
+
+    def _paginate(self, query, limit: Optional[int], offset: int):
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def _diets_report_query(self):
+        """
+        Construye la consulta unificada del reporte de dietas.
+
+        La tarifa se elige igual que DietServiceRepositoryImpl.get_by_local
+        (primera por localidad) y la liquidación igual que
+        DietLiquidationRepositoryImpl.get_by_diet_id (primera por dieta), de
+        modo que un dato duplicado nunca multiplica las filas del reporte.
+        """
+        tariff_ids = self._tariff_ids_subquery()
+        liquidation_ids = (
+            self.session.query(
+                DietLiquidationModel.diet_id.label("diet_id"),
+                func.min(DietLiquidationModel.id).label("id"),
+            )
+            .group_by(DietLiquidationModel.diet_id)
+            .subquery()
+        )
+
+        return (
+            self.session.query(
+                DietModel,
+                RequestUserModel.fullname,
+                DepartmentModel.name,
+                DietServiceModel,
+                DietLiquidationModel,
+                RequestUserModel.ci,
+            )
+            .outerjoin(RequestUserModel, RequestUserModel.id == DietModel.request_user_id)
+            .outerjoin(DepartmentModel, DepartmentModel.id == RequestUserModel.department_id)
+            .outerjoin(tariff_ids, tariff_ids.c.is_local == DietModel.is_local)
+            .outerjoin(DietServiceModel, DietServiceModel.id == tariff_ids.c.id)
+            .outerjoin(liquidation_ids, liquidation_ids.c.diet_id == DietModel.id)
+            .outerjoin(DietLiquidationModel, DietLiquidationModel.id == liquidation_ids.c.id)
+            .order_by(DietModel.advance_number.desc())
+        )
+
+    def _tariff_ids_subquery(self):
+        """Tarifa vigente por localidad: la primera, igual que DietServiceRepositoryImpl.get_by_local"""
+        return (
+            self.session.query(
+                DietServiceModel.is_local.label("is_local"),
+                func.min(DietServiceModel.id).label("id"),
+            )
+            .group_by(DietServiceModel.is_local)
+            .subquery()
+        )
+
+    def _to_record(self, row) -> DietReportRecord:
+        diet_model, requester_name, department_name, service_model, liquidation_model, requester_ci = row
+        return DietReportRecord(
+            diet=self._diet_to_entity(diet_model),
+            requester_name=requester_name,
+            department_name=department_name,
+            diet_service=self._service_to_entity(service_model) if service_model else None,
+            liquidation=self._liquidation_to_entity(liquidation_model) if liquidation_model else None,
+            requester_ci=requester_ci,
+        )
+
+    def _diet_to_entity(self, model: DietModel) -> Diet:
+        return Diet(
+            id=model.id,
+            is_local=model.is_local,
+            start_date=model.start_date,
+            end_date=model.end_date,
+            created_at=model.created_at,
+            description=model.description,
+            advance_number=model.advance_number,
+            is_group=model.is_group,
+            status=model.status.value,
+            request_user_id=model.request_user_id,
+            diet_service_id=model.diet_service_id,
+            breakfast_count=model.breakfast_count,
+            lunch_count=model.lunch_count,
+            dinner_count=model.dinner_count,
+            accommodation_count=model.accommodation_count,
+            accommodation_payment_method=model.accommodation_payment_method.value,
+            accommodation_card_id=model.accommodation_card_id
+        )
+
+    def _card_to_entity(self, model: CardModel) -> Card:
+        return Card(
+            id=model.card_id,
+            card_number=model.card_number,
+            card_pin=model.card_pin,
+            is_active=model.is_active,
+            balance=float(model.balance) if model.balance is not None else 0.0
+        )
+
+    def _service_to_entity(self, model: DietServiceModel) -> DietService:
+        return DietService(
+            id=model.id,
+            is_local=model.is_local,
+            breakfast_price=model.breakfast_price,
+            lunch_price=model.lunch_price,
+            dinner_price=model.dinner_price,
+            accommodation_cash_price=model.accommodation_cash_price,
+            accommodation_card_price=model.accommodation_card_price
+        )
+
+    def _liquidation_to_entity(self, model: DietLiquidationModel) -> DietLiquidation:
+        return DietLiquidation(
+            id=model.id,
+            diet_id=model.diet_id,
+            liquidation_number=model.liquidation_number,
+            liquidation_date=model.liquidation_date,
+            breakfast_count_liquidated=model.breakfast_count_liquidated,
+            lunch_count_liquidated=model.lunch_count_liquidated,
+            dinner_count_liquidated=model.dinner_count_liquidated,
+            accommodation_count_liquidated=model.accommodation_count_liquidated,
+            accommodation_payment_method=model.accommodation_payment_method.value,
+            diet_service_id=model.diet_service_id,
+            accommodation_card_id=model.accommodation_card_id,
+            total_pay=model.total_pay
+        )
@@ -1,12 +1,15 @@
 from sqlalchemy.orm import Session
 from core.entities.request_user import RequestUser
-from sqlalchemy import exists
+from sqlalchemy import exists, insert
 from core.repositories.request_user_repository import RequestUserRepository
 from infrastructure.database.models import RequestUserModel, DepartmentModel, DietModel
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 class RequestUserRepositoryImpl(RequestUserRepository):
     
+    # Valores por consulta en los filtros IN (SQLite admite pocos parámetros)
+    IN_CHUNK_SIZE = 500
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -133,6 +136,24 @@ class RequestUserRepositoryImpl(RequestUserRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener solicitante por CI: {str(e)}")
 
+    def get_existing_cis(self, cis: list[str]) -> set[str]:
+        """
+        Devuelve cuáles de los CI dados ya están registrados.
+        """
+        try:
+            return self._existing_values(RequestUserModel.ci, cis)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al verificar CI existentes: {str(e)}")
+
+    def get_existing_fullnames(self, fullnames: list[str]) -> set[str]:
+        """
+        Devuelve cuáles de los nombres completos dados ya están registrados.
+        """
+        try:
+            return self._existing_values(RequestUserModel.fullname, fullnames)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al verificar nombres existentes: {str(e)}")
+
     def get_all(self) -> list[RequestUser]:
         """
         Obtiene todos los solicitantes ordenados por nombre.
@@ -145,6 +166,37 @@ class RequestUserRepositoryImpl(RequestUserRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener todos los solicitantes: {str(e)}")
 
+    def save_all(self, req_users: list[RequestUser]) -> int:
+        """
+        Guarda varios solicitantes nuevos con un único INSERT masivo y un
+        solo commit. Las validaciones (departamento, CI y nombre únicos)
+        corresponden a quien llama; si la base rechaza alguna fila no se
+        guarda ninguna.
+        """
+        if not req_users:
+            return 0
+        try:
+            self.db.execute(insert(RequestUserModel), [
+                {
+                    "username": req_user.username,
+                    "fullname": req_user.fullname,
+                    "email": req_user.email,
+                    "ci": req_user.ci,
+                    "department_id": req_user.department_id,
+                }
+                for req_user in req_users
+            ])
+            self.db.commit()
+            return len(req_users)
+
+        except IntegrityError as e:
+            self.db.rollback()
+            raise Exception(f"Error de integridad al guardar solicitantes: {str(e)}")
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error de base de datos al guardar solicitantes: {str(e)}")
+
     def update(self, req_user: RequestUser) -> RequestUser:
         """
         Actualiza un solicitante existente.
@@ -258,6 +310,17 @@ class RequestUserRepositoryImpl(RequestUserRepository):
                 raise
             raise Exception(f"Error al eliminar solicitante: {str(e)}")
         
+    def _existing_values(self, column, values: list[str]) -> set[str]:
+        values = list(set(values))
+        existing = set()
+        for start in range(0, len(values), self.IN_CHUNK_SIZE):
+            existing.update(
+                value for (value,) in self.db.query(column).filter(
+                    column.in_(values[start:start + self.IN_CHUNK_SIZE])
+                )
+            )
+        return existing
+
     def _to_entity(self, db_request_user: RequestUserModel) -> RequestUser:
         return RequestUser(
             id=db_request_user.id,
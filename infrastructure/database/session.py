@@ -1,19 +1,93 @@
 # infrastructure/database/session.py
-from sqlalchemy import create_engine
+import os
+import logging
+import threading
+import functools
+import inspect
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Callable, Dict, Generator
+
+logger = logging.getLogger(__name__)
 
 # Configuración de la base de datos SQLite
 SQLALCHEMY_DATABASE_URL = "sqlite:///./dietas_app.db"
 
+# ========== PERFILES DE RENDIMIENTO SQLITE ==========
+
+# PRAGMAs aplicados a cada conexión nueva, por perfil.
+# - performance: WAL (los lectores no se bloquean durante las escrituras),
+#   synchronous=NORMAL (un fsync por checkpoint en vez de por commit),
+#   caché de 64 MiB y 256 MiB de mmap.
+# - safe: WAL con synchronous=FULL, para equipos con cortes de energía.
+# - legacy: comportamiento anterior (journal de rollback, synchronous=FULL).
+#   WAL queda grabado en el archivo, por eso se revierte explícitamente.
+DB_PROFILES: Dict[str, Dict[str, Any]] = {
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16384,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+    },
+}
+
+DEFAULT_DB_PROFILE = "performance"
+
+# El perfil se elige por instalación con la variable de entorno VIAJEX_DB_PROFILE
+DB_PROFILE = os.environ.get("VIAJEX_DB_PROFILE", DEFAULT_DB_PROFILE).strip().lower()
+if DB_PROFILE not in DB_PROFILES:
+    logger.warning(f"Perfil de base de datos desconocido '{DB_PROFILE}', se usa '{DEFAULT_DB_PROFILE}'")
+    DB_PROFILE = DEFAULT_DB_PROFILE
+
+
+def get_active_profile() -> Dict[str, Any]:
+    """
+    Devuelve el perfil de base de datos activo.
+    
+    Returns:
+        Dict con el nombre del perfil y los PRAGMAs que aplica
+    """
+    return {"name": DB_PROFILE, "pragmas": dict(DB_PROFILES[DB_PROFILE])}
+
+
+def apply_sqlite_pragmas(dbapi_connection, profile: str = None):
+    """Aplica los PRAGMAs del perfil a una conexión DB-API de SQLite"""
+    pragmas = DB_PROFILES[profile or DB_PROFILE]
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
 # Crear motor de base de datos
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
     connect_args={"check_same_thread": False}
 )
 
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection)
+
 # Crear sesión local
 SessionLocal = sessionmaker(
     autocommit=False, 
@@ -22,9 +96,82 @@ SessionLocal = sessionmaker(
     class_=Session
 )
 
+# Sesión por hilo: los repositorios reciben este proxy y cada hilo (la UI
+# de Tk o un trabajo en segundo plano) resuelve su propia sesión
+ScopedSession = scoped_session(SessionLocal)
+
 # Base para los modelos
 Base = declarative_base()
 
+# ========== UNIDAD DE TRABAJO ==========
+
+_unit_state = threading.local()
+
+
+def in_unit_of_work() -> bool:
+    """Indica si el hilo actual está dentro de una unidad de trabajo"""
+    return getattr(_unit_state, "depth", 0) > 0
+
+
+def on_unit_of_work_rollback(callback: Callable[[], None]):
+    """
+    Registra una acción a ejecutar si la unidad de trabajo del hilo se
+    deshace, por ejemplo descartar datos en memoria leídos o escritos
+    dentro de ella. Fuera de una unidad no hace nada.
+    """
+    if in_unit_of_work():
+        _unit_state.rollback_callbacks.append(callback)
+
+
+@contextmanager
+def unit_of_work() -> Generator[Session, None, None]:
+    """
+    Agrupa varias operaciones de repositorio en una sola transacción.
+    
+    Los repositorios siguen llamando a commit()/rollback(); dentro de la
+    unidad esas llamadas solo cierran o deshacen un SAVEPOINT, y el commit
+    real se hace una vez al salir del bloque. Si ocurre una excepción se
+    deshace todo. Una unidad anidada se une a la exterior.
+    
+    Uso:
+        with unit_of_work():
+            diet_service.create_diet_liquidation(dto)
+            card_service.discount_card(card_id, total)
+    """
+    if in_unit_of_work():
+        _unit_state.depth += 1
+        try:
+            yield ScopedSession()
+        finally:
+            _unit_state.depth -= 1
+        return
+    
+    # La sesión anterior del hilo se descarta: la unidad usa una propia
+    ScopedSession.remove()
+    connection = engine.connect()
+    transaction = connection.begin()
+    # pysqlite no abre la transacción antes de un SAVEPOINT; sin este BEGIN
+    # el primer commit() de un repositorio se confirmaría de inmediato
+    connection.exec_driver_sql("BEGIN")
+    session = ScopedSession(bind=connection, join_transaction_mode="create_savepoint")
+    _unit_state.depth = 1
+    _unit_state.rollback_callbacks = []
+    try:
+        yield session
+        session.flush()
+        transaction.commit()
+    except Exception:
+        transaction.rollback()
+        for callback in _unit_state.rollback_callbacks:
+            callback()
+        raise
+    finally:
+        _unit_state.depth = 0
+        _unit_state.rollback_callbacks = []
+        ScopedSession.remove()
+        connection.close()
+
+
 # Gestor de contexto para sesiones
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -32,12 +179,20 @@ def get_db() -> Generator[Session, None, None]:
     Context manager para obtener sesiones de base de datos.
     Maneja automáticamente commit, rollback y cierre.
     
+    Dentro de una unidad de trabajo devuelve la sesión de la unidad y deja
+    el commit a cargo de ella.
+    
     Uso:
         with get_db() as db:
             # operaciones con db
             db.query(...)
             # commit automático al salir (si no hay error)
     """
+    if in_unit_of_work():
+        with unit_of_work() as db:
+            yield db
+        return
+    
     db = SessionLocal()
     try:
         yield db
@@ -55,11 +210,81 @@ def get_db_session() -> Session:
     """
     return SessionLocal()
 
+def release_session():
+    """
+    Descarta la sesión del hilo actual al terminar una operación o acción
+    de UI, liberando su mapa de identidad. Dentro de una unidad de trabajo
+    no hace nada.
+    """
+    if not in_unit_of_work():
+        ScopedSession.remove()
+
 def reset_all_sessions():
     """
     Limpia todas las sesiones existentes.
     Útil después de errores críticos.
     """
-    # SQLAlchemy maneja esto internamente
-    # Esta función es principalmente para documentación
-    pass
\ No newline at end of file
+    _unit_state.depth = 0
+    _operation_state.depth = 0
+    ScopedSession.remove()
+
+# ========== SESIÓN POR OPERACIÓN ==========
+
+_operation_state = threading.local()
+
+
+@contextmanager
+def session_scope():
+    """
+    Delimita una operación: una llamada a un servicio o una acción de UI.
+    
+    Al salir de la operación más externa del hilo se descarta su sesión
+    (release_session), de modo que ninguna transacción de lectura queda
+    abierta entre acciones y cada operación empieza con un mapa de
+    identidad vacío. Las operaciones anidadas se unen a la externa.
+    """
+    _operation_state.depth = getattr(_operation_state, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _operation_state.depth -= 1
+        if _operation_state.depth == 0:
+            release_session()
+
+
+def scoped_operation(func):
+    """
+    Decorador que ejecuta `func` dentro de session_scope.
+    
+    Si devuelve un generador (p. ej. iter_diets_report_rows), la operación
+    dura mientras se recorre, para no cerrar la sesión bajo su cursor.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with session_scope():
+            result = func(*args, **kwargs)
+        if inspect.isgenerator(result):
+            return _iterate_in_scope(result)
+        return result
+    return wrapper
+
+
+def _iterate_in_scope(iterator):
+    with session_scope():
+        yield from iterator
+
+
+def scope_service_calls(service):
+    """
+    Envuelve con scoped_operation los métodos públicos de un servicio ya
+    construido, para que cada llamada desde la UI use su propia sesión.
+    
+    Returns:
+        El mismo servicio
+    """
+    for name in dir(type(service)):
+        if name.startswith("_"):
+            continue
+        if inspect.isfunction(inspect.getattr_static(service, name)):
+            setattr(service, name, scoped_operation(getattr(service, name)))
+    return service
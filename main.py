@@ -1,9 +1,11 @@
+import multiprocessing
 import tkinter as tk
 from application.services.account_service import AccountService
 from application.services.card_service import CardService
 from application.services.card_transaction_service import CardTransactionService
 from application.services.department_service import DepartmentService
 from application.services.report_service import ReportService  
+from application.services.reference_data_cache import ReferenceDataCache
 from core.entities import card_transaction
 from core.repositories import card_transaction_repository
 from core.use_cases.account import create_account_use_case
@@ -20,6 +22,7 @@ from core.use_cases.cards.discount_card import DiscountCardUseCase
 from core.use_cases.cards.export_card_transactions_use_case import ExportCardTransactionsUseCase
 from core.use_cases.cards.generate_daily_snapshots_use_case import GenerateDailySnapshotsUseCase
 from core.use_cases.cards.get_card_balance_at_date_use_case import GetCardBalanceAtDateUseCase
+from core.use_cases.cards.get_card_balance_history_use_case import GetCardBalanceHistoryUseCase
 from core.use_cases.cards.get_card_monthly_summary_use_case import GetCardMonthlySummaryUseCase
 from core.use_cases.cards.get_card_transactions_use_case import GetCardTransactionsUseCase
 from core.use_cases.cards.record_card_transaction_use_case import RecordCardTransactionUseCase
@@ -30,14 +33,16 @@ from infrastructure.database.repositories.department_repository import Departmen
 from infrastructure.database.repositories.diet_liquidation_repository import DietLiquidationRepositoryImpl
 from infrastructure.database.repositories.diet_repository import DietRepositoryImpl
 from infrastructure.database.repositories.diet_service_repository import DietServiceRepositoryImpl
+from infrastructure.database.repositories.cached_diet_service_repository import CachedDietServiceRepository
+from infrastructure.database.repositories.report_repository import ReportRepositoryImpl
 from infrastructure.database.repositories.request_user_repository import RequestUserRepositoryImpl
 from infrastructure.database.repositories.user_repository import UserRepositoryImpl
+from infrastructure.database.models import create_missing_indexes
 from infrastructure.database.session import Base, engine
 from infrastructure.security.password_hasher import BCryptPasswordHasher
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from infrastructure.database.session import Base, engine
+from infrastructure.database.session import ScopedSession, release_session, reset_all_sessions, scope_service_calls
 from infrastructure.database.repositories.user_repository import UserRepositoryImpl
 from infrastructure.security.password_hasher import BCryptPasswordHasher
 
@@ -63,6 +68,7 @@ from core.use_cases.request_user.update_user_request import UpdateRequestUserUse
 from core.use_cases.request_user.get_request_user import GetRequestUserUseCase
 from core.use_cases.request_user.delete_request_user import DeleteRequestUserUseCase
 from core.use_cases.request_user.list_users_request import ListRequestUsersUseCase
+from core.use_cases.request_user.import_request_users import ImportRequestUsersUseCase
 
 # Use Cases Card 
 from core.use_cases.cards.create_card import CreateCardUseCase
@@ -117,8 +123,9 @@ def main():
     """Función principal que inicializa la aplicación completa"""
     # Configuración de la base de datos
     Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db_session = SessionLocal()
+    create_missing_indexes(engine)
+    # Proxy de sesión por hilo; cada llamada a un servicio la libera al terminar
+    db_session = ScopedSession
 
     try:
         # Inicializar dependencias
@@ -133,7 +140,8 @@ def main():
 
         diet_liquidation_repository = DietLiquidationRepositoryImpl(db_session)
         diet_repository = DietRepositoryImpl(db_session)
-        diet_service_repository = DietServiceRepositoryImpl(db_session)
+        diet_service_repository = CachedDietServiceRepository(DietServiceRepositoryImpl(db_session))
+        report_repository = ReportRepositoryImpl(db_session)
         
         # Inicializar casos de uso de usuarios
         create_user_use_case = CreateUserUseCase(user_repository, password_hasher)
@@ -149,6 +157,7 @@ def main():
         get_request_user = GetRequestUserUseCase(request_user_repository)
         delete_request_user = DeleteRequestUserUseCase(request_user_repository)
         get_request_user_list = ListRequestUsersUseCase(request_user_repository)
+        import_request_users = ImportRequestUsersUseCase(request_user_repository, department_repository)
 
         # Inicializar casos de uso de department
         create_department = CreateDepartmentUseCase(department_repository)
@@ -171,10 +180,11 @@ def main():
 
         get_card_transactions_use_case = GetCardTransactionsUseCase(card_transaction_repository, card_repository)
         get_card_balance_at_date_use_case = GetCardBalanceAtDateUseCase(card_transaction_repository, card_repository)
+        get_card_balance_history_use_case = GetCardBalanceHistoryUseCase(card_transaction_repository, card_repository)
         get_card_monthly_summary_use_case = GetCardMonthlySummaryUseCase(card_balance_snapshot_repository, card_transaction_repository, card_repository)
         export_card_transactions_use_case = ExportCardTransactionsUseCase(card_transaction_repository, card_repository)
         generate_daily_snapshots_use_case = GenerateDailySnapshotsUseCase(card_transaction_repository, card_balance_snapshot_repository, card_repository)
-        record_card_transaction_use_case = RecordCardTransactionUseCase(card_transaction_repository, card_repository)
+        record_card_transaction_use_case = RecordCardTransactionUseCase(card_transaction_repository, card_repository, card_balance_snapshot_repository)
 
         # Inicializar casos de uso de Account
         create_account_use_case = CreateAccountUseCase(account_repository)
@@ -198,6 +208,9 @@ def main():
             delete_user_use_case=delete_user_use_case
         )
 
+        # Caché de departamentos y solicitantes compartida por sus servicios
+        reference_data_cache = ReferenceDataCache(department_repository, request_user_repository)
+
         # Inicializar servicio de departments
         department_service = DepartmentService(
             department_repository=department_repository,
@@ -205,7 +218,8 @@ def main():
             update_department=update_department,
             get_department=get_department,
             delete_department=delete_department,
-            get_department_list=get_department_list
+            get_department_list=get_department_list,
+            reference_cache=reference_data_cache
         )
 
         # Inicializar servicio de solicitantes
@@ -215,7 +229,9 @@ def main():
             update_user_request=update_user_request,
             get_user_request=get_request_user,
             get_user_request_list=get_request_user_list,
-            delete_user_request=delete_request_user
+            delete_user_request=delete_request_user,
+            reference_cache=reference_data_cache,
+            import_request_users=import_request_users
         )
 
         # Inicializar servicio de dietas
@@ -224,6 +240,7 @@ def main():
             diet_service_repository = diet_service_repository,
             diet_repository = diet_repository,
             request_user_repository = request_user_repository,
+            report_repository = report_repository,
         )
 
         # Inicializar servicio de cards
@@ -246,7 +263,8 @@ def main():
             get_card_monthly_summary_use_case = get_card_monthly_summary_use_case,
             export_card_transactions_use_case = export_card_transactions_use_case,
             generate_daily_snapshots_use_case = generate_daily_snapshots_use_case, 
-            record_card_transaction_use_case = record_card_transaction_use_case
+            record_card_transaction_use_case = record_card_transaction_use_case,
+            get_card_balance_history_use_case = get_card_balance_history_use_case
         )
 
         # Inicializar servicio de usuarios
@@ -267,7 +285,8 @@ def main():
             request_user_repo = request_user_repository,
             department_repo = department_repository,
             liquidation_repo = diet_liquidation_repository,
-            diet_service = diet_service_repository
+            diet_service = diet_service_repository,
+            report_repo = report_repository
         )
 
         # # Crear usuario admin por defecto
@@ -280,6 +299,12 @@ def main():
         # Inicializar servicio de autenticación
         auth_service = AuthService(user_repository, login_use_case)
 
+        # Cada llamada a un servicio (una acción de la UI) usa su propia sesión
+        # y la descarta al terminar, sin transacciones abiertas entre acciones
+        for service in (user_service, auth_service, department_service, request_user_service,
+                        card_service, diet_service, account_service, card_transaction, report_service):
+            scope_service_calls(service)
+
         # Función que se ejecuta cuando el login es exitoso
         def on_login_success(user):
             """Callback que se ejecuta después de un login exitoso"""
@@ -296,6 +321,8 @@ def main():
                 report_service=report_service
                 )
             dashboard.run()
+            # Por si algo usó la sesión fuera de un servicio
+            release_session()
 
         # Ciclo principal de la aplicación
         while True:
@@ -316,7 +343,9 @@ def main():
         print(f"Error crítico en la aplicación: {e}")
         tk.messagebox.showerror("Error", f"Error crítico: {e}")         # type: ignore
     finally:
-        db_session.close()
+        reset_all_sessions()
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos de exportación por lotes
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
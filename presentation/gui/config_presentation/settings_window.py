@@ -264,6 +264,13 @@ class SettingsWindow(tk.Toplevel):
                        f"• Backups: {info['backup_count']}\n"
                        f"• Ciclos: {info.get('cycles_count', 0)}\n")
                 
+                profile = info.get('profile')
+                if profile:
+                    effective = profile.get('effective', {})
+                    text += (f"• Perfil: {profile['name']}"
+                             f" (journal: {effective.get('journal_mode', 'N/A')},"
+                             f" synchronous: {effective.get('synchronous', 'N/A')})\n")
+                
                 if 'tables' in info:
                     text += f"\n📋 Tablas principales:\n"
                     for table in ['requests', 'cards', 'department', 'users', 'diets', 'diet_liquidations']:
@@ -14,6 +14,7 @@ class DietDialog(tk.Toplevel):
         self.request_user_service = request_user_service
         self.card_service = card_service
         self.result = False
+        self.diet_ids = []  # Dietas creadas o editadas, para actualizar las listas sin recargarlas
         
         title = "Editar Dieta" if diet else "Crear Dieta"
         self.title(title)
@@ -243,6 +244,7 @@ class DietDialog(tk.Toplevel):
                 self.card_service.toggle_card_active(form_data["accommodation_card_id"])
             
             # Si todo fue bien, mostramos éxito
+            self.diet_ids = diet_ids
             self.result = True
             messagebox.showinfo("Éxito", f"Se crearon {len(diet_ids)} dietas correctamente")
             self.destroy()
@@ -283,6 +285,7 @@ class DietDialog(tk.Toplevel):
                 # ACTUALIZAR LA DIETA
                 result = self.diet_service.update_diet(self.diet.id, update_dto)    # type: ignore
                 if result:
+                    self.diet_ids = [result.id]
                     self.result = result
                     messagebox.showinfo("Editado", f"Se editó la dieta satisfactoriamente")
                     self.destroy()
@@ -4,6 +4,7 @@ from datetime import datetime
 from application.dtos.diet_dtos import DietLiquidationCreateDTO, DietLiquidationUpdateDTO
 from application.services.card_service import CardService
 from application.services.diet_service import DietAppService
+from infrastructure.database.session import unit_of_work
 
 class DietLiquidationDialog(tk.Toplevel):
 
@@ -370,20 +371,24 @@ class DietLiquidationDialog(tk.Toplevel):
                 total_pay=accommodation_total 
             )
             
-            # Crear liquidación
-            result = self.diet_controller.create_diet_liquidation(create_dto)
+            # Liquidación, descuento y estado de la tarjeta en una sola transacción
+            # (los mensajes se muestran fuera de la unidad, con la transacción ya cerrada)
+            with unit_of_work():
+                # Crear liquidación
+                result = self.diet_controller.create_diet_liquidation(create_dto)
+                
+                # Aplicar descuento si es con tarjeta
+                if result and self.diet.accommodation_payment_method.upper() == 'CARD' and self.diet.accommodation_card_id:
+                    self.card_service.discount_card(self.diet.accommodation_card_id, accommodation_total)
+                    
+                    # Verificar si la tarjeta sigue en viaje
+                    if not self.diet_service.card_on_the_road(self.diet.accommodation_card_id):
+                        self.card_service.toggle_card_active(self.diet.accommodation_card_id)
+            
             if not result:
                 messagebox.showerror("Error", "No se pudo liquidar la dieta")
                 return
             
-            # Aplicar descuento si es con tarjeta
-            if self.diet.accommodation_payment_method.upper() == 'CARD' and self.diet.accommodation_card_id:
-                self.card_service.discount_card(self.diet.accommodation_card_id, accommodation_total)
-                
-                # Verificar si la tarjeta sigue en viaje
-                if not self.diet_service.card_on_the_road(self.diet.accommodation_card_id):
-                    self.card_service.toggle_card_active(self.diet.accommodation_card_id)
-            
             self.result = True
             messagebox.showinfo("Éxito", "Dieta liquidada correctamente")
             self.destroy()
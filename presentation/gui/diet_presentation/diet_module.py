@@ -169,16 +169,16 @@ class DietModule(ttk.Frame):
     def refresh_diets(self):
         """Actualiza las listas de dietas y liquidaciones"""
         try:
-            # Obtener todas
-            diets = self.diet_service.get_all()                                                        # type: ignore
+            # Obtener todas (con solicitante, departamento y total en una sola consulta)
+            diets = self.diet_service.list_diet_rows()                                                 # type: ignore
             self.all_list.update_data(diets, type=0)
             
             # Obtener anticipos
-            diets = self.diet_service.list_diets(status=DietStatus.REQUESTED)                          # type: ignore
+            diets = self.diet_service.list_diet_rows(status=DietStatus.REQUESTED)                      # type: ignore
             self.advances_list.update_data(diets, type=1)
             
             # Obtener liquidaciones
-            liquidations = self.diet_service.list_all_liquidations()                  
+            liquidations = self.diet_service.list_liquidation_rows()                  
             self.liquidations_list.update_data(liquidations,  type=2)
 
             self.actions_widget.refresh_counters()
@@ -188,6 +188,25 @@ class DietModule(ttk.Frame):
             import traceback
             traceback.print_exc()
     
+    def refresh_diet_rows(self, diet_ids):
+        """Actualiza en las listas solo las dietas creadas o editadas, manteniendo la búsqueda"""
+        if not diet_ids:
+            self.refresh_diets()
+            return
+        try:
+            rows = self.diet_service.list_diet_rows(diet_ids=diet_ids)                                 # type: ignore
+            self.all_list.upsert_rows(rows)
+            self.advances_list.upsert_rows([row for row in rows if row.diet.status == "requested"])
+            # La liquidación muestra datos de su dieta (anticipo, solicitante, departamento)
+            self.liquidations_list.upsert_rows(self.diet_service.list_liquidation_rows(diet_ids=diet_ids))
+            
+            self.actions_widget.refresh_counters()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudieron cargar los datos: {str(e)}")
+            import traceback
+            traceback.print_exc()
+
     def on_diet_selected(self, diet: DietResponseDTO):
         """Maneja la selección de una dieta"""
         self.current_item = diet
@@ -203,7 +222,7 @@ class DietModule(ttk.Frame):
         dialog = DietDialog(self, self.diet_service, self.request_user_service, self.card_service)
         self.wait_window(dialog)
         if dialog.result:
-            self.refresh_diets()
+            self.refresh_diet_rows(dialog.diet_ids)
     
     def edit_item(self):
         """Abre diálogo para editar seleccionada"""
@@ -225,7 +244,7 @@ class DietModule(ttk.Frame):
         dialog = DietDialog(self, self.diet_service, self.request_user_service, self.card_service, self.current_item)
         self.wait_window(dialog)
         if dialog.result:
-            self.refresh_diets()
+            self.refresh_diet_rows(dialog.diet_ids)
             self.current_item = None
             self.actions_widget.update_buttons_state(None)
             self.advances_list.clear_selection()
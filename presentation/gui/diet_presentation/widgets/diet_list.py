@@ -5,11 +5,12 @@ from traceback import print_exc
 import traceback
 from typing import List, Optional, Callable
 
-from application.dtos.diet_dtos import DietResponseDTO, DietLiquidationResponseDTO
+from application.dtos.diet_dtos import DietResponseDTO, DietLiquidationResponseDTO, DietListRowDTO
 from application.services import user_service
 from application.services.department_service import DepartmentService
 from application.services.request_service import UserRequestService
 from application.services.diet_service import DietAppService, DietService
+from presentation.gui.utils.search_index import SearchIndex
 from datetime import datetime, timezone, date
 
 class DietList(ttk.Frame):
@@ -27,86 +28,13 @@ class DietList(ttk.Frame):
         self.sort_column = None
         self.sort_reverse = False
         self.current_data = []  
+        self.rows: List[DietListRowDTO] = []          # Filas cargadas (con datos relacionados ya resueltos)
+        self.visible_rows: List[DietListRowDTO] = []  # Filas mostradas tras filtrar
+        self.search_index = SearchIndex()             # Índice de búsqueda sobre self.rows
+        self.search_text = ""                         # Búsqueda aplicada actualmente
+        self._positions = {}                          # Clave de fila -> posición en self.rows
         self.create_widgets()
     
-    def calculate_total(self, diet, is_local = None) -> float:
-        """Calcula el total de una dieta basado en los precios del servicio"""
-        try:            
-            if not diet:
-                return 0.0
-            
-            if not self.diet_service:
-                return 0.0
-            
-            local = None
-
-            if is_local is not None:
-                local = is_local
-            elif hasattr(diet, 'is_local'):
-                local = diet.is_local
-            else:
-                local = True
-
-            service = self.diet_service.get_diet_service_by_local(local) 
-            
-            if not service:
-                return 0.0
-            
-            breakfast_count = 0
-            lunch_count = 0
-            dinner_count = 0
-            accommodation_count = 0
-            accommodation_payment_method = "CASH"
-
-            if hasattr(diet, 'breakfast_count'):
-                # Es un DietResponseDTO (anticipo)
-                breakfast_count = diet.breakfast_count
-                lunch_count = diet.lunch_count
-                dinner_count = diet.dinner_count
-                accommodation_count = diet.accommodation_count
-                accommodation_payment_method = diet.accommodation_payment_method
-            elif hasattr(diet, 'breakfast_count_liquidated'):
-                # Es un DietLiquidationResponseDTO (liquidación)
-                breakfast_count = diet.breakfast_count_liquidated
-                lunch_count = diet.lunch_count_liquidated
-                dinner_count = diet.dinner_count_liquidated
-                accommodation_count = diet.accommodation_count_liquidated
-                accommodation_payment_method = diet.accommodation_payment_method
-            
-            # Calcular total
-            breakfast_total = breakfast_count * service.breakfast_price
-            lunch_total = lunch_count * service.lunch_price
-            dinner_total = dinner_count * service.dinner_price
-            
-            
-            # Usar precio correcto según método de pago
-            if diet.accommodation_payment_method.upper() == "CARD":
-                # si tiene accommodation_count es dieta sino es liquidacion 
-                if hasattr(diet, 'accommodation_count'):
-                    accommodation_total = diet.accommodation_count * service.accommodation_card_price
-                else:
-                    # si tiene total_pay se usa ese precio en vez del precio en el servicio
-                    if hasattr(diet, 'total_pay'):
-                        accommodation_total =  diet.total_pay
-                    else:
-                        accommodation_total = diet.accommodation_count_liquidated * service.accommodation_card_price
-            # Cuando es en efectivo
-            else:
-                if hasattr(diet, 'accommodation_count'):
-                    accommodation_total = diet.accommodation_count * service.accommodation_cash_price
-                else: 
-                    if hasattr(diet, 'total_pay'):
-                        accommodation_total = diet.accommodation_count_liquidated * diet.total_pay
-                    else:
-                        accommodation_total = diet.accommodation_count_liquidated * service.accommodation_cash_price
-            
-            total = breakfast_total + lunch_total + dinner_total + accommodation_total            
-            return total
-            
-        except Exception as e:
-            traceback.print_exc()
-            return 0.0
-    
     def create_widgets(self):
         # Frame principal
         main_frame = ttk.Frame(self)
@@ -169,13 +97,11 @@ class DietList(ttk.Frame):
             return
         
         try:
-            selected_item_id = selection[0]
-            selected_index = self.tree.index(selected_item_id)
+            selected_index = self.tree.index(selection[0])
 
-            # Obtener el objeto correspondiente de current_data
-            if self.current_data and selected_index < len(self.current_data):
-                selected_item = self.current_data[selected_index]
-                self.selection_callback(selected_item)
+            # Obtener el objeto correspondiente de las filas visibles (pueden estar filtradas)
+            if selected_index < len(self.visible_rows):
+                self.selection_callback(self.visible_rows[selected_index].item)
             else:
                 self.selection_callback(None)
                 
@@ -189,105 +115,49 @@ class DietList(ttk.Frame):
             return "👥 Grupal" if diet.is_group else "👤 Individual"
         return "Individual"
     
-    def update_data(self, data: list, type):
-        """Actualiza los datos en la lista"""
+    def update_data(self, data: List[DietListRowDTO], type):
+        """
+        Actualiza los datos en la lista.
+
+        Recibe las filas de DietAppService.list_diet_rows / list_liquidation_rows,
+        que ya traen solicitante, departamento y total, de modo que mostrar y
+        filtrar no hace consultas adicionales.
+        """
         self.current_display_type = type  
-        
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        self.current_data = data or []  
-        if not data:
+        self.rows = list(data or [])
+        self._reindex_positions()
+        self.search_index.build((row.item.id, self._search_values(row)) for row in self.rows)
+        self.search_text = ""
+        self._refresh_display(self.rows)
+
+    def upsert_rows(self, rows: List[DietListRowDTO]):
+        """
+        Agrega o reemplaza filas sin recargar la lista (alta o edición de dietas).
+
+        Las filas nuevas se agregan al principio, igual que en el orden
+        descendente de la carga completa; la búsqueda actual se vuelve a aplicar.
+        """
+        if not rows:
             return
+        new_rows = []
+        for row in rows:
+            position = self._positions.get(row.item.id)
+            if position is None:
+                new_rows.append(row)
+            else:
+                self.rows[position] = row
+            self.search_index.update(row.item.id, self._search_values(row))
         
-        # Para pestañas "all" o "advances"
-        if type == 1 or type == 0:
-            for i, item in enumerate(data):
-                if hasattr(item, 'advance_number'):  
-                    user = self.request_user_service.get_user_by_id(item.request_user_id)                    
-                    total_amount = self.calculate_total(item)
-                    
-                    # Obtener departamento del usuario (si existe)
-                    departamento = "N/A"
-                    if user and hasattr(user, 'department_id'):
-                        departamento = self.departament_service.get_department_by_id(user.department_id).name
-                    
-                    # Para pestaña "all"
-                    if self.list_type == "all":
-                        status_display = "Pendiente"  
-                        if hasattr(item, 'status'):
-                            status_display = item.status
-                        
-                        item_id = self.tree.insert("", "end", values=(
-                            item.advance_number,
-                            item.description,
-                            f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A",  
-                            departamento,
-                            item.start_date.strftime("%d/%m/%Y") if item.start_date else "N/A",
-                            item.end_date.strftime("%d/%m/%Y") if item.end_date else "N/A",
-                            f"${total_amount:.2f}" if total_amount is not None else "$0.00",
-                            status_display  
-                        ))
-                    # Para pestaña "advances"   
-                    elif self.list_type == "advances":
-                        # Obtener departamento del usuario (si existe)
-                        departamento = "N/A"
-                        if user and hasattr(user, 'department_id'):
-                            departamento = self.departament_service.get_department_by_id(user.department_id).name
-                        
-                        # Determinar color basado en antigüedad
-                        bg_color = self._get_row_color_based_on_age(item)
-                        
-                        item_id = self.tree.insert("", "end", values=(
-                            item.advance_number,
-                            item.description,
-                            f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A",  
-                            departamento,
-                            item.start_date.strftime("%d/%m/%Y") if item.start_date else "N/A",
-                            item.end_date.strftime("%d/%m/%Y") if item.end_date else "N/A",
-                            f"${total_amount:.2f}" if total_amount is not None else "$0.00"
-                        ))
-                        
-                        # Aplicar color de fondo si corresponde
-                        if bg_color:
-                            # Crear un tag único para este color específico
-                            tag_name = f"color_{bg_color.replace('#', '')}"
-                            self.tree.item(item_id, tags=(tag_name,))
-                            self.tree.tag_configure(tag_name, background=bg_color)
-        
-        # Para pestaña "liquidations" (type == 2)
-        elif type == 2:  
-            for item in data:
-                if hasattr(item, 'liquidation_number'):
-                    # Obtener información completa
-                    diet = self.diet_service.get_diet(item.diet_id) if self.diet_service else None
-                    user = self.request_user_service.get_user_by_id(diet.request_user_id) if diet else None
-                    
-                    # Obtener departamento del usuario (si existe) - CORREGIDO
-                    departamento = "N/A"
-                    if user and hasattr(user, 'department_id'):
-                        dept = self.departament_service.get_department_by_id(user.department_id)
-                        departamento = dept.name if dept else "N/A"
-                    
-                    # Formatear datos para mostrar
-                    solicitante = f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A"
-                    fecha_liquidacion = item.liquidation_date.strftime("%d/%m/%Y") if item.liquidation_date else "N/A"
-                    monto = self.calculate_total(item, diet.is_local)   # type: ignore
-                    advance_number = diet.advance_number if diet else "N/A"
-                    
-                    self.tree.insert("", "end", values=(
-                        item.liquidation_number,      
-                        advance_number,               
-                        solicitante,                 
-                        departamento,                                               # Columna departamento
-                        fecha_liquidacion,            
-                        item.breakfast_count_liquidated,  
-                        item.lunch_count_liquidated,      
-                        item.dinner_count_liquidated,     
-                        item.accommodation_count_liquidated, 
-                        f"${monto:.2f}" if monto is not None else "$0.00"
-                    ))
+        if new_rows:
+            self.rows[:0] = new_rows
+            self._reindex_positions()
+        else:
+            self.current_data = [row.item for row in self.rows]
+        self.filter_data(self.search_text)
+
+    def _reindex_positions(self):
+        self.current_data = [row.item for row in self.rows]
+        self._positions = {row.item.id: position for position, row in enumerate(self.rows)}
 
     def bind_selection(self, callback: Callable):
         """Establece el callback para cuando se selecciona un item"""
@@ -324,8 +194,8 @@ class DietList(ttk.Frame):
         selection = self.tree.selection()
         if selection:
             selected_index = self.tree.index(selection[0])
-            if selected_index < len(self.current_data):
-                return self.current_data[selected_index]
+            if selected_index < len(self.visible_rows):
+                return self.visible_rows[selected_index].item
         return None
     
     def clear_selection(self):
@@ -333,225 +203,97 @@ class DietList(ttk.Frame):
         self.tree.selection_remove(self.tree.selection())
 
     def filter_data(self, search_text: str):
-        """Filtra los datos basado en el texto de búsqueda"""
-        if not search_text:
+        """Filtra los datos con el índice de búsqueda (sin recorrer filas ni consultar servicios)"""
+        self.search_text = search_text or ""
+        keys = self.search_index.search(self.search_text)
+        if keys is None:
             # Si no hay texto, mostrar todos los datos ORIGINALES (no filtrados)
-            self._refresh_display(self.current_data)
+            self._refresh_display(self.rows)
             return
         
-        search_lower = search_text.lower()
-        filtered_data = []
-        
-        for item in self.current_data:
-            # Buscar en todos los valores de las columnas
-            if self._item_matches_search(item, search_lower):
-                filtered_data.append(item)
-        
-        self._refresh_display(filtered_data)
-        
-    def _item_matches_search(self, item, search_lower: str) -> bool:
-        """Verifica si el item coincide con el texto de búsqueda - CORREGIDO PARA LIQUIDACIONES"""
-        try:
-            # BÚSQUEDA ESPECÍFICA PARA LIQUIDACIONES
-            if self.list_type == "liquidations" and hasattr(item, 'liquidation_number'):
-                # Buscar en campos directos de la liquidación
-                if (self._value_matches_search(item.liquidation_number, search_lower) or
-                    self._value_matches_search(item.breakfast_count_liquidated, search_lower) or
-                    self._value_matches_search(item.lunch_count_liquidated, search_lower) or
-                    self._value_matches_search(item.dinner_count_liquidated, search_lower) or
-                    self._value_matches_search(item.accommodation_count_liquidated, search_lower)):
-                    return True
-                
-                # Buscar en la dieta asociada
-                diet = self.diet_service.get_diet(item.diet_id) if self.diet_service else None
-                if diet:
-                    # Buscar en número de anticipo
-                    if self._value_matches_search(diet.advance_number, search_lower):
-                        return True
-                    
-                    # Buscar en nombre del solicitante
-                    user = self.request_user_service.get_user_by_id(diet.request_user_id)
-                    if user:
-                        if hasattr(user, 'fullname') and self._value_matches_search(user.fullname, search_lower):
-                            return True
-                        
-                        # BUSCAR EN EL DEPARTAMENTO DEL USUARIO (NUEVO)
-                        if hasattr(user, 'department_id') and user.department_id:
-                            dept = self.departament_service.get_department_by_id(user.department_id)
-                            if dept and hasattr(dept, 'name') and self._value_matches_search(dept.name, search_lower):
-                                return True
-                    
-                    # Buscar en descripción de la dieta
-                    if self._value_matches_search(diet.description, search_lower):
-                        return True
-                
-                # Buscar en fecha de liquidación
-                if (item.liquidation_date and 
-                    self._value_matches_search(item.liquidation_date.strftime("%d/%m/%Y"), search_lower)):
-                    return True
-                    
-                return False
+        positions = sorted(self._positions[key] for key in keys)
+        self._refresh_display([self.rows[position] for position in positions])
+    
+    def _search_values(self, row: DietListRowDTO) -> list:
+        """Valores indexados para la búsqueda de una fila"""
+        values = [
+            row.diet.advance_number,
+            row.requester_name,
+            row.requester_ci,
+            row.department_name,
+            row.diet.description,
+        ]
+        item = row.item
+        if self.list_type == "liquidations":
+            values.append(item.liquidation_number)
+            if item.liquidation_date:
+                values.append(item.liquidation_date.strftime("%d/%m/%Y"))
+        else:
+            values.extend(
+                date_value.strftime("%d/%m/%Y")
+                for date_value in (item.start_date, item.end_date) if date_value
+            )
+            if self.list_type == "all":
+                values.append(self._status_display(item))
+        return values
 
-            # LÓGICA ORIGINAL PARA ANTICIPOS Y TODAS LAS DIETAS
-            if hasattr(item, '__dict__'):
-                # Para objetos, revisar todos sus atributos
-                for attr_name, attr_value in item.__dict__.items():
-                    if self._value_matches_search(attr_value, search_lower):
-                        return True
-            else:
-                # Para otros tipos de datos
-                if self._value_matches_search(str(item), search_lower):
-                    return True
-                    
-            # Búsqueda específica para campos comunes de dietas
-            common_fields = ['advance_number', 'liquidation_number', 'description', 'status']
-            for field in common_fields:
-                if hasattr(item, field):
-                    value = getattr(item, field)
-                    if self._value_matches_search(value, search_lower):
-                        return True
-            
-            # Buscar en el nombre del solicitante Y DEPARTAMENTO
-            if hasattr(item, 'request_user_id'):
-                user = self.request_user_service.get_user_by_id(item.request_user_id)
-                if user:
-                    if hasattr(user, 'fullname') and self._value_matches_search(user.fullname, search_lower):
-                        return True
-                    
-                    # BUSCAR EN EL DEPARTAMENTO DEL USUARIO (NUEVO)
-                    if hasattr(user, 'department_id') and user.department_id:
-                        dept = self.departament_service.get_department_by_id(user.department_id)
-                        if dept and hasattr(dept, 'name') and self._value_matches_search(dept.name, search_lower):
-                            return True
-            
-            # Buscar en montos
-            if hasattr(item, 'total_amount') or hasattr(item, 'amount'):
-                amount = getattr(item, 'total_amount', getattr(item, 'amount', None))
-                if self._value_matches_search(amount, search_lower):
-                    return True
-                    
-        except Exception as e:
-            traceback.print_exc()
-        
-        return False
+    def _status_display(self, item) -> str:
+        return "Liquidada" if item.status == "liquidated" else "Solicitada"
 
-    def _value_matches_search(self, value, search_lower: str) -> bool:
-        """Verifica si un valor individual coincide con la búsqueda"""
-        if value is None:
-            return False
-        
-        try:
-            if isinstance(value, (int, float)):
-                # Para números, buscar en su representación string
-                return search_lower in str(value)
-            elif isinstance(value, str):
-                return search_lower in value.lower()
-            elif hasattr(value, 'strftime'):  # Para objetos datetime
-                return search_lower in value.strftime("%d/%m/%Y").lower()
-            else:
-                return search_lower in str(value).lower()
-        except:
-            return False
 
-    def _refresh_display(self, data: list):
-        """Actualiza la visualización con los datos proporcionados - OPTIMIZADO"""
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _row_values(self, row: DietListRowDTO) -> tuple:
+        """Valores de las columnas de una fila según el tipo de lista"""
+        item = row.item
+        solicitante = row.requester_name or "N/A"
+        departamento = row.department_name or "N/A"
+        monto = f"${row.total:.2f}"
         
-        # Mostrar nuevos datos
-        if not data:
-            return
-            
+        if self.list_type == "liquidations":
+            return (
+                item.liquidation_number,
+                row.diet.advance_number,
+                solicitante,
+                departamento,
+                item.liquidation_date.strftime("%d/%m/%Y") if item.liquidation_date else "N/A",
+                item.breakfast_count_liquidated,
+                item.lunch_count_liquidated,
+                item.dinner_count_liquidated,
+                item.accommodation_count_liquidated,
+                monto
+            )
+        
+        values = (
+            item.advance_number,
+            item.description,
+            solicitante,
+            departamento,
+            item.start_date.strftime("%d/%m/%Y") if item.start_date else "N/A",
+            item.end_date.strftime("%d/%m/%Y") if item.end_date else "N/A",
+            monto
+        )
         if self.list_type == "all":
-            # Lógica para pestaña "Todas"
-            for item in data:
-                user = self.request_user_service.get_user_by_id(item.request_user_id)                    
-                total_amount = self.calculate_total(item)
-                
-                # Obtener departamento del usuario (si existe) - CORREGIDO
-                departamento = "N/A"
-                if user and hasattr(user, 'department_id'):
-                    dept = self.departament_service.get_department_by_id(user.department_id)
-                    departamento = dept.name if dept else "N/A"
-                
-                status_display = "Pendiente"  
-                if hasattr(item, 'status'):
-                    status_display = "Liquidada" if item.status == "liquidated" else "Solicitada"
-                
-                item_id = self.tree.insert("", "end", values=(
-                    item.advance_number,
-                    item.description,
-                    f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A",  
-                    departamento,
-                    item.start_date.strftime("%d/%m/%Y") if item.start_date else "N/A",
-                    item.end_date.strftime("%d/%m/%Y") if item.end_date else "N/A",
-                    f"${total_amount:.2f}" if total_amount is not None else "$0.00",
-                    status_display  
-                ))
+            values += (self._status_display(item),)
+        return values
 
-        elif self.list_type == "advances":
-            # Lógica para pestaña "Anticipos"
-            for item in data:
-                user = self.request_user_service.get_user_by_id(item.request_user_id)                    
-                total_amount = self.calculate_total(item)
-                
-                # Obtener departamento del usuario (si existe) - CORREGIDO
-                departamento = "N/A"
-                if user and hasattr(user, 'department_id'):
-                    dept = self.departament_service.get_department_by_id(user.department_id)
-                    departamento = dept.name if dept else "N/A"
-                
+    def _refresh_display(self, rows: List[DietListRowDTO]):
+        """Actualiza la visualización con las filas proporcionadas"""
+        # Limpiar lista actual
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        
+        self.visible_rows = rows
+        for row in rows:
+            tags = ()
+            if self.list_type == "advances":
                 # Determinar color basado en antigüedad
-                bg_color = self._get_row_color_based_on_age(item)
-                
-                item_id = self.tree.insert("", "end", values=(
-                    item.advance_number,
-                    item.description,
-                    f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A",  
-                    departamento,
-                    item.start_date.strftime("%d/%m/%Y") if item.start_date else "N/A",
-                    item.end_date.strftime("%d/%m/%Y") if item.end_date else "N/A",
-                    f"${total_amount:.2f}" if total_amount is not None else "$0.00"
-                ))
-                
-                # Aplicar color de fondo si corresponde
+                bg_color = self._get_row_color_based_on_age(row.item)
                 if bg_color:
-                    # Crear un tag único para este color específico
                     tag_name = f"color_{bg_color.replace('#', '')}"
-                    self.tree.item(item_id, tags=(tag_name,))
                     self.tree.tag_configure(tag_name, background=bg_color)
-        
-        # AGREGAR MANEJO DE LIQUIDACIONES
-        elif self.list_type == "liquidations":
-            for item in data:
-                if hasattr(item, 'liquidation_number'):
-                    diet = self.diet_service.get_diet(item.diet_id) if self.diet_service else None
-                    user = self.request_user_service.get_user_by_id(diet.request_user_id) if diet else None
-                    
-                    # Obtener departamento del usuario (si existe) - CORREGIDO
-                    departamento = "N/A"
-                    if user and hasattr(user, 'department_id'):
-                        dept = self.departament_service.get_department_by_id(user.department_id)
-                        departamento = dept.name if dept else "N/A"
-                    
-                    solicitante = f"{user.fullname}" if user and hasattr(user, 'fullname') else "N/A"
-                    fecha_liquidacion = item.liquidation_date.strftime("%d/%m/%Y") if item.liquidation_date else "N/A"
-                    monto = self.calculate_total(item, diet.is_local if diet else True)
-                    advance_number = diet.advance_number if diet else "N/A"
-                    
-                    self.tree.insert("", "end", values=(
-                        item.liquidation_number,      
-                        advance_number,               
-                        solicitante,                 
-                        departamento,                 
-                        fecha_liquidacion,            
-                        item.breakfast_count_liquidated,  
-                        item.lunch_count_liquidated,      
-                        item.dinner_count_liquidated,     
-                        item.accommodation_count_liquidated, 
-                        f"${monto:.2f}" if monto is not None else "$0.00"
-                    ))
+                    tags = (tag_name,)
+            
+            self.tree.insert("", "end", values=self._row_values(row), tags=tags)
 
     def refresh_colors(self):
         """Refresca los colores de todas las filas basado en su antigüedad"""
@@ -559,8 +301,8 @@ class DietList(ttk.Frame):
             return
             
         for i, item_id in enumerate(self.tree.get_children()):
-            if i < len(self.current_data):
-                item = self.current_data[i]
+            if i < len(self.visible_rows):
+                item = self.visible_rows[i].item
                 bg_color = self._get_row_color_based_on_age(item)
                 
                 # Limpiar tags existentes
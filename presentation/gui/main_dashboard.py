@@ -4,7 +4,6 @@ from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 from application.dtos.diet_dtos import DietServiceCreateDTO
-from application.dtos.request_user_dtos import RequestUserCreateDTO
 from core.entities.user import UserRole
 from presentation.gui.user_presentation.user_module import UserModule
 from presentation.gui.card_presentation.card_module import CardModule
@@ -993,7 +992,8 @@ class MainDashboard:
         
         update_progress(15, "Leyendo archivo Excel...")
         
-        df = pd.read_excel(file_path, skiprows=3)
+        # CI como texto: conserva ceros a la izquierda y evita "85010112345.0"
+        df = pd.read_excel(file_path, skiprows=3, dtype={'CI': str})
         
         required_columns = ['Nomre y apellidos', 'CI', 'Unidad']
         missing_columns = [col for col in required_columns if col not in df.columns]
@@ -1001,90 +1001,30 @@ class MainDashboard:
         if missing_columns:
             raise ValueError(f"Columnas faltantes: {', '.join(missing_columns)}")
         
-        update_progress(20, "Procesando datos...")
+        update_progress(30, f"Validando {len(df)} filas...")
         
-        # CORRECCIÓN: Usar las columnas correctamente
-        personas = []
-        total_filas = len(df)
+        personas = df[required_columns].rename(columns={
+            'Nomre y apellidos': 'fullname',
+            'CI': 'ci',
+            'Unidad': 'department'
+        })
+        # Número de fila en Excel (3 filas omitidas, encabezado y base 1) para el reporte
+        personas.index = personas.index + 5
         
-        for idx, row in df.iterrows():
-            try:
-                nombre = str(row['Nomre y apellidos']).strip()
-                ci = str(row['CI']).strip()
-                unidad = str(row['Unidad']).strip()
-                
-                if not nombre or nombre.lower() == 'nan' or nombre == 'None':
-                    continue
-                if not ci or ci.lower() == 'nan' or ci == 'None':
-                    continue
-                if len(ci) > 11:
-                    continue
-                
-                personas.append({
-                    'nombre': nombre,
-                    'ci': ci,
-                    'unidad': unidad
-                })
-            except Exception as e:
-                continue
-            
-            # Actualizar progreso cada 50 filas
-            if idx % 50 == 0 or idx == total_filas - 1:
-                progress = 20 + int((idx / total_filas) * 30)
-                update_progress(progress, f"Procesando datos... ({idx}/{total_filas})")
+        result = self.request_user_service.import_users(personas)
         
-        if not personas:
+        if not result.total:
             raise ValueError("No se encontraron personas con datos válidos en el archivo")
         
-        update_progress(50, f"Creando {len(personas)} solicitantes...")
-        
-        success_count = 0
-        error_count = 0
-        dept_not_found = 0
-        total_personas = len(personas)
-        
-        for idx, persona in enumerate(personas, 1):
-            # Calcular progreso
-            progress = 50 + int((idx / total_personas) * 50)
-            update_progress(progress, f"Creando solicitantes... ({idx}/{total_personas})",
-                        f"CI: {persona['ci']}")
-            
-            try:
-                requ_user = self.request_user_service.get_user_by_ci(persona['ci'])
-                if requ_user:
-                    continue
-                
-                department = self.department_service.get_department_by_name(name=persona['unidad'])
-                if not department:
-                    dept_not_found += 1
-                    continue
-              
-                
-                user_data = RequestUserCreateDTO(
-                    username=None,
-                    fullname=persona['nombre'],
-                    email=None,
-                    ci=persona['ci'],
-                    department_id=department.id
-                )
-                
-                requ_user = self.request_user_service.create_user(user_data)
-                
-                if requ_user:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    
-            except Exception as e:
-                error_count += 1
-        
         update_progress(100, "Finalizando...")
         
         return {
-            'total': len(personas),
-            'created': success_count,
-            'dept_not_found': dept_not_found,
-            'errors': error_count,
+            'total': result.total,
+            'created': result.created,
+            'existing': result.existing,
+            'dept_not_found': result.department_not_found,
+            'errors': len(result.errors),
+            'error_rows': result.errors,
             'file': os.path.basename(file_path)
         } 
     
@@ -1101,11 +1041,19 @@ class MainDashboard:
                 result_message += f"📄 Archivo: {result['file']}\n"
                 result_message += f"📊 Total procesados: {result['total']}\n"
                 result_message += f"✅ Solicitantes creados: {result['created']}\n"
+                result_message += f"↪️ Ya registrados (omitidos): {result['existing']}\n"
                 result_message += f"❌ Errores: {result['errors']}\n"
                 
                 if result['dept_not_found'] > 0:
                     result_message += f"⚠️ Departamentos no encontrados: {result['dept_not_found']}\n"
-                    result_message += "(Algunos solicitantes no pudieron ser creados por falta de departamento)"
+                    result_message += "(Algunos solicitantes no pudieron ser creados por falta de departamento)\n"
+                
+                if result['error_rows']:
+                    result_message += "\nFilas con errores:\n"
+                    for error in result['error_rows'][:15]:
+                        result_message += f"• Fila {error.row} (CI {error.ci or '-'}): {error.reason}\n"
+                    if len(result['error_rows']) > 15:
+                        result_message += f"... y {len(result['error_rows']) - 15} más\n"
                 
                 messagebox.showinfo("📊 Resultado", result_message)
         
@@ -4,6 +4,7 @@ Diálogo para configurar opciones de exportación de reportes.
 Proporciona opciones para exportar reportes en diferentes formatos.
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
@@ -14,6 +15,9 @@ from .base_report_dialog import BaseReportDialog
 class ExportOptionsDialog(BaseReportDialog):
     """Diálogo para configurar opciones de exportación"""
     
+    # Formatos que se pueden generar juntos en una exportación por lotes
+    MULTI_FORMAT_EXTENSIONS = (".xlsx", ".docx", ".pdf")
+    
     def __init__(self, parent, 
                  report_name: str = "Reporte",
                  available_formats: Optional[List[str]] = None,
@@ -30,6 +34,7 @@ class ExportOptionsDialog(BaseReportDialog):
         self.report_name = report_name
         self.available_formats = available_formats or [
             "Excel (.xlsx)",
+            "Word (.docx)",
             "PDF (.pdf)",
             "CSV (.csv)",
             "HTML (.html)",
@@ -41,7 +46,13 @@ class ExportOptionsDialog(BaseReportDialog):
         
         self.default_filename = default_filename or f"{report_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        super().__init__(parent, f"Exportar {report_name}", width=550, height=550)
+        # Formatos adicionales que pueden generarse junto con el principal
+        self.multi_formats = [
+            format_name for format_name in self.available_formats
+            if self._get_extension_from_format(format_name) in self.MULTI_FORMAT_EXTENSIONS
+        ]
+        
+        super().__init__(parent, f"Exportar {report_name}", width=550, height=620)
     
     def _create_widgets(self) -> None:
         """Crea los widgets del diálogo."""
@@ -84,6 +95,26 @@ class ExportOptionsDialog(BaseReportDialog):
         self.format_options_frame = ttk.Frame(format_frame)
         self.format_options_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(10, 0))
         
+        # Formatos adicionales: se generan en la misma pasada
+        self.extra_format_vars: Dict[str, tk.BooleanVar] = {}
+        if len(self.multi_formats) > 1:
+            ttk.Label(format_frame, text="Exportar también en:").grid(
+                row=2, column=0, sticky="w", padx=(0, 10), pady=(10, 0)
+            )
+            
+            extra_formats_frame = ttk.Frame(format_frame)
+            extra_formats_frame.grid(row=2, column=1, sticky="w", pady=(10, 0))
+            
+            for format_name in self.multi_formats:
+                var = tk.BooleanVar(value=False)
+                self.extra_format_vars[format_name] = var
+                ttk.Checkbutton(
+                    extra_formats_frame,
+                    text=format_name,
+                    variable=var,
+                    command=self._update_filename_preview
+                ).pack(side=tk.LEFT, padx=(0, 10))
+        
         # Inicializar opciones de formato
         self._create_format_options()
         
@@ -111,7 +142,7 @@ class ExportOptionsDialog(BaseReportDialog):
         location_frame = ttk.Frame(file_frame)
         location_frame.grid(row=1, column=1, sticky="ew", pady=10)
         
-        self.location_var = tk.StringVar(value="Documentos")
+        self.location_var = tk.StringVar(value=self._default_location())
         ttk.Entry(
             location_frame,
             textvariable=self.location_var,
@@ -210,6 +241,14 @@ class ExportOptionsDialog(BaseReportDialog):
             variable=self.compress_file_var
         ).grid(row=3, column=0, columnspan=2, sticky="w", pady=(5, 0))
         
+        # Agrupar por solicitante y mes dentro de cada departamento
+        self.group_by_employee_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            content_frame,
+            text="Agrupar por solicitante y mes dentro de cada departamento",
+            variable=self.group_by_employee_var
+        ).grid(row=4, column=0, columnspan=2, sticky="w", pady=(5, 0))
+        
         # Sección de opciones avanzadas
         advanced_frame = self._create_section(main_frame, "Opciones Avanzadas", 4)
         
@@ -443,10 +482,17 @@ class ExportOptionsDialog(BaseReportDialog):
                 parent=self
             )
     
+    def _default_location(self) -> str:
+        """Carpeta Documentos del usuario, o su carpeta personal si no existe."""
+        documents = os.path.join(os.path.expanduser("~"), "Documents")
+        return documents if os.path.isdir(documents) else os.path.expanduser("~")
+    
     def _get_extension_from_format(self, format_name: str) -> str:
         """Obtiene extensión de archivo del formato."""
         if "Excel" in format_name:
             return ".xlsx"
+        elif "Word" in format_name:
+            return ".docx"
         elif "PDF" in format_name:
             return ".pdf"
         elif "CSV" in format_name:
@@ -468,6 +514,8 @@ class ExportOptionsDialog(BaseReportDialog):
         """Obtiene tipos de archivo para el diálogo de guardado."""
         if "Excel" in format_name:
             return [("Excel files", "*.xlsx"), ("All files", "*.*")]
+        elif "Word" in format_name:
+            return [("Word files", "*.docx"), ("All files", "*.*")]
         elif "PDF" in format_name:
             return [("PDF files", "*.pdf"), ("All files", "*.*")]
         elif "CSV" in format_name:
@@ -485,13 +533,20 @@ class ExportOptionsDialog(BaseReportDialog):
         else:
             return [("All files", "*.*")]
     
-    def _update_filename_preview(self) -> None:
-        """Actualiza la vista previa del nombre de archivo."""
-        base_name = self.filename_var.get().strip()
-        if not base_name:
-            base_name = self.report_name
+    def _get_selected_extensions(self) -> List[str]:
+        """Extensiones a generar: el formato principal y los adicionales marcados."""
+        extensions = [self._get_extension_from_format(self.format_var.get())]
         
-        # Agregar componentes según opciones
+        if extensions[0] in self.MULTI_FORMAT_EXTENSIONS:
+            for format_name, var in getattr(self, 'extra_format_vars', {}).items():
+                extension = self._get_extension_from_format(format_name)
+                if var.get() and extension not in extensions:
+                    extensions.append(extension)
+        
+        return extensions
+    
+    def _build_base_filename(self, base_name: str) -> str:
+        """Nombre del archivo sin extensión con fecha, hora y usuario según opciones."""
         components = [base_name]
         
         if self.include_date_var.get():
@@ -504,13 +559,22 @@ class ExportOptionsDialog(BaseReportDialog):
             import getpass
             components.append(getpass.getuser())
         
-        # Unir componentes
-        filename = "_".join(components)
+        return "_".join(components)
+    
+    def _update_filename_preview(self) -> None:
+        """Actualiza la vista previa del nombre de archivo."""
+        base_name = self.filename_var.get().strip()
+        if not base_name:
+            base_name = self.report_name
         
-        # Agregar extensión
-        format_name = self.format_var.get()
-        extension = self._get_extension_from_format(format_name)
-        filename += extension
+        filename = self._build_base_filename(base_name)
+        
+        # Agregar extensión (o extensiones si se exportan varios formatos)
+        extensions = self._get_selected_extensions()
+        if len(extensions) > 1:
+            filename += " (" + ", ".join(extensions) + ")"
+        else:
+            filename += extensions[0]
         
         # Actualizar variable
         self.filename_preview_var.set(filename)
@@ -594,21 +658,10 @@ class ExportOptionsDialog(BaseReportDialog):
         extension = self._get_extension_from_format(format_name)
         
         # Construir nombre de archivo completo
-        base_name = self.filename_var.get().strip()
-        components = [base_name]
-        
-        if self.include_date_var.get():
-            components.append(datetime.now().strftime("%Y%m%d"))
-        
-        if self.include_time_var.get():
-            components.append(datetime.now().strftime("%H%M%S"))
-        
-        if self.include_user_var.get():
-            import getpass
-            components.append(getpass.getuser())
-        
-        filename = "_".join(components) + extension
-        full_path = f"{self.location_var.get()}/{filename}"
+        base_filename = self._build_base_filename(self.filename_var.get().strip())
+        filename = base_filename + extension
+        full_path = os.path.join(self.location_var.get(), filename)
+        formats = self._get_selected_extensions()
         
         # Obtener opciones específicas del formato
         format_options = {}
@@ -647,6 +700,9 @@ class ExportOptionsDialog(BaseReportDialog):
         return {
             'format': format_name,
             'format_extension': extension,
+            'formats': formats,
+            'multi_format': len(formats) > 1,
+            'base_filename': base_filename,
             'filename': filename,
             'full_path': full_path,
             'location': self.location_var.get(),
@@ -654,6 +710,9 @@ class ExportOptionsDialog(BaseReportDialog):
             'include_signatures': self.include_signatures_var.get(),
             'include_logo': self.include_logo_var.get(),
             'compress_file': self.compress_file_var.get(),
+            'group_levels': (
+                ('department', 'employee', 'month') if self.group_by_employee_var.get() else ('department',)
+            ),
             'quality': self.quality_var.get(),
             'encoding': self.encoding_var.get(),
             'separator': separator,
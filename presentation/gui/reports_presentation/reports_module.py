@@ -1,10 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import Dict, List, Any
+import os
 import traceback
 from datetime import datetime
 from tkcalendar import DateEntry
+from application.dtos.report_dtos import CARD_REPORT_COLUMNS, DIET_REPORT_COLUMNS
+from core.entities.report_query import ReportFilter, ReportSort
 from presentation.gui.utils.data_exporter import TreeviewExporter, create_export_button
+from presentation.gui.utils.excel_stream import export_report_to_excel
+from presentation.gui.utils.export_jobs import submit_export_job
+from presentation.gui.utils.smart_treeview import LazyDataModel, SmartTreeview
 
 
 class ReportModule(ttk.Frame):
@@ -20,10 +26,15 @@ class ReportModule(ttk.Frame):
         self.diet_service = diet_service
         self.request_user_service = request_user_service
         
-        self.current_data = []
         self.current_report_type = None
         self.filter_entries = {}
         
+        # Desplazamiento virtual: las filas se consultan por bloques y solo
+        # la ventana visible existe en el Treeview
+        self.page_size = 500
+        self.total_count = 0
+        self.date_filter_active = False
+        
         self.create_widgets()
         self.show_initial_message()
     
@@ -50,6 +61,9 @@ class ReportModule(ttk.Frame):
         self.export_button_frame = ttk.Frame(self.button_frame)
         self.export_button_frame.pack(side=tk.LEFT, padx=5)
         
+        self.count_label = ttk.Label(self.button_frame, text="")
+        self.count_label.pack(side=tk.LEFT, padx=20)
+        
         ttk.Button(self.button_frame, text="🔄 Actualizar", 
                   command=self.refresh_report).pack(side=tk.RIGHT, padx=5)
         
@@ -165,7 +179,7 @@ class ReportModule(ttk.Frame):
         table_container = ttk.Frame(parent)
         table_container.pack(fill=tk.BOTH, expand=True)
         
-        self.tree = ttk.Treeview(table_container, show="headings")
+        self.tree = SmartTreeview(table_container, show="headings")
         
         vsb = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(table_container, orient="horizontal", command=self.tree.xview)
@@ -244,11 +258,9 @@ class ReportModule(ttk.Frame):
     def load_report_data(self):
         try:
             if self.current_report_type == "cards":
-                self.current_data = self.report_service.get_all_cards_report()
                 self._setup_columns_for_cards()
                 self.clear_date_filter()
             else:
-                self.current_data = self.report_service.get_all_diets_report()
                 self._setup_columns_for_diets()
             
             self.apply_filters()
@@ -256,7 +268,6 @@ class ReportModule(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"No se pudieron cargar los datos:\n{str(e)}")
             traceback.print_exc()
-            self.current_data = []
             self._clear_table()
     
     def _setup_columns_for_cards(self):
@@ -275,7 +286,7 @@ class ReportModule(ttk.Frame):
         for i, (text, width, *align) in enumerate(columns):
             col_id = col_ids[i]
             anchor = "e" if align and align[0] == "e" else "w"
-            self.tree.heading(col_id, text=text)
+            self._setup_heading(col_id, text, CARD_REPORT_COLUMNS[i])
             self.tree.column(col_id, width=width, anchor=anchor)
     
     def _setup_columns_for_diets(self):
@@ -311,21 +322,31 @@ class ReportModule(ttk.Frame):
             else:
                 anchor = "w"
             
-            self.tree.heading(col_id, text=text)
+            self._setup_heading(col_id, text, DIET_REPORT_COLUMNS[i])
             self.tree.column(col_id, width=width, anchor=anchor)
     
+    def _setup_heading(self, col_id, text, report_column):
+        """Encabezado de la columna; las ordenables ordenan todo el reporte al hacer clic"""
+        if report_column.sortable:
+            self.tree.heading(col_id, text=text, command=lambda: self.tree.sort_column(col_id))
+        else:
+            self.tree.heading(col_id, text=text, command="")
+    
     def _clear_table(self):
+        self.tree.clear_virtual_model()
+        # El orden elegido pertenece a las columnas del reporte anterior
+        self.tree.clear_sort()
+        self.update_status_bar(None)
+        
         for col in self.tree["columns"]:
             self.tree.heading(col, text="")
         
         for item in self.tree.get_children():
             self.tree.delete(item)
     
-    def apply_filters(self):
-        if not self.current_data:
-            return
-        
-        filters = {}
+    def _collect_filters(self) -> List[ReportFilter]:
+        """Construye la especificación de filtros a partir de los campos de la interfaz"""
+        filters = []
         for key, widget in self.filter_entries.items():
             value = widget.get().strip()
             
@@ -339,138 +360,86 @@ class ReportModule(ttk.Frame):
             elif key == "estado" and self.current_report_type == "cards":
                 if value == "Todas":
                     continue
-                elif value == "Activas":
-                    value = "+"
-                elif value == "Inactivas":
-                    value = "-"
+                filters.append(ReportFilter("is_active", "eq", value == "Activas"))
+                continue
             
             if value:
-                filters[key] = value
+                filters.append(ReportFilter(key, "contains", value))
+        
+        if self.current_report_type == "diets" and self.date_filter_active:
+            filters.extend(self._collect_date_filters())
+        
+        return filters
+    
+    def _collect_date_filters(self) -> List[ReportFilter]:
+        date_field = "fecha_solicitud" if self.date_filter_type.get() == "solicitud" else "fecha_liquidacion"
+        filters = []
+        
+        date_from = self.date_from_entry.get_date()
+        date_to = self.date_to_entry.get_date()
+        if date_from:
+            filters.append(ReportFilter(date_field, "gte", date_from))
+        if date_to:
+            filters.append(ReportFilter(date_field, "lte", date_to))
+        return filters
+    
+    def _query_page(self, filters, page, page_size, sort):
+        if self.current_report_type == "cards":
+            return self.report_service.query_cards_report(filters, page=page, page_size=page_size, sort=sort)
+        return self.report_service.query_diets_report(filters, page=page, page_size=page_size, sort=sort)
+    
+    def _report_model(self, filters) -> LazyDataModel:
+        """
+        Modelo que consulta el reporte por páginas a medida que se desplaza la tabla.
+        
+        Ordenar por un encabezado vuelve a consultar con ORDER BY, de modo
+        que el orden abarca todas las filas filtradas y no solo las cargadas.
+        """
+        columns = CARD_REPORT_COLUMNS if self.current_report_type == "cards" else DIET_REPORT_COLUMNS
+        sort_keys = {index: column.key for index, column in enumerate(columns) if column.sortable}
+        
+        # Conservar el orden activo al filtrar sin consultar dos veces el primer bloque
+        tree_columns = list(self.tree["columns"])
+        criteria = [(tree_columns.index(column), reverse)
+                    for column, reverse in self.tree.sort_state if column in tree_columns]
+        
+        def fetch_block(block, block_size, sort):
+            sort = [ReportSort(key, descending) for key, descending in sort]
+            result = self._query_page(filters, block + 1, block_size, sort)
+            return list(result.display_rows()), result.total_count
+        
+        return LazyDataModel(fetch_block, block_size=self.page_size, sort_keys=sort_keys, criteria=criteria)
+    
+    def apply_filters(self):
+        """Aplica los filtros y reemplaza el modelo de la tabla sin reinsertar filas"""
+        if not self.current_report_type:
+            return
         
         try:
-            if self.current_report_type == "cards":
-                filtered_data = self.report_service.filter_cards_report(filters)
-            else:
-                filtered_data = self.report_service.filter_diets_report(filters)
-            
-            self._populate_table(filtered_data)
+            model = self._report_model(self._collect_filters())
+            self.total_count = len(model)
+            self.tree.set_virtual_model(model)
+            self.update_status_bar(self.total_count)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al aplicar filtros:\n{str(e)}")
     
     def apply_date_filter(self):
-        if self.current_report_type != "diets" or not self.current_data:
-            return
-        
-        try:
-            date_from_obj = self.date_from_entry.get_date()
-            date_to_obj = self.date_to_entry.get_date()
-            
-            date_from_str = date_from_obj.strftime("%d/%m/%Y")
-            date_to_str = date_to_obj.strftime("%d/%m/%Y")
-        except Exception:
-            date_from_str = ""
-            date_to_str = ""
-        
-        filter_type = self.date_filter_type.get()
-        
-        if not date_from_str and not date_to_str:
-            self.apply_filters()
+        if self.current_report_type != "diets":
             return
         
         try:
-            date_from = None
-            date_to = None
-            
-            if date_from_str:
-                date_from = datetime.strptime(date_from_str, "%d/%m/%Y")
-            
-            if date_to_str:
-                date_to = datetime.strptime(date_to_str, "%d/%m/%Y")
-            
-            filtered_data = []
-            for item in self.current_data:
-                if filter_type == "solicitud":
-                    date_str = item.get("fecha_solicitud", "")
-                else:
-                    date_str = item.get("fecha_liquidacion", "")
-                
-                if not date_str or date_str == "N/A":
-                    continue
-                
-                try:
-                    item_date = datetime.strptime(date_str, "%d/%m/%Y")
-                except ValueError:
-                    continue
-                
-                in_range = True
-                
-                if date_from and item_date < date_from:
-                    in_range = False
-                
-                if date_to and item_date > date_to:
-                    in_range = False
-                
-                if in_range:
-                    filtered_data.append(item)
-            
-            self._populate_table(filtered_data)
-            
+            self.date_from_entry.get_date()
+            self.date_to_entry.get_date()
         except ValueError:
             messagebox.showwarning("Formato inválido", "Por favor ingrese fechas en formato dd/mm/yyyy")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al aplicar filtro de fechas:\n{str(e)}")
-    
-    def _populate_table(self, data):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not data:
             return
         
-        for item in data:
-            if self.current_report_type == "cards":
-                values = (
-                    item.get("numero_tarjeta", ""),
-                    item.get("pin", ""),
-                    item.get("balance", ""),
-                    item.get("estado", "")
-                )
-            else:
-                estado_raw = item.get("estado", "").upper()
-                if estado_raw == "LIQUIDATED":
-                    estado = "Liquidado"
-                elif estado_raw == "REQUESTED":
-                    estado = "Solicitado"
-                else:
-                    estado = estado_raw
-
-                monto = item.get("raw_gasto", "0.0") 
-
-                values = (
-                    item.get("no_anticipo", ""),
-                    item.get("no_liquidacion", ""),
-                    item.get("descripcion", ""),
-                    item.get("solicitante", ""),
-                    item.get("departamento", ""),
-                    item.get("fecha_inicio", ""),
-                    item.get("fecha_fin", ""),
-                    item.get("fecha_solicitud", ""),
-                    item.get("fecha_liquidacion", ""),
-                    item.get("monto_solicitado_efec", ""),
-                    item.get("monto_solicitado_card", ""), 
-                    item.get("gasto_efec", ""),   
-                    item.get("gasto_card", ""),
-                    monto,
-                    estado
-                )
-            
-            self.tree.insert("", tk.END, values=values)
-        
-        self.update_status_bar(len(data))
+        self.date_filter_active = True
+        self.apply_filters()
     
     def update_status_bar(self, count):
-        pass
+        self.count_label.config(text="" if count is None else f"{count} registros")
     
     def clear_filters(self):
         for key, widget in self.filter_entries.items():
@@ -491,6 +460,7 @@ class ReportModule(ttk.Frame):
         self.date_to_entry.set_date(today)
         
         self.date_filter_type.set("solicitud")
+        self.date_filter_active = False
         
         if self.current_report_type == "diets":
             self.apply_filters()
@@ -565,7 +535,7 @@ class ReportModule(ttk.Frame):
             if hasattr(TreeviewExporter, 'export_to_excel_full_columns'):
                 menu.add_command(
                     label="📊 Excel ",
-                    command=lambda: TreeviewExporter.export_to_excel_full_columns(self.tree, current_title),
+                    command=lambda: self._export_all_rows(current_title),
                     font=('Arial', 10)
                 )
             
@@ -583,6 +553,52 @@ class ReportModule(ttk.Frame):
         
         show_menu(event)
 
+    def _export_all_rows(self, title):
+        """
+        Exporta todas las filas que cumplen los filtros, no solo la página visible.
+        
+        Las filas se leen del servicio de reportes por lotes y se escriben en
+        streaming, sin pasar por el Treeview, en un trabajo en segundo plano
+        que muestra el avance y se puede cancelar.
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            title="Guardar como Excel "
+        )
+        if not filename:
+            return
+        
+        # Los filtros leen variables de Tk: se resuelven antes de encolar
+        filters = self._collect_filters()
+        if self.current_report_type == "cards":
+            columns = CARD_REPORT_COLUMNS
+            iter_rows = self.report_service.iter_cards_report_rows
+        else:
+            columns = DIET_REPORT_COLUMNS
+            iter_rows = self.report_service.iter_diets_report_rows
+        
+        def task(job):
+            rows = job.track(iter_rows(filters), message="Filas exportadas")
+            return export_report_to_excel(filename, title, columns, rows)
+        
+        def on_done(stats):
+            if not stats["rows"]:
+                os.remove(filename)
+                messagebox.showwarning("Sin datos", "No hay datos para exportar")
+                return
+            
+            messagebox.showinfo(
+                "Exportación exitosa",
+                f"✅ EXCEL :\n\n📂 {filename}\n\n• Registros: {stats['rows']}"
+            )
+        
+        def on_error(error):
+            messagebox.showerror("❌ Error", f"No se pudo exportar a Excel:\n\n{str(error)}")
+        
+        submit_export_job(self, f"Excel: {title}", task, output_path=filename,
+                          on_done=on_done, on_error=on_error)
+
     def show_initial_message(self):
         self._clear_table()
         
@@ -1,19 +1,32 @@
 # data_exporter.py
 """
-Módulo para exportar datos de Treeview a diferentes formatos.
+Módulo para exportar datos a diferentes formatos.
+
+Los datos se convierten una sola vez en un ReportDocument (jerarquía,
+subtotales y columnas por departamento) que consumen los renderizadores
+de Excel, Word y PDF. DataExporter genera los archivos a partir de
+encabezados y filas de cualquier origen, BatchExporter genera varios
+formatos del mismo documento en paralelo y TreeviewExporter es un
+adaptador que lee el Treeview y muestra los diálogos.
 """
+import itertools
 import keyword
 import platform
+import shutil
 import subprocess
 import tempfile
+import zipfile
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Optional, List, Any
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Optional, List, Any, Callable, Dict, Iterable, Iterator, Sequence
 import os
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -21,10 +34,14 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, CondPageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from presentation.gui.utils.excel_stream import (
+    DEPARTMENT_AMOUNT_KEYS, StreamingExcelWriter, write_department_summary, write_footer, write_subtotal
+)
+from presentation.gui.utils.export_jobs import ExportJob, submit_export_job
 
 
 
@@ -34,69 +51,188 @@ HAS_PDF = True
 
 # Agregar al inicio de data_exporter.py, después de las importaciones
 class DataHierarchyTransformer:
-    """Transformador de datos planos a estructura jerárquica"""
+    """
+    Transformador de datos planos a estructura jerárquica.
+    
+    Las columnas clave (departamento, monto y, si se piden, solicitante y
+    mes) se extraen una sola vez y se agrupan con pandas/NumPy: los montos
+    se interpretan con operaciones vectorizadas y los subtotales se suman
+    con np.bincount, en lugar de procesar fila por fila en un diccionario.
+    """
+    
+    # Niveles de agrupación admitidos y la columna clave de cada uno
+    GROUP_LEVELS = {
+        'department': 'department',
+        'employee': 'employee',
+        'month': 'date',
+    }
+    
+    # Texto de las filas de encabezado de los niveles inferiores
+    GROUP_LABELS = {
+        'employee': 'SOLICITANTE',
+        'month': 'MES',
+    }
+    
+    @staticmethod
+    def parse_amount(value):
+        """
+        Obtiene el valor numérico de una celda de monto.
+        
+        Los valores nativos (int, float, Decimal) se usan directamente; solo
+        el texto formateado ("$12.50") se vuelve a interpretar.
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float, Decimal)):
+            return float(value)
+        try:
+            amount_str = str(value).replace('$', '').replace(',', '').replace(' ', '')
+            if amount_str.replace('.', '', 1).isdigit():
+                return float(amount_str)
+        except (ValueError, AttributeError):
+            pass
+        return None
+    
+    @staticmethod
+    def parse_amounts(values: Sequence[Any]) -> np.ndarray:
+        """
+        Versión vectorizada de parse_amount para una columna completa.
+        
+        Las columnas tipadas (int, float, Decimal) se convierten de una vez;
+        el texto formateado se limpia e interpreta con np.strings.
+        
+        Returns:
+            Arreglo float64 con NaN donde la celda no es un monto
+        """
+        values = values if isinstance(values, list) else list(values)
+        kind = infer_dtype(values, skipna=False)
+        
+        if kind in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+            return np.asarray(values, dtype=float)
+        if kind == 'string':
+            return DataHierarchyTransformer._parse_amount_texts(values)
+        
+        # Mezcla de tipos: los números nativos se usan directamente y el
+        # resto se interpreta como texto; los booleanos no son montos
+        amounts = np.full(len(values), np.nan)
+        native, text = [], []
+        for position, value in enumerate(values):
+            if isinstance(value, (bool, np.bool_)):
+                continue
+            if isinstance(value, (int, float, Decimal, np.number)):
+                native.append(position)
+            else:
+                text.append(position)
+        
+        if native:
+            amounts[native] = np.asarray([values[i] for i in native], dtype=float)
+        if text:
+            amounts[text] = DataHierarchyTransformer._parse_amount_texts([str(values[i]) for i in text])
+        return amounts
+    
+    @staticmethod
+    def _parse_amount_texts(texts: List[str]) -> np.ndarray:
+        """Interpreta texto con formato de monto ("$1,234.50") igual que parse_amount"""
+        text = np.array(texts, dtype=str)
+        amounts = np.full(len(texts), np.nan)
+        if not len(texts):
+            return amounts
+        
+        for symbol in ('$', ',', ' '):
+            text = np.strings.replace(text, symbol, '')
+        valid = np.strings.isdigit(np.strings.replace(text, '.', '', 1))
+        
+        try:
+            amounts[valid] = text[valid].astype(float)
+        except ValueError:
+            # Dígitos Unicode que isdigit acepta pero float no
+            for position in np.flatnonzero(valid):
+                amount = DataHierarchyTransformer.parse_amount(text[position])
+                amounts[position] = np.nan if amount is None else amount
+        return amounts
+    
+    # Palabras clave de los encabezados de cada columna clave. Los montos de
+    # anticipo y gasto por medio de pago son los que se totalizan en el
+    # resumen por departamento del Excel con todas las columnas.
+    KEY_COLUMN_KEYWORDS = {
+        'department': ['departamento', 'depto', 'unidad', 'area', 'direccion', 'gerencia'],
+        'employee': ['solicitante', 'empleado', 'nombre', 'fullname', 'colaborador', 'trabajador', 'persona'],
+        'amount': ['gasto', 'monto', 'total', 'importe', 'cantidad', 'costo', 'precio', 'valor', 'saldo', 'monto liquidado'],
+        'date': ['fecha', 'date'],
+        'balance': ['balance', 'saldo'],
+        'cash_advance': ['s.e', 'efec', 'efectivo solicitado', 'monto efec'],
+        'card_advance': ['s.t', 'tarjeta solicitado', 'monto card', 'tarjeta'],
+        'cash_spent': ['g.e', 'gasto efec', 'gasto efectivo'],
+        'card_spent': ['g.t', 'gasto card', 'gasto tarjeta'],
+    }
     
     @staticmethod
     def detect_key_columns(headers):
         """
         Detecta las columnas clave en los headers
         
+        Cada clave toma la primera columna cuyo encabezado contiene alguna
+        de sus palabras clave (KEY_COLUMN_KEYWORDS).
+        
         Returns:
-            dict: Índices de columnas importantes
+            dict: Índices de columnas importantes (None si no se detectan)
         """
-        indices = {
-            'department': None,
-            'employee': None,
-            'amount': None
-        }
-        
-        # Mapeo de posibles nombres para cada columna
-        department_keywords = ['departamento', 'depto', 'unidad', 'area', 'direccion', 'gerencia', 'Departamento']
-        employee_keywords = ['solicitante', 'empleado', 'nombre', 'fullname', 'colaborador', 'trabajador', 'persona', 'Solicitante']
-        amount_keywords = ['gasto', 'monto', 'total', 'importe', 'cantidad', 'costo', 'precio', 'valor', 'saldo', 'monto liquidado', 'Monto Liquidado', 'Monto']
+        indices = dict.fromkeys(DataHierarchyTransformer.KEY_COLUMN_KEYWORDS)
         
         for i, header in enumerate(headers):
             header_lower = str(header).lower()
-            
-            # Buscar departamento
-            if indices['department'] is None:
-                for keyword in department_keywords:
-                    if keyword in header_lower:
-                        indices['department'] = i
-                        break
-            
-            # Buscar empleado/solicitante
-            if indices['employee'] is None:
-                for keyword in employee_keywords:
-                    if keyword in header_lower:
-                        indices['employee'] = i
-                        break
-            
-            # Buscar monto/gasto
-            if indices['amount'] is None:
-                for keyword in amount_keywords:
-                    if keyword in header_lower:
-                        indices['amount'] = i
-                        break
+            for key, keywords in DataHierarchyTransformer.KEY_COLUMN_KEYWORDS.items():
+                if indices[key] is None and any(keyword in header_lower for keyword in keywords):
+                    indices[key] = i
         
         return indices
     
     @staticmethod
-    def transform_to_hierarchical(headers, data):
+    def _column(data, index: int, default: Any = None) -> List[Any]:
+        """Valores de una columna; `default` para las filas más cortas"""
+        return [row[index] if index < len(row) else default for row in data]
+    
+    @staticmethod
+    def _month_keys(values: Sequence[Any]) -> pd.Series:
+        """Clave 'AAAA-MM' de fechas nativas o con formato dd/mm/aaaa"""
+        dates = pd.to_datetime(pd.Series(list(values), dtype=object), errors='coerce', dayfirst=True, format='mixed')
+        return dates.dt.strftime('%Y-%m').fillna("SIN FECHA")
+    
+    @staticmethod
+    def transform_to_hierarchical(headers, data, levels: Sequence[str] = ('department',)):
         """
         Transforma datos planos a estructura jerárquica
         
+        Args:
+            levels: Niveles de agrupación; el primero siempre es 'department'
+                y pueden agregarse 'employee' y 'month' (por ejemplo
+                ('department', 'employee', 'month')). Los niveles cuya
+                columna no se detecta se omiten.
+        
         Returns:
             dict: {
                 'headers': headers originales,
                 'hierarchical_data': datos transformados con jerarquía,
                 'summary': resumen por departamento,
-                'total_general': total general
+                'total_general': total general,
+                'indices': columnas clave detectadas,
+                'levels': niveles de agrupación aplicados
             }
+            
+            Los niveles inferiores al departamento agregan elementos
+            'group_header' (con 'level', 'group', 'key' y 'subtotal') antes
+            de sus filas; la numeración de solicitantes sigue siendo por
+            departamento.
         """
         if not headers or not data:
             return None
         
+        if not levels or levels[0] != 'department':
+            raise ValueError("El primer nivel de agrupación debe ser 'department'")
+        unknown = [level for level in levels if level not in DataHierarchyTransformer.GROUP_LEVELS]
+        if unknown:
+            raise ValueError(f"Niveles de agrupación no soportados: {', '.join(unknown)}")
+        
         # Detectar columnas clave
         indices = DataHierarchyTransformer.detect_key_columns(headers)
         
@@ -104,73 +240,132 @@ class DataHierarchyTransformer:
         if indices['department'] is None:
             return None
         
-        # Agrupar por departamento
-        departments = {}
-        for row in data:
-            dept = str(row[indices['department']]) if indices['department'] < len(row) else "SIN DEPARTAMENTO"
-            if dept not in departments:
-                departments[dept] = {
-                    'rows': [],
-                    'subtotal': 0
-                }
-            
-            departments[dept]['rows'].append(row)
-            
-            # Calcular subtotal si hay columna de monto
-            if indices['amount'] is not None and indices['amount'] < len(row):
-                try:
-                    amount_str = str(row[indices['amount']]).replace('$', '').replace(',', '').replace(' ', '')
-                    if amount_str.replace('.', '', 1).isdigit():
-                        amount = float(amount_str)
-                        departments[dept]['subtotal'] += amount
-                except (ValueError, AttributeError):
-                    pass
+        levels = [level for level in dict.fromkeys(levels)
+                  if indices[DataHierarchyTransformer.GROUP_LEVELS[level]] is not None]
+        
+        data = data if isinstance(data, list) else list(data)
+        row_count = len(data)
+        
+        # Claves de agrupación por nivel (códigos ordenados alfabéticamente)
+        keys = []
+        for level in levels:
+            index = indices[DataHierarchyTransformer.GROUP_LEVELS[level]]
+            if level == 'month':
+                values = DataHierarchyTransformer._month_keys(DataHierarchyTransformer._column(data, index))
+            elif level == 'department':
+                values = [str(row[index]) if index < len(row) else "SIN DEPARTAMENTO" for row in data]
+            else:
+                values = [str(row[index]) if index < len(row) else "" for row in data]
+            keys.append(pd.factorize(pd.Series(values, dtype=object), sort=True))
+        
+        # Montos (0 donde no hay monto)
+        if indices['amount'] is not None:
+            amounts = DataHierarchyTransformer.parse_amounts(
+                DataHierarchyTransformer._column(data, indices['amount'])
+            )
+            amounts = np.nan_to_num(amounts, nan=0.0)
+        else:
+            amounts = np.zeros(row_count)
+        
+        # Orden estable: por departamento y luego por los niveles inferiores,
+        # conservando el orden original dentro de cada grupo
+        codes = [level_codes for level_codes, _ in keys]
+        order = np.lexsort(codes[::-1]) if len(codes) > 1 else np.argsort(codes[0], kind='stable')
+        sorted_amounts = amounts[order]
+        
+        # Inicio de grupo por nivel: cambia el código de ese nivel o de uno superior
+        starts = []
+        changed = np.zeros(row_count, dtype=bool)
+        changed[0] = True
+        for level_codes in codes:
+            sorted_codes = level_codes[order]
+            changed = changed.copy()
+            changed[1:] |= sorted_codes[1:] != sorted_codes[:-1]
+            starts.append(changed)
+        
+        # Subtotales por grupo, sumados en el orden de las filas
+        boundaries = []
+        subtotals = []
+        for level_starts in starts:
+            boundaries.append(np.flatnonzero(level_starts).tolist())
+            subtotals.append(np.bincount(np.cumsum(level_starts) - 1, weights=sorted_amounts).tolist())
+        
+        order = order.tolist()
+        
+        # Encabezados de los niveles inferiores, por posición de la fila que abren
+        group_starts = {}
+        for depth in range(1, len(levels)):
+            level = levels[depth]
+            column = indices[DataHierarchyTransformer.GROUP_LEVELS[level]]
+            level_codes, level_keys = keys[depth]
+            for group, position in enumerate(boundaries[depth]):
+                group_starts.setdefault(position, []).append(
+                    (depth, level, column, level_keys[level_codes[order[position]]], subtotals[depth][group])
+                )
         
         # Construir estructura jerárquica
         hierarchical_data = []
         total_general = 0
         summary = {}
         
-        # Ordenar departamentos alfabéticamente
-        sorted_depts = sorted(departments.keys())
+        employee_index = indices['employee']
+        amount_index = indices['amount']
+        department_codes, department_keys = keys[0]
+        department_ends = boundaries[0][1:] + [row_count]
         
-        for dept in sorted_depts:
-            dept_info = departments[dept]
+        for begin, end, subtotal in zip(boundaries[0], department_ends, subtotals[0]):
+            dept = department_keys[department_codes[order[begin]]]
             
             # 1. Fila de encabezado del departamento
             dept_header = [''] * len(headers)
             dept_header[indices['department']] = f"📊 DEPARTAMENTO: {dept.upper()}"
             
             # Agregar subtotal si existe
-            if indices['amount'] is not None and dept_info['subtotal'] > 0:
+            if amount_index is not None and subtotal > 0:
                 # Buscar la columna de monto para poner el subtotal
-                subtotal_text = f"SUBTOTAL: ${dept_info['subtotal']:,.2f}"
-                dept_header[indices['amount']] = subtotal_text
+                dept_header[amount_index] = f"SUBTOTAL: ${subtotal:,.2f}"
             
             hierarchical_data.append({
                 'type': 'department_header',
                 'data': dept_header,
                 'department': dept,
-                'subtotal': dept_info['subtotal']
+                'subtotal': subtotal
             })
             
-            summary[dept] = dept_info['subtotal']
-            total_general += dept_info['subtotal']
+            summary[dept] = subtotal
+            total_general += subtotal
             
             # 2. Filas de solicitantes (con numeración)
-            for idx, row in enumerate(dept_info['rows'], 1):
-                formatted_row = list(row)
+            for number, position in enumerate(range(begin, end), 1):
+                if position in group_starts:
+                    # Encabezados de los niveles inferiores (solicitante, mes)
+                    for depth, level, column, key, group_subtotal in group_starts[position]:
+                        group_header = [''] * len(headers)
+                        group_header[column] = f"{DataHierarchyTransformer.GROUP_LABELS[level]}: {key}"
+                        if amount_index is not None and group_subtotal > 0:
+                            group_header[amount_index] = f"SUBTOTAL: ${group_subtotal:,.2f}"
+                        
+                        hierarchical_data.append({
+                            'type': 'group_header',
+                            'data': group_header,
+                            'department': dept,
+                            'level': depth,
+                            'group': level,
+                            'key': key,
+                            'subtotal': group_subtotal
+                        })
+                
+                formatted_row = list(data[order[position]])
                 
                 # Numerar solicitantes
-                if indices['employee'] is not None and indices['employee'] < len(formatted_row):
-                    employee_name = formatted_row[indices['employee']]
-                    formatted_row[indices['employee']] = f"{idx}. {employee_name}"
+                if employee_index is not None and employee_index < len(formatted_row):
+                    formatted_row[employee_index] = f"{number}. {formatted_row[employee_index]}"
                 
                 hierarchical_data.append({
                     'type': 'employee_row',
                     'data': formatted_row,
                     'department': dept,
-                    'employee_number': idx
+                    'employee_number': number
                 })
             
             # 3. Separador entre departamentos
@@ -181,10 +376,10 @@ class DataHierarchyTransformer:
             })
         
         # 4. Fila de total general
-        if indices['amount'] is not None and total_general > 0:
+        if amount_index is not None and total_general > 0:
             total_row = [''] * len(headers)
             total_row[indices['department']] = "✅ TOTAL GENERAL"
-            total_row[indices['amount']] = f"${total_general:,.2f}"
+            total_row[amount_index] = f"${total_general:,.2f}"
             
             hierarchical_data.append({
                 'type': 'total_row',
@@ -197,1196 +392,1653 @@ class DataHierarchyTransformer:
             'hierarchical_data': hierarchical_data,
             'summary': summary,
             'total_general': total_general,
-            'indices': indices
+            'indices': indices,
+            'levels': levels
         }
 
 
-class TreeviewExporter:
-    """Exportador genérico para Treeview de tkinter"""
-    
-    
-    @staticmethod
-    def get_treeview_data(tree: ttk.Treeview, hierarchical=True):
+# Abreviaturas de los encabezados de cantidades en las tablas por departamento
+ABREVIACIONES_ENCABEZADO = {
+    'Desayunos': 'D',
+    'Almuerzos': 'A',
+    'Cenas': 'C',
+    'Alojamientos': 'H',  # H para Hospedaje
+}
+
+# Columnas que no se repiten en las tablas por departamento
+COLUMNAS_EXCLUIDAS_POR_DEPARTAMENTO = [
+    'anticipo', 'n° anticipo', 'n anticipo', 'nº anticipo', 'numero anticipo', 'no. anticipo',
+    'liquidación', 'n° liquidación', 'n liquidación', 'nº liquidación', 'numero liquidación', 'no. liquidación',
+    'estado', 'status', 'situacion',
+]
+
+
+def abreviar_encabezado(header) -> str:
+    """Abrevia encabezados específicos a su inicial"""
+    header_str = str(header)
+    for key, value in ABREVIACIONES_ENCABEZADO.items():
+        if key in header_str:
+            return value
+    return header_str
+
+
+@dataclass
+class ReportGroup:
+    """
+    Subgrupo de un departamento (solicitante o mes) en un documento armado
+    con varios niveles de agrupación.
+
+    `position` es la fila de la sección donde empieza el subgrupo y
+    `level` su profundidad (1 para el primer nivel bajo el departamento).
+    """
+    position: int
+    level: int
+    group: str
+    key: str
+    subtotal: float
+
+    @property
+    def title(self) -> str:
+        """Texto de la fila de encabezado del subgrupo"""
+        text = f"{'    ' * (self.level - 1)}{DataHierarchyTransformer.GROUP_LABELS[self.group]}: {self.key}"
+        if self.subtotal > 0:
+            text += f" - Subtotal: ${self.subtotal:,.2f}"
+        return text
+
+
+@dataclass
+class ReportSection:
+    """
+    Departamento del reporte con sus filas (solicitantes ya numerados).
+
+    `totals` suma los montos de anticipo y gasto por medio de pago
+    (DEPARTMENT_AMOUNT_KEYS) de las columnas que se detectaron. `groups`
+    solo tiene elementos si el documento se armó con niveles inferiores
+    al departamento.
+    """
+    name: str
+    subtotal: float
+    rows: List[List[Any]] = field(default_factory=list)
+    totals: Dict[str, float] = field(default_factory=dict)
+    groups: List[ReportGroup] = field(default_factory=list)
+
+    def groups_by_position(self) -> Dict[int, List[ReportGroup]]:
+        """Subgrupos que empiezan en cada fila, para escribirlos antes de ella"""
+        starts: Dict[int, List[ReportGroup]] = {}
+        for group in self.groups:
+            starts.setdefault(group.position, []).append(group)
+        return starts
+
+
+@dataclass
+class ReportDocument:
+    """
+    Documento intermedio compartido por todos los formatos de exportación.
+
+    Se construye una sola vez a partir de la salida de
+    DataHierarchyTransformer: los renderizadores de Excel, Word, PDF e
+    impresión lo consumen sin volver a agrupar filas ni recalcular
+    subtotales, de modo que exportar el mismo reporte a varios formatos
+    reutiliza la misma estructura.
+
+    Memoria: por defecto el documento guarda todas las filas (O(filas)).
+    Solo un documento plano armado con `stream=True` conserva el iterable
+    original; ver `build`.
+    """
+    title: str
+    headers: List[Any]
+    rows: Iterable[Sequence[Any]]
+    sections: List[ReportSection] = field(default_factory=list)
+    indices: Dict[str, Optional[int]] = field(default_factory=dict)
+    total_general: float = 0
+    section_columns: List[int] = field(default_factory=list)
+    row_count: Optional[int] = None
+
+    def __post_init__(self):
+        if not self.streamed:
+            self.row_count = len(self.rows)
+
+    @classmethod
+    def build(cls, title: str, headers: Sequence[Any], rows: Iterable[Sequence[Any]],
+              stream: bool = False, levels: Sequence[str] = ('department',)) -> "ReportDocument":
         """
-        Extrae todos los datos del Treeview con transformación jerárquica automática
-        
-        Args:
-            hierarchical: Si True, intenta transformar a estructura jerárquica
-        
-        Returns:
-            tuple: (encabezados, datos, estructura_jerarquica)
+        Arma la estructura por departamentos.
+
+        `levels` se pasa a DataHierarchyTransformer.transform_to_hierarchical:
+        con ('department', 'employee', 'month') cada sección ordena sus filas
+        por solicitante y mes y guarda los subgrupos en `groups`.
+
+        Si hay columna de departamento las filas siempre se materializan en
+        una lista: agruparlas exige ordenarlas. Sin departamento (documento
+        plano) también se materializan, salvo con `stream=True`: entonces
+        el documento conserva `rows` sin copiarlo y solo admite una pasada,
+        así que debe entregarse a un único renderizador con `streams_rows`
+        (Excel), que lo escribe fila a fila con memoria constante.
+
+        Raises:
+            ValueError: Si no hay encabezados o un nivel no es válido
         """
-        # Obtener encabezados
-        columns = tree['columns']
-        headers = []
-        for col in columns:
-            header = tree.heading(col)['text']
-            headers.append(header)
-        
-        # Obtener datos
-        data = []
-        for item in tree.get_children():
-            values = tree.item(item)['values']
-            data.append(values)
-        
-        # Aplicar transformación jerárquica si está habilitada y hay datos
-        hierarchical_structure = None
-        if hierarchical and headers and data:
-            hierarchical_structure = DataHierarchyTransformer.transform_to_hierarchical(headers, data)
-        
-        return headers, data, hierarchical_structure
-    
-    @staticmethod
-    def export_to_excel(tree: ttk.Treeview, title: str, filename: str = None) -> Optional[str]:
-        """Exporta Treeview a Excel con tablas separadas por departamento"""
-        if not HAS_EXCEL:
-            messagebox.showerror("Error", "openpyxl no está instalado. Instálelo con: pip install openpyxl")
-            return None
-        
-        if not filename:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                title="Guardar como Excel"
-            )
-            
-        if not filename:
-            return None
-        
-        try:
-            # Obtener datos con transformación jerárquica automática
-            headers, _, hierarchical_structure = TreeviewExporter.get_treeview_data(tree, hierarchical=True)
-            
-            if not headers:
-                messagebox.showwarning("Sin datos", "No hay datos para exportar")
-                return None
-            
-            # Función para abreviar encabezados específicos
-            def abreviar_encabezado(header):
-                header_str = str(header)
-                abreviaciones = {
-                    'Desayunos': 'D',
-                    'Almuerzos': 'A', 
-                    'Cenas': 'C',
-                    'Alojamientos': 'H',
-                }
-                for key, value in abreviaciones.items():
-                    if key in header_str:
-                        return value
-                return header_str
-            
-            # Crear workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Reporte"
-            
-            # Escribir título principal
-            ws.merge_cells(f'A1:{get_column_letter(len(headers))}1')
-            title_cell = ws['A1']
-            title_cell.value = title
-            title_cell.font = Font(size=14, bold=True, color="2c3e50")
-            title_cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Subtítulo informativo si hay jerarquía
-            if hierarchical_structure:
-                ws.merge_cells(f'A2:{get_column_letter(len(headers))}2')
-                subtitle = "📊 REPORTE POR DEPARTAMENTOS"
-                subtitle_cell = ws['A2']
-                subtitle_cell.value = subtitle
-                subtitle_cell.font = Font(size=11, bold=True, color="27ae60")
-                subtitle_cell.alignment = Alignment(horizontal='center')
-                subtitle_cell.fill = PatternFill(start_color="e8f8f5", end_color="e8f8f5", fill_type="solid")
-            
-            # Fecha de exportación
-            ws.merge_cells(f'A3:{get_column_letter(len(headers))}3')
-            date_cell = ws['A3']
-            date_cell.value = f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-            date_cell.font = Font(size=9, color="666666")
-            date_cell.alignment = Alignment(horizontal='center')
-            
-            # Espacio
-            current_row = 5
-            
-            if hierarchical_structure:
-                # PROCESAR POR DEPARTAMENTOS
-                departments_data = {}
-                current_dept = None
-                
-                for item in hierarchical_structure['hierarchical_data']:
-                    if item['type'] == 'department_header':
-                        current_dept = item['department']
-                        departments_data[current_dept] = {
-                            'header': item,
-                            'employees': [],
-                            'subtotal': item.get('subtotal', 0)
-                        }
-                    elif item['type'] == 'employee_row' and current_dept:
-                        departments_data[current_dept]['employees'].append(item)
-                
-                # CREAR UNA SECCIÓN POR CADA DEPARTAMENTO
-                for dept_name, dept_info in departments_data.items():
-                    # Título del departamento con subtotal
-                    dept_cell = ws.cell(row=current_row, column=1)
-                    dept_text = f"📊 {dept_name}"
-                    if dept_info['subtotal'] > 0:
-                        dept_text += f" - Subtotal: ${dept_info['subtotal']:,.2f}"
-                    
-                    dept_cell.value = dept_text
-                    dept_cell.font = Font(bold=True, color="2c3e50", size=12)
-                    dept_cell.fill = PatternFill(start_color="e8f4f8", end_color="e8f4f8", fill_type="solid")
-                    
-                    # Fusionar celdas para el título del departamento
-                    ws.merge_cells(
-                        start_row=current_row,
-                        start_column=1,
-                        end_row=current_row,
-                        end_column=len(headers)
-                    )
-                    
-                    current_row += 1
-                    
-                    # Crear tabla para este departamento
-                    num_employees = len(dept_info['employees'])
-                    if num_employees > 0:
-                        # Identificar índices de columnas a excluir
-                        indices_a_excluir = []
-                        
-                        # 1. Columna de departamento (siempre)
-                        if hierarchical_structure['indices'].get('department') is not None:
-                            indices_a_excluir.append(hierarchical_structure['indices']['department'])
-                        
-                        # 2. Columna "N° Anticipo" y "N° Liquidación"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['anticipo', 'n° anticipo', 'n anticipo', 'nº anticipo', 'numero anticipo',
-                                                                        'no. anticipo', 'liquidación', 'n° liquidación', 'n liquidación', 
-                                                                        'nº liquidación', 'numero liquidación', 'no. liquidación']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        # 3. Columna "Estado"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['estado', 'status', 'situacion']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        indices_a_excluir.sort()
-                        
-                        # ENCABEZADOS DE LA TABLA (excluyendo columnas no deseadas)
-                        col_idx_destino = 1
-                        
-                        # Lista para mapear índices de columna a headers originales
-                        included_headers = []
-                        
-                        for i, header in enumerate(headers):
-                            if i in indices_a_excluir:
-                                continue
-                            
-                            included_headers.append(header)  # Guardar header para referencia
-                            header_cell = ws.cell(row=current_row, column=col_idx_destino)
-                            header_abreviado = abreviar_encabezado(header)
-                            header_cell.value = str(header_abreviado)
-                            header_cell.font = Font(bold=True, color="FFFFFF")
-                            header_cell.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-                            header_cell.alignment = Alignment(horizontal='center', vertical='center')
-                            
-                            # Ajustar ancho de columna
-                            col_letter = get_column_letter(col_idx_destino)
-                            ws.column_dimensions[col_letter].width = max(len(str(header_abreviado)) + 4, 12)
-                            
-                            col_idx_destino += 1
-                        
-                        current_row += 1
-                        
-                        # DATOS DE LOS EMPLEADOS
-                        for idx, emp_item in enumerate(dept_info['employees']):
-                            row_data = emp_item['data']
-                            col_idx_destino = 1
-                            
-                            for i, cell_data in enumerate(row_data):
-                                if i in indices_a_excluir:
-                                    continue
-                                
-                                cell = ws.cell(row=current_row, column=col_idx_destino, value=cell_data)
-                                
-                                # Obtener el header original para esta columna
-                                original_header = included_headers[col_idx_destino - 1]
-                                
-                                # Formatear nombre del empleado con numeración
-                                if i == hierarchical_structure['indices'].get('employee'):
-                                    employee_name = cell_data
-                                    clean_name = str(employee_name).replace('   ├── ', '').replace('├── ', '')
-                                    cell.value = f"{idx + 1}. {clean_name}"
-                                    cell.alignment = Alignment(horizontal='left')
-                                
-                                # Formatear montos (excluyendo columnas D, A, C, H)
-                                cell_str = str(cell_data)
-                                
-                                # Verificar si es una columna de cantidad (D, A, C, H)
-                                is_quantity_column = False
-                                if original_header and any(keyword in str(original_header).lower() for keyword in ['desayunos', 'almuerzos', 'cenas', 'alojamientos']):
-                                    is_quantity_column = True
-                                
-                                # Para montos (excepto columnas de cantidad)
-                                if cell_str.startswith('$') or (cell_str.replace('.', '', 1).replace(',', '').isdigit() and not is_quantity_column):
-                                    cell.alignment = Alignment(horizontal='right')
-                                    cell.number_format = '"$"#,##0.00'
-                                # Para columnas de cantidad (D, A, C, H)
-                                elif is_quantity_column and cell_str.replace('.', '', 1).isdigit():
-                                    # Mostrar como número entero
-                                    try:
-                                        # Convertir a entero si es decimal
-                                        if '.' in cell_str:
-                                            cell.value = int(float(cell_str))
-                                        else:
-                                            cell.value = int(cell_str)
-                                        cell.alignment = Alignment(horizontal='right')
-                                        cell.number_format = '0'  # Formato entero sin decimales
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # Fondo alternado para filas
-                                if idx % 2 == 0:
-                                    cell.fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
-                                
-                                col_idx_destino += 1
-                            
-                            current_row += 1
-                    
-                    # Espacio entre departamentos
-                    current_row += 1
-                
-                # TABLA DE RESUMEN FINAL
-                summary_row = current_row + 1
-                summary_title = ws.cell(row=summary_row, column=1, value="📊 RESUMEN DE DEPARTAMENTOS")
-                summary_title.font = Font(bold=True, color="2c3e50", size=12)
-                ws.merge_cells(
-                    start_row=summary_row,
-                    start_column=1,
-                    end_row=summary_row,
-                    end_column=2
-                )
-                
-                summary_row += 1
-                
-                # Encabezados del resumen
-                ws.cell(row=summary_row, column=1, value="DEPARTAMENTO").font = Font(bold=True)
-                ws.cell(row=summary_row, column=2, value="SUBTOTAL").font = Font(bold=True)
-                
-                summary_row += 1
-                
-                # Datos del resumen
-                total_general = 0
-                for dept_name, dept_info in departments_data.items():
-                    ws.cell(row=summary_row, column=1, value=dept_name)
-                    ws.cell(row=summary_row, column=2, value=f"${dept_info['subtotal']:,.2f}")
-                    ws.cell(row=summary_row, column=2).number_format = '"$"#,##0.00'
-                    total_general += dept_info['subtotal']
-                    summary_row += 1
-                
-                # Fila de total general
-                total_row = summary_row
-                ws.cell(row=total_row, column=1, value="TOTAL GENERAL").font = Font(bold=True, color="FFFFFF")
-                ws.cell(row=total_row, column=2, value=f"${total_general:,.2f}").font = Font(bold=True, color="FFFFFF")
-                ws.cell(row=total_row, column=2).number_format = '"$"#,##0.00'
-                
-                # Formato para celdas de total
-                for col in [1, 2]:
-                    cell = ws.cell(row=total_row, column=col)
-                    cell.fill = PatternFill(start_color="27ae60", end_color="27ae60", fill_type="solid")
-            else:
-                # FALLBACK: Tabla plana (sin jerarquía)
-                _, flat_data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
-                
-                # Escribir encabezados
-                for col_idx, header in enumerate(headers, start=1):
-                    cell = ws.cell(row=current_row, column=col_idx, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    col_letter = get_column_letter(col_idx)
-                    ws.column_dimensions[col_letter].width = max(len(str(header)) + 4, 15)
-                
-                current_row += 1
-                
-                # Escribir datos
-                for row_idx, row_data in enumerate(flat_data):
-                    for col_idx, cell_data in enumerate(row_data, start=1):
-                        cell = ws.cell(row=current_row, column=col_idx, value=cell_data)
-                        
-                        if isinstance(cell_data, str) and cell_data.startswith('$'):
-                            cell.alignment = Alignment(horizontal='right')
-                        elif isinstance(cell_data, (int, float)):
-                            cell.alignment = Alignment(horizontal='right')
-                            cell.number_format = '"$"#,##0.00'
-                        
-                        if row_idx % 2 == 0:
-                            cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-                    
-                    current_row += 1
-            
-            # Agregar bordes a todas las celdas con datos
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            # Aplicar bordes dinámicamente
-            max_row = ws.max_row
-            max_col = ws.max_column
-            
-            for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_col):
-                for cell in row:
-                    if cell.value:
-                        cell.border = thin_border
-            
-            # Pie de página
-            footer_row = max_row + 2
-            ws.cell(row=footer_row, column=1, 
-                value=f"Sistema de Gestión de Dietas VIAJEX • Exportado el: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-            ws.cell(row=footer_row, column=1).font = Font(italic=True, size=9, color="666666")
-            
+        headers = list(headers or [])
+        if not headers:
+            raise ValueError("No hay datos para exportar")
 
-            for col_idx in range(1, ws.max_column + 1):
-                max_length = 0
-                col_letter = get_column_letter(col_idx)
-                
-                # Verificar si esta columna tiene dimensiones definidas
-                if col_letter in ws.column_dimensions:
-                    # Iterar solo sobre filas que existen
-                    for row in range(1, ws.max_row + 1):
-                        cell = ws.cell(row=row, column=col_idx)
-                        
-                        # Verificar que no sea una celda fusionada
-                        try:
-                            # Si es MergedCell, saltarla
-                            if hasattr(cell, 'is_merged') and cell.is_merged:
-                                continue
-                        except:
-                            pass
-                        
-                        # Calcular longitud del contenido
-                        if cell.value:
-                            try:
-                                cell_length = len(str(cell.value))
-                                if cell_length > max_length:
-                                    max_length = cell_length
-                            except:
-                                pass
-                    
-                    # Ajustar ancho (mínimo 10, máximo 50)
-                    adjusted_width = min(max(max_length + 2, 10), 50)
-                    ws.column_dimensions[col_letter].width = adjusted_width
-            
-            wb.save(filename)
-            
-            # Mensaje de éxito
-            if hierarchical_structure:
-                message = (
-                    f"✅ EXCEL :\n\n"
-                    f"📂 {filename}\n\n"
-                    f"• Tablas por departamento: {len(departments_data)}\n"
-                    f"• Total General: ${total_general:,.2f}\n"
-                    f"• Incluye resumen detallado"
+        if stream:
+            indices = DataHierarchyTransformer.detect_key_columns(headers)
+            if indices['department'] is None:
+                return cls(title, headers, iter(rows), indices=indices)
+
+        data = [list(row) for row in rows]
+        structure = DataHierarchyTransformer.transform_to_hierarchical(headers, data, levels) if data else None
+
+        if structure is None:
+            return cls(title, headers, data, indices=DataHierarchyTransformer.detect_key_columns(headers))
+
+        sections = []
+        for item in structure['hierarchical_data']:
+            if item['type'] == 'department_header':
+                sections.append(ReportSection(item['department'], item.get('subtotal', 0)))
+            elif item['type'] == 'group_header' and sections:
+                sections[-1].groups.append(ReportGroup(
+                    len(sections[-1].rows), item['level'], item['group'], item['key'], item['subtotal']
+                ))
+            elif item['type'] == 'employee_row' and sections:
+                sections[-1].rows.append(item['data'])
+
+        indices = structure['indices']
+        for key in DEPARTMENT_AMOUNT_KEYS:
+            if indices[key] is None:
+                continue
+            for section in sections:
+                amounts = DataHierarchyTransformer.parse_amounts(
+                    DataHierarchyTransformer._column(section.rows, indices[key])
                 )
-            else:
-                message = f"✅ Excel exportado exitosamente:\n\n{filename}"
-            
-            messagebox.showinfo("Exportación exitosa", message)
-            return filename
-            
-        except Exception as e:
-            messagebox.showerror("❌ Error", f"No se pudo exportar a Excel:\n\n{str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None        
-        
+                section.totals[key] = float(np.nansum(amounts))
+
+        excluded = {indices['department']}
+        for i, header in enumerate(headers):
+            header_lower = str(header).lower()
+            if any(keyword in header_lower for keyword in COLUMNAS_EXCLUIDAS_POR_DEPARTAMENTO):
+                excluded.add(i)
+
+        return cls(
+            title,
+            headers,
+            data,
+            sections=sections,
+            indices=indices,
+            total_general=structure['total_general'],
+            section_columns=[i for i in range(len(headers)) if i not in excluded],
+        )
+
+    @property
+    def hierarchical(self) -> bool:
+        return bool(self.sections)
+
+    @property
+    def streamed(self) -> bool:
+        """True si las filas son un iterable de una sola pasada (ver build)"""
+        return not isinstance(self.rows, list)
+
+    def iter_rows(self) -> Iterator[Sequence[Any]]:
+        """Recorre las filas; en un documento en streaming las cuenta al leerlas"""
+        if not self.streamed:
+            yield from self.rows
+            return
+        self.row_count = 0
+        for row in self.rows:
+            self.row_count += 1
+            yield row
+
+    @property
+    def section_headers(self) -> List[Any]:
+        """Encabezados originales de las columnas de las tablas por departamento"""
+        return [self.headers[i] for i in self.section_columns]
+
+    @property
+    def section_employee_column(self) -> Optional[int]:
+        """Posición del solicitante dentro de las columnas por departamento"""
+        employee = self.indices.get('employee')
+        return self.section_columns.index(employee) if employee in self.section_columns else None
+
+    @property
+    def section_amount_column(self) -> Optional[int]:
+        """Posición del monto dentro de las columnas por departamento"""
+        amount = self.indices.get('amount')
+        return self.section_columns.index(amount) if amount in self.section_columns else None
+
+    def section_row(self, row: Sequence[Any]) -> List[Any]:
+        """Valores de una fila limitados a las columnas por departamento"""
+        return [row[i] for i in self.section_columns if i < len(row)]
+
+    def row_amount(self, row: Sequence[Any]) -> float:
+        """Monto de una fila tal como se suma en el subtotal del departamento"""
+        amount = self.indices.get('amount')
+        if amount is None or amount >= len(row):
+            return 0
+        return DataHierarchyTransformer.parse_amount(row[amount]) or 0
+
+    def result(self, filename: str) -> Dict[str, Any]:
+        """Resumen de la exportación para informar al usuario"""
+        return {
+            'filename': filename,
+            'rows': self.row_count or 0,
+            'departments': len(self.sections),
+            'total_general': self.total_general,
+            'hierarchical': self.hierarchical,
+        }
+
+
+class ReportRenderer:
+    """
+    Base de los renderizadores de ReportDocument.
+
+    `progress(porcentaje, mensaje)` es opcional; se invoca al empezar cada
+    departamento y puede interrumpir el renderizado lanzando una excepción
+    (por ejemplo, ExportCancelled).
+    """
+
+    extension = None
+    package = None
+    available = True
+    # True si puede escribir un documento plano en streaming (una sola pasada)
+    streams_rows = False
+
+    def render(self, document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def check_available(self):
+        if not self.available:
+            raise RuntimeError(f"{self.package} no está instalado. Instálelo con: pip install {self.package}")
+
     @staticmethod
-    def export_to_word(tree: ttk.Treeview, title: str, filename: str = None) -> Optional[str]:
-        """Exporta Treeview a Word con tablas separadas por departamento"""
-        if not HAS_WORD:
-            messagebox.showerror("Error", "python-docx no está instalado. Instálelo con: pip install python-docx")
-            return None
-        
-        if not filename:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".docx",
-                filetypes=[("Word files", "*.docx"), ("All files", "*.*")],
-                title="Guardar como Word (Tablas separadas)"
+    def _sections(document: ReportDocument, progress: Optional[Callable[[int, str], None]]):
+        total = len(document.sections)
+        for index, section in enumerate(document.sections):
+            if progress:
+                progress(index * 100 // total, f"Departamento {index + 1} de {total}: {section.name}")
+            yield index, section
+
+    @staticmethod
+    def _started(progress: Optional[Callable[[int, str], None]]):
+        if progress:
+            progress(0, "Generando archivo...")
+
+
+def _excel_widths(headers: Sequence[Any], rows: Iterable[Sequence[Any]],
+                 minimum: int = 10, maximum: int = 50) -> List[float]:
+    """Ancho de cada columna según su texto más largo (encabezado o celda)"""
+    widths = [len(str(header)) for header in headers]
+    for row in rows:
+        for index, value in enumerate(row[:len(widths)]):
+            if value is not None and value != '':
+                widths[index] = max(widths[index], len(str(value)))
+    return [min(max(width + 2, minimum), maximum) for width in widths]
+
+
+class ExcelRenderer(ReportRenderer):
+    """
+    Libro de Excel con una tabla por departamento y resumen final.
+
+    Se escribe en streaming (StreamingExcelWriter) con los estilos con
+    nombre de excel_stream: los anchos de columna se calculan antes de
+    escribir la primera fila.
+    """
+
+    extension = '.xlsx'
+    package = 'openpyxl'
+    available = HAS_EXCEL
+    streams_rows = True
+
+    # Columnas de cantidad (D, A, C, H): se muestran como enteros
+    QUANTITY_KEYWORDS = ['desayunos', 'almuerzos', 'cenas', 'alojamientos']
+
+    def render(self, document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        self.check_available()
+        self._started(progress)
+        width = len(document.headers)
+
+        writer = StreamingExcelWriter(filename, "Reporte")
+        if document.hierarchical:
+            headers = [abreviar_encabezado(header) for header in document.section_headers]
+            rows = itertools.chain(
+                (document.section_row(row) for section in document.sections for row in section.rows),
+                ([section.name, f"${section.subtotal:,.2f}"] for section in document.sections),
             )
-            
-        if not filename:
-            return None
-        
-        try:
-            
-            # Obtener datos con transformación jerárquica automática
-            headers, _, hierarchical_structure = TreeviewExporter.get_treeview_data(tree, hierarchical=True)
-            
-            if not headers:
-                messagebox.showwarning("Sin datos", "No hay datos para exportar")
-                return None
-            
-            # Crear documento
-            doc = Document()
+            writer.set_column_widths(_excel_widths(headers, rows))
+        else:
+            # En streaming las filas aún no se leyeron: ancho según los encabezados
+            writer.set_column_widths(_excel_widths(document.headers, () if document.streamed else document.rows))
 
-            def abreviar_encabezado(header):
-                """Abrevia encabezados específicos a su inicial"""
-                header_str = str(header)
-                
-                # Diccionario de abreviaciones
-                abreviaciones = {
-                    'Desayunos': 'D',
-                    'Almuerzos': 'A', 
-                    'Cenas': 'C',
-                    'Alojamientos': 'H',  # H para Hospedaje
-                }
-                
-                # Verificar si el encabezado está en el diccionario
-                for key, value in abreviaciones.items():
-                    if key in header_str:
-                        return value
-                
-                # Si no es un encabezado específico, devolver el original
-                return header_str
-            
-            # Configurar página
-            section = doc.sections[0]
-            section.left_margin = Inches(0.5)
-            section.right_margin = Inches(0.5)
-            section.top_margin = Inches(0.75)
-            section.bottom_margin = Inches(0.75)
-            
-            # Título principal
-            title_para = doc.add_paragraph()
-            title_run = title_para.add_run(title)
-            title_run.font.size = Pt(14)
-            title_run.font.bold = True
-            title_run.font.color.rgb = RGBColor(44, 62, 80)
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Subtítulo informativo si hay jerarquía
-            if hierarchical_structure:
-                subtitle_para = doc.add_paragraph()
-                subtitle_run = subtitle_para.add_run("📊 REPORTE POR DEPARTAMENTOS")
-                subtitle_run.font.size = Pt(11)
-                subtitle_run.font.bold = True
-                subtitle_run.font.color.rgb = RGBColor(39, 174, 96)
-                subtitle_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Fecha de exportación
-            date_para = doc.add_paragraph()
-            date_run = date_para.add_run(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            date_run.font.size = Pt(9)
-            date_run.font.color.rgb = RGBColor(102, 102, 102)
-            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            doc.add_paragraph()  # Espacio
-            
-            if hierarchical_structure:
-                # PROCESAR POR DEPARTAMENTOS - TABLAS SEPARADAS
-                # Primero, agrupar los datos por departamento
-                departments_data = {}
-                
-                current_dept = None
-                for item in hierarchical_structure['hierarchical_data']:
-                    if item['type'] == 'department_header':
-                        current_dept = item['department']
-                        departments_data[current_dept] = {
-                            'header': item,
-                            'employees': [],
-                            'subtotal': item.get('subtotal', 0)
-                        }
-                    elif item['type'] == 'employee_row' and current_dept:
-                        departments_data[current_dept]['employees'].append(item)
-                    
-                
-                # CREAR UNA TABLA POR CADA DEPARTAMENTO
-                for dept_name, dept_info in departments_data.items():
-                    # Título del departamento (como párrafo, no como fila de tabla)
-                    dept_title_para = doc.add_paragraph()
-                    
-                    # Formatear el texto del departamento con subtotal
-                    dept_header_text = dept_info['header']['data'][hierarchical_structure['indices']['department']]
-                    if dept_info['subtotal'] > 0:
-                        subtotal_text = f" - Subtotal: ${dept_info['subtotal']:,.2f}"
-                    else:
-                        subtotal_text = ""
-                    
-                    dept_title_run = dept_title_para.add_run(f"📊 {dept_header_text}{subtotal_text}")
-                    dept_title_run.font.size = Pt(12)
-                    dept_title_run.font.bold = True
-                    dept_title_run.font.color.rgb = RGBColor(44, 62, 80)
-    
+        writer.append_merged(document.title, "vx_title", width)
+        # Subtítulo informativo si hay jerarquía
+        if document.hierarchical:
+            writer.append_merged("📊 REPORTE POR DEPARTAMENTOS", "vx_banner", width)
+        writer.append_merged(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", "vx_subtitle", width)
+        writer.append()
 
-                    # Crear tabla para este departamento
-                    num_employees = len(dept_info['employees'])
-                    if num_employees > 0:
-                        # Identificar índices de columnas a excluir
-                        indices_a_excluir = []
-                        
-                        # 1. Columna de departamento (siempre)
-                        if hierarchical_structure['indices'].get('department') is not None:
-                            indices_a_excluir.append(hierarchical_structure['indices']['department'])
-                        
-                        # 2. Columna "N° Anticipo" - buscar por varios nombres posibles
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['anticipo', 'n° anticipo', 'n anticipo', 'nº anticipo', 'numero anticipo',
-                                                                        'no. anticipo', 'liquidación', 'n° liquidación', 'n liquidación', 
-                                                                        'nº liquidación', 'numero liquidación', 'no. liquidación']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        # 3. Columna "Estado" - buscar por varios nombres posibles
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['estado', 'status', 'situacion']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        # Ordenar los índices a excluir
-                        indices_a_excluir.sort()
-                        
-                        # Calcular número de columnas finales
-                        num_columnas_finales = len(headers) - len(indices_a_excluir)
-                        
-                        # Crear tabla con las columnas restantes
-                        table = doc.add_table(rows=num_employees + 1, cols=num_columnas_finales)
-                        table.style = 'Table Grid'
-                        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-                        table.autofit = False
-                        
-                        # Configurar anchos de columna proporcionales
-                        for i in range(num_columnas_finales):
-                            table.columns[i].width = Inches(1.8)  # Un poco más ancho porque hay menos columnas
-                        
-                        # ENCABEZADOS DE LA TABLA (excluyendo las columnas no deseadas)
-                        header_cells = table.rows[0].cells
-                        col_idx_destino = 0
-                        
-                        for i, header in enumerate(headers):
-                            # Saltar las columnas que están en la lista de exclusión
-                            if i in indices_a_excluir:
-                                continue
-                            
-                            # Abreviar encabezados específicos
-                            header_abreviado = abreviar_encabezado(header)
-                            header_cells[col_idx_destino].text = str(header_abreviado)
-                            
-                            header_cells[col_idx_destino].paragraphs[0].runs[0].font.bold = True
-                            header_cells[col_idx_destino].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            header_cells[col_idx_destino].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-                            
-                            # Fondo azul oscuro
-                            tc = header_cells[col_idx_destino]._tc
-                            tcPr = tc.get_or_add_tcPr()
-                            shading = OxmlElement('w:shd')
-                            shading.set(qn('w:fill'), '2c3e50')
-                            tcPr.append(shading)
-                            
-                            col_idx_destino += 1
-                        
-                        # DATOS DE LOS EMPLEADOS (excluyendo las mismas columnas)
-                        for idx, emp_item in enumerate(dept_info['employees']):
-                            row_cells = table.rows[idx + 1].cells
-                            row_data = emp_item['data']
-                            
-                            col_idx_destino = 0
-                            for i, cell_data in enumerate(row_data):
-                                # Saltar las columnas que están en la lista de exclusión
-                                if i in indices_a_excluir:
-                                    continue
-                                    
-                                # Formatear el nombre del empleado con numeración
-                                if i == hierarchical_structure['indices'].get('employee'):
-                                    employee_name = cell_data
-                                    # Quitar cualquier prefijo existente y agregar numeración
-                                    clean_name = str(employee_name).replace('   ├── ', '').replace('├── ', '')
-                                    row_cells[col_idx_destino].text = f"{idx + 1}. {clean_name}"
-                                else:
-                                    row_cells[col_idx_destino].text = str(cell_data)
-                                
-                                # Formato para montos
-                                cell_str = str(cell_data)
-                                if cell_str.startswith('$') or cell_str.replace('.', '', 1).replace(',', '').isdigit():
-                                    row_cells[col_idx_destino].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                                
-                                # Fondo alternado para filas
-                                if idx % 2 == 0:
-                                    tc = row_cells[col_idx_destino]._tc
-                                    tcPr = tc.get_or_add_tcPr()
-                                    shading = OxmlElement('w:shd')
-                                    shading.set(qn('w:fill'), 'f8f9fa')
-                                    tcPr.append(shading)
-                                
-                                col_idx_destino += 1
-                        
-                        # Ajustar altura de filas
-                        for row in table.rows:
-                            tr = row._tr
-                            trPr = tr.get_or_add_trPr()
-                            trHeight = OxmlElement('w:trHeight')
-                            trHeight.set(qn('w:val'), "350")
-                            trPr.append(trHeight)
-
-                    # Espacio entre departamentos
-                    doc.add_paragraph()
-                
-                # TABLA DE RESUMEN FINAL (departamentos con subtotales)
-                summary_title = doc.add_paragraph()
-                summary_title_run = summary_title.add_run("📊 RESUMEN DE DEPARTAMENTOS")
-                summary_title_run.font.size = Pt(12)
-                summary_title_run.font.bold = True
-                summary_title_run.font.color.rgb = RGBColor(44, 62, 80)
-                
-                # Crear tabla de resumen (2 columnas: departamento, subtotal)
-                summary_table = doc.add_table(rows=len(departments_data) + 2, cols=2)
-                summary_table.style = 'Table Grid'
-                summary_table.alignment = WD_TABLE_ALIGNMENT.CENTER
-                
-                # Encabezados del resumen
-                summary_header = summary_table.rows[0].cells
-                summary_header[0].text = "DEPARTAMENTO"
-                summary_header[1].text = "SUBTOTAL"
-                
-                for cell in summary_header:
-                    cell.paragraphs[0].runs[0].font.bold = True
-                    cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    
-                    tc = cell._tc
-                    tcPr = tc.get_or_add_tcPr()
-                    shading = OxmlElement('w:shd')
-                    shading.set(qn('w:fill'), '2c3e50')
-                    tcPr.append(shading)
-                
-                # Datos del resumen
-                row_idx = 1
-                total_general = 0
-                
-                for dept_name, dept_info in departments_data.items():
-                    row_cells = summary_table.rows[row_idx].cells
-                    row_cells[0].text = dept_name
-                    row_cells[1].text = f"${dept_info['subtotal']:,.2f}"
-                    row_cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    
-                    total_general += dept_info['subtotal']
-                    row_idx += 1
-                
-                # Fila de total general
-                total_cells = summary_table.rows[row_idx].cells
-                total_cells[0].text = "TOTAL GENERAL"
-                total_cells[1].text = f"${total_general:,.2f}"
-                
-                for cell in total_cells:
-                    cell.paragraphs[0].runs[0].font.bold = True
-                    cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    
-                    tc = cell._tc
-                    tcPr = tc.get_or_add_tcPr()
-                    shading = OxmlElement('w:shd')
-                    shading.set(qn('w:fill'), '27ae60')
-                    tcPr.append(shading)
-                
-                total_cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            else:
-                # FALLBACK: Tabla plana (sin jerarquía)
-                _, flat_data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
-                
-                table = doc.add_table(rows=1, cols=len(headers))
+        if document.hierarchical:
+            self._write_sections(writer, document, progress)
+            self._write_summary(writer, document)
+        else:
+            self._write_flat(writer, document)
+
+        write_footer(writer)
+        writer.save()
+        return document.result(filename)
+
+    def _write_sections(self, writer: StreamingExcelWriter, document: ReportDocument, progress):
+        width = len(document.headers)
+        section_headers = document.section_headers
+        employee_column = document.section_employee_column
+        quantity_columns = {
+            position for position, header in enumerate(section_headers)
+            if any(keyword in str(header).lower() for keyword in self.QUANTITY_KEYWORDS)
+        }
+
+        for _, section in self._sections(document, progress):
+            # Título del departamento con subtotal
+            dept_text = f"📊 {section.name}"
+            if section.subtotal > 0:
+                dept_text += f" - Subtotal: ${section.subtotal:,.2f}"
+            writer.append_merged(dept_text, "vx_section", width)
+
+            if section.rows:
+                # Encabezados de la tabla (excluyendo columnas no deseadas)
+                writer.append(writer.cell(str(abreviar_encabezado(header)), "vx_header") for header in section_headers)
+                group_starts = section.groups_by_position()
+
+                for idx, row_data in enumerate(section.rows):
+                    # Encabezados de los subgrupos (solicitante, mes) que empiezan aquí
+                    for group in group_starts.get(idx, ()):
+                        writer.append_merged(group.title, "vx_subtotal", len(section_headers))
+                    suffix = "_alt" if idx % 2 == 0 else ""
+                    writer.append(
+                        writer.cell(*self._section_cell(cell_data, position == employee_column,
+                                                        position in quantity_columns, suffix))
+                        for position, cell_data in enumerate(document.section_row(row_data))
+                    )
+
+            # Espacio entre departamentos
+            writer.append()
+
+    @staticmethod
+    def _section_cell(value: Any, is_employee: bool, is_quantity: bool, suffix: str):
+        """Valor y estilo de una celda de las tablas por departamento"""
+        if is_employee:
+            return value, "vx_text" + suffix
+
+        text = str(value)
+        if is_quantity and text.replace('.', '', 1).isdigit():
+            return int(float(text)), "vx_int" + suffix
+        if text.startswith('$') or (not is_quantity and text.replace('.', '', 1).replace(',', '').isdigit()):
+            amount = DataHierarchyTransformer.parse_amount(value)
+            if amount is not None:
+                return amount, "vx_currency" + suffix
+        return value, "vx_text" + suffix
+
+    def _write_summary(self, writer: StreamingExcelWriter, document: ReportDocument):
+        writer.append()
+        writer.append_merged("📊 RESUMEN DE DEPARTAMENTOS", "vx_section", 2)
+        writer.append([writer.cell("DEPARTAMENTO", "vx_label"), writer.cell("SUBTOTAL", "vx_label")])
+
+        for section in document.sections:
+            writer.append([writer.cell(section.name, "vx_text"), writer.cell(section.subtotal, "vx_currency")])
+
+        writer.append([
+            writer.cell("TOTAL GENERAL", "vx_total"),
+            writer.cell(document.total_general, "vx_total_currency"),
+        ])
+
+    def _write_flat(self, writer: StreamingExcelWriter, document: ReportDocument):
+        # Tabla plana (sin jerarquía)
+        writer.append(writer.cell(header, "vx_header") for header in document.headers)
+
+        for row_idx, row_data in enumerate(document.iter_rows()):
+            suffix = "_alt" if row_idx % 2 == 0 else ""
+            cells = []
+            for cell_data in row_data:
+                style = "vx_text"
+                if isinstance(cell_data, str) and cell_data.startswith('$'):
+                    amount = DataHierarchyTransformer.parse_amount(cell_data)
+                    if amount is not None:
+                        cell_data, style = amount, "vx_currency"
+                elif isinstance(cell_data, (int, float)) and not isinstance(cell_data, bool):
+                    style = "vx_currency"
+                cells.append(writer.cell(cell_data, style + suffix))
+            writer.append(cells)
+
+
+def _shade_word_cell(cell, color: str):
+    """Aplica un color de fondo a una celda de Word"""
+    tc_pr = cell._tc.get_or_add_tcPr()
+    shading = OxmlElement('w:shd')
+    shading.set(qn('w:fill'), color)
+    tc_pr.append(shading)
+
+
+def _style_word_header_cell(cell, color: str = '2c3e50'):
+    cell.paragraphs[0].runs[0].font.bold = True
+    cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+    _shade_word_cell(cell, color)
+
+
+class WordRenderer(ReportRenderer):
+    """Documento de Word con una tabla por departamento y resumen final"""
+
+    extension = '.docx'
+    package = 'python-docx'
+    available = HAS_WORD
+
+    def render(self, document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        self.check_available()
+        self._started(progress)
+
+        doc = Document()
+
+        # Configurar página
+        section = doc.sections[0]
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+        section.top_margin = Inches(0.75)
+        section.bottom_margin = Inches(0.75)
+
+        # Título principal
+        title_para = doc.add_paragraph()
+        title_run = title_para.add_run(document.title)
+        title_run.font.size = Pt(14)
+        title_run.font.bold = True
+        title_run.font.color.rgb = RGBColor(44, 62, 80)
+        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Subtítulo informativo si hay jerarquía
+        if document.hierarchical:
+            subtitle_para = doc.add_paragraph()
+            subtitle_run = subtitle_para.add_run("📊 REPORTE POR DEPARTAMENTOS")
+            subtitle_run.font.size = Pt(11)
+            subtitle_run.font.bold = True
+            subtitle_run.font.color.rgb = RGBColor(39, 174, 96)
+            subtitle_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Fecha de exportación
+        date_para = doc.add_paragraph()
+        date_run = date_para.add_run(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+        date_run.font.size = Pt(9)
+        date_run.font.color.rgb = RGBColor(102, 102, 102)
+        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        doc.add_paragraph()  # Espacio
+
+        if document.hierarchical:
+            self._write_sections(doc, document, progress)
+            self._write_summary(doc, document)
+        else:
+            self._write_flat(doc, document)
+
+        # Ajustar altura de filas en todas las tablas
+        for table in doc.tables:
+            for row in table.rows:
+                tr_pr = row._tr.get_or_add_trPr()
+                tr_height = OxmlElement('w:trHeight')
+                tr_height.set(qn('w:val'), "350")
+                tr_pr.append(tr_height)
+
+        # Pie de documento
+        doc.add_paragraph()
+        footer_para = doc.add_paragraph()
+
+        footer_text = "Sistema de Gestión de Dietas VIAJEX"
+        if document.hierarchical:
+            footer_text += f" • {len(document.sections)} departamentos procesados"
+
+        footer_run = footer_para.add_run(footer_text)
+        footer_run.font.size = Pt(8)
+        footer_run.italic = True
+        footer_run.font.color.rgb = RGBColor(102, 102, 102)
+        footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        doc.save(filename)
+        return document.result(filename)
+
+    def _write_sections(self, doc, document: ReportDocument, progress):
+        section_headers = [abreviar_encabezado(header) for header in document.section_headers]
+
+        for _, section in self._sections(document, progress):
+            # Título del departamento (como párrafo, no como fila de tabla)
+            dept_title_para = doc.add_paragraph()
+            subtotal_text = f" - Subtotal: ${section.subtotal:,.2f}" if section.subtotal > 0 else ""
+
+            dept_title_run = dept_title_para.add_run(f"📊 DEPARTAMENTO: {section.name.upper()}{subtotal_text}")
+            dept_title_run.font.size = Pt(12)
+            dept_title_run.font.bold = True
+            dept_title_run.font.color.rgb = RGBColor(44, 62, 80)
+
+            if section.rows:
+                # Una fila por solicitante y una por encabezado de subgrupo
+                table = doc.add_table(rows=len(section.rows) + len(section.groups) + 1, cols=len(section_headers))
                 table.style = 'Table Grid'
                 table.alignment = WD_TABLE_ALIGNMENT.CENTER
-                
-                # Configurar anchos
-                for i in range(len(headers)):
-                    table.columns[i].width = Inches(1.5)
-                
-                # Encabezados
+                table.autofit = False
+
+                for i in range(len(section_headers)):
+                    table.columns[i].width = Inches(1.8)
+
+                # ENCABEZADOS DE LA TABLA
                 header_cells = table.rows[0].cells
-                for i, header in enumerate(headers):
-                    header_cells[i].text = str(header)
-                    header_cells[i].paragraphs[0].runs[0].font.bold = True
-                    header_cells[i].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    header_cells[i].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    
-                    tc = header_cells[i]._tc
-                    tcPr = tc.get_or_add_tcPr()
-                    shading = OxmlElement('w:shd')
-                    shading.set(qn('w:fill'), '2c3e50')
-                    tcPr.append(shading)
-                
-                # Datos
-                for row_idx, row_data in enumerate(flat_data):
-                    row_cells = table.add_row().cells
-                    
-                    for i, cell_data in enumerate(row_data):
-                        row_cells[i].text = str(cell_data)
-                        
-                        # Fondo alternado
-                        if row_idx % 2 == 0:
-                            tc = row_cells[i]._tc
-                            tcPr = tc.get_or_add_tcPr()
-                            shading = OxmlElement('w:shd')
-                            shading.set(qn('w:fill'), 'f8f9fa')
-                            tcPr.append(shading)
-            
-            # Ajustar altura de filas en todas las tablas
-            for table in doc.tables:
-                for row in table.rows:
-                    tr = row._tr
-                    trPr = tr.get_or_add_trPr()
-                    trHeight = OxmlElement('w:trHeight')
-                    trHeight.set(qn('w:val'), "350")
-                    trPr.append(trHeight)
-            
-            # Pie de documento
+                for position, header in enumerate(section_headers):
+                    header_cells[position].text = str(header)
+                    _style_word_header_cell(header_cells[position])
+
+                # DATOS DE LOS EMPLEADOS
+                group_starts = section.groups_by_position()
+                table_row = 1
+                for idx, row_data in enumerate(section.rows):
+                    # Encabezados de los subgrupos (solicitante, mes) que empiezan aquí
+                    for group in group_starts.get(idx, ()):
+                        group_cell = table.rows[table_row].cells[0].merge(table.rows[table_row].cells[-1])
+                        group_cell.text = group.title
+                        group_cell.paragraphs[0].runs[0].font.bold = True
+                        _shade_word_cell(group_cell, 'fff3cd')
+                        table_row += 1
+
+                    row_cells = table.rows[table_row].cells
+                    table_row += 1
+
+                    for position, cell_data in enumerate(document.section_row(row_data)):
+                        row_cells[position].text = str(cell_data)
+
+                        # Formato para montos
+                        cell_str = str(cell_data)
+                        if cell_str.startswith('$') or cell_str.replace('.', '', 1).replace(',', '').isdigit():
+                            row_cells[position].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+                        # Fondo alternado para filas
+                        if idx % 2 == 0:
+                            _shade_word_cell(row_cells[position], 'f8f9fa')
+
+            # Espacio entre departamentos
             doc.add_paragraph()
-            footer_para = doc.add_paragraph()
-            
-            footer_text = "Sistema de Gestión de Dietas VIAJEX"
-            if hierarchical_structure:
-                footer_text += f" • {len(departments_data)} departamentos procesados"
-            
-            footer_run = footer_para.add_run(footer_text)
-            footer_run.font.size = Pt(8)
-            footer_run.italic = True
-            footer_run.font.color.rgb = RGBColor(102, 102, 102)
-            footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Guardar documento
-            doc.save(filename)
-            
-            # Mensaje de éxito
-            if hierarchical_structure:
-                message = (
-                    f"✅ WORD con tablas separadas exportado:\n\n"
-                    f"📂 {filename}\n\n"
-                    f"• Tablas por departamento: {len(departments_data)}\n"
-                    f"• Total General: ${total_general:,.2f}\n"
-                    f"• Incluye resumen detallado"
-                )
+
+    def _write_summary(self, doc, document: ReportDocument):
+        # TABLA DE RESUMEN FINAL (departamentos con subtotales)
+        summary_title = doc.add_paragraph()
+        summary_title_run = summary_title.add_run("📊 RESUMEN DE DEPARTAMENTOS")
+        summary_title_run.font.size = Pt(12)
+        summary_title_run.font.bold = True
+        summary_title_run.font.color.rgb = RGBColor(44, 62, 80)
+
+        summary_table = doc.add_table(rows=len(document.sections) + 2, cols=2)
+        summary_table.style = 'Table Grid'
+        summary_table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+        summary_header = summary_table.rows[0].cells
+        summary_header[0].text = "DEPARTAMENTO"
+        summary_header[1].text = "SUBTOTAL"
+        for cell in summary_header:
+            _style_word_header_cell(cell)
+
+        row_idx = 1
+        for section in document.sections:
+            row_cells = summary_table.rows[row_idx].cells
+            row_cells[0].text = section.name
+            row_cells[1].text = f"${section.subtotal:,.2f}"
+            row_cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            row_idx += 1
+
+        # Fila de total general
+        total_cells = summary_table.rows[row_idx].cells
+        total_cells[0].text = "TOTAL GENERAL"
+        total_cells[1].text = f"${document.total_general:,.2f}"
+
+        for cell in total_cells:
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+            _shade_word_cell(cell, '27ae60')
+
+        total_cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+    def _write_flat(self, doc, document: ReportDocument):
+        # FALLBACK: Tabla plana (sin jerarquía)
+        headers = document.headers
+        table = doc.add_table(rows=1, cols=len(headers))
+        table.style = 'Table Grid'
+        table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+        for i in range(len(headers)):
+            table.columns[i].width = Inches(1.5)
+
+        header_cells = table.rows[0].cells
+        for i, header in enumerate(headers):
+            header_cells[i].text = str(header)
+            _style_word_header_cell(header_cells[i])
+
+        for row_idx, row_data in enumerate(document.rows):
+            row_cells = table.add_row().cells
+
+            for i, cell_data in enumerate(row_data):
+                row_cells[i].text = str(cell_data)
+
+                # Fondo alternado
+                if row_idx % 2 == 0:
+                    _shade_word_cell(row_cells[i], 'f8f9fa')
+
+
+class FlowableStream(list):
+    """
+    Historia de reportlab que se llena a demanda desde un generador.
+
+    SimpleDocTemplate.build consume los flowables desde el frente
+    (flowables[0], del flowables[0]) y reinserta allí las partes que no
+    caben en la página. Esta lista solo mantiene cargados los próximos
+    `lookahead` elementos, de modo que las tablas ya dibujadas se liberan
+    y el resto del documento todavía no se ha creado.
+    """
+
+    def __init__(self, flowables: Iterable[Any], lookahead: int = 8):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._fill(0)
+
+    def _fill(self, index: int):
+        while self._source is not None and list.__len__(self) <= max(index, self._lookahead):
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill(0)
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is not None and index.stop > 0:
+                self._fill(index.stop)
+        elif index >= 0:
+            self._fill(index)
+        return list.__getitem__(self, index)
+
+
+class PdfRenderer(ReportRenderer):
+    """
+    PDF con tablas por departamento y resumen final (también se usa para imprimir).
+
+    Cada departamento se divide en tablas de `chunk_rows` filas (alrededor
+    de una página) con el encabezado repetido y una fila de subtotal
+    acumulado. Los flowables se generan a medida que reportlab los
+    maqueta: el costo de dividir tablas entre páginas no crece con el
+    tamaño del departamento y la memoria queda acotada al fragmento
+    en curso. Con chunk_rows=0 se genera una sola tabla por departamento.
+    """
+
+    extension = '.pdf'
+    package = 'reportlab'
+    available = HAS_PDF
+
+    # Filas por tabla: en A4 con letra de 8 pt caben unas 40 filas por página
+    CHUNK_ROWS = 40
+
+    def __init__(self, date_label: str = "Exportado", chunk_rows: Optional[int] = None):
+        self.date_label = date_label
+        self.chunk_rows = self.CHUNK_ROWS if chunk_rows is None else chunk_rows
+
+    def _chunks(self, rows: List[Any]):
+        """Fragmentos consecutivos de filas; uno solo si no se fragmenta"""
+        size = self.chunk_rows if self.chunk_rows > 0 else max(len(rows), 1)
+        for start in range(0, len(rows), size):
+            yield start, rows[start:start + size]
+
+    def render(self, document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        self.check_available()
+        self._started(progress)
+
+        # Crear documento PDF con márgenes optimizados
+        doc = SimpleDocTemplate(
+            filename,
+            pagesize=A4,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch,
+            leftMargin=0.4*inch,  # Reducido para más espacio
+            rightMargin=0.4*inch
+        )
+
+        doc.build(FlowableStream(self._story(doc, document, progress)))
+        return document.result(filename)
+
+    def _story(self, doc, document: ReportDocument, progress):
+        """Genera los flowables del documento en orden de maquetación"""
+        # Estilos
+        styles = getSampleStyleSheet()
+
+        # Título principal
+        title_style = ParagraphStyle(
+            'MainTitle',
+            parent=styles['Heading1'],
+            fontSize=14,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=8,
+            alignment=1,
+            fontName='Helvetica-Bold'
+        )
+        yield Paragraph(document.title, title_style)
+
+        # Subtítulo informativo si hay jerarquía
+        if document.hierarchical:
+            subtitle_style = ParagraphStyle(
+                'Subtitle',
+                parent=styles['Normal'],
+                fontSize=11,
+                textColor=colors.HexColor('#27ae60'),
+                alignment=1,
+                spaceAfter=10
+            )
+            yield Paragraph("📊 REPORTE POR DEPARTAMENTOS", subtitle_style)
+
+        # Fecha de exportación
+        date_style = ParagraphStyle(
+            'DateStyle',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#666666'),
+            alignment=1,
+            spaceAfter=12
+        )
+        yield Paragraph(f"{self.date_label}: {datetime.now().strftime('%d/%m/%Y %H:%M')}", date_style)
+
+        yield Spacer(1, 0.15*inch)
+
+        if document.hierarchical:
+            yield from self._section_flowables(doc, document, styles, progress)
+            yield from self._summary_flowables(doc, document, styles)
+        else:
+            yield from self._flat_flowables(doc, document, progress)
+
+        # Pie de página
+        yield Spacer(1, 0.3*inch)
+
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=styles['Italic'],
+            fontSize=8,
+            textColor=colors.HexColor('#666666'),
+            alignment=1,
+            spaceBefore=10
+        )
+
+        footer_text = "Sistema de Gestión de Dietas VIAJEX"
+        if document.hierarchical:
+            footer_text += f" • {len(document.sections)} departamentos procesados"
+
+        yield Paragraph(footer_text, footer_style)
+
+    def _section_flowables(self, doc, document: ReportDocument, styles, progress):
+        table_headers = [abreviar_encabezado(header) for header in document.section_headers]
+        employee_column = document.section_employee_column
+        amount_column = document.section_amount_column
+
+        dept_title_style = ParagraphStyle(
+            'DeptTitle',
+            parent=styles['Heading2'],
+            fontSize=11,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=8,
+            leftIndent=0,
+            fontName='Helvetica-Bold',
+            backColor=colors.HexColor('#e8f4f8'),
+            borderPadding=(6, 6, 6, 6)
+        )
+        # Estilo que permite ajustar el nombre del empleado en varias líneas
+        employee_style = ParagraphStyle(
+            'EmployeeStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            wordWrap='CJK',
+            leading=10,
+        )
+
+        table_style = self._section_table_style(table_headers)
+        subtotal_style = self._subtotal_table_style(table_style)
+        col_widths = self._section_col_widths(doc, len(table_headers))
+
+        # Fila de subtotal acumulado: etiqueta en la columna del solicitante
+        label_column = employee_column if employee_column is not None else 0
+        show_subtotals = amount_column is not None and amount_column != label_column
+
+        for dept_idx, section in self._sections(document, progress):
+            dept_text = f"📊 {section.name}"
+            if section.subtotal > 0:
+                dept_text += f" - Subtotal: ${section.subtotal:,.2f}"
+            # Evita que el título quede solo al pie de una página
+            yield CondPageBreak(inch)
+            yield Paragraph(dept_text, dept_title_style)
+
+            if section.rows and table_headers:
+                running_subtotal = 0
+                group_starts = section.groups_by_position()
+                for start, chunk in self._chunks(section.rows):
+                    table_data = [table_headers]
+                    group_rows = []
+                    for row_index, row_data in enumerate(chunk, start):
+                        # Encabezados de los subgrupos (solicitante, mes) que empiezan aquí
+                        for group in group_starts.get(row_index, ()):
+                            group_rows.append(len(table_data))
+                            table_data.append([group.title] + [""] * (len(table_headers) - 1))
+
+                        table_row = []
+                        for position, cell_data in enumerate(document.section_row(row_data)):
+                            if position == employee_column:
+                                table_row.append(Paragraph(str(cell_data), employee_style))
+                            else:
+                                table_row.append(str(cell_data) if cell_data is not None else "")
+                        table_data.append(table_row)
+                        running_subtotal += document.row_amount(row_data)
+
+                    if show_subtotals:
+                        is_last = start + len(chunk) >= len(section.rows)
+                        subtotal_row = [""] * len(table_headers)
+                        subtotal_row[label_column] = "Subtotal" if is_last else "Subtotal acumulado"
+                        subtotal_row[amount_column] = f"${running_subtotal:,.2f}"
+                        table_data.append(subtotal_row)
+
+                    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+                    table.setStyle(subtotal_style if show_subtotals else table_style)
+                    if group_rows:
+                        table.setStyle(self._group_rows_style(group_rows))
+                    yield table
+
+                yield Spacer(1, 0.25*inch)
+
+            # Espacio entre departamentos
+            if dept_idx < len(document.sections) - 1:
+                yield Spacer(1, 0.15*inch)
+
+    def _section_col_widths(self, doc, num_cols: int) -> List[float]:
+        """Anchos proporcionales: con muchas columnas, la primera (empleado) recibe el 35%"""
+        if num_cols == 0:
+            return []
+        total_width = doc.width
+        if num_cols <= 4:
+            return [total_width / num_cols] * num_cols
+        other_cols_width = total_width * 0.65 / (num_cols - 1)
+        return [total_width * 0.35] + [other_cols_width] * (num_cols - 1)
+
+    def _section_table_style(self, table_headers: List[Any]) -> TableStyle:
+        table_style = TableStyle([
+            # Encabezados
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('TOPPADDING', (0, 0), (-1, 0), 6),
+
+            # Bordes finos
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor("#dddddd")),
+
+            # Filas alternadas
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+            [colors.white, colors.HexColor("#f5f7fa")]),
+
+            # Alineación y padding
+            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+
+            ('LEFTPADDING', (0, 1), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 1), (-1, -1), 8),
+            ('TOPPADDING', (0, 1), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+
+            # Más espacio para la columna del empleado
+            ('LEFTPADDING', (0, 1), (0, -1), 12),
+            ('RIGHTPADDING', (0, 1), (0, -1), 10),
+        ])
+
+        # Alinear montos a la derecha
+        for col_idx, header in enumerate(table_headers):
+            if any(keyword in str(header).lower() for keyword in ['gasto', 'monto', 'total', 'precio', 'costo', '$', 'saldo']):
+                table_style.add('ALIGN', (col_idx, 1), (col_idx, -1), 'RIGHT')
+
+        return table_style
+
+    def _subtotal_table_style(self, table_style: TableStyle) -> TableStyle:
+        """Estilo de las tablas cuya última fila es el subtotal acumulado"""
+        return TableStyle(table_style.getCommands() + [
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#e8f4f8")),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ])
+
+    @staticmethod
+    def _group_rows_style(group_rows: List[int]) -> TableStyle:
+        """Filas de encabezado de subgrupo: una celda combinada en negrita"""
+        commands = []
+        for row in group_rows:
+            commands += [
+                ('SPAN', (0, row), (-1, row)),
+                ('BACKGROUND', (0, row), (-1, row), colors.HexColor("#fff3cd")),
+                ('FONTNAME', (0, row), (-1, row), 'Helvetica-Bold'),
+            ]
+        return TableStyle(commands)
+
+    def _summary_flowables(self, doc, document: ReportDocument, styles) -> List[Any]:
+        # Salto de página para el resumen
+        elements = [PageBreak()]
+
+        summary_title_style = ParagraphStyle(
+            'SummaryTitle',
+            parent=styles['Heading2'],
+            fontSize=12,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=12,
+            alignment=1
+        )
+        elements.append(Paragraph("📊 RESUMEN DE DEPARTAMENTOS", summary_title_style))
+
+        summary_data = [["DEPARTAMENTO", "SUBTOTAL"]]
+        for section in document.sections:
+            summary_data.append([section.name, f"${section.subtotal:,.2f}"])
+        summary_data.append(["TOTAL GENERAL", f"${document.total_general:,.2f}"])
+
+        summary_table = Table(summary_data, colWidths=[doc.width * 0.7, doc.width * 0.3])
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
+
+            ('ALIGN', (1, 1), (1, -2), 'RIGHT'),
+            ('FONTNAME', (1, -1), (1, -1), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, -1), (1, -1), colors.HexColor("#27ae60")),
+            ('TEXTCOLOR', (0, -1), (1, -1), colors.white),
+
+            ('LEFTPADDING', (0, 1), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 1), (-1, -1), 10),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+        ]))
+        elements.append(summary_table)
+        return elements
+
+    def _flat_flowables(self, doc, document: ReportDocument, progress):
+        # FALLBACK: Tabla plana (sin jerarquía), también fragmentada
+        num_cols = len(document.headers)
+        if num_cols == 0:
+            return
+
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
+
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+            [colors.white, colors.HexColor("#f5f7fa")]),
+
+            ('LEFTPADDING', (0, 1), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 1), (-1, -1), 8),
+        ])
+        col_widths = [doc.width / num_cols] * num_cols
+        total = len(document.rows)
+
+        for start, chunk in self._chunks(document.rows):
+            if progress:
+                progress(start * 100 // total, f"Filas {start + 1} a {start + len(chunk)} de {total}")
+            table = Table([document.headers] + chunk, colWidths=col_widths, repeatRows=1)
+            table.setStyle(table_style)
+            yield table
+
+
+class FullColumnsExcelRenderer(ReportRenderer):
+    """
+    Excel con todas las columnas del reporte, subtotales y consolidado por departamento.
+
+    Los departamentos, su orden y sus montos salen del ReportDocument; la
+    hoja se escribe en streaming con los estilos con nombre de excel_stream.
+    """
+
+    extension = '.xlsx'
+    package = 'openpyxl'
+    available = HAS_EXCEL
+    streams_rows = True
+
+    # Columnas que se centran: fechas y estado
+    CENTERED_KEYWORDS = ['fecha', 'date', 'estado', 'status', 'situacion']
+
+    def render(self, document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        self.check_available()
+        rows = document.iter_rows()
+        first_row = next(rows, None)
+        if first_row is None:
+            raise ValueError("No hay datos para exportar")
+        self._started(progress)
+
+        headers = document.headers
+        width = len(headers)
+        writer = StreamingExcelWriter(filename, "Reporte Completo")
+        # En streaming las filas aún no se leyeron: ancho según los encabezados
+        writer.set_column_widths(_excel_widths(headers, () if document.streamed else document.rows, maximum=30))
+        writer.append_merged(document.title, "vx_title", width)
+        writer.append_merged(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", "vx_subtitle", width)
+        writer.append()
+
+        if document.hierarchical:
+            self._write_sections(writer, document, progress)
+            write_department_summary(
+                writer, width, [(section.name, section.totals) for section in document.sections]
+            )
+        else:
+            self._write_flat(writer, document, itertools.chain([first_row], rows))
+
+        writer.save()
+        return document.result(filename)
+
+    def _column_styles(self, document: ReportDocument, money_columns: Iterable[Optional[int]]) -> List[str]:
+        styles = []
+        for header in document.headers:
+            header_lower = str(header).lower()
+            centered = any(keyword in header_lower for keyword in self.CENTERED_KEYWORDS)
+            styles.append("vx_center" if centered else "vx_text")
+        for index in money_columns:
+            if index is not None:
+                styles[index] = "vx_money"
+        return styles
+
+    @staticmethod
+    def _cells(writer: StreamingExcelWriter, row: Sequence[Any], styles: List[str], suffix: str):
+        """Celdas de una fila; los montos (columnas de monto o texto "$...") se escriben como números"""
+        cells = []
+        for value, style in zip(row, styles):
+            if style == "vx_money" or (isinstance(value, str) and value.startswith('$')):
+                amount = DataHierarchyTransformer.parse_amount(value)
+                if amount is not None:
+                    value, style = amount, "vx_money"
+                elif style == "vx_money":
+                    style = "vx_text"
+            cells.append(writer.cell(value, style + suffix))
+        return cells
+
+    def _write_sections(self, writer: StreamingExcelWriter, document: ReportDocument, progress):
+        headers = document.headers
+        width = len(headers)
+        indices = document.indices
+        styles = self._column_styles(document, (indices[key] for key in DEPARTMENT_AMOUNT_KEYS))
+        subtotal_keys = [key for key in ("cash_advance", "card_advance") if indices[key] is not None]
+
+        for _, section in self._sections(document, progress):
+            writer.append_merged(f"📊 DEPARTAMENTO: {section.name.upper()}", "vx_section", width)
+            writer.append(writer.cell(header, "vx_header") for header in headers)
+            group_starts = section.groups_by_position()
+
+            for position, row in enumerate(section.rows):
+                for group in group_starts.get(position, ()):
+                    writer.append_merged(group.title, "vx_subtotal", width)
+                writer.append(self._cells(writer, row, styles, "_alt" if position % 2 == 0 else ""))
+
+            write_subtotal(
+                writer, width, indices['department'], f"Subtotal {section.name}",
+                {indices[key]: section.totals[key] for key in subtotal_keys}
+            )
+            writer.append()
+
+    def _write_flat(self, writer: StreamingExcelWriter, document: ReportDocument, rows: Iterable[Sequence[Any]]):
+        # Sin departamentos: tabla simple con el total de la columna de saldo o monto
+        total_index = document.indices['balance']
+        if total_index is None:
+            total_index = document.indices['amount']
+        styles = self._column_styles(document, [total_index])
+
+        writer.append(writer.cell(header, "vx_header") for header in document.headers)
+
+        total = 0
+        for position, row in enumerate(rows):
+            writer.append(self._cells(writer, row, styles, "_alt" if position % 2 == 0 else ""))
+            if total_index is not None and total_index < len(row):
+                total += DataHierarchyTransformer.parse_amount(row[total_index]) or 0
+
+        if total_index is not None:
+            write_subtotal(writer, len(document.headers), 0 if total_index else None, "TOTAL", {total_index: total})
+
+
+# Renderizadores por extensión; register_renderer permite agregar formatos
+RENDERERS: Dict[str, Callable[[], ReportRenderer]] = {
+    '.xlsx': ExcelRenderer,
+    '.docx': WordRenderer,
+    '.pdf': PdfRenderer,
+}
+
+
+def register_renderer(extension: str, factory: Callable[[], ReportRenderer]):
+    """Registra (o reemplaza) el renderizador de una extensión de archivo"""
+    RENDERERS[extension.lower()] = factory
+
+
+class DataExporter:
+    """
+    Exportador sin interfaz gráfica.
+
+    Recibe encabezados y un iterable de filas (por ejemplo, las de
+    ReportService.iter_diets_report_rows o las transacciones de
+    CardTransactionRepositoryImpl), arma un ReportDocument y lo entrega a
+    los renderizadores de XLSX, DOCX o PDF sin abrir diálogos ni depender
+    de un Treeview. Los errores se propagan como excepciones para que el
+    llamador decida cómo informarlos.
+    """
+
+    @staticmethod
+    def display_rows(columns: Sequence[Any], rows: Iterable[Sequence[Any]]):
+        """
+        Formatea filas nativas con sus columnas tipadas (ReportColumn).
+
+        Returns:
+            Generador de tuplas con el texto tal como se muestra en pantalla
+        """
+        for row in rows:
+            yield tuple(column.format(value) for column, value in zip(columns, row))
+
+    @staticmethod
+    def build_document(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str,
+                       levels: Sequence[str] = ('department',)) -> ReportDocument:
+        """Arma el documento compartido por todos los formatos (ver ReportDocument.build)"""
+        return ReportDocument.build(title, headers, rows, levels=levels)
+
+    @staticmethod
+    def renderer_for(filename: str) -> ReportRenderer:
+        """Renderizador según la extensión del archivo"""
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in RENDERERS:
+            raise ValueError(f"Formato de exportación no soportado: {extension or filename}")
+        return RENDERERS[extension]()
+
+    @staticmethod
+    def render(document: ReportDocument, filename: str,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        """Genera un archivo a partir de un documento ya construido"""
+        return DataExporter.renderer_for(filename).render(document, filename, progress)
+
+    @staticmethod
+    def export(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str, filename: str,
+               levels: Sequence[str] = ('department',)) -> Dict[str, Any]:
+        """
+        Exporta eligiendo el formato según la extensión del archivo.
+
+        Las filas de un reporte plano se escriben en streaming si el formato
+        lo admite (Excel); en los demás casos se cargan todas en memoria.
+        `levels` son los niveles de agrupación (ver ReportDocument.build).
+        """
+        renderer = DataExporter.renderer_for(filename)
+        document = ReportDocument.build(title, headers, rows, stream=renderer.streams_rows, levels=levels)
+        return renderer.render(document, filename)
+
+    @staticmethod
+    def export_many(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str,
+                    filenames: Sequence[str], levels: Sequence[str] = ('department',)) -> List[Dict[str, Any]]:
+        """Exporta el mismo reporte a varios archivos armando el documento una sola vez"""
+        renderers = [DataExporter.renderer_for(filename) for filename in filenames]
+        document = ReportDocument.build(title, headers, rows, levels=levels)
+        return [renderer.render(document, filename) for renderer, filename in zip(renderers, filenames)]
+
+    @staticmethod
+    def to_excel(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str, filename: str,
+                 levels: Sequence[str] = ('department',)) -> Dict[str, Any]:
+        """Exporta a Excel con tablas separadas por departamento"""
+        return ExcelRenderer().render(ReportDocument.build(title, headers, rows, stream=True, levels=levels), filename)
+
+    @staticmethod
+    def to_word(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str, filename: str,
+                levels: Sequence[str] = ('department',)) -> Dict[str, Any]:
+        """Exporta a Word con tablas separadas por departamento"""
+        return WordRenderer().render(ReportDocument.build(title, headers, rows, levels=levels), filename)
+
+    @staticmethod
+    def to_pdf(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str, filename: str,
+               date_label: str = "Exportado", levels: Sequence[str] = ('department',)) -> Dict[str, Any]:
+        """Exporta a PDF con tablas separadas por departamento"""
+        return PdfRenderer(date_label).render(ReportDocument.build(title, headers, rows, levels=levels), filename)
+
+    @staticmethod
+    def to_excel_full_columns(headers: Sequence[Any], rows: Iterable[Sequence[Any]], title: str, filename: str,
+                              levels: Sequence[str] = ('department',)) -> Dict[str, Any]:
+        """Exporta a Excel con todas las columnas del reporte"""
+        document = ReportDocument.build(title, headers, rows, stream=True, levels=levels)
+        return FullColumnsExcelRenderer().render(document, filename)
+
+def _render_batch_file(renderer: ReportRenderer, document: ReportDocument, filename: str) -> Dict[str, Any]:
+    """Renderiza un formato del lote (se ejecuta en un proceso del pool)"""
+    return renderer.render(document, filename)
+
+
+class BatchExporter:
+    """
+    Exporta el mismo reporte a varios formatos en una sola pasada.
+
+    Los datos se leen y se transforman una única vez (ReportDocument) y
+    cada formato se renderiza en su propio proceso: la generación de
+    XLSX, DOCX y PDF es puro cálculo en Python, así que en hilos se
+    serializaría en el GIL. Con pocos registros el arranque de los
+    procesos cuesta más de lo que ahorra y se renderiza en el proceso
+    actual. El resultado queda en una carpeta o en un único archivo .zip.
+    """
+
+    # Filas a partir de las cuales conviene repartir los formatos en procesos
+    PROCESS_POOL_MIN_ROWS = 2000
+
+    # Cada cuánto se consulta el pool para informar avance y atender la cancelación
+    POLL_SECONDS = 0.5
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 min_rows_for_processes: int = PROCESS_POOL_MIN_ROWS):
+        self.max_workers = max_workers
+        self.min_rows_for_processes = min_rows_for_processes
+
+    def export(self, document: ReportDocument, destination: str, base_name: str,
+               extensions: Sequence[str], as_zip: bool = False,
+               progress: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Genera todos los formatos pedidos a partir del mismo documento.
+
+        Args:
+            document: Documento ya construido
+            destination: Carpeta de salida (se crea si no existe)
+            base_name: Nombre de los archivos, sin extensión
+            extensions: Extensiones a generar ('.xlsx', '.docx', '.pdf')
+            as_zip: Si True, los archivos se empaquetan en destination/base_name.zip
+            progress: Callback(porcentaje, mensaje); puede lanzar una excepción para cancelar
+
+        Returns:
+            dict: Resumen del documento con 'filename' (carpeta o .zip) y 'files'
+        """
+        extensions = list(dict.fromkeys(extension.lower() for extension in extensions))
+        if not extensions:
+            raise ValueError("Seleccione al menos un formato de exportación")
+
+        renderers = {extension: DataExporter.renderer_for(base_name + extension) for extension in extensions}
+        for renderer in renderers.values():
+            renderer.check_available()
+
+        os.makedirs(destination, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="viajex_lote_") if as_zip else destination
+        targets = {extension: os.path.join(work_dir, base_name + extension) for extension in extensions}
+
+        try:
+            self._render_all(document, renderers, targets, progress)
+
+            if as_zip:
+                archive = os.path.join(destination, base_name + ".zip")
+                with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                    for path in targets.values():
+                        zip_file.write(path, os.path.basename(path))
+                files = [archive]
             else:
-                message = f"✅ Word exportado exitosamente:\n\n{filename}"
-            
-            messagebox.showinfo("Exportación exitosa", message)
-            return filename
-            
-        except Exception as e:
-            messagebox.showerror("❌ Error", f"No se pudo exportar a Word:\n\n{str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None        
-        
+                files = list(targets.values())
+        except BaseException:
+            if not as_zip:
+                self._discard(targets.values())
+            raise
+        finally:
+            if as_zip:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        result = document.result(files[0] if as_zip else destination)
+        result['files'] = files
+        return result
+
+    def _render_all(self, document: ReportDocument, renderers: Dict[str, ReportRenderer],
+                    targets: Dict[str, str], progress: Optional[Callable[[int, str], None]]):
+        total = len(targets)
+
+        if total == 1 or len(document.rows) < self.min_rows_for_processes:
+            for index, (extension, filename) in enumerate(targets.items()):
+                if progress:
+                    progress(index * 100 // total, f"Generando {extension} ({index + 1} de {total})")
+                renderers[extension].render(document, filename)
+            if progress:
+                progress(100, f"Formatos generados: {total} de {total}")
+            return
+
+        workers = min(total, self.max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(_render_batch_file, renderers[extension], document, filename)
+                for extension, filename in targets.items()
+            }
+            try:
+                if progress:
+                    progress(0, f"Generando {total} formatos en paralelo...")
+                while pending:
+                    finished, pending = wait(pending, timeout=self.POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+                    if progress:
+                        done = total - len(pending)
+                        progress(done * 100 // total, f"Formatos generados: {done} de {total}")
+            except BaseException:
+                # Los formatos que aún no empezaron se descartan; al salir del
+                # with se espera a los que están en curso antes de borrar nada
+                for future in pending:
+                    future.cancel()
+                raise
+
     @staticmethod
-    def export_to_pdf(tree: ttk.Treeview, title: str, filename: str = None) -> Optional[str]:
-        """Exporta Treeview a PDF con tablas separadas por departamento"""
-        if not HAS_PDF:
-            messagebox.showerror("Error", "reportlab no está instalado. Instálelo con: pip install reportlab")
-            return None
+    def _discard(paths: Iterable[str]):
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class TreeviewExporter:
+    """Exportador genérico para Treeview de tkinter"""
+    
+    
+    @staticmethod
+    def get_treeview_data(tree: ttk.Treeview, hierarchical=True):
+        """
+        Extrae todos los datos del Treeview con transformación jerárquica automática
         
-        if not filename:
-            filename = filedialog.asksaveasfilename(
+        Args:
+            hierarchical: Si True, intenta transformar a estructura jerárquica
+        
+        Returns:
+            tuple: (encabezados, datos, estructura_jerarquica)
+        """
+        # Obtener encabezados
+        headers = [tree.heading(col)['text'] for col in tree['columns']]
+        
+        # Obtener datos
+        # En modo virtual (SmartTreeview) el widget solo contiene la ventana
+        # visible: las filas se leen del modelo
+        model = getattr(tree, 'virtual_model', None)
+        if model is not None:
+            data = [list(row) for row in model.all_rows()]
+        else:
+            data = [tree.item(item)['values'] for item in tree.get_children()]
+        
+        # Aplicar transformación jerárquica si está habilitada y hay datos
+        hierarchical_structure = None
+        if hierarchical and headers and data:
+            hierarchical_structure = DataHierarchyTransformer.transform_to_hierarchical(headers, data)
+        
+        return headers, data, hierarchical_structure
+    
+    # Formatos de exportación: renderizador y textos de la interfaz
+    EXPORT_FORMATS = {
+        'excel': {
+            'renderer': ExcelRenderer,
+            'name': 'Excel',
+            'heading': "✅ EXCEL :",
+            'dialog': dict(
+                defaultextension=".xlsx",
+                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+                title="Guardar como Excel"
+            ),
+        },
+        'word': {
+            'renderer': WordRenderer,
+            'name': 'Word',
+            'heading': "✅ WORD con tablas separadas exportado:",
+            'dialog': dict(
+                defaultextension=".docx",
+                filetypes=[("Word files", "*.docx"), ("All files", "*.*")],
+                title="Guardar como Word (Tablas separadas)"
+            ),
+        },
+        'pdf': {
+            'renderer': PdfRenderer,
+            'name': 'PDF',
+            'heading': "✅ PDF con tablas separadas exportado:",
+            'dialog': dict(
                 defaultextension=".pdf",
                 filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
                 title="Guardar como PDF (Tablas separadas)"
-            )
-            
-        if not filename:
-            return None
+            ),
+        },
+        'excel_full': {
+            'renderer': FullColumnsExcelRenderer,
+            'name': 'Excel',
+            'heading': "✅ EXCEL :",
+            'plain': "✅ Excel exportado:",
+            'summary': False,
+            'requires_rows': True,
+            'dialog': dict(
+                defaultextension=".xlsx",
+                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+                title="Guardar como Excel "
+            ),
+        },
+    }
+    
+    @staticmethod
+    def _success_message(export_format: dict, result: Dict[str, Any]) -> str:
+        if not result['hierarchical']:
+            plain = export_format.get('plain', f"✅ {export_format['name']} exportado exitosamente:")
+            return f"{plain}\n\n{result['filename']}"
+        if not export_format.get('summary', True):
+            return f"{export_format['heading']}\n\n📂 {result['filename']}\n\n"
+        return (
+            f"{export_format['heading']}\n\n"
+            f"📂 {result['filename']}\n\n"
+            f"• Tablas por departamento: {result['departments']}\n"
+            f"• Total General: ${result['total_general']:,.2f}\n"
+            f"• Incluye resumen detallado"
+        )
+    
+    @staticmethod
+    def _read_for_export(tree: ttk.Treeview, export_format: dict, filename: Optional[str] = None):
+        """
+        Comprueba la dependencia, pide el archivo y lee el Treeview una sola vez.
         
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib import colors
-            from reportlab.lib.units import inch
-            
-            # Obtener datos con transformación jerárquica automática
-            headers, _, hierarchical_structure = TreeviewExporter.get_treeview_data(tree, hierarchical=True)
-            
-            if not headers:
-                messagebox.showwarning("Sin datos", "No hay datos para exportar")
-                return None
-            
-            # Función para abreviar encabezados específicos
-            def abreviar_encabezado(header):
-                header_str = str(header)
-                abreviaciones = {
-                    'Desayunos': 'D',
-                    'Almuerzos': 'A', 
-                    'Cenas': 'C',
-                    'Alojamientos': 'H',
-                }
-                for key, value in abreviaciones.items():
-                    if key in header_str:
-                        return value
-                return header_str
-            
-            # Crear documento PDF con márgenes optimizados
-            doc = SimpleDocTemplate(
-                filename, 
-                pagesize=A4,
-                topMargin=0.5*inch, 
-                bottomMargin=0.5*inch,
-                leftMargin=0.4*inch,  # Reducido para más espacio
-                rightMargin=0.4*inch
-            )
-            elements = []
-            
-            # Estilos
-            styles = getSampleStyleSheet()
-            
-            # Título principal
-            title_style = ParagraphStyle(
-                'MainTitle',
-                parent=styles['Heading1'],
-                fontSize=14,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=8,
-                alignment=1,
-                fontName='Helvetica-Bold'
-            )
-            
-            main_title = Paragraph(title, title_style)
-            elements.append(main_title)
-            
-            # Subtítulo informativo si hay jerarquía
-            if hierarchical_structure:
-                subtitle_style = ParagraphStyle(
-                    'Subtitle',
-                    parent=styles['Normal'],
-                    fontSize=11,
-                    textColor=colors.HexColor('#27ae60'),
-                    alignment=1,
-                    spaceAfter=10
-                )
-                
-                subtitle = Paragraph("📊 REPORTE POR DEPARTAMENTOS", subtitle_style)
-                elements.append(subtitle)
-            
-            # Fecha de exportación
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=9,
-                textColor=colors.HexColor('#666666'),
-                alignment=1,
-                spaceAfter=12
-            )
-            
-            date_para = Paragraph(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", date_style)
-            elements.append(date_para)
-            
-            elements.append(Spacer(1, 0.15*inch))
-            
-            if hierarchical_structure:
-                # PROCESAR POR DEPARTAMENTOS
-                departments_data = {}
-                current_dept = None
-                
-                for item in hierarchical_structure['hierarchical_data']:
-                    if item['type'] == 'department_header':
-                        current_dept = item['department']
-                        departments_data[current_dept] = {
-                            'header': item,
-                            'employees': [],
-                            'subtotal': item.get('subtotal', 0)
-                        }
-                    elif item['type'] == 'employee_row' and current_dept:
-                        departments_data[current_dept]['employees'].append(item)
-                
-                total_general = 0
-                
-                # CREAR UNA SECCIÓN POR CADA DEPARTAMENTO
-                for dept_idx, (dept_name, dept_info) in enumerate(departments_data.items()):
-                    # Título del departamento
-                    dept_title_style = ParagraphStyle(
-                        'DeptTitle',
-                        parent=styles['Heading2'],
-                        fontSize=11,
-                        textColor=colors.HexColor('#2c3e50'),
-                        spaceAfter=8,
-                        leftIndent=0,
-                        fontName='Helvetica-Bold',
-                        backColor=colors.HexColor('#e8f4f8'),
-                        borderPadding=(6, 6, 6, 6)
-                    )
-                    
-                    dept_text = f"📊 {dept_name}"
-                    if dept_info['subtotal'] > 0:
-                        dept_text += f" - Subtotal: ${dept_info['subtotal']:,.2f}"
-                        total_general += dept_info['subtotal']
-                    
-                    dept_title = Paragraph(dept_text, dept_title_style)
-                    elements.append(dept_title)
-                    
-                    # Crear tabla para este departamento
-                    num_employees = len(dept_info['employees'])
-                    if num_employees > 0:
-                        # Identificar índices de columnas a excluir
-                        indices_a_excluir = []
-                        
-                        # 1. Columna de departamento (siempre)
-                        if hierarchical_structure['indices'].get('department') is not None:
-                            indices_a_excluir.append(hierarchical_structure['indices']['department'])
-                        
-                        # 2. Columna "N° Anticipo" y "N° Liquidación"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['anticipo', 'n° anticipo', 'n anticipo', 'nº anticipo', 'numero anticipo',
-                                                                        'no. anticipo', 'liquidación', 'n° liquidación', 'n liquidación', 
-                                                                        'nº liquidación', 'numero liquidación', 'no. liquidación']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        # 3. Columna "Estado"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['estado', 'status', 'situacion']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        indices_a_excluir.sort()
-                        
-                        # Construir encabezados de la tabla
-                        table_headers = []
-                        for i, header in enumerate(headers):
-                            if i in indices_a_excluir:
-                                continue
-                            header_abreviado = abreviar_encabezado(header)
-                            table_headers.append(header_abreviado)
-                        
-                        # Construir datos de la tabla
-                        table_data = [table_headers]
-                        
-                        for idx, emp_item in enumerate(dept_info['employees']):
-                            row_data = emp_item['data']
-                            table_row = []
-                            
-                            for i, cell_data in enumerate(row_data):
-                                if i in indices_a_excluir:
-                                    continue
-                                
-                                # Formatear nombre del empleado con numeración usando Paragraph para ajuste de texto
-                                if i == hierarchical_structure['indices'].get('employee'):
-                                    employee_name = cell_data
-                                    clean_name = str(employee_name).replace('   ├── ', '').replace('├── ', '')
-                                    # Crear Paragraph con estilo que permita wrap de texto
-                                    employee_style = ParagraphStyle(
-                                        'EmployeeStyle',
-                                        parent=styles['Normal'],
-                                        fontSize=8,
-                                        wordWrap='CJK',  # Permite wrap de texto
-                                        leading=10,  # Espacio entre líneas
-                                    )
-                                    table_row.append(Paragraph(f"{idx + 1}. {clean_name}", employee_style))
-                                else:
-                                    table_row.append(str(cell_data) if cell_data is not None else "")
-                            
-                            table_data.append(table_row)
-                        
-                        # Crear tabla
-                        if table_data and len(table_data[0]) > 0:
-                            num_cols = len(table_data[0])
-                            
-                            # Calcular anchos de columna proporcionales
-                            col_widths = []
-                            total_width = doc.width
-                            
-                            # Distribución inteligente de anchos
-                            if num_cols <= 4:
-                                # Poco columnas: distribuir equitativamente
-                                col_width = total_width / num_cols
-                                col_widths = [col_width] * num_cols
-                            else:
-                                # Muchas columnas: dar más espacio a la primera (empleado)
-                                col_widths = [total_width * 0.35]  # 35% para empleado
-                                # Resto dividido entre las otras columnas
-                                remaining_width = total_width * 0.65
-                                other_cols_width = remaining_width / (num_cols - 1)
-                                col_widths.extend([other_cols_width] * (num_cols - 1))
-                            
-                            table = Table(table_data, colWidths=col_widths, repeatRows=1)
-                            
-                            # ESTILO DE LA TABLA MEJORADO
-                            table_style = TableStyle([
-                                # Encabezados
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                                ('TOPPADDING', (0, 0), (-1, 0), 6),
-                                
-                                # Bordes finos
-                                ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor("#dddddd")),
-                                
-                                # Filas alternadas con mejor contraste
-                                ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-                                [colors.white, colors.HexColor("#f5f7fa")]),
-                                
-                                # Alineación y padding mejorado
-                                ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                                ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alinear arriba para mejor ajuste
-                                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                                
-                                # Padding interno para evitar superposición
-                                ('LEFTPADDING', (0, 1), (-1, -1), 8),
-                                ('RIGHTPADDING', (0, 1), (-1, -1), 8),
-                                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                                
-                                # Ajuste especial para la columna del empleado (más espacio)
-                                ('LEFTPADDING', (0, 1), (0, -1), 12),
-                                ('RIGHTPADDING', (0, 1), (0, -1), 10),
-                            ])
-                            
-                            # Alinear montos a la derecha
-                            for col_idx, header in enumerate(table_headers):
-                                if any(keyword in str(header).lower() for keyword in ['gasto', 'monto', 'total', 'precio', 'costo', '$', 'saldo']):
-                                    table_style.add('ALIGN', (col_idx, 1), (col_idx, -1), 'RIGHT')
-                            
-                            table.setStyle(table_style)
-                            elements.append(table)
-                            elements.append(Spacer(1, 0.25*inch))
-                    
-                    # Espacio entre departamentos
-                    if dept_idx < len(departments_data) - 1:
-                        elements.append(Spacer(1, 0.15*inch))
-                
-                # Salto de página para el resumen
-                elements.append(PageBreak())
-                
-                # Tabla de resumen final
-                summary_title_style = ParagraphStyle(
-                    'SummaryTitle',
-                    parent=styles['Heading2'],
-                    fontSize=12,
-                    textColor=colors.HexColor('#2c3e50'),
-                    spaceAfter=12,
-                    alignment=1
-                )
-                
-                summary_title = Paragraph("📊 RESUMEN DE DEPARTAMENTOS", summary_title_style)
-                elements.append(summary_title)
-                
-                # Crear tabla de resumen
-                summary_data = [["DEPARTAMENTO", "SUBTOTAL"]]
-                
-                for dept_name, dept_info in departments_data.items():
-                    summary_data.append([dept_name, f"${dept_info['subtotal']:,.2f}"])
-                
-                summary_data.append(["TOTAL GENERAL", f"${total_general:,.2f}"])
-                
-                summary_table = Table(summary_data, colWidths=[doc.width * 0.7, doc.width * 0.3])
-                
-                # Estilo mejorado para la tabla de resumen
-                summary_style = TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
-                    
-                    ('ALIGN', (1, 1), (1, -2), 'RIGHT'),
-                    ('FONTNAME', (1, -1), (1, -1), 'Helvetica-Bold'),
-                    ('BACKGROUND', (1, -1), (1, -1), colors.HexColor("#27ae60")),
-                    ('TEXTCOLOR', (1, -1), (1, -1), colors.white),
-                    
-                    # Padding mejorado
-                    ('LEFTPADDING', (0, 1), (-1, -1), 10),
-                    ('RIGHTPADDING', (0, 1), (-1, -1), 10),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ])
-                
-                # También aplicar estilo a la primera columna del total
-                summary_style.add('BACKGROUND', (0, -1), (0, -1), colors.HexColor("#27ae60"))
-                summary_style.add('TEXTCOLOR', (0, -1), (0, -1), colors.white)
-                
-                summary_table.setStyle(summary_style)
-                elements.append(summary_table)
-            else:
-                # FALLBACK: Tabla plana (sin jerarquía)
-                _, flat_data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
-                
-                # Construir tabla completa
-                table_data = [headers] + flat_data
-                
-                num_cols = len(headers)
-                if num_cols > 0:
-                    col_widths = [doc.width / num_cols] * num_cols
-                    table = Table(table_data, colWidths=col_widths, repeatRows=1)
-                    
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
-                        
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-                        [colors.white, colors.HexColor("#f5f7fa")]),
-                        
-                        # Padding para evitar superposición
-                        ('LEFTPADDING', (0, 1), (-1, -1), 8),
-                        ('RIGHTPADDING', (0, 1), (-1, -1), 8),
-                    ]))
-                    
-                    elements.append(table)
-            
-            # Pie de página mejorado
-            elements.append(Spacer(1, 0.3*inch))
-            
-            footer_style = ParagraphStyle(
-                'Footer',
-                parent=styles['Italic'],
-                fontSize=8,
-                textColor=colors.HexColor('#666666'),
-                alignment=1,
-                spaceBefore=10
-            )
-            
-            footer_text = "Sistema de Gestión de Dietas VIAJEX"
-            if hierarchical_structure:
-                footer_text += f" • {len(departments_data)} departamentos procesados"
-            
-            footer = Paragraph(footer_text, footer_style)
-            elements.append(footer)
-            
-            # Construir documento
-            doc.build(elements)
+        Debe llamarse desde el hilo de Tk.
+        
+        Returns:
+            tuple: (archivo, encabezados, datos) o None si no hay nada que exportar
+        """
+        if not export_format['renderer'].available:
+            package = export_format['renderer'].package
+            messagebox.showerror("Error", f"{package} no está instalado. Instálelo con: pip install {package}")
+            return None
+        
+        if not filename:
+            filename = filedialog.asksaveasfilename(**export_format['dialog'])
             
-            # Mensaje de éxito
-            if hierarchical_structure:
-                message = (
-                    f"✅ PDF con tablas separadas exportado:\n\n"
-                    f"📂 {filename}\n\n"
-                    f"• Tablas por departamento: {len(departments_data)}\n"
-                    f"• Total General: ${total_general:,.2f}\n"
-                    f"• Incluye resumen detallado"
-                )
-            else:
-                message = f"✅ PDF exportado exitosamente:\n\n{filename}"
+        if not filename:
+            return None
+        
+        headers, data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
+        
+        if not headers or (export_format.get('requires_rows') and not data):
+            messagebox.showwarning("Sin datos", "No hay datos para exportar")
+            return None
+        
+        return filename, headers, data
+    
+    @staticmethod
+    def _export_done(export_format: dict, result: Dict[str, Any]):
+        messagebox.showinfo("Exportación exitosa", TreeviewExporter._success_message(export_format, result))
+    
+    @staticmethod
+    def _export_failed(export_format: dict, error: Exception):
+        messagebox.showerror("❌ Error", f"No se pudo exportar a {export_format['name']}:\n\n{str(error)}")
+    
+    @staticmethod
+    def _export(tree: ttk.Treeview, title: str, filename: Optional[str], format_key: str,
+                levels: Sequence[str] = ('department',)) -> Optional[str]:
+        """Exportación síncrona: lee el Treeview y delega la generación en el renderizador"""
+        export_format = TreeviewExporter.EXPORT_FORMATS[format_key]
+        try:
+            prepared = TreeviewExporter._read_for_export(tree, export_format, filename)
+            if prepared is None:
+                return None
             
-            messagebox.showinfo("Exportación exitosa", message)
+            filename, headers, data = prepared
+            renderer = export_format['renderer']()
+            document = ReportDocument.build(title, headers, data, stream=renderer.streams_rows, levels=levels)
+            result = renderer.render(document, filename)
+            TreeviewExporter._export_done(export_format, result)
             return filename
             
         except Exception as e:
-            messagebox.showerror("❌ Error", f"No se pudo exportar a PDF:\n\n{str(e)}")
+            TreeviewExporter._export_failed(export_format, e)
             import traceback
             traceback.print_exc()
-            return None    
+            return None
+    
+    @staticmethod
+    def _job_progress(job: ExportJob, start: int) -> Callable[[int, str], None]:
+        """Traduce el avance del renderizador al tramo restante de la barra del trabajo"""
+        def progress(percent: int, message: str):
+            job.update(start + (100 - start) * percent // 100, message)
+        return progress
+    
+    @staticmethod
+    def submit_export(tree: ttk.Treeview, title: str, format_key: str,
+                      levels: Sequence[str] = ('department',)) -> Optional[ExportJob]:
+        """
+        Encola la exportación en segundo plano.
+        
+        El Treeview se lee en el hilo de Tk; el archivo se genera en el
+        ExportJobRunner de la ventana, que muestra el avance y permite
+        cancelar. Si se cancela, el archivo parcial se elimina.
+        
+        Returns:
+            ExportJob encolado, o None si el usuario no eligió archivo o no hay datos
+        """
+        export_format = TreeviewExporter.EXPORT_FORMATS[format_key]
+        prepared = TreeviewExporter._read_for_export(tree, export_format)
+        if prepared is None:
+            return None
+        
+        filename, headers, data = prepared
+        renderer = export_format['renderer']()
+        
+        def task(job: ExportJob):
+            document = ReportDocument.build(title, headers, job.track(data, end=10, message="Leyendo filas"),
+                                            stream=renderer.streams_rows, levels=levels)
+            return renderer.render(document, filename, TreeviewExporter._job_progress(job, 10))
+        
+        return submit_export_job(
+            tree,
+            f"{export_format['name']}: {title}",
+            task,
+            output_path=filename,
+            on_done=lambda result: TreeviewExporter._export_done(export_format, result),
+            on_error=lambda error: TreeviewExporter._export_failed(export_format, error)
+        )
+    
+    @staticmethod
+    def submit_batch_export(tree: ttk.Treeview, title: str, extensions: Sequence[str],
+                            destination: str, base_name: str, as_zip: bool = False,
+                            levels: Sequence[str] = ('department',)) -> Optional[ExportJob]:
+        """
+        Encola la exportación del Treeview a varios formatos a la vez.
+        
+        El Treeview se lee una sola vez en el hilo de Tk; el documento se
+        arma una vez en el trabajo y BatchExporter genera los formatos en
+        paralelo dentro de la carpeta destino o de un .zip.
+        
+        Returns:
+            ExportJob encolado, o None si no hay datos
+        """
+        headers, data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
+        
+        if not headers:
+            messagebox.showwarning("Sin datos", "No hay datos para exportar")
+            return None
+        
+        def task(job: ExportJob):
+            document = ReportDocument.build(title, headers, job.track(data, end=10, message="Leyendo filas"),
+                                            levels=levels)
+            return BatchExporter().export(
+                document, destination, base_name, extensions, as_zip,
+                TreeviewExporter._job_progress(job, 10)
+            )
+        
+        def done(result: Dict[str, Any]):
+            files = "\n".join(f"📄 {os.path.basename(path)}" for path in result['files'])
+            message = f"✅ Exportación en {len(extensions)} formatos:\n\n📂 {result['filename']}\n\n{files}"
+            if result['hierarchical']:
+                message += (
+                    f"\n\n• Tablas por departamento: {result['departments']}\n"
+                    f"• Total General: ${result['total_general']:,.2f}"
+                )
+            messagebox.showinfo("Exportación exitosa", message)
+        
+        def failed(error: Exception):
+            messagebox.showerror("❌ Error", f"No se pudo completar la exportación por lotes:\n\n{str(error)}")
+        
+        return submit_export_job(
+            tree,
+            f"{len(extensions)} formatos: {title}",
+            task,
+            on_done=done,
+            on_error=failed
+        )
+    
+    @staticmethod
+    def export_multiple(tree: ttk.Treeview, title: str) -> Optional[ExportJob]:
+        """Pide formatos y destino con ExportOptionsDialog y encola la exportación por lotes"""
+        from presentation.gui.reports_presentation.dialogs.export_options_dialog import ExportOptionsDialog
+        
+        formats = [
+            format_name for format_name, available in (
+                ("Excel (.xlsx)", HAS_EXCEL), ("Word (.docx)", HAS_WORD), ("PDF (.pdf)", HAS_PDF)
+            ) if available
+        ]
+        if not formats:
+            TreeviewExporter.show_dependency_help()
+            return None
+        
+        options = ExportOptionsDialog(
+            tree.winfo_toplevel(),
+            report_name=title,
+            available_formats=formats,
+            default_filename=title.replace(" ", "_")
+        ).show()
+        if not options:
+            return None
+        
+        return TreeviewExporter.submit_batch_export(
+            tree, title, options['formats'], options['location'],
+            options['base_filename'], options['compress_file'], options['group_levels']
+        )
+    
+    @staticmethod
+    def export_to_excel(tree: ttk.Treeview, title: str, filename: str = None,
+                        levels: Sequence[str] = ('department',)) -> Optional[str]:
+        """Exporta Treeview a Excel con tablas separadas por departamento"""
+        return TreeviewExporter._export(tree, title, filename, 'excel', levels)
+        
+    @staticmethod
+    def export_to_word(tree: ttk.Treeview, title: str, filename: str = None,
+                       levels: Sequence[str] = ('department',)) -> Optional[str]:
+        """Exporta Treeview a Word con tablas separadas por departamento"""
+        return TreeviewExporter._export(tree, title, filename, 'word', levels)
+        
+    @staticmethod
+    def export_to_pdf(tree: ttk.Treeview, title: str, filename: str = None,
+                      levels: Sequence[str] = ('department',)) -> Optional[str]:
+        """Exporta Treeview a PDF con tablas separadas por departamento"""
+        return TreeviewExporter._export(tree, title, filename, 'pdf', levels)
+    
+    @staticmethod
+    def export_to_excel_full_columns(tree: ttk.Treeview, title: str, filename: str = None,
+                                     levels: Sequence[str] = ('department',)) -> Optional[str]:
+        """Exporta Treeview a Excel con todas las columnas del reporte"""
+        return TreeviewExporter._export(tree, title, filename, 'excel_full', levels)
                 
     @staticmethod
     def show_dependency_help():
@@ -1403,1113 +2055,116 @@ class TreeviewExporter:
         """
         messagebox.showinfo("Dependencias requeridas", help_text)
 
+    @staticmethod
+    def _print_filename() -> str:
+        """Ruta del PDF temporal que se envía a imprimir"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(tempfile.gettempdir(), f"impresion_{timestamp}.pdf")
+    
+    @staticmethod
+    def _open_for_printing(temp_filename: str) -> bool:
+        """Abre el PDF generado para imprimirlo y programa su eliminación"""
+        temp_dir = os.path.dirname(temp_filename)
+        
+        # Ahora abrir el PDF para imprimir 
+        system = platform.system()
+
+        if system == "Windows":
+            try:
+
+                import time
+                time.sleep(1)  # Esperar un segundo para que se abra el PDF
+
+                messagebox.showinfo(
+                    "📄 Imprimir documento",
+                    "Se ha abierto el documento PDF en su visor predeterminado.\n\n"
+                    "Para imprimir:\n"
+                    "1. Presione Ctrl+P en el visor de PDF\n"
+                    "2. Seleccione su impresora\n"
+                    "3. Ajuste las configuraciones si es necesario\n"
+                    "4. Haga clic en 'Imprimir'\n\n"
+                    f"Archivo: {temp_filename}\n"
+                    f"Este archivo se eliminará automáticamente."
+                )
+
+                os.startfile(temp_filename)
+            except Exception as e:
+                # Si no se puede abrir, mostrar el archivo en el explorador
+                messagebox.showinfo(
+                    "📄 Localizar archivo para imprimir",
+                    f"No se pudo abrir el PDF automáticamente.\n\n"
+                    f"Por favor, abra manualmente el archivo:\n\n"
+                    f"{temp_filename}\n\n"
+                    f"Y luego imprímalo con Ctrl+P."
+                )
+                # Abrir el explorador en la carpeta
+                os.startfile(temp_dir)
+
+        # Programar eliminación del archivo temporal (después de 60 segundos)
+        def delete_temp_file():
+            try:
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+            except:
+                pass
+
+        import threading
+        timer = threading.Timer(60.0, delete_temp_file)
+        timer.start()
+
+        return True
+
+    @staticmethod
+    def _print_failed(error: Exception):
+        messagebox.showerror("❌ Error de impresión", 
+                        f"No se pudo preparar la impresión:\n\n{str(error)}")
+
     @staticmethod
     def print_directly(tree: ttk.Treeview, title: str) -> bool:
         """Imprime directamente sin mostrar vista previa"""
         try:
-            # Crear un PDF temporal con el MISMO formato que export_to_pdf
-            temp_dir = tempfile.gettempdir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            temp_filename = os.path.join(temp_dir, f"impresion_{timestamp}.pdf")
-                   
-            # Obtener datos con transformación jerárquica automática
-            headers, _, hierarchical_structure = TreeviewExporter.get_treeview_data(tree, hierarchical=True)
+            headers, data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
             
             if not headers:
                 messagebox.showwarning("Sin datos", "No hay datos para imprimir")
                 return False
             
-            # Función para abreviar encabezados específicos (IDÉNTICA a export_to_pdf)
-            def abreviar_encabezado(header):
-                header_str = str(header)
-                abreviaciones = {
-                    'Desayunos': 'D',
-                    'Almuerzos': 'A', 
-                    'Cenas': 'C',
-                    'Alojamientos': 'H',
-                }
-                for key, value in abreviaciones.items():
-                    if key in header_str:
-                        return value
-                return header_str
-            
-            # Crear documento PDF con márgenes optimizados (IDÉNTICO a export_to_pdf)
-            doc = SimpleDocTemplate(
-                temp_filename, 
-                pagesize=A4,
-                topMargin=0.5*inch, 
-                bottomMargin=0.5*inch,
-                leftMargin=0.4*inch,
-                rightMargin=0.4*inch
-            )
-            elements = []
-            
-            # Estilos (IDÉNTICOS a export_to_pdf)
-            styles = getSampleStyleSheet()
-            
-            # Título principal (IDÉNTICO a export_to_pdf)
-            title_style = ParagraphStyle(
-                'MainTitle',
-                parent=styles['Heading1'],
-                fontSize=14,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=8,
-                alignment=1,
-                fontName='Helvetica-Bold'
-            )
-            
-            main_title = Paragraph(title, title_style)
-            elements.append(main_title)
-            
-            # Subtítulo informativo si hay jerarquía (IDÉNTICO a export_to_pdf)
-            if hierarchical_structure:
-                subtitle_style = ParagraphStyle(
-                    'Subtitle',
-                    parent=styles['Normal'],
-                    fontSize=11,
-                    textColor=colors.HexColor('#27ae60'),
-                    alignment=1,
-                    spaceAfter=10
-                )
-                
-                subtitle = Paragraph("📊 REPORTE POR DEPARTAMENTOS", subtitle_style)
-                elements.append(subtitle)
-            
-            # Fecha de exportación (IDÉNTICO a export_to_pdf)
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=9,
-                textColor=colors.HexColor('#666666'),
-                alignment=1,
-                spaceAfter=12
-            )
-            
-            date_para = Paragraph(f"Impreso: {datetime.now().strftime('%d/%m/%Y %H:%M')}", date_style)
-            elements.append(date_para)
-            
-            elements.append(Spacer(1, 0.15*inch))
-            
-            if hierarchical_structure:
-                # PROCESAR POR DEPARTAMENTOS 
-                departments_data = {}
-                current_dept = None
-                
-                for item in hierarchical_structure['hierarchical_data']:
-                    if item['type'] == 'department_header':
-                        current_dept = item['department']
-                        departments_data[current_dept] = {
-                            'header': item,
-                            'employees': [],
-                            'subtotal': item.get('subtotal', 0)
-                        }
-                    elif item['type'] == 'employee_row' and current_dept:
-                        departments_data[current_dept]['employees'].append(item)
-                
-                total_general = 0
-                
-                # CREAR UNA SECCIÓN POR CADA DEPARTAMENTO 
-                for dept_idx, (dept_name, dept_info) in enumerate(departments_data.items()):
-                    # Título del departamento
-                    dept_title_style = ParagraphStyle(
-                        'DeptTitle',
-                        parent=styles['Heading2'],
-                        fontSize=11,
-                        textColor=colors.HexColor('#2c3e50'),
-                        spaceAfter=8,
-                        leftIndent=0,
-                        fontName='Helvetica-Bold',
-                        backColor=colors.HexColor('#e8f4f8'),
-                        borderPadding=(6, 6, 6, 6)
-                    )
-                    
-                    dept_text = f"📊 {dept_name}"
-                    if dept_info['subtotal'] > 0:
-                        dept_text += f" - Subtotal: ${dept_info['subtotal']:,.2f}"
-                        total_general += dept_info['subtotal']
-                    
-                    dept_title = Paragraph(dept_text, dept_title_style)
-                    elements.append(dept_title)
-                    
-                    # Crear tabla para este departamento 
-                    num_employees = len(dept_info['employees'])
-                    if num_employees > 0:
-                        # Identificar índices de columnas a excluir 
-                        indices_a_excluir = []
-                        
-                        # 1. Columna de departamento (siempre)
-                        if hierarchical_structure['indices'].get('department') is not None:
-                            indices_a_excluir.append(hierarchical_structure['indices']['department'])
-                        
-                        # 2. Columna "N° Anticipo" y "N° Liquidación"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['anticipo', 'n° anticipo', 'n anticipo', 'nº anticipo', 'numero anticipo',
-                                                                        'no. anticipo', 'liquidación', 'n° liquidación', 'n liquidación', 
-                                                                        'nº liquidación', 'numero liquidación', 'no. liquidación']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        # 3. Columna "Estado"
-                        for i, header in enumerate(headers):
-                            header_lower = str(header).lower()
-                            if any(keyword in header_lower for keyword in ['estado', 'status', 'situacion']):
-                                if i not in indices_a_excluir:
-                                    indices_a_excluir.append(i)
-                        
-                        indices_a_excluir.sort()
-                        
-                        # Construir encabezados de la tabla (IDÉNTICO a export_to_pdf)
-                        table_headers = []
-                        for i, header in enumerate(headers):
-                            if i in indices_a_excluir:
-                                continue
-                            header_abreviado = abreviar_encabezado(header)
-                            table_headers.append(header_abreviado)
-                        
-                        # Construir datos de la tabla (IDÉNTICO a export_to_pdf)
-                        table_data = [table_headers]
-                        
-                        for idx, emp_item in enumerate(dept_info['employees']):
-                            row_data = emp_item['data']
-                            table_row = []
-                            
-                            for i, cell_data in enumerate(row_data):
-                                if i in indices_a_excluir:
-                                    continue
-                                
-                                # Formatear nombre del empleado con numeración usando Paragraph para ajuste de texto
-                                if i == hierarchical_structure['indices'].get('employee'):
-                                    employee_name = cell_data
-                                    clean_name = str(employee_name).replace('   ├── ', '').replace('├── ', '')
-                                    # Crear Paragraph con estilo que permita wrap de texto
-                                    employee_style = ParagraphStyle(
-                                        'EmployeeStyle',
-                                        parent=styles['Normal'],
-                                        fontSize=8,
-                                        wordWrap='CJK',  # Permite wrap de texto
-                                        leading=10,  # Espacio entre líneas
-                                    )
-                                    table_row.append(Paragraph(f"{idx + 1}. {clean_name}", employee_style))
-                                else:
-                                    table_row.append(str(cell_data) if cell_data is not None else "")
-                            
-                            table_data.append(table_row)
-                        
-                        # Crear tabla 
-                        if table_data and len(table_data[0]) > 0:
-                            num_cols = len(table_data[0])
-                            
-                            # Calcular anchos de columna proporcionales 
-                            col_widths = []
-                            total_width = doc.width
-                            
-                            # Distribución inteligente de anchos 
-                            if num_cols <= 4:
-                                # Poco columnas: distribuir equitativamente
-                                col_width = total_width / num_cols
-                                col_widths = [col_width] * num_cols
-                            else:
-                                # Muchas columnas: dar más espacio a la primera (empleado)
-                                col_widths = [total_width * 0.35]  # 35% para empleado
-                                # Resto dividido entre las otras columnas
-                                remaining_width = total_width * 0.65
-                                other_cols_width = remaining_width / (num_cols - 1)
-                                col_widths.extend([other_cols_width] * (num_cols - 1))
-                            
-                            table = Table(table_data, colWidths=col_widths, repeatRows=1)
-                            
-                            # ESTILO DE LA TABLA MEJORADO (IDÉNTICO a export_to_pdf)
-                            table_style = TableStyle([
-                                # Encabezados
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                                ('TOPPADDING', (0, 0), (-1, 0), 6),
-                                
-                                # Bordes finos
-                                ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor("#dddddd")),
-                                
-                                # Filas alternadas con mejor contraste
-                                ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-                                [colors.white, colors.HexColor("#f5f7fa")]),
-                                
-                                # Alineación y padding mejorado
-                                ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                                ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alinear arriba para mejor ajuste
-                                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                                
-                                # Padding interno para evitar superposición
-                                ('LEFTPADDING', (0, 1), (-1, -1), 8),
-                                ('RIGHTPADDING', (0, 1), (-1, -1), 8),
-                                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                                
-                                # Ajuste especial para la columna del empleado (más espacio)
-                                ('LEFTPADDING', (0, 1), (0, -1), 12),
-                                ('RIGHTPADDING', (0, 1), (0, -1), 10),
-                            ])
-                            
-                            # Alinear montos a la derecha (IDÉNTICO a export_to_pdf)
-                            for col_idx, header in enumerate(table_headers):
-                                if any(keyword in str(header).lower() for keyword in ['gasto', 'monto', 'total', 'precio', 'costo', '$', 'saldo']):
-                                    table_style.add('ALIGN', (col_idx, 1), (col_idx, -1), 'RIGHT')
-                            
-                            table.setStyle(table_style)
-                            elements.append(table)
-                            elements.append(Spacer(1, 0.25*inch))
-                    
-                    # Espacio entre departamentos (IDÉNTICO a export_to_pdf)
-                    if dept_idx < len(departments_data) - 1:
-                        elements.append(Spacer(1, 0.15*inch))
-                
-                # Salto de página para el resumen (IDÉNTICO a export_to_pdf)
-                elements.append(PageBreak())
-                
-                # Tabla de resumen final (IDÉNTICO a export_to_pdf)
-                summary_title_style = ParagraphStyle(
-                    'SummaryTitle',
-                    parent=styles['Heading2'],
-                    fontSize=12,
-                    textColor=colors.HexColor('#2c3e50'),
-                    spaceAfter=12,
-                    alignment=1
-                )
-                
-                summary_title = Paragraph("📊 RESUMEN DE DEPARTAMENTOS", summary_title_style)
-                elements.append(summary_title)
-                
-                # Crear tabla de resumen (IDÉNTICO a export_to_pdf)
-                summary_data = [["DEPARTAMENTO", "SUBTOTAL"]]
-                
-                for dept_name, dept_info in departments_data.items():
-                    summary_data.append([dept_name, f"${dept_info['subtotal']:,.2f}"])
-                
-                summary_data.append(["TOTAL GENERAL", f"${total_general:,.2f}"])
-                
-                summary_table = Table(summary_data, colWidths=[doc.width * 0.7, doc.width * 0.3])
-                
-                # Estilo mejorado para la tabla de resumen (IDÉNTICO a export_to_pdf)
-                summary_style = TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
-                    
-                    ('ALIGN', (1, 1), (1, -2), 'RIGHT'),
-                    ('FONTNAME', (1, -1), (1, -1), 'Helvetica-Bold'),
-                    ('BACKGROUND', (1, -1), (1, -1), colors.HexColor("#27ae60")),
-                    ('TEXTCOLOR', (1, -1), (1, -1), colors.white),
-                    
-                    # Padding mejorado
-                    ('LEFTPADDING', (0, 1), (-1, -1), 10),
-                    ('RIGHTPADDING', (0, 1), (-1, -1), 10),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ])
-                
-                # También aplicar estilo a la primera columna del total (IDÉNTICO a export_to_pdf)
-                summary_style.add('BACKGROUND', (0, -1), (0, -1), colors.HexColor("#27ae60"))
-                summary_style.add('TEXTCOLOR', (0, -1), (0, -1), colors.white)
-                
-                summary_table.setStyle(summary_style)
-                elements.append(summary_table)
-            else:
-                # FALLBACK: Tabla plana (sin jerarquía) - IDÉNTICO a export_to_pdf
-                _, flat_data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
-                
-                # Construir tabla completa
-                table_data = [headers] + flat_data
-                
-                num_cols = len(headers)
-                if num_cols > 0:
-                    col_widths = [doc.width / num_cols] * num_cols
-                    table = Table(table_data, colWidths=col_widths, repeatRows=1)
-                    
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
-                        
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-                        [colors.white, colors.HexColor("#f5f7fa")]),
-                        
-                        # Padding para evitar superposición
-                        ('LEFTPADDING', (0, 1), (-1, -1), 8),
-                        ('RIGHTPADDING', (0, 1), (-1, -1), 8),
-                    ]))
-                    
-                    elements.append(table)
-            
-            # Pie de página mejorado (IDÉNTICO a export_to_pdf)
-            elements.append(Spacer(1, 0.3*inch))
-            
-            footer_style = ParagraphStyle(
-                'Footer',
-                parent=styles['Italic'],
-                fontSize=8,
-                textColor=colors.HexColor('#666666'),
-                alignment=1,
-                spaceBefore=10
-            )
-            
-            footer_text = "Sistema de Gestión de Dietas VIAJEX"
-            if hierarchical_structure:
-                footer_text += f" • {len(departments_data)} departamentos procesados"
-            
-            footer = Paragraph(footer_text, footer_style)
-            elements.append(footer)
-            
-            # Construir documento 
-            doc.build(elements)
-            
-            # Ahora abrir el PDF para imprimir 
-            system = platform.system()
-            
-            if system == "Windows":
-                try:
-                    
-                    import time
-                    time.sleep(1)  # Esperar un segundo para que se abra el PDF
-                    
-                    messagebox.showinfo(
-                        "📄 Imprimir documento",
-                        "Se ha abierto el documento PDF en su visor predeterminado.\n\n"
-                        "Para imprimir:\n"
-                        "1. Presione Ctrl+P en el visor de PDF\n"
-                        "2. Seleccione su impresora\n"
-                        "3. Ajuste las configuraciones si es necesario\n"
-                        "4. Haga clic en 'Imprimir'\n\n"
-                        f"Archivo: {temp_filename}\n"
-                        f"Este archivo se eliminará automáticamente."
-                    )
-                    
-                    os.startfile(temp_filename)
-                except Exception as e:
-                    # Si no se puede abrir, mostrar el archivo en el explorador
-                    messagebox.showinfo(
-                        "📄 Localizar archivo para imprimir",
-                        f"No se pudo abrir el PDF automáticamente.\n\n"
-                        f"Por favor, abra manualmente el archivo:\n\n"
-                        f"{temp_filename}\n\n"
-                        f"Y luego imprímalo con Ctrl+P."
-                    )
-                    # Abrir el explorador en la carpeta
-                    os.startfile(temp_dir)
-            
-            # Programar eliminación del archivo temporal (después de 60 segundos)
-            def delete_temp_file():
-                try:
-                    if os.path.exists(temp_filename):
-                        os.remove(temp_filename)
-                except:
-                    pass
-            
-            import threading
-            timer = threading.Timer(60.0, delete_temp_file)
-            timer.start()
+            # Crear un PDF temporal con el MISMO formato que export_to_pdf
+            temp_filename = TreeviewExporter._print_filename()
+            PdfRenderer(date_label="Impreso").render(ReportDocument.build(title, headers, data), temp_filename)
             
-            return True
+            return TreeviewExporter._open_for_printing(temp_filename)
             
         except Exception as e:
-            messagebox.showerror("❌ Error de impresión", 
-                            f"No se pudo preparar la impresión:\n\n{str(e)}")
+            TreeviewExporter._print_failed(e)
             import traceback
             traceback.print_exc()
             return False
 
     @staticmethod
-    def export_to_excel_full_columns(tree: ttk.Treeview, title: str, filename: str = None) -> Optional[str]:
-        """Exporta Treeview a Excel con todas las columnas del reporte"""
-        if not HAS_EXCEL:
-            messagebox.showerror("Error", "openpyxl no está instalado. Instálelo con: pip install openpyxl")
-            return None
+    def submit_print(tree: ttk.Treeview, title: str) -> Optional[ExportJob]:
+        """Genera el PDF de impresión en segundo plano y lo abre al terminar"""
+        headers, data, _ = TreeviewExporter.get_treeview_data(tree, hierarchical=False)
         
-        if not filename:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                title="Guardar como Excel "
-            )
-            
-        if not filename:
+        if not headers:
+            messagebox.showwarning("Sin datos", "No hay datos para imprimir")
             return None
         
-        try:
-            # Obtener datos del treeview
-            columns = tree['columns']
-            headers = []
-            for col in columns:
-                header = tree.heading(col)['text']
-                headers.append(header)
-            
-            data = []
-            for item in tree.get_children():
-                values = tree.item(item)['values']
-                data.append(values)
-            
-            if not headers or not data:
-                messagebox.showwarning("Sin datos", "No hay datos para exportar")
-                return None
-            
-            # Detectar índices de columnas importantes
-            def detect_columns():
-                indices = {
-                    'departamento': None,
-                    'solicitante': None,
-                    'monto_efec': None,
-                    'monto_card': None,
-                    'gasto_efec': None,
-                    'gasto_card': None,
-                    'estado': None
-                }
-                
-                for i, header in enumerate(headers):
-                    header_str = str(header).lower()
-                    
-                    if indices['departamento'] is None:
-                        if any(keyword in header_str for keyword in ['departamento', 'depto', 'unidad', 'area']):
-                            indices['departamento'] = i
-                    
-                    if indices['solicitante'] is None:
-                        if any(keyword in header_str for keyword in ['solicitante', 'empleado', 'nombre', 'fullname']):
-                            indices['solicitante'] = i
-                    
-                    if indices['monto_efec'] is None:
-                        if any(keyword in header_str for keyword in ['s.e', 'efec', 'efectivo solicitado', 'monto efec']):
-                            indices['monto_efec'] = i
-                    
-                    if indices['monto_card'] is None:
-                        if any(keyword in header_str for keyword in ['s.t', 'tarjeta solicitado', 'monto card', 'tarjeta']):
-                            indices['monto_card'] = i
-                    
-                    if indices['gasto_efec'] is None:
-                        if any(keyword in header_str for keyword in ['g.e', 'gasto efec', 'gasto efectivo']):
-                            indices['gasto_efec'] = i
-                    
-                    if indices['gasto_card'] is None:
-                        if any(keyword in header_str for keyword in ['g.t', 'gasto card', 'gasto tarjeta']):
-                            indices['gasto_card'] = i
-                    
-                    if indices['estado'] is None:
-                        if any(keyword in header_str for keyword in ['estado', 'status', 'situacion']):
-                            indices['estado'] = i
-                
-                return indices
-            
-            indices = detect_columns()
-            
-            # Crear workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Reporte Completo"
-            
-            # Escribir título principal
-            ws.merge_cells(f'A1:{get_column_letter(len(headers))}1')
-            title_cell = ws['A1']
-            title_cell.value = f"{title}"
-            title_cell.font = Font(size=14, bold=True, color="2c3e50")
-            title_cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Fecha de exportación
-            ws.merge_cells(f'A2:{get_column_letter(len(headers))}2')
-            date_cell = ws['A2']
-            date_cell.value = f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-            date_cell.font = Font(size=9, color="666666")
-            date_cell.alignment = Alignment(horizontal='center')
-            
-            # Comenzar en la fila 4
-            current_row = 4
-            
-            # Agrupar datos por departamento si se detectó columna de departamento
-            if indices['departamento'] is not None:
-                # Agrupar por departamento
-                departments = {}
-                for row in data:
-                    dept = str(row[indices['departamento']]) if indices['departamento'] < len(row) else "Sin Departamento"
-                    if dept not in departments:
-                        departments[dept] = []
-                    departments[dept].append(row)
-                
-                # Ordenar departamentos
-                sorted_depts = sorted(departments.keys())
-                total_general_efec = 0
-                total_general_card = 0
-                
-                for dept in sorted_depts:
-                    dept_data = departments[dept]
-                    
-                    # Título del departamento
-                    dept_cell = ws.cell(row=current_row, column=1)
-                    dept_cell.value = f"📊 DEPARTAMENTO: {dept.upper()}"
-                    dept_cell.font = Font(bold=True, color="2c3e50", size=12)
-                    dept_cell.fill = PatternFill(start_color="e8f4f8", end_color="e8f4f8", fill_type="solid")
-                    
-                    ws.merge_cells(
-                        start_row=current_row,
-                        start_column=1,
-                        end_row=current_row,
-                        end_column=len(headers)
-                    )
-                    
-                    current_row += 1
-                    
-                    # Encabezados de tabla
-                    for col_idx, header in enumerate(headers, start=1):
-                        header_cell = ws.cell(row=current_row, column=col_idx)
-                        header_cell.value = header
-                        header_cell.font = Font(bold=True, color="FFFFFF")
-                        header_cell.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-                        header_cell.alignment = Alignment(horizontal='center', vertical='center')
-                        
-                        col_letter = get_column_letter(col_idx)
-                        ws.column_dimensions[col_letter].width = max(len(str(header)) + 2, 12)
-                    
-                    current_row += 1
-                    
-                    # Variables para subtotales del departamento
-                    dept_subtotal_efec = 0
-                    dept_subtotal_card = 0
-                    dept_gasto_efec = 0
-                    dept_gasto_card = 0
-                    
-                    # Datos del departamento
-                    for idx, row in enumerate(dept_data):
-                        for col_idx, cell_data in enumerate(row, start=1):
-                            cell = ws.cell(row=current_row, column=col_idx, value=cell_data)
-                            
-                            # Formatear según tipo de dato
-                            cell_str = str(cell_data) if cell_data is not None else ""
-                            
-                            # Convertir montos a números (quitar $ y comas)
-                            is_monto_column = False
-                            if col_idx - 1 in [indices['monto_efec'], indices['monto_card'], 
-                                              indices['gasto_efec'], indices['gasto_card']]:
-                                is_monto_column = True
-                            
-                            if is_monto_column and cell_str:
-                                # Quitar símbolos de moneda y caracteres no numéricos
-                                clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                
-                                # Verificar si es un número
-                                if clean_str.replace('.', '', 1).isdigit():
-                                    try:
-                                        num_value = float(clean_str)
-                                        cell.value = num_value
-                                        
-                                        # Formato numérico con 2 decimales
-                                        cell.number_format = '0.00'
-                                        cell.alignment = Alignment(horizontal='right')
-                                        
-                                        # Acumular subtotales
-                                        if col_idx - 1 == indices['monto_efec']:
-                                            dept_subtotal_efec += num_value
-                                            total_general_efec += num_value
-                                        elif col_idx - 1 == indices['monto_card']:
-                                            dept_subtotal_card += num_value
-                                            total_general_card += num_value
-                                        elif col_idx - 1 == indices['gasto_efec']:
-                                            dept_gasto_efec += num_value
-                                        elif col_idx - 1 == indices['gasto_card']:
-                                            dept_gasto_card += num_value
-                                            
-                                    except (ValueError, TypeError):
-                                        # Si no se puede convertir, mantener el string original
-                                        cell.value = cell_str
-                                else:
-                                    cell.value = cell_str
-                            
-                            # Numerar solicitantes
-                            elif col_idx - 1 == indices['solicitante']:
-                                if cell_str:
-                                    # Quitar prefijos existentes y agregar numeración
-                                    clean_name = cell_str.replace('   ├── ', '').replace('├── ', '')
-                                    cell.value = f"{idx + 1}. {clean_name}"
-                            
-                            # Formatear fechas
-                            elif any(keyword in headers[col_idx-1].lower() for keyword in ['fecha', 'date']):
-                                cell.alignment = Alignment(horizontal='center')
-                            
-                            # Formatear estado
-                            elif col_idx - 1 == indices['estado']:
-                                cell.alignment = Alignment(horizontal='center')
-                        
-                        # Fondo alternado para filas
-                        if idx % 2 == 0:
-                            for col_idx in range(1, len(headers) + 1):
-                                ws.cell(row=current_row, column=col_idx).fill = PatternFill(
-                                    start_color="F8F9FA", end_color="F8F9FA", fill_type="solid"
-                                )
-                        
-                        current_row += 1
-                    
-                    # Fila de subtotales del departamento
-                    subtotal_row = current_row
-                    
-                    # Crear fila de subtotal
-                    for col_idx in range(1, len(headers) + 1):
-                        cell = ws.cell(row=subtotal_row, column=col_idx)
-                        
-                        # Poner subtotales en sus columnas respectivas
-                        if col_idx - 1 == indices['monto_efec']:
-                            cell.value = dept_subtotal_efec
-                            cell.number_format = '0.00'
-                            cell.font = Font(bold=True, color="2c3e50")
-                            cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                        elif col_idx - 1 == indices['monto_card']:
-                            cell.value = dept_subtotal_card
-                            cell.number_format = '0.00'
-                            cell.font = Font(bold=True, color="2c3e50")
-                            cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                        elif col_idx - 1 == indices['departamento']:
-                            cell.value = f"Subtotal {dept}"
-                            cell.font = Font(bold=True, italic=True)
-                            cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                    
-                    current_row += 2  # Espacio entre departamentos
-                
-                                # --- RESUMEN POR DEPARTAMENTO (NUEVO) ---
-                summary_row = current_row + 1
-                
-                # Título del resumen por departamento
-                ws.merge_cells(f'A{summary_row}:{get_column_letter(len(headers))}{summary_row}')
-                summary_title = ws.cell(row=summary_row, column=1)
-                summary_title.value = "📊 RESUMEN POR DEPARTAMENTOS"
-                summary_title.font = Font(bold=True, color="2c3e50", size=12)
-                summary_title.alignment = Alignment(horizontal='center')
-                summary_title.fill = PatternFill(start_color="E8F8F5", end_color="E8F8F5", fill_type="solid")
-                
-                summary_row += 1
-                
-                # Encabezados del resumen por departamento
-                dept_summary_headers = [
-                    "DEPARTAMENTO",
-                    "Total Efectivo Anticipado",
-                    "Total Tarjeta Anticipado",
-                    "Total Efectivo Gastado",
-                    "Total Tarjeta Gastado",
-                    "Reembolso Efectivo",
-                    "Reembolso Tarjeta",
-                    "Gasto Total",
-                    "Subtotal Departamento"
-                ]
-                
-                for col_idx, header in enumerate(dept_summary_headers, start=1):
-                    header_cell = ws.cell(row=summary_row, column=col_idx, value=header)
-                    header_cell.font = Font(bold=True, color="FFFFFF")
-                    header_cell.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-                    header_cell.alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    # Ajustar ancho de columna
-                    col_letter = get_column_letter(col_idx)
-                    ws.column_dimensions[col_letter].width = max(len(header) + 2, 15)
-                
-                summary_row += 1
-                
-                # Variables para el resumen general
-                general_efec_anticipado = 0
-                general_card_anticipado = 0
-                general_efec_gastado = 0
-                general_card_gastado = 0
-                
-                # Crear lista para almacenar resumen por departamento
-                dept_summary_data = []
-                
-                # Procesar cada departamento para el resumen
-                for dept in sorted_depts:
-                    dept_data = departments[dept]
-                    
-                    # Inicializar acumuladores para este departamento
-                    dept_efec_anticipado = 0
-                    dept_card_anticipado = 0
-                    dept_efec_gastado = 0
-                    dept_card_gastado = 0
-                    
-                    # Calcular montos por departamento
-                    for row in dept_data:
-                        # Efectivo solicitado (S.E)
-                        if indices['monto_efec'] is not None and indices['monto_efec'] < len(row):
-                            cell_str = str(row[indices['monto_efec']]) if row[indices['monto_efec']] is not None else ""
-                            if cell_str:
-                                clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                if clean_str.replace('.', '', 1).isdigit():
-                                    dept_efec_anticipado += float(clean_str)
-                                    general_efec_anticipado += float(clean_str)
-                        
-                        # Tarjeta solicitado (S.T)
-                        if indices['monto_card'] is not None and indices['monto_card'] < len(row):
-                            cell_str = str(row[indices['monto_card']]) if row[indices['monto_card']] is not None else ""
-                            if cell_str:
-                                clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                if clean_str.replace('.', '', 1).isdigit():
-                                    dept_card_anticipado += float(clean_str)
-                                    general_card_anticipado += float(clean_str)
-                        
-                        # Gasto efectivo (G.E)
-                        if indices['gasto_efec'] is not None and indices['gasto_efec'] < len(row):
-                            cell_str = str(row[indices['gasto_efec']]) if row[indices['gasto_efec']] is not None else ""
-                            if cell_str:
-                                clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                if clean_str.replace('.', '', 1).isdigit():
-                                    dept_efec_gastado += float(clean_str)
-                                    general_efec_gastado += float(clean_str)
-                        
-                        # Gasto tarjeta (G.T)
-                        if indices['gasto_card'] is not None and indices['gasto_card'] < len(row):
-                            cell_str = str(row[indices['gasto_card']]) if row[indices['gasto_card']] is not None else ""
-                            if cell_str:
-                                clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                if clean_str.replace('.', '', 1).isdigit():
-                                    dept_card_gastado += float(clean_str)
-                                    general_card_gastado += float(clean_str)
-                    
-                    # Calcular valores derivados
-                    reembolso_efec = dept_efec_anticipado - dept_efec_gastado
-                    reembolso_card = dept_card_anticipado - dept_card_gastado
-                    gasto_total = dept_efec_gastado + dept_card_gastado
-                    subtotal_dept = dept_efec_anticipado + dept_card_anticipado
-                    
-                    # Agregar a la lista de resumen
-                    dept_summary_data.append({
-                        'nombre': dept,
-                        'efec_anticipado': dept_efec_anticipado,
-                        'card_anticipado': dept_card_anticipado,
-                        'efec_gastado': dept_efec_gastado,
-                        'card_gastado': dept_card_gastado,
-                        'reembolso_efec': reembolso_efec,
-                        'reembolso_card': reembolso_card,
-                        'gasto_total': gasto_total,
-                        'subtotal': subtotal_dept
-                    })
-                
-                # Escribir datos del resumen por departamento
-                for dept_summary in dept_summary_data:
-                    # DEPARTAMENTO
-                    ws.cell(row=summary_row, column=1, value=dept_summary['nombre'])
-                    
-                    # Total Efectivo Anticipado
-                    ws.cell(row=summary_row, column=2, value=dept_summary['efec_anticipado'])
-                    ws.cell(row=summary_row, column=2).number_format = '0.00'
-                    
-                    # Total Tarjeta Anticipado
-                    ws.cell(row=summary_row, column=3, value=dept_summary['card_anticipado'])
-                    ws.cell(row=summary_row, column=3).number_format = '0.00'
-                    
-                    # Total Efectivo Gastado
-                    ws.cell(row=summary_row, column=4, value=dept_summary['efec_gastado'])
-                    ws.cell(row=summary_row, column=4).number_format = '0.00'
-                    
-                    # Total Tarjeta Gastado
-                    ws.cell(row=summary_row, column=5, value=dept_summary['card_gastado'])
-                    ws.cell(row=summary_row, column=5).number_format = '0.00'
-                    
-                    # Reembolso Efectivo
-                    reembolso_efec_cell = ws.cell(row=summary_row, column=6, value=dept_summary['reembolso_efec'])
-                    reembolso_efec_cell.number_format = '0.00'
-                    # Color: rojo si es negativo (faltante), verde si es positivo (sobrante)
-                    if dept_summary['reembolso_efec'] < 0:
-                        reembolso_efec_cell.font = Font(color="FF0000")  # Rojo
-                    elif dept_summary['reembolso_efec'] > 0:
-                        reembolso_efec_cell.font = Font(color="00AA00")  # Verde
-                    
-                    # Reembolso Tarjeta
-                    reembolso_card_cell = ws.cell(row=summary_row, column=7, value=dept_summary['reembolso_card'])
-                    reembolso_card_cell.number_format = '0.00'
-                    if dept_summary['reembolso_card'] < 0:
-                        reembolso_card_cell.font = Font(color="FF0000")
-                    elif dept_summary['reembolso_card'] > 0:
-                        reembolso_card_cell.font = Font(color="00AA00")
-                    
-                    # Gasto Total
-                    ws.cell(row=summary_row, column=8, value=dept_summary['gasto_total'])
-                    ws.cell(row=summary_row, column=8).number_format = '0.00'
-                    
-                    # Subtotal Departamento
-                    ws.cell(row=summary_row, column=9, value=dept_summary['subtotal'])
-                    ws.cell(row=summary_row, column=9).number_format = '0.00'
-                    ws.cell(row=summary_row, column=9).font = Font(bold=True)
-                    
-                    # Fondo alternado para filas
-                    if (summary_row - 3) % 2 == 0:
-                        for col in range(1, len(dept_summary_headers) + 1):
-                            ws.cell(row=summary_row, column=col).fill = PatternFill(
-                                start_color="F8F9FA", end_color="F8F9FA", fill_type="solid"
-                            )
-                    
-                    summary_row += 1
-                
-                # Fila de TOTALES POR DEPARTAMENTOS
-                total_row = summary_row
-                
-                # "TOTAL GENERAL" en primera columna
-                ws.cell(row=total_row, column=1, value="TOTAL GENERAL").font = Font(bold=True, color="FFFFFF")
-                
-                # Total Efectivo Anticipado
-                total_efec_anticipado_cell = ws.cell(row=total_row, column=2, value=general_efec_anticipado)
-                total_efec_anticipado_cell.number_format = '0.00'
-                total_efec_anticipado_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Total Tarjeta Anticipado
-                total_card_anticipado_cell = ws.cell(row=total_row, column=3, value=general_card_anticipado)
-                total_card_anticipado_cell.number_format = '0.00'
-                total_card_anticipado_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Total Efectivo Gastado
-                total_efec_gastado_cell = ws.cell(row=total_row, column=4, value=general_efec_gastado)
-                total_efec_gastado_cell.number_format = '0.00'
-                total_efec_gastado_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Total Tarjeta Gastado
-                total_card_gastado_cell = ws.cell(row=total_row, column=5, value=general_card_gastado)
-                total_card_gastado_cell.number_format = '0.00'
-                total_card_gastado_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Reembolso Efectivo Total
-                reembolso_efec_total = general_efec_anticipado - general_efec_gastado
-                reembolso_efec_total_cell = ws.cell(row=total_row, column=6, value=reembolso_efec_total)
-                reembolso_efec_total_cell.number_format = '0.00'
-                reembolso_efec_total_cell.font = Font(bold=True, color="FFFFFF")
-                if reembolso_efec_total < 0:
-                    reembolso_efec_total_cell.font = Font(bold=True, color="FFCCCC")  # Rojo claro
-                elif reembolso_efec_total > 0:
-                    reembolso_efec_total_cell.font = Font(bold=True, color="CCFFCC")  # Verde claro
-                
-                # Reembolso Tarjeta Total
-                reembolso_card_total = general_card_anticipado - general_card_gastado
-                reembolso_card_total_cell = ws.cell(row=total_row, column=7, value=reembolso_card_total)
-                reembolso_card_total_cell.number_format = '0.00'
-                reembolso_card_total_cell.font = Font(bold=True, color="FFFFFF")
-                if reembolso_card_total < 0:
-                    reembolso_card_total_cell.font = Font(bold=True, color="FFCCCC")
-                elif reembolso_card_total > 0:
-                    reembolso_card_total_cell.font = Font(bold=True, color="CCFFCC")
-                
-                # Gasto Total General
-                gasto_total_general = general_efec_gastado + general_card_gastado
-                gasto_total_cell = ws.cell(row=total_row, column=8, value=gasto_total_general)
-                gasto_total_cell.number_format = '0.00'
-                gasto_total_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Subtotal General (Total Anticipado)
-                subtotal_general = general_efec_anticipado + general_card_anticipado
-                subtotal_cell = ws.cell(row=total_row, column=9, value=subtotal_general)
-                subtotal_cell.number_format = '0.00'
-                subtotal_cell.font = Font(bold=True, color="FFFFFF")
-                
-                # Aplicar fondo verde a toda la fila de total general
-                for col in range(1, len(dept_summary_headers) + 1):
-                    ws.cell(row=total_row, column=col).fill = PatternFill(
-                        start_color="27ae60", end_color="27ae60", fill_type="solid"
-                    )
-                
-                # Espacio después del resumen
-                summary_row = total_row + 2
-                
-                # --- RESUMEN CONSOLIDADO SIMPLE (opcional) ---
-                # Título del resumen consolidado
-                ws.merge_cells(f'A{summary_row}:{get_column_letter(len(headers))}{summary_row}')
-                consol_title = ws.cell(row=summary_row, column=1)
-                consol_title.value = "📊 RESUMEN CONSOLIDADO"
-                consol_title.font = Font(bold=True, color="2c3e50", size=12)
-                consol_title.alignment = Alignment(horizontal='center')
-                consol_title.fill = PatternFill(start_color="E8F8F5", end_color="E8F8F5", fill_type="solid")
-                
-                summary_row += 1
-                
-                # Encabezados del resumen consolidado
-                ws.cell(row=summary_row, column=1, value="CONCEPTO").font = Font(bold=True)
-                ws.cell(row=summary_row, column=2, value="MONTO").font = Font(bold=True)
-                
-                summary_row += 1
-                
-                # Datos del resumen consolidado
-                consolidado_data = [
-                    ("Total Efectivo Anticipado", general_efec_anticipado),
-                    ("Total Tarjeta Anticipado", general_card_anticipado),
-                    ("Total Anticipado", subtotal_general),
-                    ("", ""),  # Separador
-                    ("Total Efectivo Gastado", general_efec_gastado),
-                    ("Total Tarjeta Gastado", general_card_gastado),
-                    ("Total Gastado", gasto_total_general),
-                    ("", ""),  # Separador
-                    ("Reembolso Efectivo", reembolso_efec_total),
-                    ("Reembolso Tarjeta", reembolso_card_total),
-                    ("Reembolso Total", reembolso_efec_total + reembolso_card_total),
-                ]
-                
-                for idx, (concepto, monto) in enumerate(consolidado_data):
-                    row = summary_row + idx
-                    if concepto:  # Si no es separador
-                        ws.cell(row=row, column=1, value=concepto)
-                        if monto != "":  # Si tiene monto
-                            cell = ws.cell(row=row, column=2, value=monto)
-                            cell.number_format = '0.00'
-                            
-                            # Formato especial para reembolsos
-                            if "Reembolso" in concepto:
-                                if monto < 0:
-                                    cell.font = Font(color="FF0000", bold=True)
-                                elif monto > 0:
-                                    cell.font = Font(color="00AA00", bold=True)
-                            
-                            # Formato para totales
-                            if "Total" in concepto and "Anticipado" not in concepto and "Gastado" not in concepto:
-                                cell.font = Font(bold=True)
-                
-                # Ajustar el ancho de las columnas del resumen
-                ws.column_dimensions['A'].width = 25
-                ws.column_dimensions['B'].width = 15
-                
-            else:
-                # Si no hay columna de departamento, tabla simple
-                # Encabezados
-                for col_idx, header in enumerate(headers, start=1):
-                    header_cell = ws.cell(row=current_row, column=col_idx)
-                    header_cell.value = header
-                    header_cell.font = Font(bold=True, color="FFFFFF")
-                    header_cell.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-                    header_cell.alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    col_letter = get_column_letter(col_idx)
-                    ws.column_dimensions[col_letter].width = max(len(str(header)) + 2, 12)
-                
-                current_row += 1
-                
-                # Variables para total de balance
-                total_balance = 0
-                balance_col_idx = None
-                
-                # Detectar índice de columna balance si existe
-                for col_idx, header in enumerate(headers):
-                    header_str = str(header).lower()
-                    if any(keyword in header_str for keyword in ['balance', 'saldo', 'monto', 'total']):
-                        balance_col_idx = col_idx
-                        break
-                
-                # Datos
-                for row_idx, row in enumerate(data):
-                    for col_idx, cell_data in enumerate(row, start=1):
-                        cell = ws.cell(row=current_row, column=col_idx, value=cell_data)
-                        
-                        # Convertir montos a números
-                        cell_str = str(cell_data) if cell_data is not None else ""
-                        
-                        # Verificar si es la columna de balance para acumular total
-                        if balance_col_idx is not None and (col_idx - 1) == balance_col_idx:
-                            # Limpiar y convertir a número
-                            clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                            if clean_str.replace('.', '', 1).isdigit():
-                                try:
-                                    num_value = float(clean_str)
-                                    cell.value = num_value
-                                    cell.number_format = '0.00'
-                                    cell.alignment = Alignment(horizontal='right')
-                                    total_balance += num_value
-                                except (ValueError, TypeError):
-                                    cell.value = cell_str
-                        elif cell_str.startswith('$'):
-                            clean_str = cell_str.replace('$', '').replace(',', '').replace(' ', '').strip()
-                            if clean_str.replace('.', '', 1).isdigit():
-                                try:
-                                    cell.value = float(clean_str)
-                                    cell.number_format = '0.00'
-                                    cell.alignment = Alignment(horizontal='right')
-                                except (ValueError, TypeError):
-                                    cell.value = cell_str
-                    
-                    # Fondo alternado
-                    if row_idx % 2 == 0:
-                        for col_idx in range(1, len(headers) + 1):
-                            ws.cell(row=current_row, column=col_idx).fill = PatternFill(
-                                start_color="F8F9FA", end_color="F8F9FA", fill_type="solid"
-                            )
-                    
-                    current_row += 1
-                
-                # Agregar fila de total de balance si se detectó la columna
-                if balance_col_idx is not None:
-                    # Fila de total
-                    total_row = current_row
-                    
-                    # Crear fila de total
-                    for col_idx in range(1, len(headers) + 1):
-                        cell = ws.cell(row=total_row, column=col_idx)
-                        
-                        # Poner total en la columna de balance
-                        if (col_idx - 1) == balance_col_idx:
-                            cell.value = total_balance
-                            cell.number_format = '0.00'
-                            cell.font = Font(bold=True, color="2c3e50")
-                            cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                        elif col_idx == 1:  # Primera columna
-                            cell.value = "TOTAL"
-                            cell.font = Font(bold=True, italic=True)
-                            cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                    
-                    current_row += 1  # Para espacio después del total
-            
-            # Aplicar bordes a todas las celdas con datos
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            max_row = ws.max_row
-            max_col = ws.max_column
-            
-            for row in ws.iter_rows(min_row=4, max_row=max_row, min_col=1, max_col=max_col):
-                for cell in row:
-                    if cell.value is not None:
-                        cell.border = thin_border
-            
-            # Ajustar automáticamente el ancho de las columnas
-            for col_idx in range(1, max_col + 1):
-                max_length = 0
-                col_letter = get_column_letter(col_idx)
-                
-                for row in range(4, max_row + 1):
-                    cell = ws.cell(row=row, column=col_idx)
-                    if cell.value:
-                        cell_length = len(str(cell.value))
-                        if cell_length > max_length:
-                            max_length = cell_length
-                
-                # Ajustar ancho (mínimo 10, máximo 30)
-                adjusted_width = min(max(max_length + 2, 10), 30)
-                ws.column_dimensions[col_letter].width = adjusted_width
-            
-            # Guardar archivo
-            wb.save(filename)
-            
-            # Mensaje de éxito
-            if indices['departamento'] is not None:
-                message = (
-                    f"✅ EXCEL :\n\n"
-                    f"📂 {filename}\n\n"
-                )
-            else:
-                message = f"✅ Excel exportado:\n\n{filename}"
-            
-            messagebox.showinfo("Exportación exitosa", message)
-            return filename
-            
-        except Exception as e:
-            messagebox.showerror("❌ Error", f"No se pudo exportar a Excel:\n\n{str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
+        temp_filename = TreeviewExporter._print_filename()
+        
+        def task(job: ExportJob):
+            document = ReportDocument.build(title, headers, job.track(data, end=10, message="Leyendo filas"))
+            PdfRenderer(date_label="Impreso").render(document, temp_filename, TreeviewExporter._job_progress(job, 10))
+            return temp_filename
+        
+        return submit_export_job(
+            tree,
+            f"Imprimir: {title}",
+            task,
+            output_path=temp_filename,
+            on_done=TreeviewExporter._open_for_printing,
+            on_error=TreeviewExporter._print_failed
+        )
         
 @staticmethod
 def create_export_button(parent, tree: ttk.Treeview, title, 
@@ -2535,15 +2190,12 @@ def create_export_button(parent, tree: ttk.Treeview, title,
         """Muestra el menú de exportación"""
         menu = Menu(parent, tearoff=0)
         
-        # Obtener información sobre la estructura
-        headers, _, hierarchical_structure = TreeviewExporter.get_treeview_data(tree, hierarchical=True)
-        
         # Menú para report_module (solo Excel Completo)
         if export_type == "report_module":
             if HAS_EXCEL:
                 menu.add_command(
                     label="📊 Excel (.xlsx)",
-                    command=lambda: TreeviewExporter.export_to_excel_full_columns(tree, title),
+                    command=lambda: TreeviewExporter.submit_export(tree, title, 'excel_full'),
                     font=('Arial', 10)
                 )
         
@@ -2552,21 +2204,28 @@ def create_export_button(parent, tree: ttk.Treeview, title,
             if HAS_EXCEL:
                 menu.add_command(
                     label="📊 Excel (.xlsx)",
-                    command=lambda: TreeviewExporter.export_to_excel(tree, title),
+                    command=lambda: TreeviewExporter.submit_export(tree, title, 'excel'),
                     font=('Arial', 10)
                 )
             
             if HAS_WORD:
                 menu.add_command(
                     label="📝 Word (.docx)",
-                    command=lambda: TreeviewExporter.export_to_word(tree, title),
+                    command=lambda: TreeviewExporter.submit_export(tree, title, 'word'),
                     font=('Arial', 10)
                 )
             
             if HAS_PDF:
                 menu.add_command(
                     label="📄 PDF (.pdf)",
-                    command=lambda: TreeviewExporter.export_to_pdf(tree, title),
+                    command=lambda: TreeviewExporter.submit_export(tree, title, 'pdf'),
+                    font=('Arial', 10)
+                )
+            
+            if HAS_EXCEL or HAS_WORD or HAS_PDF:
+                menu.add_command(
+                    label="📦 Varios formatos...",
+                    command=lambda: TreeviewExporter.export_multiple(tree, title),
                     font=('Arial', 10)
                 )
             
@@ -2575,7 +2234,7 @@ def create_export_button(parent, tree: ttk.Treeview, title,
             if include_print and HAS_PDF:
                 menu.add_command(
                     label="🖨️ Imprimir",
-                    command=lambda: TreeviewExporter.print_directly(tree, title),
+                    command=lambda: TreeviewExporter.submit_print(tree, title),
                     font=('Arial', 10)
                 )
         
@@ -0,0 +1,468 @@
+# excel_stream.py
+"""
+Motor de exportación a Excel en modo streaming.
+
+Usa el modo write-only de openpyxl: cada fila se escribe directamente al
+archivo y no se conserva en memoria, de modo que el consumo se mantiene
+constante sin importar la cantidad de filas. Los formatos se definen una
+sola vez como estilos con nombre compartidos por todas las celdas.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+from application.dtos.report_dtos import ReportColumn
+
+
+MONEY_FORMAT = '0.00'
+CURRENCY_FORMAT = '"$"#,##0.00'
+DATE_FORMAT = 'DD/MM/YYYY'
+
+_THIN = Side(style='thin')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+
+def _fill(color: str) -> PatternFill:
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def _build_named_styles() -> List[NamedStyle]:
+    """
+    Estilos con nombre del reporte.
+
+    Los estilos de celdas de datos tienen una variante "_alt" con el fondo
+    de las filas alternas.
+    """
+    styles = [
+        NamedStyle(name="vx_title", font=Font(size=14, bold=True, color="2c3e50"),
+                   alignment=Alignment(horizontal='center', vertical='center')),
+        NamedStyle(name="vx_subtitle", font=Font(size=9, color="666666"),
+                   alignment=Alignment(horizontal='center')),
+        NamedStyle(name="vx_banner", font=Font(size=11, bold=True, color="27ae60"), fill=_fill("e8f8f5"),
+                   alignment=Alignment(horizontal='center')),
+        NamedStyle(name="vx_section", font=Font(bold=True, color="2c3e50", size=12),
+                   fill=_fill("e8f4f8")),
+        NamedStyle(name="vx_summary_title", font=Font(bold=True, color="2c3e50", size=12),
+                   fill=_fill("E8F8F5"), alignment=Alignment(horizontal='center')),
+        NamedStyle(name="vx_header", font=Font(bold=True, color="FFFFFF"), fill=_fill("2c3e50"),
+                   alignment=Alignment(horizontal='center', vertical='center'), border=_BORDER),
+        NamedStyle(name="vx_label", font=Font(bold=True), border=_BORDER),
+        NamedStyle(name="vx_subtotal", font=Font(bold=True, italic=True), fill=_fill("FFF3CD"),
+                   border=_BORDER),
+        NamedStyle(name="vx_subtotal_money", font=Font(bold=True, color="2c3e50"), fill=_fill("FFF3CD"),
+                   number_format=MONEY_FORMAT, border=_BORDER),
+        NamedStyle(name="vx_total", font=Font(bold=True, color="FFFFFF"), fill=_fill("27ae60"),
+                   border=_BORDER),
+        NamedStyle(name="vx_total_money", font=Font(bold=True, color="FFFFFF"), fill=_fill("27ae60"),
+                   number_format=MONEY_FORMAT, border=_BORDER),
+        NamedStyle(name="vx_total_currency", font=Font(bold=True, color="FFFFFF"), fill=_fill("27ae60"),
+                   number_format=CURRENCY_FORMAT, border=_BORDER),
+        NamedStyle(name="vx_total_money_negative", font=Font(bold=True, color="FFCCCC"), fill=_fill("27ae60"),
+                   number_format=MONEY_FORMAT, border=_BORDER),
+        NamedStyle(name="vx_total_money_positive", font=Font(bold=True, color="CCFFCC"), fill=_fill("27ae60"),
+                   number_format=MONEY_FORMAT, border=_BORDER),
+        NamedStyle(name="vx_footer", font=Font(italic=True, size=9, color="666666")),
+    ]
+
+    data_styles = {
+        "vx_text": dict(),
+        "vx_center": dict(alignment=Alignment(horizontal='center')),
+        "vx_date": dict(alignment=Alignment(horizontal='center'), number_format=DATE_FORMAT),
+        "vx_int": dict(alignment=Alignment(horizontal='right'), number_format='0'),
+        "vx_money": dict(alignment=Alignment(horizontal='right'), number_format=MONEY_FORMAT),
+        "vx_currency": dict(alignment=Alignment(horizontal='right'), number_format=CURRENCY_FORMAT),
+        "vx_money_bold": dict(alignment=Alignment(horizontal='right'), number_format=MONEY_FORMAT,
+                              font=Font(bold=True)),
+        "vx_money_negative": dict(alignment=Alignment(horizontal='right'), number_format=MONEY_FORMAT,
+                                  font=Font(color="FF0000")),
+        "vx_money_positive": dict(alignment=Alignment(horizontal='right'), number_format=MONEY_FORMAT,
+                                  font=Font(color="00AA00")),
+    }
+    for name, options in data_styles.items():
+        styles.append(NamedStyle(name=name, border=_BORDER, **options))
+        styles.append(NamedStyle(name=f"{name}_alt", border=_BORDER, fill=_fill("F8F9FA"), **options))
+
+    return styles
+
+
+# Estilo de celda según el tipo nativo de la columna
+KIND_STYLES = {
+    "money": "vx_money",
+    "date": "vx_date",
+    "int": "vx_int",
+    "diet_status": "vx_center",
+    "active_flag": "vx_center",
+}
+
+# Ancho por defecto según el tipo de la columna (el contenido no se conoce de antemano)
+KIND_WIDTHS = {
+    "money": 12,
+    "date": 12,
+    "int": 10,
+    "diet_status": 12,
+    "active_flag": 12,
+}
+
+
+class StreamingExcelWriter:
+    """
+    Escritor de hojas de Excel fila a fila (openpyxl write-only).
+
+    Las filas no se pueden modificar una vez escritas: los anchos de columna
+    deben fijarse antes de la primera fila y las celdas combinadas se
+    registran por rango.
+    """
+
+    def __init__(self, filename: str, sheet_title: str = "Reporte"):
+        self.filename = filename
+        self.workbook = openpyxl.Workbook(write_only=True)
+        for style in _build_named_styles():
+            self.workbook.add_named_style(style)
+        self.sheet = self.workbook.create_sheet(sheet_title)
+        self.row_count = 0
+        self._style_cache = {}
+
+    def set_column_widths(self, widths: Sequence[float]):
+        """Fija los anchos de columna (antes de escribir filas)"""
+        for index, width in enumerate(widths, start=1):
+            self.sheet.column_dimensions[get_column_letter(index)].width = width
+
+    def cell(self, value: Any, style: Optional[str] = None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self.sheet, value=value)
+        if style:
+            # Resolver el estilo con nombre una sola vez y compartir su índice
+            style_array = self._style_cache.get(style)
+            if style_array is None:
+                cell.style = style
+                self._style_cache[style] = cell._style
+            else:
+                cell._style = style_array
+        return cell
+
+    def append(self, cells: Iterable[Any] = ()):
+        """Escribe una fila con valores o celdas ya estilizadas"""
+        self.sheet.append(list(cells))
+        self.row_count += 1
+
+    def append_merged(self, value: Any, style: Optional[str], width: int):
+        """Escribe una fila con una sola celda combinada sobre `width` columnas"""
+        self.append([self.cell(value, style)])
+        if width > 1:
+            # Cada rango está en una fila nueva y no puede solaparse: se agrega
+            # directo al conjunto (MultiCellRange.add revisa todos los rangos)
+            self.sheet.merged_cells.ranges.add(CellRange(
+                min_col=1, min_row=self.row_count, max_col=width, max_row=self.row_count
+            ))
+
+    def save(self) -> str:
+        self.workbook.save(self.filename)
+        return self.filename
+
+
+def _excel_value(column: ReportColumn, value: Any) -> Any:
+    """Valor nativo apto para Excel: números y fechas reales, el resto como texto"""
+    if column.kind == "money":
+        return float(value) if value is not None else 0.0
+    if column.kind == "date" and isinstance(value, (date, datetime)):
+        return value
+    if column.kind == "int" and value is not None:
+        return value
+    return column.format(value)
+
+
+def _column_widths(columns: Sequence[ReportColumn]) -> List[float]:
+    widths = []
+    for column in columns:
+        default = KIND_WIDTHS.get(column.kind, 30)
+        widths.append(min(max(len(column.header) + 2, default, 10), 30))
+    return widths
+
+
+def _money_style(value: float, base: str = "vx_money") -> str:
+    if value < 0:
+        return f"{base}_negative"
+    if value > 0:
+        return f"{base}_positive"
+    return base
+
+
+# Montos que se totalizan por departamento: anticipo y gasto por medio de pago
+DEPARTMENT_AMOUNT_KEYS = ("cash_advance", "card_advance", "cash_spent", "card_spent")
+
+DEPARTMENT_SUMMARY_HEADERS = [
+    "DEPARTAMENTO",
+    "Total Efectivo Anticipado",
+    "Total Tarjeta Anticipado",
+    "Total Efectivo Gastado",
+    "Total Tarjeta Gastado",
+    "Reembolso Efectivo",
+    "Reembolso Tarjeta",
+    "Gasto Total",
+    "Subtotal Departamento",
+]
+
+
+def write_subtotal(writer: StreamingExcelWriter, width: int, label_index: Optional[int], label: str,
+                   amounts: Dict[int, float]):
+    """Fila de subtotal: `label` en la columna `label_index` y cada monto en su columna"""
+    cells = [None] * width
+    for index, amount in amounts.items():
+        cells[index] = writer.cell(amount, "vx_subtotal_money")
+    if label_index is not None:
+        cells[label_index] = writer.cell(label, "vx_subtotal")
+    writer.append(cells)
+
+
+def write_department_summary(writer: StreamingExcelWriter, width: int,
+                             departments: Iterable[Tuple[str, Dict[str, float]]]):
+    """
+    Resumen por departamento, total general y resumen consolidado.
+
+    Args:
+        departments: Pares (departamento, montos) en el orden a mostrar; los
+            montos van por clave de DEPARTMENT_AMOUNT_KEYS (0 si falta)
+    """
+    writer.append()
+    writer.append_merged("📊 RESUMEN POR DEPARTAMENTOS", "vx_summary_title", width)
+    writer.append(writer.cell(header, "vx_header") for header in DEPARTMENT_SUMMARY_HEADERS)
+
+    general = dict.fromkeys(DEPARTMENT_AMOUNT_KEYS, 0.0)
+    for position, (department, department_amounts) in enumerate(departments):
+        amounts = {key: department_amounts.get(key, 0.0) for key in DEPARTMENT_AMOUNT_KEYS}
+        for key in general:
+            general[key] += amounts[key]
+
+        suffix = "_alt" if position % 2 == 1 else ""
+        efec_refund = amounts["cash_advance"] - amounts["cash_spent"]
+        card_refund = amounts["card_advance"] - amounts["card_spent"]
+        writer.append([
+            writer.cell(department, "vx_text" + suffix),
+            writer.cell(amounts["cash_advance"], "vx_money" + suffix),
+            writer.cell(amounts["card_advance"], "vx_money" + suffix),
+            writer.cell(amounts["cash_spent"], "vx_money" + suffix),
+            writer.cell(amounts["card_spent"], "vx_money" + suffix),
+            writer.cell(efec_refund, _money_style(efec_refund) + suffix),
+            writer.cell(card_refund, _money_style(card_refund) + suffix),
+            writer.cell(amounts["cash_spent"] + amounts["card_spent"], "vx_money" + suffix),
+            writer.cell(amounts["cash_advance"] + amounts["card_advance"], "vx_money_bold" + suffix),
+        ])
+
+    efec_refund = general["cash_advance"] - general["cash_spent"]
+    card_refund = general["card_advance"] - general["card_spent"]
+    total_advanced = general["cash_advance"] + general["card_advance"]
+    total_spent = general["cash_spent"] + general["card_spent"]
+    writer.append([
+        writer.cell("TOTAL GENERAL", "vx_total"),
+        writer.cell(general["cash_advance"], "vx_total_money"),
+        writer.cell(general["card_advance"], "vx_total_money"),
+        writer.cell(general["cash_spent"], "vx_total_money"),
+        writer.cell(general["card_spent"], "vx_total_money"),
+        writer.cell(efec_refund, _money_style(efec_refund, "vx_total_money")),
+        writer.cell(card_refund, _money_style(card_refund, "vx_total_money")),
+        writer.cell(total_spent, "vx_total_money"),
+        writer.cell(total_advanced, "vx_total_money"),
+    ])
+
+    # Resumen consolidado
+    writer.append()
+    writer.append_merged("📊 RESUMEN CONSOLIDADO", "vx_summary_title", width)
+    writer.append([writer.cell("CONCEPTO", "vx_label"), writer.cell("MONTO", "vx_label")])
+
+    consolidated = [
+        ("Total Efectivo Anticipado", general["cash_advance"], "vx_money"),
+        ("Total Tarjeta Anticipado", general["card_advance"], "vx_money"),
+        ("Total Anticipado", total_advanced, "vx_money"),
+        None,
+        ("Total Efectivo Gastado", general["cash_spent"], "vx_money"),
+        ("Total Tarjeta Gastado", general["card_spent"], "vx_money"),
+        ("Total Gastado", total_spent, "vx_money"),
+        None,
+        ("Reembolso Efectivo", efec_refund, _money_style(efec_refund)),
+        ("Reembolso Tarjeta", card_refund, _money_style(card_refund)),
+        ("Reembolso Total", efec_refund + card_refund, _money_style(efec_refund + card_refund)),
+    ]
+    for entry in consolidated:
+        if entry is None:
+            writer.append()
+            continue
+        concept, amount, style = entry
+        writer.append([writer.cell(concept, "vx_text"), writer.cell(amount, style)])
+
+
+def write_footer(writer: StreamingExcelWriter):
+    writer.append()
+    writer.append([writer.cell(
+        f"Sistema de Gestión de Dietas VIAJEX • Exportado el: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+        "vx_footer"
+    )])
+
+
+class DietsExcelReport:
+    """
+    Reporte de dietas por departamento escrito en streaming.
+
+    Las filas deben llegar agrupadas por departamento (la consulta las
+    ordena así); solo se acumulan los totales de cada departamento para el
+    resumen final, nunca las filas.
+    """
+
+    # Columna del reporte de cada monto del resumen por departamento
+    AMOUNT_COLUMNS = {
+        "cash_advance": "monto_solicitado_efec",
+        "card_advance": "monto_solicitado_card",
+        "cash_spent": "gasto_efec",
+        "card_spent": "gasto_card",
+    }
+
+    def __init__(self, writer: StreamingExcelWriter, title: str, columns: Sequence[ReportColumn]):
+        self.writer = writer
+        self.title = title
+        self.columns = list(columns)
+        self.keys = [column.key for column in self.columns]
+        self.styles = [KIND_STYLES.get(column.kind, "vx_text") for column in self.columns]
+        self.department_index = self.keys.index("departamento")
+        self.requester_index = self.keys.index("solicitante") if "solicitante" in self.keys else None
+        self.amount_indices = {
+            key: self.keys.index(column_key)
+            for key, column_key in self.AMOUNT_COLUMNS.items() if column_key in self.keys
+        }
+        # Montos que se muestran en la fila de subtotal de cada departamento
+        self.subtotal_keys = [key for key in ("cash_advance", "card_advance") if key in self.amount_indices]
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+        """
+        Escribe el reporte completo.
+
+        Returns:
+            Dict con la cantidad de filas y de departamentos escritos
+        """
+        width = len(self.columns)
+        self.writer.set_column_widths(_column_widths(self.columns))
+        self.writer.append_merged(self.title, "vx_title", width)
+        self.writer.append_merged(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", "vx_subtitle", width)
+        self.writer.append()
+
+        totals: Dict[str, Dict[str, float]] = {}
+        current = None
+        position = 0
+        row_count = 0
+
+        for row in rows:
+            department = row[self.department_index] or "Sin Departamento"
+            if department != current:
+                if current is not None:
+                    self._write_subtotal(current, totals[current])
+                current = department
+                position = 0
+                totals.setdefault(department, dict.fromkeys(self.amount_indices, 0.0))
+                self.writer.append_merged(f"📊 DEPARTAMENTO: {department.upper()}", "vx_section", width)
+                self.writer.append(self.writer.cell(column.header, "vx_header") for column in self.columns)
+
+            position += 1
+            row_count += 1
+            self._write_row(row, position, totals[department])
+
+        if current is not None:
+            self._write_subtotal(current, totals[current])
+            write_department_summary(self.writer, width, sorted(totals.items()))
+
+        write_footer(self.writer)
+        return {"rows": row_count, "departments": len(totals)}
+
+    def _write_row(self, row: Sequence[Any], position: int, department_totals: Dict[str, float]):
+        suffix = "_alt" if position % 2 == 1 else ""
+        cells = []
+        for index, (column, value) in enumerate(zip(self.columns, row)):
+            excel_value = _excel_value(column, value)
+            if index == self.requester_index:
+                excel_value = f"{position}. {excel_value}"
+            cells.append(self.writer.cell(excel_value, self.styles[index] + suffix))
+
+        for key, index in self.amount_indices.items():
+            if row[index] is not None:
+                department_totals[key] += float(row[index])
+
+        self.writer.append(cells)
+
+    def _write_subtotal(self, department: str, department_totals: Dict[str, float]):
+        amounts = {self.amount_indices[key]: department_totals[key] for key in self.subtotal_keys}
+        write_subtotal(self.writer, len(self.columns), self.department_index, f"Subtotal {department}", amounts)
+        self.writer.append()
+
+
+class TableExcelReport:
+    """Reporte de tabla simple (sin departamentos) con total de la columna de monto"""
+
+    def __init__(self, writer: StreamingExcelWriter, title: str, columns: Sequence[ReportColumn]):
+        self.writer = writer
+        self.title = title
+        self.columns = list(columns)
+        self.styles = [KIND_STYLES.get(column.kind, "vx_text") for column in self.columns]
+        self.total_index = next(
+            (index for index, column in enumerate(self.columns) if column.kind == "money"), None
+        )
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+        writer = self.writer
+        width = len(self.columns)
+        writer.set_column_widths(_column_widths(self.columns))
+        writer.append_merged(self.title, "vx_title", width)
+        writer.append_merged(f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", "vx_subtitle", width)
+        writer.append()
+        writer.append(writer.cell(column.header, "vx_header") for column in self.columns)
+
+        total = Decimal("0")
+        row_count = 0
+        for row in rows:
+            suffix = "_alt" if row_count % 2 == 0 else ""
+            writer.append(
+                writer.cell(_excel_value(column, value), self.styles[index] + suffix)
+                for index, (column, value) in enumerate(zip(self.columns, row))
+            )
+            if self.total_index is not None and row[self.total_index] is not None:
+                total += Decimal(str(row[self.total_index]))
+            row_count += 1
+
+        if self.total_index is not None:
+            cells = [None] * width
+            cells[0] = writer.cell("TOTAL", "vx_subtotal")
+            cells[self.total_index] = writer.cell(float(total), "vx_subtotal_money")
+            writer.append(cells)
+
+        return {"rows": row_count, "departments": 0}
+
+
+def export_report_to_excel(
+    filename: str,
+    title: str,
+    columns: Sequence[ReportColumn],
+    rows: Iterable[Sequence[Any]]
+) -> Dict[str, Any]:
+    """
+    Exporta un reporte tipado a Excel leyendo las filas de un iterable.
+
+    Args:
+        filename: Ruta del archivo .xlsx
+        title: Título del reporte
+        columns: Columnas del reporte (clave, encabezado, tipo)
+        rows: Filas con valores nativos en el orden de `columns`; si hay
+            columna "departamento" deben venir agrupadas por ella
+
+    Returns:
+        Dict con la cantidad de filas y de departamentos escritos
+    """
+    writer = StreamingExcelWriter(filename, "Reporte Completo")
+    if any(column.key == "departamento" for column in columns):
+        report = DietsExcelReport(writer, title, columns)
+    else:
+        report = TableExcelReport(writer, title, columns)
+
+    stats = report.write(rows)
+    writer.save()
+    return stats
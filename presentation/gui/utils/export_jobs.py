@@ -0,0 +1,373 @@
+"""
+Ejecución de exportaciones en segundo plano.
+
+ExportJobRunner mantiene un pool de hilos propio de la capa de
+presentación: las exportaciones se encolan, se ejecutan fuera del hilo de
+Tk y su avance vuelve a la interfaz mediante una cola que se consulta con
+after(), de modo que ningún widget se toca desde un hilo secundario.
+"""
+import logging
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from infrastructure.database.session import release_session
+
+logger = logging.getLogger(__name__)
+
+
+class ExportCancelled(Exception):
+    """La exportación fue cancelada por el usuario"""
+    pass
+
+
+class ExportJob:
+    """
+    Trabajo de exportación encolado en un ExportJobRunner.
+
+    La tarea recibe el propio trabajo para informar su avance (update,
+    track) y comprobar la cancelación. Los callbacks on_done, on_error y
+    on_update se ejecutan siempre en el hilo de Tk.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, job_id: int, title: str, task: Callable[["ExportJob"], Any],
+                 output_path: Optional[str] = None,
+                 on_done: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.id = job_id
+        self.title = title
+        self.task = task
+        self.output_path = output_path
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_update: Optional[Callable[["ExportJob"], None]] = None
+
+        self.status = self.QUEUED
+        self.progress: Optional[int] = 0
+        self.message = "En cola..."
+        self.future = None
+
+        self._cancel_event = threading.Event()
+        self._events: Optional[queue.Queue] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    def cancel(self):
+        """Solicita la cancelación; la tarea la atiende en su próximo punto de control"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Punto de control: interrumpe la tarea si se pidió cancelarla"""
+        if self._cancel_event.is_set():
+            raise ExportCancelled(f"Exportación cancelada: {self.title}")
+
+    def update(self, progress: Optional[int], message: str = ""):
+        """
+        Informa el avance desde el hilo de trabajo.
+
+        Args:
+            progress: Porcentaje (0-100) o None si no se conoce el total
+            message: Texto descriptivo de la etapa actual
+        """
+        self.check_cancelled()
+        if self._events is not None:
+            self._events.put((self, "progress", (progress, message)))
+
+    def track(self, items: Iterable[Any], total: Optional[int] = None,
+              start: int = 0, end: int = 100, message: str = "Procesando filas") -> Iterator[Any]:
+        """
+        Recorre un iterable informando avance y atendiendo la cancelación.
+
+        Si no se conoce el total (por ejemplo, un generador que lee de la
+        base de datos), se informa la cantidad de filas procesadas.
+        """
+        if total is None and hasattr(items, "__len__"):
+            total = len(items)
+
+        step = max(1, total // 100) if total else 500
+        index = 0
+        for index, item in enumerate(items, 1):
+            if index % step == 0:
+                if total:
+                    self.update(start + (end - start) * index // total, message)
+                else:
+                    self.update(None, f"{message}: {index:,}")
+            yield item
+
+        if total:
+            self.update(end, message)
+        else:
+            self.update(None, f"{message}: {index:,}")
+
+
+class ExportJobRunner:
+    """
+    Cola de exportaciones ejecutadas en un pool de hilos.
+
+    Se obtiene con ExportJobRunner.for_widget para compartir un único
+    runner por ventana raíz; con un solo worker los trabajos se ejecutan
+    en orden de llegada.
+    """
+
+    def __init__(self, root: tk.Misc, max_workers: int = 1, poll_interval: int = 100):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="viajex-export")
+        self._events: queue.Queue = queue.Queue()
+        self._ids = count(1)
+        self._jobs: Dict[int, ExportJob] = {}
+        self._polling = False
+        self._closed = False
+
+    @classmethod
+    def for_widget(cls, widget: tk.Misc) -> "ExportJobRunner":
+        """Runner compartido de la ventana raíz del widget"""
+        root = widget._root()
+        runner = getattr(root, "_export_job_runner", None)
+        if runner is None or runner._closed:
+            runner = cls(root)
+            root._export_job_runner = runner
+            root.bind("<Destroy>", runner._on_root_destroy, add="+")
+        return runner
+
+    @property
+    def active_jobs(self) -> list:
+        """Trabajos en cola o en ejecución"""
+        return list(self._jobs.values())
+
+    def submit(self, title: str, task: Callable[[ExportJob], Any],
+               output_path: Optional[str] = None,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> ExportJob:
+        """
+        Encola una exportación.
+
+        Args:
+            title: Descripción mostrada al usuario
+            task: Función que recibe el ExportJob y devuelve el resultado
+            output_path: Archivo que se elimina si la exportación se cancela
+            on_done: Callback con el resultado (hilo de Tk)
+            on_error: Callback con la excepción (hilo de Tk)
+
+        Returns:
+            ExportJob: Trabajo encolado
+        """
+        if self._closed:
+            raise RuntimeError("El ejecutor de exportaciones está cerrado")
+
+        job = ExportJob(next(self._ids), title, task, output_path, on_done, on_error)
+        job._events = self._events
+        self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        self._schedule_poll()
+        return job
+
+    def cancel(self, job: ExportJob):
+        """Cancela un trabajo; si aún no empezó, se descarta sin ejecutarse"""
+        job.cancel()
+        if job.future is not None and job.future.cancel():
+            self._events.put((job, ExportJob.CANCELLED, None))
+            self._schedule_poll()
+
+    def cancel_all(self):
+        for job in self.active_jobs:
+            self.cancel(job)
+
+    def shutdown(self):
+        """Cancela los trabajos pendientes y libera el pool"""
+        self._closed = True
+        for job in self.active_jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ========== HILO DE TRABAJO ==========
+
+    def _run(self, job: ExportJob):
+        if job.cancelled:
+            self._events.put((job, ExportJob.CANCELLED, None))
+            return
+
+        self._events.put((job, ExportJob.RUNNING, None))
+        try:
+            result = job.task(job)
+            job.check_cancelled()
+        except ExportCancelled:
+            self._discard_output(job)
+            self._events.put((job, ExportJob.CANCELLED, None))
+        except Exception as e:
+            logger.exception(f"Error en la exportación '{job.title}'")
+            self._events.put((job, ExportJob.FAILED, e))
+        else:
+            self._events.put((job, ExportJob.DONE, result))
+        finally:
+            # Los hilos del pool se reutilizan: no dejar una sesión abierta
+            release_session()
+
+    def _discard_output(self, job: ExportJob):
+        if job.output_path and os.path.exists(job.output_path):
+            try:
+                os.remove(job.output_path)
+            except OSError as e:
+                logger.warning(f"No se pudo eliminar {job.output_path}: {e}")
+
+    # ========== HILO DE TK ==========
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_event(job, kind, payload)
+
+        if self._jobs and not self._closed:
+            self._schedule_poll()
+
+    def _apply_event(self, job: ExportJob, kind: str, payload: Any):
+        if job.finished:
+            return
+
+        if kind == "progress":
+            job.progress, message = payload
+            if message:
+                job.message = message
+        elif kind == ExportJob.RUNNING:
+            job.status = ExportJob.RUNNING
+            job.message = "Iniciando..."
+        else:
+            job.status = kind
+            job.message = {
+                ExportJob.DONE: "Completado",
+                ExportJob.FAILED: "Error",
+                ExportJob.CANCELLED: "Cancelado",
+            }[kind]
+            self._jobs.pop(job.id, None)
+
+        self._notify(job)
+
+        try:
+            if kind == ExportJob.DONE and job.on_done:
+                job.on_done(payload)
+            elif kind == ExportJob.FAILED and job.on_error:
+                job.on_error(payload)
+        except Exception:
+            logger.exception(f"Error al finalizar la exportación '{job.title}'")
+
+    def _notify(self, job: ExportJob):
+        if job.on_update:
+            try:
+                job.on_update(job)
+            except tk.TclError:
+                job.on_update = None
+
+    def _on_root_destroy(self, event):
+        if event.widget is self.root:
+            self.shutdown()
+
+
+class ExportProgressWindow(tk.Toplevel):
+    """Ventana no modal con el avance de un trabajo y el botón para cancelarlo"""
+
+    def __init__(self, parent: tk.Misc, job: ExportJob, runner: ExportJobRunner):
+        super().__init__(parent)
+        self.job = job
+        self.runner = runner
+
+        self.title("Exportando...")
+        self.transient(parent.winfo_toplevel())
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+
+        self._create_widgets()
+        self._place(len(runner.active_jobs))
+
+        job.on_update = self._refresh
+        self._refresh(job)
+
+    def _create_widgets(self):
+        main_frame = ttk.Frame(self, padding=15)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            main_frame,
+            text=self.job.title,
+            font=('Arial', 10, 'bold'),
+            wraplength=320
+        ).pack(anchor=tk.W, pady=(0, 8))
+
+        self.progress_bar = ttk.Progressbar(main_frame, length=320, maximum=100)
+        self.progress_bar.pack(pady=(0, 6))
+
+        self.message_label = ttk.Label(main_frame, text="", font=('Arial', 9), foreground='#7f8c8d')
+        self.message_label.pack(anchor=tk.W)
+
+        self.cancel_button = ttk.Button(main_frame, text="Cancelar", command=self._cancel)
+        self.cancel_button.pack(anchor=tk.E, pady=(10, 0))
+
+    def _place(self, stack_index: int):
+        """Apila las ventanas de los trabajos en la esquina de la ventana padre"""
+        self.update_idletasks()
+        parent = self.master.winfo_toplevel()
+        x = parent.winfo_rootx() + parent.winfo_width() - self.winfo_width() - 20
+        y = parent.winfo_rooty() + 60 + (stack_index - 1) * (self.winfo_height() + 10)
+        self.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+
+    def _refresh(self, job: ExportJob):
+        if job.finished:
+            self.destroy()
+            return
+
+        if job.progress is None:
+            if str(self.progress_bar['mode']) != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate')
+                self.progress_bar.start(15)
+        else:
+            if str(self.progress_bar['mode']) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate')
+            self.progress_bar['value'] = job.progress
+
+        self.message_label.config(text=job.message)
+
+    def _cancel(self):
+        self.cancel_button.config(state=tk.DISABLED)
+        self.message_label.config(text="Cancelando...")
+        self.runner.cancel(self.job)
+
+
+def submit_export_job(widget: tk.Misc, title: str, task: Callable[[ExportJob], Any],
+                      output_path: Optional[str] = None,
+                      on_done: Optional[Callable[[Any], None]] = None,
+                      on_error: Optional[Callable[[Exception], None]] = None) -> ExportJob:
+    """
+    Encola una exportación en el runner de la ventana y muestra su avance.
+    """
+    runner = ExportJobRunner.for_widget(widget)
+    job = runner.submit(title, task, output_path, on_done, on_error)
+    ExportProgressWindow(widget, job, runner)
+    return job
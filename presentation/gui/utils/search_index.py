@@ -0,0 +1,167 @@
+# search_index.py
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_text(value) -> str:
+    """Texto en minúsculas y sin acentos ("Pérez" -> "perez")"""
+    text = unicodedata.normalize("NFKD", str(value))
+    return "".join(char for char in text if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(value) -> list:
+    """Palabras normalizadas de un valor; los separadores (espacios, "/", "-", ...) se descartan"""
+    if value is None:
+        return []
+    return TOKEN_PATTERN.findall(normalize_text(value))
+
+
+class SearchIndex:
+    """
+    Índice de búsqueda en memoria para listas filtrables.
+
+    Cada fila se registra con una clave y los valores en los que se busca.
+    Los valores se normalizan (minúsculas, sin acentos) y se parten en
+    palabras; el índice guarda, ordenados, los sufijos de todas las palabras
+    distintas, de modo que una búsqueda por subcadena es un `bisect` sobre
+    los sufijos seguido de la unión de las filas de las palabras encontradas.
+    Con varias palabras en la búsqueda, cada una debe aparecer en la fila:
+    se expande solo la más selectiva y las demás se comprueban sobre las
+    filas ya encontradas (o se cruzan, si esas filas son más que las que
+    aportaría la palabra).
+
+    Alta, edición y baja de filas actualizan el índice sin reconstruirlo.
+    """
+
+    # Hasta esta cantidad de sufijos se cuentan las filas exactas de un
+    # término para elegir el más selectivo; por encima se lo considera amplio
+    ESTIMATE_MAX_SUFFIXES = 256
+
+    def __init__(self, entries=()):
+        self._row_tokens = {}       # clave -> palabras de la fila
+        self._token_rows = {}       # palabra -> claves de las filas que la contienen
+        self._suffix_tokens = {}    # sufijo -> palabras que terminan en él
+        self._suffixes = []         # sufijos ordenados para bisect
+        self.build(entries)
+
+    def __len__(self):
+        return len(self._row_tokens)
+
+    def __contains__(self, key):
+        return key in self._row_tokens
+
+    def build(self, entries):
+        """Reconstruye el índice a partir de pares (clave, valores)"""
+        self._row_tokens.clear()
+        self._token_rows.clear()
+        self._suffix_tokens.clear()
+        for key, values in entries:
+            self._add(key, values, keep_sorted=False)
+        self._suffixes = sorted(self._suffix_tokens)
+
+    def update(self, key, values):
+        """Agrega una fila o reemplaza sus valores si ya estaba indexada"""
+        self.remove(key)
+        self._add(key, values, keep_sorted=True)
+
+    def remove(self, key):
+        """Quita una fila del índice (no hace nada si no estaba)"""
+        for token in self._row_tokens.pop(key, ()):
+            rows = self._token_rows[token]
+            rows.discard(key)
+            if not rows:
+                del self._token_rows[token]
+                self._forget_token(token)
+
+    def search(self, text):
+        """
+        Claves de las filas que contienen todas las palabras de `text`.
+
+        Returns:
+            set con las claves encontradas, o None si el texto no tiene
+            palabras (no hay nada que filtrar)
+        """
+        terms = set(tokenize(text))
+        if not terms:
+            return None
+
+        ranges = sorted((self._term_cost(*bounds), bounds, term)
+                        for term, bounds in ((term, self._suffix_range(term)) for term in terms))
+        _, (start, stop), _ = ranges[0]
+        result = self._rows_with(self._tokens_in_range(start, stop))
+        for (_, estimate), (start, stop), term in ranges[1:]:
+            if not result:
+                break
+            if len(result) <= estimate:
+                row_tokens = self._row_tokens
+                result = {key for key in result if any(term in token for token in row_tokens[key])}
+            else:
+                result &= self._rows_with(self._tokens_in_range(start, stop))
+        return result
+
+    # ========== MANTENIMIENTO ==========
+
+    def _add(self, key, values, keep_sorted: bool):
+        tokens = set()
+        for value in values:
+            tokens.update(tokenize(value))
+        self._row_tokens[key] = tokens
+        for token in tokens:
+            rows = self._token_rows.get(token)
+            if rows is None:
+                rows = self._token_rows[token] = set()
+                self._register_token(token, keep_sorted)
+            rows.add(key)
+
+    def _register_token(self, token: str, keep_sorted: bool):
+        for start in range(len(token)):
+            suffix = token[start:]
+            tokens = self._suffix_tokens.get(suffix)
+            if tokens is None:
+                tokens = self._suffix_tokens[suffix] = set()
+                if keep_sorted:
+                    insort(self._suffixes, suffix)
+            tokens.add(token)
+
+    def _forget_token(self, token: str):
+        for start in range(len(token)):
+            suffix = token[start:]
+            tokens = self._suffix_tokens[suffix]
+            tokens.discard(token)
+            if not tokens:
+                del self._suffix_tokens[suffix]
+                del self._suffixes[bisect_left(self._suffixes, suffix)]
+
+    # ========== CONSULTA ==========
+
+    def _suffix_range(self, term: str):
+        """Posiciones [start, stop) de los sufijos que empiezan por `term`"""
+        start = bisect_left(self._suffixes, term)
+        stop = bisect_left(self._suffixes, term + "\U0010ffff", start)
+        return start, stop
+
+    def _tokens_in_range(self, start: int, stop: int) -> set:
+        """Palabras indexadas que terminan en alguno de los sufijos del rango"""
+        tokens = set()
+        for suffix in self._suffixes[start:stop]:
+            tokens.update(self._suffix_tokens[suffix])
+        return tokens
+
+    def _term_cost(self, start: int, stop: int):
+        """
+        Orden de selectividad y filas estimadas de un término: las exactas si
+        abarca pocos sufijos, o la cantidad de sufijos como cota si es amplio
+        """
+        if stop - start > self.ESTIMATE_MAX_SUFFIXES:
+            return (1, stop - start)
+        return (0, sum(len(self._token_rows[token]) for token in self._tokens_in_range(start, stop)))
+
+    def _rows_with(self, tokens: set) -> set:
+        rows = set()
+        for token in tokens:
+            rows.update(self._token_rows[token])
+        return rows
@@ -2,8 +2,183 @@
 import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkfont
+from collections import OrderedDict
 from datetime import datetime
 
+
+def native_sort_key(value):
+    """Clave para valores nativos (fecha, Decimal, ...); los vacíos van al final"""
+    return (value is None, value)
+
+
+def text_sort_keys(texts):
+    """Claves para textos mostrados: numéricas si toda la columna es numérica"""
+    try:
+        return [float(text.replace('$', '').replace(',', '')) if text else 0 for text in texts]
+    except (ValueError, AttributeError):
+        return [str(text) for text in texts]
+
+
+class TreeviewDataModel:
+    """
+    Origen de filas para el modo virtual de SmartTreeview.
+    
+    El Treeview solo pide la ventana visible con `rows(start, stop)`; el
+    modelo decide si las filas ya están en memoria o se consultan a demanda.
+    """
+    
+    def __len__(self):
+        raise NotImplementedError
+    
+    def rows(self, start, stop):
+        """Filas [start, stop) como tuplas listas para mostrar"""
+        raise NotImplementedError
+    
+    def all_rows(self):
+        """Todas las filas en el orden actual (por ejemplo, para exportar)"""
+        return self.rows(0, len(self))
+    
+    def sort(self, column_index, reverse=False):
+        """Ordena por una columna; devuelve False si el modelo no lo admite"""
+        return self.sort_by([(column_index, reverse)])
+    
+    def sort_by(self, criteria):
+        """
+        Ordena por varias columnas
+        
+        Args:
+            criteria: Lista de (índice de columna, descendente), del criterio
+                principal al último desempate; vacía restaura el orden original
+        
+        Returns:
+            False si el modelo no admite ordenamiento
+        """
+        return False
+
+
+class ListDataModel(TreeviewDataModel):
+    """Filas ya cargadas en memoria, con valores nativos opcionales para ordenar"""
+    
+    def __init__(self, rows, sort_values=None):
+        self._rows = [tuple(row) for row in rows]
+        self._sort_values = [tuple(values) for values in sort_values] if sort_values is not None else None
+        # Índices en el orden mostrado; None mientras se conserva el original
+        self._order = None
+        # Claves de orden ya calculadas por columna
+        self._sort_keys = {}
+    
+    def __len__(self):
+        return len(self._rows)
+    
+    def rows(self, start, stop):
+        if self._order is None:
+            return self._rows[start:stop]
+        return [self._rows[index] for index in self._order[start:stop]]
+    
+    def sort_keys(self, column_index):
+        """Clave de orden de cada fila en una columna, calculada una sola vez"""
+        keys = self._sort_keys.get(column_index)
+        if keys is None:
+            if self._sort_values is not None:
+                keys = [native_sort_key(values[column_index]) for values in self._sort_values]
+            else:
+                keys = text_sort_keys([str(row[column_index]) if column_index < len(row) else ""
+                                       for row in self._rows])
+            self._sort_keys[column_index] = keys
+        return keys
+    
+    def sort_by(self, criteria):
+        if not criteria:
+            self._order = None
+            return True
+        
+        # Ordenamientos estables del último criterio al principal
+        order = list(range(len(self._rows)))
+        for column_index, reverse in reversed(criteria):
+            order.sort(key=self.sort_keys(column_index).__getitem__, reverse=reverse)
+        self._order = order
+        return True
+
+
+class LazyDataModel(TreeviewDataModel):
+    """
+    Filas consultadas por bloques a medida que se desplaza la vista.
+    
+    `fetch_block(block, block_size, sort)` devuelve `(filas, total)` del
+    bloque indicado (base 0) en el orden `sort`, por ejemplo una página de
+    ReportService. Solo los últimos `max_blocks` bloques usados quedan en
+    memoria.
+    
+    El orden lo resuelve el origen (ORDER BY), no el modelo: `sort_keys`
+    asocia la posición de cada columna ordenable con su clave en el origen,
+    y `sort` es la lista de (clave, descendente) de los criterios activos.
+    """
+    
+    def __init__(self, fetch_block, block_size=500, max_blocks=8, sort_keys=None, criteria=()):
+        self._fetch_block = fetch_block
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.sort_keys = dict(sort_keys or {})
+        self.sort = self._source_sort(criteria) or []
+        self._blocks = OrderedDict()
+        self._total = 0
+        
+        # El primer bloque también informa el total de filas
+        self._load_block(0)
+    
+    def _source_sort(self, criteria):
+        """Criterios como (clave, descendente); None si alguna columna no se puede ordenar"""
+        sort = []
+        for column_index, reverse in criteria:
+            key = self.sort_keys.get(column_index)
+            if key is None:
+                return None
+            sort.append((key, reverse))
+        return sort
+    
+    def sort_by(self, criteria):
+        sort = self._source_sort(criteria)
+        if sort is None:
+            return False
+        
+        if sort != self.sort:
+            # Otro orden: los bloques en memoria ya no corresponden
+            self.sort = sort
+            self._blocks.clear()
+            self._load_block(0)
+        return True
+    
+    def __len__(self):
+        return self._total
+    
+    def _load_block(self, block):
+        if block in self._blocks:
+            self._blocks.move_to_end(block)
+            return self._blocks[block]
+        
+        rows, total = self._fetch_block(block, self.block_size, self.sort)
+        rows = [tuple(row) for row in rows]
+        self._total = total
+        self._blocks[block] = rows
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return rows
+    
+    def rows(self, start, stop):
+        stop = min(stop, self._total)
+        index = max(0, start)
+        result = []
+        while index < stop:
+            block, offset = divmod(index, self.block_size)
+            chunk = self._load_block(block)[offset:offset + stop - index]
+            if not chunk:
+                # El origen devolvió menos filas que el total informado
+                break
+            result.extend(chunk)
+            index += len(chunk)
+        return result
+
+
 class SmartTreeview(ttk.Treeview):
     """
     Treeview mejorado con autoajuste inteligente, tooltips y personalización
@@ -27,6 +202,34 @@ class SmartTreeview(ttk.Treeview):
         self.tooltips = {}
         self.column_tooltips = {}
         
+        # Valores nativos por fila (fecha, Decimal, ...) usados al ordenar
+        self._sort_values = {}
+        
+        # Orden: criterios activos, valores mostrados y claves ya calculadas
+        self._sort_state = []
+        self._row_values = {}
+        self._item_sort_keys = {}
+        self._resort_job = None
+        
+        # Modo virtual: modelo de datos y ventana de ítems reutilizados
+        self._virtual_model = None
+        self._virtual_top = 0
+        self._virtual_items = []
+        self._virtual_index = {}
+        self._virtual_selected = set()
+        self._virtual_focus = None
+        self._virtual_yscroll = ""
+        
+        # Anchos de contenido por posición de columna, mantenidos al insertar
+        self._measure_font = None
+        self._text_widths = {}
+        self._content_widths = []
+        self._content_chars = []
+        self._content_measured = []
+        self._widths_dirty = False
+        self._adjust_job = None
+        self._last_width = None
+        
         # Configurar eventos
         self.setup_events()
         
@@ -37,19 +240,22 @@ class SmartTreeview(ttk.Treeview):
         if columns_config:
             self.setup_columns(columns_config)
     
+    # Estilo propio para no alterar los demás Treeview de la aplicación
+    STYLE_NAME = "Smart.Treeview"
+    
     def configure_style(self):
         """Configurar estilos para mejor legibilidad"""
         style = ttk.Style()
         
         # Configurar fuentes más legibles
-        style.configure("Treeview", 
+        style.configure(self.STYLE_NAME, 
                        font=("Segoe UI", 9),  # Cambiar por fuente disponible
                        rowheight=28,  # Más altura para mejor lectura
                        background="#FFFFFF",
                        fieldbackground="#FFFFFF",
                        borderwidth=0)
         
-        style.configure("Treeview.Heading", 
+        style.configure(f"{self.STYLE_NAME}.Heading", 
                        font=("Segoe UI", 9, "bold"),
                        background="#2C3E50",
                        foreground="white",
@@ -57,10 +263,13 @@ class SmartTreeview(ttk.Treeview):
                        borderwidth=1)
         
         # Configurar colores para filas alternadas y selección
-        style.map("Treeview", 
+        style.map(self.STYLE_NAME, 
                  background=[("selected", "#3498DB")],
                  foreground=[("selected", "white")])
         
+        if not str(self.cget("style")):
+            self.configure(style=self.STYLE_NAME)
+        
         # Colores alternados para filas
         self.tag_configure('oddrow', background='#F8F9FA')
         self.tag_configure('evenrow', background='#FFFFFF')
@@ -77,6 +286,15 @@ class SmartTreeview(ttk.Treeview):
         # Evento para tooltips de contenido largo
         self.bind("<Motion>", self.show_content_tooltip)
         self.bind("<Leave>", self.hide_content_tooltip)
+        
+        # Shift+clic en un encabezado agrega un criterio de orden
+        self.bind("<Shift-Button-1>", self._on_heading_shift_click)
+        
+        # Desplazamiento del modo virtual (sin efecto en modo normal)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind(sequence, self._on_virtual_wheel)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.bind(sequence, self._on_virtual_key)
     
     def setup_columns(self, columns_config):
         """
@@ -126,7 +344,7 @@ class SmartTreeview(ttk.Treeview):
                 self.create_header_tooltip(col_id, display_text)
         
         # Autoajustar después de un breve delay
-        self.after(100, self.auto_adjust_columns)
+        self.schedule_auto_adjust(100)
     
     def create_header_tooltip(self, column, text):
         """Crear tooltip para encabezados largos"""
@@ -219,7 +437,10 @@ class SmartTreeview(ttk.Treeview):
     
     def auto_adjust_columns(self):
         """Autoajustar columnas basado en contenido y espacio disponible"""
-        if not self.get_children():
+        if self._virtual_model is not None:
+            if not len(self._virtual_model):
+                return
+        elif not self.get_children():
             return
         
         # Calcular espacio disponible
@@ -282,49 +503,154 @@ class SmartTreeview(ttk.Treeview):
     
     def calculate_content_width(self, column):
         """Calcular ancho máximo del contenido en una columna"""
-        font = tkfont.Font(font="TkDefaultFont")
-        max_width = 0
-        
-        # Ver contenido de cada fila
-        for item in self.get_children():
-            value = self.set(item, column)
-            if value:
-                # Medir ancho del texto
-                text_width = font.measure(str(value))
-                
-                # Agregar padding y espacio para iconos
-                cell_width = text_width + 30
-                
-                if cell_width > max_width:
-                    max_width = cell_width
+        columns = list(self["columns"])
+        if column not in columns:
+            return 0
+        
+        self._refresh_content_widths()
+        position = columns.index(column)
+        if position >= len(self._content_widths) or not self._content_widths[position]:
+            return 0
         
-        return max_width
+        # Agregar padding y espacio para iconos
+        return self._content_widths[position] + 30
     
     def calculate_header_width(self, column):
         """Calcular ancho necesario para el encabezado"""
-        font = tkfont.Font(font="TkDefaultFont")
         header_text = self.heading(column)["text"]
         
         # Medir texto y agregar espacio para icono de ordenamiento
-        header_width = font.measure(header_text) + 40
+        header_width = self._measure_text(str(header_text)) + 40
         
         return header_width
     
+    # ========== ANCHO DE COLUMNAS ==========
+    
+    # Filas medidas al recalcular anchos desde cero
+    WIDTH_SAMPLE_ROWS = 200
+    # Espera para agrupar ráfagas de <Configure>/<Visibility>
+    ADJUST_DELAY_MS = 150
+    # Tope de textos con el ancho ya medido
+    MAX_MEASURED_TEXTS = 20000
+    
+    def _measure_text(self, text):
+        """Ancho en píxeles de un texto, reutilizando la fuente y las mediciones"""
+        width = self._text_widths.get(text)
+        if width is None:
+            if self._measure_font is None:
+                self._measure_font = tkfont.nametofont("TkDefaultFont")
+            if len(self._text_widths) >= self.MAX_MEASURED_TEXTS:
+                self._text_widths.clear()
+            width = self._measure_font.measure(text)
+            self._text_widths[text] = width
+        return width
+    
+    def _track_widths(self, values):
+        """
+        Actualizar el ancho máximo de cada columna con una fila
+        
+        Solo se miden los textos más largos (en caracteres) que el más
+        largo visto en su columna; los de igual largo, solo hasta juntar
+        WIDTH_SAMPLE_ROWS mediciones. Los más cortos no pueden ampliar la
+        columna de forma apreciable.
+        """
+        widths = self._content_widths
+        chars = self._content_chars
+        measured = self._content_measured
+        if len(widths) < len(values):
+            missing = len(values) - len(widths)
+            widths.extend([0] * missing)
+            chars.extend([0] * missing)
+            measured.extend([0] * missing)
+        
+        for position, value in enumerate(values):
+            if value is None:
+                continue
+            text = str(value)
+            length = len(text)
+            if not text or length < chars[position]:
+                continue
+            if length == chars[position] and measured[position] >= self.WIDTH_SAMPLE_ROWS:
+                continue
+            chars[position] = length
+            measured[position] += 1
+            width = self._measure_text(text)
+            if width > widths[position]:
+                widths[position] = width
+    
+    def _invalidate_widths(self):
+        """Los anchos se recalculan con una muestra en el próximo ajuste"""
+        self._widths_dirty = True
+    
+    def _sample_rows(self):
+        """Hasta WIDTH_SAMPLE_ROWS filas repartidas en toda la tabla"""
+        if self._virtual_model is not None:
+            # Primer bloque y ventana actual, que el modelo ya tiene en memoria
+            top = self._virtual_top
+            rows = self._virtual_model.rows(0, self.WIDTH_SAMPLE_ROWS)
+            return rows + self._virtual_model.rows(top, top + len(self._virtual_items))
+        
+        children = self.get_children()
+        step = max(1, len(children) // self.WIDTH_SAMPLE_ROWS)
+        return [self.item(item, "values") for item in children[::step]]
+    
+    def _refresh_content_widths(self):
+        if not self._widths_dirty:
+            return
+        
+        self._widths_dirty = False
+        self._content_widths = []
+        self._content_chars = []
+        self._content_measured = []
+        for values in self._sample_rows():
+            self._track_widths(values)
+    
+    def schedule_auto_adjust(self, delay=None):
+        """Autoajustar una sola vez después de una ráfaga de eventos"""
+        if self._adjust_job is not None:
+            self.after_cancel(self._adjust_job)
+        self._adjust_job = self.after(self.ADJUST_DELAY_MS if delay is None else delay,
+                                      self._run_scheduled_adjust)
+    
+    def _run_scheduled_adjust(self):
+        self._adjust_job = None
+        self.auto_adjust_columns()
+    
     def on_resize(self, event):
         """Reajustar columnas cuando se redimensiona"""
-        if event.widget == self and self.winfo_width() > 50:
-            self.after(150, self.auto_adjust_columns)
+        if event.widget != self:
+            return
+        
+        if self._virtual_model is not None:
+            # La cantidad de filas visibles depende del alto
+            self._render_virtual_window()
+        
+        # Los cambios de alto no afectan el ancho de las columnas
+        width = self.winfo_width()
+        if width > 50 and width != self._last_width:
+            self._last_width = width
+            self.schedule_auto_adjust()
     
     def on_visibility(self, event):
         """Ajustar columnas cuando se hace visible"""
-        self.after(200, self.auto_adjust_columns)
+        self.schedule_auto_adjust(200)
     
     def update_row_tags(self, event=None):
         """Actualizar tags para colores alternados"""
+        if self._virtual_model is not None:
+            self._render_virtual_window()
+            return
+        
         children = self.get_children()
-        for i, child in enumerate(children):
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.item(child, tags=(tag,))
+        if not children:
+            return
+        
+        # Pocas llamadas a Tk sin importar la cantidad de filas
+        for tag in ('evenrow', 'oddrow'):
+            self.tk.call(self._w, "tag", "remove", tag, children)
+        self.tk.call(self._w, "tag", "add", "evenrow", children[0::2])
+        if len(children) > 1:
+            self.tk.call(self._w, "tag", "add", "oddrow", children[1::2])
     
     def setup_context_menu(self):
         """Configurar menú contextual para personalización"""
@@ -493,26 +819,28 @@ class SmartTreeview(ttk.Treeview):
     
     def copy_selected_data(self):
         """Copiar datos seleccionados al portapapeles"""
-        selection = self.selection()
-        if not selection:
+        selected_rows = self.selected_rows()
+        if not selected_rows:
             return
         
         copied_data = []
         
         # Obtener encabezados visibles
         headers = []
-        for col in self["columns"]:
+        visible_positions = []
+        for position, col in enumerate(self["columns"]):
             if self.column(col)["width"] > 0:  # Solo columnas visibles
                 headers.append(self.heading(col)["text"])
+                visible_positions.append(position)
         
         copied_data.append("\t".join(headers))
         
         # Obtener datos de las filas seleccionadas
-        for item in selection:
+        for values in selected_rows:
             row_data = []
-            for col in self["columns"]:
-                if self.column(col)["width"] > 0:  # Solo columnas visibles
-                    row_data.append(str(self.set(item, col) or ""))
+            for position in visible_positions:
+                value = values[position] if position < len(values) else ""
+                row_data.append(str(value if value is not None else ""))
             
             copied_data.append("\t".join(row_data))
         
@@ -520,28 +848,393 @@ class SmartTreeview(ttk.Treeview):
         self.clipboard_clear()
         self.clipboard_append("\n".join(copied_data))
     
-    def sort_column(self, column, reverse=False):
-        """Ordenar columna al hacer clic en el encabezado"""
-        # Obtener datos
-        data = [(self.set(item, column), item) for item in self.get_children()]
+    def insert_row(self, values, sort_values=None, parent="", index=tk.END, **kwargs):
+        """
+        Insertar una fila guardando sus valores nativos para ordenar
         
-        # Intentar ordenar numéricamente si es posible
-        try:
-            data.sort(key=lambda t: float(t[0].replace('$', '').replace(',', '')) 
-                     if t[0] else 0, reverse=reverse)
-        except (ValueError, AttributeError):
-            # Ordenar alfabéticamente
-            data.sort(reverse=reverse)
+        Args:
+            values: Valores a mostrar (texto ya formateado)
+            sort_values: Valores nativos en el mismo orden de columnas (opcional)
+        """
+        item = self.insert(parent, index, values=values, **kwargs)
+        if sort_values is not None:
+            self._sort_values[item] = tuple(sort_values)
+        return item
+    
+    def insert(self, parent, index, iid=None, **kw):
+        """Insertar un ítem actualizando los anchos de contenido"""
+        item = super().insert(parent, index, iid, **kw)
+        if "values" in kw and self._virtual_model is None:
+            self._row_values[item] = tuple(kw["values"])
+            self._item_sort_keys.clear()
+            self._schedule_resort()
+        if "values" in kw and not self._widths_dirty:
+            self._track_widths(kw["values"])
+        return item
+    
+    def item(self, item, option=None, **kw):
+        if "values" in kw and self._virtual_model is None:
+            self._row_values[item] = tuple(kw["values"])
+            self._item_sort_keys.clear()
+        return super().item(item, option, **kw)
+    
+    def delete(self, *items):
+        """Eliminar filas junto con sus valores nativos"""
+        for item in items:
+            self._sort_values.pop(item, None)
+            self._row_values.pop(item, None)
+        super().delete(*items)
+        self._item_sort_keys.clear()
+        self._invalidate_widths()
+    
+    # ========== ORDENAMIENTO ==========
+    
+    @property
+    def sort_state(self):
+        """Criterios activos como lista de (columna, descendente)"""
+        return list(self._sort_state)
+    
+    def sort_column(self, column, reverse=False, add=False):
+        """
+        Ordenar columna al hacer clic en el encabezado
         
-        # Reorganizar items
-        for index, (_, item) in enumerate(data):
-            self.move(item, '', index)
+        Con add=True (Shift+clic en el encabezado) la columna se agrega
+        como desempate de los criterios ya activos.
+        """
+        if add:
+            criteria = list(self._sort_state)
+            sorted_columns = [sorted_column for sorted_column, _ in criteria]
+            if column in sorted_columns:
+                criteria[sorted_columns.index(column)] = (column, reverse)
+            else:
+                criteria.append((column, reverse))
+        else:
+            criteria = [(column, reverse)]
+        
+        self.sort_by(criteria)
         
         # Cambiar dirección para el próximo clic
         self.heading(column, command=lambda: self.sort_column(column, not reverse))
+    
+    def sort_by(self, criteria):
+        """
+        Ordenar por varias columnas de forma estable
         
-        # Actualizar tags de filas
+        El orden se calcula sobre los datos (valores nativos o texto ya
+        guardado) y se aplica al widget de una sola vez. Los criterios
+        quedan guardados y se vuelven a aplicar al cargar otro modelo
+        virtual o al insertar filas, por ejemplo después de filtrar.
+        
+        Args:
+            criteria: Lista de (columna, descendente) del criterio
+                principal al último desempate
+        """
+        columns = list(self["columns"])
+        self._sort_state = [(column, reverse) for column, reverse in criteria if column in columns]
+        self._apply_sort()
+    
+    def clear_sort(self):
+        """Olvidar los criterios de orden (el modelo virtual vuelve a su orden original)"""
+        self._sort_state = []
+        if self._virtual_model is not None and self._virtual_model.sort_by([]):
+            self._render_virtual_window()
+    
+    def _sort_criteria(self):
+        """Criterios activos como (posición de columna, descendente)"""
+        columns = list(self["columns"])
+        return [(columns.index(column), reverse)
+                for column, reverse in self._sort_state if column in columns]
+    
+    def _schedule_resort(self):
+        if self._sort_state and self._resort_job is None:
+            self._resort_job = self.after_idle(self._apply_sort)
+    
+    def _apply_sort(self):
+        self._resort_job = None
+        criteria = self._sort_criteria()
+        
+        if self._virtual_model is not None:
+            if self._virtual_model.sort_by(criteria):
+                self._virtual_selected = set()
+                self._virtual_focus = None
+                self._virtual_top = 0
+                self._render_virtual_window()
+            return
+        
+        children = self.get_children()
+        if not criteria or not children:
+            return
+        
+        # Ordenamientos estables del último criterio al principal
+        order = list(children)
+        for position, reverse in reversed(criteria):
+            order.sort(key=self._column_sort_keys(position, children).__getitem__, reverse=reverse)
+        
+        self.set_children("", *order)
         self.update_row_tags()
+    
+    def _column_sort_keys(self, position, children):
+        """Clave de orden de cada ítem en una columna, calculada una sola vez"""
+        keys = self._item_sort_keys.get(position)
+        if keys is None:
+            sort_values = self._sort_values
+            if sort_values and all(item in sort_values for item in children):
+                # Ordenar directamente sobre fechas/Decimal sin volver a interpretar texto
+                keys = {item: native_sort_key(sort_values[item][position]) for item in children}
+            else:
+                texts = []
+                for item in children:
+                    values = self._row_values.get(item)
+                    if values is None:
+                        values = self._row_values[item] = tuple(super().item(item, "values"))
+                    value = values[position] if position < len(values) else ""
+                    texts.append("" if value is None else str(value))
+                keys = dict(zip(children, text_sort_keys(texts)))
+            self._item_sort_keys[position] = keys
+        return keys
+    
+    def _on_heading_shift_click(self, event):
+        """Shift+clic en un encabezado: agregar la columna como desempate"""
+        if self.identify_region(event.x, event.y) != "heading":
+            return None
+        
+        columns = self["columns"]
+        col_index = int(self.identify_column(event.x).replace('#', '')) - 1
+        if not 0 <= col_index < len(columns):
+            return None
+        
+        column = columns[col_index]
+        current = dict(self._sort_state).get(column)
+        self.sort_column(column, reverse=current is False, add=True)
+        return "break"
+    
+    # ========== MODO VIRTUAL ==========
+    
+    # Filas extra materializadas debajo de la ventana visible
+    VIRTUAL_BUFFER = 5
+    
+    @property
+    def virtual_model(self):
+        """Modelo mostrado en modo virtual, o None en modo normal"""
+        return self._virtual_model
+    
+    def set_virtual_model(self, model):
+        """
+        Mostrar un TreeviewDataModel en modo virtual
+        
+        Solo existen en Tk las filas visibles más VIRTUAL_BUFFER; al
+        desplazarse se reutilizan los mismos ítems con otros valores, así
+        que cargar o filtrar no depende de la cantidad total de filas.
+        El scrollbar vertical (yscrollcommand) pasa a reflejar el modelo.
+        """
+        if self._virtual_model is None:
+            children = self.get_children()
+            if children:
+                self.delete(*children)
+            self._virtual_yscroll = str(self.cget("yscrollcommand"))
+            self.configure(yscrollcommand="")
+        
+        self._virtual_model = model
+        self._virtual_top = 0
+        self._virtual_index = {}
+        self._invalidate_widths()
+        self._virtual_selected = set()
+        self._virtual_focus = None
+        
+        # Conservar el orden elegido por el usuario al filtrar o refrescar
+        if self._sort_state:
+            model.sort_by(self._sort_criteria())
+        self._render_virtual_window()
+    
+    def clear_virtual_model(self):
+        """Salir del modo virtual dejando el Treeview vacío"""
+        if self._virtual_model is None:
+            return
+        
+        self._virtual_model = None
+        if self._virtual_items:
+            super().delete(*self._virtual_items)
+        self._virtual_items = []
+        self._virtual_index = {}
+        self._virtual_selected = set()
+        self._virtual_focus = None
+        self._invalidate_widths()
+        self.configure(yscrollcommand=self._virtual_yscroll)
+    
+    def selected_rows(self):
+        """Valores de las filas seleccionadas, incluidas las que quedaron fuera de la vista"""
+        if self._virtual_model is None:
+            return [self.item(item, "values") for item in self.selection()]
+        
+        self._sync_virtual_selection()
+        rows = []
+        for index in sorted(self._virtual_selected):
+            rows.extend(self._virtual_model.rows(index, index + 1))
+        return rows
+    
+    def yview(self, *args):
+        """En modo virtual, el desplazamiento mueve la ventana sobre el modelo"""
+        if self._virtual_model is None:
+            return super().yview(*args)
+        
+        total = len(self._virtual_model)
+        visible = self._visible_row_count()
+        if not args:
+            return self._virtual_fractions(total, visible)
+        
+        if args[0] == "moveto":
+            top = int(round(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            top = self._virtual_top + int(args[1]) * step
+        else:
+            return None
+        
+        self._scroll_virtual_to(top)
+    
+    def yview_moveto(self, fraction):
+        if self._virtual_model is None:
+            return super().yview_moveto(fraction)
+        self.yview("moveto", fraction)
+    
+    def yview_scroll(self, number, what):
+        if self._virtual_model is None:
+            return super().yview_scroll(number, what)
+        self.yview("scroll", number, what)
+    
+    def _scroll_virtual_to(self, top):
+        self._sync_virtual_selection()
+        self._virtual_top = top
+        self._render_virtual_window()
+    
+    def _row_metrics(self):
+        """Alto de fila y del encabezado en píxeles"""
+        if self._virtual_items:
+            bbox = self.bbox(self._virtual_items[0])
+            if bbox:
+                return bbox[3], bbox[1]
+        
+        style = self.cget("style") or "Treeview"
+        try:
+            row_height = int(ttk.Style().lookup(style, "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            row_height = 20
+        header_height = row_height if "headings" in str(self.cget("show")) else 0
+        return row_height, header_height
+    
+    def _visible_row_count(self):
+        """Filas que entran en el alto actual del widget"""
+        height = self.winfo_height()
+        if height <= 1:
+            # Todavía no se dibujó: usar la altura configurada en filas
+            return max(1, int(self.cget("height")))
+        
+        row_height, header_height = self._row_metrics()
+        return max(1, (height - header_height) // max(1, row_height))
+    
+    def _virtual_fractions(self, total, visible):
+        if not total:
+            return 0.0, 1.0
+        first = self._virtual_top / total
+        last = min(1.0, (self._virtual_top + visible) / total)
+        return first, last
+    
+    def _sync_virtual_selection(self):
+        """Pasar la selección de los ítems visibles a índices del modelo"""
+        if not self._virtual_index:
+            return
+        
+        window = set(self._virtual_index.values())
+        current = {self._virtual_index[item] for item in self.selection() if item in self._virtual_index}
+        self._virtual_selected = (self._virtual_selected - window) | current
+        
+        focus = self.focus()
+        if focus in self._virtual_index:
+            self._virtual_focus = self._virtual_index[focus]
+    
+    def _render_virtual_window(self):
+        """Cargar en los ítems reutilizados las filas de la ventana actual"""
+        model = self._virtual_model
+        total = len(model)
+        visible = self._visible_row_count()
+        self._virtual_top = max(0, min(self._virtual_top, total - visible))
+        top = self._virtual_top
+        
+        rows = model.rows(top, min(total, top + visible + self.VIRTUAL_BUFFER))
+        items = self._virtual_items
+        while len(items) < len(rows):
+            items.append(self.insert("", tk.END))
+        if len(items) > len(rows):
+            super().delete(*items[len(rows):])
+            del items[len(rows):]
+        
+        self._virtual_index = {}
+        selected = []
+        for offset, (item, values) in enumerate(zip(items, rows)):
+            index = top + offset
+            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
+            self.item(item, values=values, tags=(tag,))
+            self._virtual_index[item] = index
+            if not self._widths_dirty:
+                self._track_widths(values)
+            if index in self._virtual_selected:
+                selected.append(item)
+            if index == self._virtual_focus:
+                self.focus(item)
+        
+        if set(self.selection()) != set(selected):
+            self.selection_set(selected)
+        
+        # La ventana siempre se muestra desde su primer ítem
+        super().yview_moveto(0)
+        
+        if self._virtual_yscroll:
+            self.tk.call(self._virtual_yscroll, *self._virtual_fractions(total, visible))
+    
+    def _on_virtual_wheel(self, event):
+        if self._virtual_model is None:
+            return None
+        
+        if event.num == 4:
+            units = -3
+        elif event.num == 5:
+            units = 3
+        else:
+            units = -3 if event.delta > 0 else 3
+        self.yview("scroll", units, "units")
+        return "break"
+    
+    def _on_virtual_key(self, event):
+        """Navegación con teclado sobre el modelo completo"""
+        if self._virtual_model is None:
+            return None
+        
+        total = len(self._virtual_model)
+        if not total:
+            return "break"
+        
+        self._sync_virtual_selection()
+        visible = self._visible_row_count()
+        current = self._virtual_focus if self._virtual_focus is not None else self._virtual_top
+        
+        if event.keysym == "Home":
+            target = 0
+        elif event.keysym == "End":
+            target = total - 1
+        else:
+            steps = {"Up": -1, "Down": 1, "Prior": -visible, "Next": visible}
+            target = current + steps.get(event.keysym, 0)
+        target = max(0, min(target, total - 1))
+        
+        if target < self._virtual_top:
+            self._virtual_top = target
+        elif target >= self._virtual_top + visible:
+            self._virtual_top = target - visible + 1
+        
+        self._virtual_selected = {target}
+        self._virtual_focus = target
+        self._render_virtual_window()
+        return "break"
 
 
 # Función de conveniencia para crear configuraciones de columnas